@@ -10,7 +10,6 @@ Provides shared infrastructure for:
 from abc import ABC, abstractmethod
 from flask import Flask, request, jsonify, session, Response, render_template, send_file
 import uuid
-import threading
 import time
 import json
 import os
@@ -22,9 +21,12 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 from justdata.shared.core.app_factory import create_app
 from justdata.shared.utils.progress_tracker import (
     create_progress_tracker, get_progress, update_progress,
-    store_analysis_result, get_analysis_result
+    store_analysis_result, get_analysis_result,
+    get_progress_version, wait_for_progress
 )
 from justdata.shared.utils.json_utils import ensure_json_serializable, serialize_dataframes
+from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, QueueFull
+from justdata.shared.utils.analysis_cache import generate_cache_key
 
 
 class BaseReportApp(ABC):
@@ -38,8 +40,8 @@ class BaseReportApp(ABC):
     - get_template_vars(): Template variables for index page
 
     Provides:
-    - Standard Flask routes (/, /analyze, /progress, /report, /download)
-    - Background job management with progress tracking
+    - Standard Flask routes (/, /analyze, /progress, /cancel, /report, /download)
+    - Background job scheduling (bounded, de-duplicated) with progress tracking
     - SSE progress streaming
     - Report data serialization
     """
@@ -94,6 +96,7 @@ class BaseReportApp(ABC):
         self.app.add_url_rule('/', 'index', self.index, methods=['GET'])
         self.app.add_url_rule('/analyze', 'analyze', self.analyze, methods=['POST'])
         self.app.add_url_rule('/progress/<job_id>', 'progress', self.progress_handler, methods=['GET'])
+        self.app.add_url_rule('/cancel/<job_id>', 'cancel', self.cancel_handler, methods=['POST'])
         self.app.add_url_rule('/report', 'report', self.report, methods=['GET'])
         self.app.add_url_rule('/report-data', 'report_data', self.report_data, methods=['GET'])
         self.app.add_url_rule('/download', 'download', self.download, methods=['GET'])
@@ -117,7 +120,8 @@ class BaseReportApp(ABC):
     def analyze(self):
         """
         Handle analysis form submission.
-        Starts a background thread for the analysis and returns job_id.
+        Queues the analysis on the shared job scheduler and returns job_id.
+        An identical request already in flight returns that job's id instead.
         """
         try:
             data = request.get_json()
@@ -127,9 +131,6 @@ class BaseReportApp(ABC):
             job_id = str(uuid.uuid4())
             progress_tracker = create_progress_tracker(job_id, self.get_progress_steps())
 
-            # Store job_id in session
-            session['job_id'] = job_id
-
             def run_job():
                 try:
                     result = self.run_analysis(data, job_id, progress_tracker)
@@ -143,15 +144,30 @@ class BaseReportApp(ABC):
                     error_msg = f"{str(e)}\n{traceback.format_exc()}"
                     progress_tracker.complete(success=False, error=error_msg)
 
-            # Start background thread
-            thread = threading.Thread(target=run_job, daemon=True)
-            thread.start()
+            try:
+                dedup_key = generate_cache_key(self.app_name, data)
+            except Exception:
+                dedup_key = None
+
+            # Queue on the shared scheduler (bounded per-app concurrency)
+            submitted = get_job_scheduler().submit(self.app_name, run_job, job_id, dedup_key=dedup_key,
+                                                   requester=job_requester_id())
 
-            return jsonify({'success': True, 'job_id': job_id})
+            # Store job_id in session
+            session['job_id'] = submitted.job_id
+
+            return jsonify({'success': True, 'job_id': submitted.job_id, 'queue_position': submitted.queue_position})
 
+        except QueueFull as e:
+            return jsonify({'success': False, 'error': str(e)}), 503
         except Exception as e:
             return jsonify({'success': False, 'error': str(e)}), 500
 
+    def cancel_handler(self, job_id: str):
+        """Cancel a queued or running analysis job."""
+        cancelled = get_job_scheduler().cancel(job_id, requester=job_requester_id())
+        return jsonify({'success': True, 'cancelled': cancelled})
+
     def progress_handler(self, job_id: str):
         """
         Progress tracking endpoint using Server-Sent Events (SSE).
@@ -160,8 +176,7 @@ class BaseReportApp(ABC):
         def event_stream():
             last_percent = -1
             last_step = ""
-            keepalive_counter = 0
-            max_keepalive = 20  # Send keepalive every 10 seconds (20 * 0.5s)
+            version = get_progress_version(job_id)
 
             try:
                 # Send initial connection message
@@ -186,19 +201,17 @@ class BaseReportApp(ABC):
                             yield f'data: {{"percent": {percent}, "step": "{step_escaped}", "done": {str(done).lower()}, "error": {json.dumps(error) if error else "null"}}}\n\n'
                             last_percent = percent
                             last_step = step
-                            keepalive_counter = 0
 
                         if done or error:
                             time.sleep(0.2)
                             break
 
-                        # Send keepalive comment to prevent connection timeout
-                        keepalive_counter += 1
-                        if keepalive_counter >= max_keepalive:
+                        # Block until the job publishes again; on timeout send a keepalive
+                        # comment to prevent connection timeout
+                        new_version = wait_for_progress(job_id, version)
+                        if new_version == version:
                             yield ": keepalive\n\n"
-                            keepalive_counter = 0
-
-                        time.sleep(0.5)
+                        version = new_version
 
                     except GeneratorExit:
                         break
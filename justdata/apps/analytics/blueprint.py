@@ -410,12 +410,14 @@ def api_ai_costs():
         days: Number of days to look back (default 30)
     
     Returns:
-        JSON with AI cost breakdown by app, model, and totals.
+        JSON with AI cost breakdown by app, model, and totals, plus this
+        worker's narrative cache hits and tokens saved.
     """
     try:
-        from justdata.shared.analysis.ai_provider import get_ai_usage_summary
+        from justdata.shared.analysis.ai_provider import get_ai_cache_stats, get_ai_usage_summary
         days = request.args.get('days', 30, type=int)
         data = get_ai_usage_summary(days=days)
+        data['narrative_cache'] = get_ai_cache_stats()
         return jsonify({'success': True, 'data': data})
     except Exception as e:
         import traceback
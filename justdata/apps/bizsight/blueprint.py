@@ -8,20 +8,19 @@ from jinja2 import ChoiceLoader, FileSystemLoader
 import os
 import sys
 import uuid
-import threading
-import time
 import json
 from pathlib import Path
 from datetime import datetime
 
 from justdata.main.auth import require_access, get_user_permissions, get_user_type, login_required, get_current_user
 from justdata.shared.utils.analysis_cache import get_cached_result, store_cached_result, log_usage, generate_cache_key, get_analysis_result_by_job_id
+from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, QueueFull
 from justdata.shared.utils.bigquery_client import escape_sql_string
 from justdata.apps.bizsight.config import BizSightConfig, TEMPLATES_DIR_STR, STATIC_DIR_STR
 from justdata.apps.bizsight.core import run_analysis
 from justdata.apps.bizsight.data_utils import get_available_counties, get_available_years
 from justdata.apps.bizsight.utils.progress_tracker import (
-    get_progress, update_progress, create_progress_tracker
+    get_progress, update_progress, create_progress_tracker, get_progress_version, wait_for_progress
 )
 
 # In-memory fallback for when BigQuery cache storage fails
@@ -102,6 +101,8 @@ def progress_handler(job_id):
     """Progress tracking endpoint using Server-Sent Events."""
     def event_stream():
         last_percent = -1
+        last_step = ""
+        version = get_progress_version(job_id)
         while True:
             try:
                 progress = get_progress(job_id)
@@ -110,14 +111,15 @@ def progress_handler(job_id):
                 done = progress.get("done", False)
                 error = progress.get("error", None)
                 
-                if percent != last_percent or done or error:
+                if percent != last_percent or step != last_step or done or error:
                     yield f"data: {{\"percent\": {percent}, \"step\": \"{step}\", \"done\": {str(done).lower()}, \"error\": {json.dumps(error) if error else 'null'}}}\n\n"
                     last_percent = percent
+                    last_step = step
                 
                 if done or error:
                     break
                 
-                time.sleep(0.5)
+                version = wait_for_progress(job_id, version)
             except Exception as e:
                 yield f"data: {{\"percent\": 0, \"step\": \"Error: {str(e)}\", \"done\": true, \"error\": \"{str(e)}\"}}\n\n"
                 break
@@ -125,6 +127,14 @@ def progress_handler(job_id):
     return Response(event_stream(), mimetype="text/event-stream")
 
 
+@bizsight_bp.route('/cancel/<job_id>', methods=['POST'])
+@login_required
+def cancel(job_id):
+    """Cancel a queued or running analysis job."""
+    cancelled = get_job_scheduler().cancel(job_id, requester=job_requester_id())
+    return jsonify({'success': True, 'cancelled': cancelled})
+
+
 @bizsight_bp.route('/analyze', methods=['POST'])
 @login_required
 @require_access('bizsight', 'partial')
@@ -381,11 +391,17 @@ def analyze():
                     user_email=user_email
                 )
         
-        # Start background job
-        threading.Thread(target=run_job, daemon=True).start()
+        # Queue on the shared scheduler; an identical in-flight request reuses its job
+        submitted = get_job_scheduler().submit('bizsight', run_job, job_id,
+                                               dedup_key=generate_cache_key('bizsight', cache_params),
+                                               progress_update=update_progress,
+                                               requester=job_requester_id())
+        session['job_id'] = submitted.job_id
         
-        return jsonify({'success': True, 'job_id': job_id})
+        return jsonify({'success': True, 'job_id': submitted.job_id, 'queue_position': submitted.queue_position})
         
+    except QueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         # Log error
         response_time_ms = int((time_module.time() - start_time) * 1000)
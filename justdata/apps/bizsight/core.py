@@ -21,6 +21,7 @@ from justdata.apps.bizsight.utils.bigquery_client import BigQueryClient
 from justdata.apps.bizsight.utils.progress_tracker import ProgressTracker
 from justdata.apps.bizsight.report_builder import create_top_lenders_table, create_county_summary_table, create_comparison_table, calculate_hhi_by_year, calculate_hhi_for_lenders, safe_int, safe_float
 from justdata.apps.bizsight.ai_analysis import BizSightAnalyzer
+from justdata.shared.utils.job_scheduler import JobCancelled
 
 
 def parse_web_parameters(county_data: dict, years_str: str) -> tuple:
@@ -1314,6 +1315,8 @@ def run_analysis(county_data: dict, years_str: str, job_id: str = None,
 
         return result
         
+    except JobCancelled:
+        raise
     except Exception as e:
         error_msg = str(e)
         if progress_tracker:
@@ -45,30 +45,14 @@ class AIAnalyzer:
             self.model = "claude-sonnet-4-20250514" if ai_provider == "claude" else "gpt-4"
     
     def _call_ai(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.3) -> str:
-        """Make a call to the configured AI provider."""
+        """Make a call to the configured AI provider (pooled client, narrative cache)."""
+        from justdata.shared.analysis.ai_provider import complete_prompt
+        if self.provider not in ("openai", "claude"):
+            raise Exception(f"Unsupported AI provider: {self.provider}")
         try:
-            if self.provider == "openai":
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
-                return response.choices[0].message.content.strip()
-            elif self.provider == "claude":
-                import anthropic
-                client = anthropic.Anthropic(api_key=self.api_key)
-                response = client.messages.create(
-                    model=self.model,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                return response.content[0].text.strip()
-            else:
-                raise Exception(f"Unsupported AI provider: {self.provider}")
+            return complete_prompt(self.provider, self.api_key, self.model, prompt,
+                                   max_tokens=max_tokens, temperature=temperature,
+                                   app_name='bizsight').strip()
         except Exception as e:
             raise Exception(f"Error calling {self.provider.upper()} API: {e}")
 
@@ -6,6 +6,9 @@ Real-time progress updates during analysis.
 
 from typing import Dict, Any, Optional
 
+from justdata.shared.utils.job_scheduler import get_job_scheduler
+from justdata.shared.utils.progress_bus import get_progress_bus
+
 
 class ProgressTracker:
     """Tracks and reports progress during analysis."""
@@ -82,8 +85,20 @@ def get_progress(job_id: str) -> Dict[str, Any]:
     })
 
 def update_progress(job_id: str, progress_data: Dict[str, Any]):
-    """Update progress for a job."""
+    """Update progress for a job (intermediate updates raise JobCancelled once cancelled)."""
+    if not progress_data.get('done'):
+        get_job_scheduler().raise_if_cancelled(job_id)
     progress_store[job_id] = progress_data
+    get_progress_bus().publish(job_id, progress_data)
+
+def get_progress_version(job_id: str) -> int:
+    """Return the job's current progress version, to pass to wait_for_progress()."""
+    return get_progress_bus().version(job_id)
+
+def wait_for_progress(job_id: str, last_version: int, timeout: float = 10) -> int:
+    """Block until the job publishes newer progress or timeout passes; returns the new version."""
+    version, _ = get_progress_bus().wait(job_id, last_version, timeout)
+    return version
 
 def create_progress_tracker(job_id: str, steps_config: Dict[str, Dict] = None) -> ProgressTracker:
     """Create a progress tracker for a job."""
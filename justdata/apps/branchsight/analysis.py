@@ -32,11 +32,11 @@ class BranchSightAnalyzer(AIAnalyzer):
         """
 
     def _call_ai(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.3,
-                  app_name: str = None, report_type: str = None) -> str:
+                  app_name: str = None, report_type: str = None, use_cache: bool = True) -> str:
         """Override to prepend NCRC style guide to every prompt."""
         styled_prompt = self._get_style_guide() + "\n" + prompt
         return super()._call_ai(styled_prompt, max_tokens=max_tokens, temperature=temperature,
-                                app_name=app_name, report_type=report_type)
+                                app_name=app_name, report_type=report_type, use_cache=use_cache)
 
     def _get_data_source_context(self) -> str:
         """Return context about what FDIC Summary of Deposits branch data represents."""
@@ -8,7 +8,6 @@ from jinja2 import ChoiceLoader, FileSystemLoader
 import os
 import tempfile
 import uuid
-import threading
 import time
 import json
 import zipfile
@@ -17,8 +16,12 @@ from pathlib import Path
 import math
 
 from justdata.main.auth import require_access, get_user_permissions, get_user_type, login_required
-from justdata.shared.utils.progress_tracker import get_progress, update_progress, create_progress_tracker, store_analysis_result, get_analysis_result
+from justdata.shared.utils.progress_tracker import (
+    get_progress, update_progress, create_progress_tracker, store_analysis_result, get_analysis_result,
+    get_progress_version, wait_for_progress
+)
 from justdata.shared.utils.analysis_cache import store_cached_result, get_analysis_result_by_job_id, generate_cache_key
+from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, QueueFull, JobCancelled
 
 # In-memory fallback for when BigQuery cache storage fails
 _result_fallback = {}
@@ -104,6 +107,8 @@ def progress_handler(job_id):
     """Progress tracking endpoint using Server-Sent Events"""
     def event_stream():
         last_percent = -1
+        last_step = ""
+        version = get_progress_version(job_id)
         while True:
             try:
                 progress = get_progress(job_id)
@@ -112,14 +117,15 @@ def progress_handler(job_id):
                 done = progress.get("done", False)
                 error = progress.get("error", None)
 
-                if percent != last_percent or done or error:
+                if percent != last_percent or step != last_step or done or error:
                     yield f"data: {{\"percent\": {percent}, \"step\": \"{step}\", \"done\": {str(done).lower()}, \"error\": {json.dumps(error) if error else 'null'}}}\n\n"
                     last_percent = percent
+                    last_step = step
 
                 if done or error:
                     break
 
-                time.sleep(0.5)
+                version = wait_for_progress(job_id, version)
             except Exception as e:
                 yield f"data: {{\"percent\": 0, \"step\": \"Error: {str(e)}\", \"done\": true, \"error\": \"{str(e)}\"}}\n\n"
                 break
@@ -127,6 +133,14 @@ def progress_handler(job_id):
     return Response(event_stream(), mimetype="text/event-stream")
 
 
+@branchsight_bp.route('/cancel/<job_id>', methods=['POST'])
+@login_required
+def cancel(job_id):
+    """Cancel a queued or running analysis job."""
+    cancelled = get_job_scheduler().cancel(job_id, requester=job_requester_id())
+    return jsonify({'success': True, 'cancelled': cancelled})
+
+
 @branchsight_bp.route('/analyze', methods=['POST'])
 @require_access('branchsight', 'partial')
 def analyze():
@@ -222,14 +236,22 @@ def analyze():
                     _result_fallback[job_id] = result
                     progress_tracker.complete(success=True)
 
+            except JobCancelled:
+                raise
             except Exception as e:
                 error_msg = str(e)
                 progress_tracker.complete(success=False, error=error_msg)
 
-        threading.Thread(target=run_job, daemon=True).start()
+        # Queue on the shared scheduler; an identical in-flight request reuses its job
+        submitted = get_job_scheduler().submit('branchsight', run_job, job_id,
+                                               dedup_key=generate_cache_key('branchsight', cache_params),
+                                               requester=job_requester_id())
+        session['job_id'] = submitted.job_id
 
-        return jsonify({'success': True, 'job_id': job_id})
+        return jsonify({'success': True, 'job_id': submitted.job_id, 'queue_position': submitted.queue_position})
 
+    except QueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         return jsonify({
             'success': False,
@@ -12,6 +12,7 @@ from .config import OUTPUT_DIR, PROJECT_ID
 from .data_utils import find_exact_county_match, execute_branch_query
 from .analysis import BranchSightAnalyzer
 from justdata.shared.reporting.report_builder import build_report, save_excel_report
+from justdata.shared.utils.job_scheduler import JobCancelled
 
 
 def parse_web_parameters(counties_str: str, years_str: str, selection_type: str = 'county',
@@ -124,6 +125,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                 else:
                     clarified_counties.append(matches[0])
                     print(f"Using county: {matches[0]}")
+            except JobCancelled:
+                raise
             except Exception as e:
                 print(f"Error matching county {county}: {e}, using input as-is")
                 clarified_counties.append(county)
@@ -156,6 +159,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                     if progress_tracker:
                         progress_tracker.update_query_progress(query_index, total_queries)
 
+                except JobCancelled:
+                    raise
                 except Exception as e:
                     error_str = str(e)
                     print(f"    Error querying {county} {year}: {error_str}")
@@ -293,6 +298,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                     progress_tracker.update_ai_progress(1, 4, 'Key Findings')
                 ai_insights['key_findings'] = analyzer.generate_key_findings(ai_data)
                 print(f"  [OK] Key Findings generated successfully")
+            except JobCancelled:
+                raise
             except Exception as key_findings_error:
                 print(f"  [ERROR] Error generating Key Findings: {key_findings_error}")
                 import traceback
@@ -316,6 +323,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                         print(f"  [OK] table1 narrative generated ({len(narrative1)} chars)")
                     else:
                         print("  [WARNING] table1 narrative is empty or None")
+                except JobCancelled:
+                    raise
                 except Exception as e:
                     print(f"  [ERROR] Failed to generate table1 narrative: {e}")
                     import traceback
@@ -333,6 +342,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                         print(f"  [OK] table2 narrative generated ({len(narrative2)} chars)")
                     else:
                         print("  [WARNING] table2 narrative is empty or None")
+                except JobCancelled:
+                    raise
                 except Exception as e:
                     print(f"  [ERROR] Failed to generate table2 narrative: {e}")
                     import traceback
@@ -350,6 +361,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                         print(f"  [OK] table3 narrative generated ({len(narrative3)} chars)")
                     else:
                         print("  [WARNING] table3 narrative is empty or None")
+                except JobCancelled:
+                    raise
                 except Exception as e:
                     print(f"  [ERROR] Failed to generate table3 narrative: {e}")
                     import traceback
@@ -369,6 +382,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                         print(f"  [OK] HHI trends narrative generated ({len(hhi_narrative)} chars)")
                     else:
                         print("  [WARNING] HHI trends narrative is empty or None")
+                except JobCancelled:
+                    raise
                 except Exception as e:
                     print(f"  [ERROR] Failed to generate HHI trends narrative: {e}")
                     import traceback
@@ -385,6 +400,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
             # Methods section is hardcoded in the template (not AI-generated)
             print("AI insights generated successfully")
 
+        except JobCancelled:
+            raise
         except Exception as e:
             import traceback
             error_type = type(e).__name__
@@ -439,6 +456,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
             'excel_file': excel_path
         }
 
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"\nError: {str(e)}")
         if progress_tracker:
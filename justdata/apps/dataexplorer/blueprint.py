@@ -304,7 +304,8 @@ def verify_lender_gleif():
         if not lei:
             return jsonify({'error': 'LEI is required'}), 400
 
-        from .data_utils import get_gleif_data_by_lei, verify_lender_with_external_sources
+        from .data_utils import get_gleif_data_by_lei
+        from .lender_directory import get_lender_verification
 
         # Get GLEIF data from our table
         gleif_data = get_gleif_data_by_lei(lei)
@@ -317,7 +318,7 @@ def verify_lender_gleif():
         verification = None
         if name:
             try:
-                verification = verify_lender_with_external_sources(lei, name, city, state)
+                verification = get_lender_verification(lei, name, city, state)
             except Exception as e:
                 logger.warning(f"External verification failed: {e}")
 
@@ -406,9 +407,10 @@ def api_clear_cache():
 def api_generate_area_report():
     """Generate area analysis report from wizard data."""
     import uuid
-    import threading
     from justdata.shared.utils.progress_tracker import create_progress_tracker, store_analysis_result
     from justdata.apps.dataexplorer.core import run_area_analysis
+    from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, QueueFull
+    from justdata.shared.utils.analysis_cache import generate_cache_key
 
     try:
         data = request.get_json()
@@ -456,9 +458,16 @@ def api_generate_area_report():
                 if progress_tracker:
                     progress_tracker.complete(success=False, error=str(e))
 
-        threading.Thread(target=run_job, daemon=True).start()
-        return jsonify({'success': True, 'report_id': job_id})
+        # Queue on the shared scheduler; an identical in-flight request reuses its job
+        submitted = get_job_scheduler().submit(
+            'dataexplorer', run_job, job_id,
+            dedup_key=generate_cache_key('dataexplorer', {'report_type': 'area', **data}),
+            requester=job_requester_id()
+        )
+        return jsonify({'success': True, 'report_id': submitted.job_id, 'queue_position': submitted.queue_position})
 
+    except QueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         logger.error(f"Error in generate area report: {e}", exc_info=True)
         return jsonify({
@@ -473,9 +482,10 @@ def api_generate_area_report():
 def api_generate_lender_report():
     """Generate lender analysis report from wizard data."""
     import uuid
-    import threading
     from justdata.shared.utils.progress_tracker import create_progress_tracker, store_analysis_result
     from justdata.apps.dataexplorer.lender_analysis import run_lender_analysis, check_lender_has_data
+    from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, QueueFull
+    from justdata.shared.utils.analysis_cache import generate_cache_key
 
     try:
         data = request.get_json()
@@ -541,9 +551,16 @@ def api_generate_lender_report():
                 if progress_tracker:
                     progress_tracker.complete(success=False, error=str(e))
 
-        threading.Thread(target=run_job, daemon=True).start()
-        return jsonify({'success': True, 'report_id': job_id})
+        # Queue on the shared scheduler; an identical in-flight request reuses its job
+        submitted = get_job_scheduler().submit(
+            'dataexplorer', run_job, job_id,
+            dedup_key=generate_cache_key('dataexplorer', {'report_type': 'lender', **data}),
+            requester=job_requester_id()
+        )
+        return jsonify({'success': True, 'report_id': submitted.job_id, 'queue_position': submitted.queue_position})
 
+    except QueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         logger.error(f"Error in generate lender report: {e}", exc_info=True)
         return jsonify({
@@ -553,21 +570,29 @@ def api_generate_lender_report():
         }), 500
 
 
+@dataexplorer_bp.route('/cancel/<job_id>', methods=['POST'])
+@login_required
+def cancel(job_id):
+    """Cancel a queued or running report job."""
+    from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id
+    cancelled = get_job_scheduler().cancel(job_id, requester=job_requester_id())
+    return jsonify({'success': True, 'cancelled': cancelled})
+
+
 @dataexplorer_bp.route('/progress/<job_id>', methods=['GET'])
 @login_required
 def progress_handler(job_id):
     """Progress tracking endpoint using Server-Sent Events."""
-    from justdata.shared.utils.progress_tracker import get_progress
+    from justdata.shared.utils.progress_tracker import get_progress, get_progress_version, wait_for_progress
     import time
     import sys
 
     def event_stream():
         last_percent = -1
         last_step = ""
-        keepalive_counter = 0
-        max_keepalive = 4
-        max_iterations = 3600
-        iteration_count = 0
+        version = get_progress_version(job_id)
+        keepalive_seconds = 2
+        deadline = time.time() + 1800
         consecutive_errors = 0
         max_consecutive_errors = 10
 
@@ -599,10 +624,8 @@ def progress_handler(job_id):
                 yield f"data: {{\"percent\": 0, \"step\": \"Processing...\", \"done\": false, \"error\": null}}\n\n"
                 sys.stdout.flush()
 
-            while iteration_count < max_iterations:
+            while time.time() < deadline:
                 try:
-                    iteration_count += 1
-
                     try:
                         progress = get_progress(job_id)
                         if not progress:
@@ -635,14 +658,13 @@ def progress_handler(job_id):
 
                         if done:
                             break
-                    else:
-                        keepalive_counter += 1
-                        if keepalive_counter >= max_keepalive:
-                            yield ": keepalive\n\n"
-                            sys.stdout.flush()
-                            keepalive_counter = 0
-
-                    time.sleep(0.5)
+
+                    # Block until the job publishes again; keepalive on timeout
+                    new_version = wait_for_progress(job_id, version, timeout=keepalive_seconds)
+                    if new_version == version:
+                        yield ": keepalive\n\n"
+                        sys.stdout.flush()
+                    version = new_version
 
                 except GeneratorExit:
                     break
@@ -17,6 +17,7 @@ from justdata.shared.utils.progress_tracker import ProgressTracker
 from justdata.shared.utils.census_adult_demographics import get_adult_population_demographics_for_geoids
 from justdata.shared.utils.census_historical_utils import get_census_data_for_geoids
 import logging
+from justdata.shared.utils.job_scheduler import JobCancelled
 
 logger = logging.getLogger(__name__)
 
@@ -547,6 +548,8 @@ def run_area_analysis(
                             import gc
                             gc.collect()
                         
+                    except JobCancelled:
+                        raise
                     except Exception as e:
                         logger.error(f"Error querying {county_name} {year}: {e}", exc_info=True)
                         query_errors.append(str(e))
@@ -819,6 +822,8 @@ def run_area_analysis(
             'historical_census_data': historical_census_data
         }
         
+    except JobCancelled:
+        raise
     except Exception as e:
         logger.error(f"Error in area analysis: {e}", exc_info=True)
         if progress_tracker:
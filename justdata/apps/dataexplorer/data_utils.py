@@ -5,26 +5,21 @@ Includes input validation, deterministic queries, and proper error handling.
 """
 
 from typing import List, Dict, Any, Optional
-from justdata.shared.utils.bigquery_client import get_bigquery_client, escape_sql_string, execute_query
+from justdata.shared.utils.bigquery_client import get_bigquery_client, escape_sql_string, execute_query, run_query
 from justdata.apps.dataexplorer.config import (
     PROJECT_ID, MAX_YEARS, MAX_GEOIDS, MAX_LENDERS
 )
 from justdata.apps.dataexplorer.query_builders import (
-    build_hmda_query, build_sb_query, build_branch_query, build_lender_lookup_query
+    build_hmda_query, build_sb_query, build_branch_query,
+    build_hmda_lender_summary_query, build_sb_lender_summary_query
 )
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
 # App name for per-app credential support
 APP_NAME = 'DATAEXPLORER'
 
-# Cache for lenders list (with LAR count)
-_lenders_cache = None
-_lenders_cache_timestamp = None
-_lenders_cache_ttl = 3600  # Cache for 1 hour (3600 seconds)
-
 
 def validate_years(years: List[int]) -> List[int]:
     """
@@ -169,6 +164,106 @@ def execute_sb_query(
         raise Exception(f"Error executing SB query: {str(e)}")
 
 
+def execute_lender_summary_query(
+    data_type: str,
+    geoids: List[str],
+    years: List[int],
+    lender_ids: List[str],
+    timeout: int = 120,
+    **kwargs
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize several lenders (e.g. a subject and its peers) in one grouped query.
+
+    Counts and volumes are aggregated in BigQuery, so no loan-level rows are
+    transferred, however many lenders are compared.
+
+    Args:
+        data_type: 'hmda' or 'sb'
+        geoids: List of GEOIDs
+        years: List of years
+        lender_ids: LEIs to summarize
+        timeout: Query timeout in seconds
+        **kwargs: Additional filters (as for execute_hmda_query / execute_sb_query)
+
+    Returns:
+        Dict of LEI -> {'lender_id', 'lender_name', 'total_loans', 'total_volume',
+        'by_year', and for HMDA 'by_loan_purpose'}. Lenders with no matching
+        loans are omitted.
+    """
+    try:
+        from google.cloud import bigquery
+
+        validated_years = validate_years(years)
+        validated_geoids = validate_geoids(geoids)
+        lender_ids = list(dict.fromkeys(str(lid) for lid in lender_ids if lid))
+        if not lender_ids:
+            return {}
+        if len(lender_ids) > MAX_LENDERS + 1:
+            raise ValueError(f"Maximum {MAX_LENDERS} lenders allowed. Received {len(lender_ids)} lenders.")
+
+        if data_type == 'hmda':
+            query = build_hmda_lender_summary_query(validated_geoids, validated_years, **kwargs)
+        elif data_type == 'sb':
+            query = build_sb_lender_summary_query(validated_geoids, validated_years, **kwargs)
+        else:
+            raise ValueError(f"Unsupported data type: {data_type}")
+
+        client = get_bigquery_client(PROJECT_ID, app_name=APP_NAME)
+        rows = run_query(client, query, params=[bigquery.ArrayQueryParameter('leis', 'STRING', lender_ids)],
+                         timeout=timeout)
+        summaries = summarize_lender_rows(rows)
+
+        logger.info(f"{data_type.upper()} lender summary: {len(summaries)}/{len(lender_ids)} lenders with data "
+                    f"({len(rows)} grouped rows)")
+        return summaries
+
+    except ValueError as e:
+        logger.error(f"Validation error in lender summary query: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Error executing lender summary query: {e}")
+        raise Exception(f"Error executing lender summary query: {str(e)}")
+
+
+def summarize_lender_rows(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Roll grouped lender summary rows up to one summary per lender.
+
+    Args:
+        rows: Rows from a lender summary query (lender_id, year, lender_name,
+              total_loans, total_volume and optionally loan_purpose)
+
+    Returns:
+        Dict of lender_id -> summary with totals and per-year (and per-loan-purpose) breakdowns
+    """
+    summaries = {}
+    for row in rows:
+        lender_id = row['lender_id']
+        summary = summaries.get(lender_id)
+        if summary is None:
+            summary = summaries[lender_id] = {
+                'lender_id': lender_id,
+                'lender_name': row.get('lender_name') or 'Unknown',
+                'total_loans': 0,
+                'total_volume': 0.0,
+                'by_year': {}
+            }
+        loans = int(row.get('total_loans') or 0)
+        volume = float(row.get('total_volume') or 0)
+        summary['total_loans'] += loans
+        summary['total_volume'] += volume
+
+        breakdowns = [('by_year', str(row['year']))]
+        if 'loan_purpose' in row:
+            breakdowns.append(('by_loan_purpose', str(row['loan_purpose'])))
+        for field, key in breakdowns:
+            bucket = summary.setdefault(field, {}).setdefault(key, {'total_loans': 0, 'total_volume': 0.0})
+            bucket['total_loans'] += loans
+            bucket['total_volume'] += volume
+    return summaries
+
+
 def execute_branch_query(
     geoids: List[str] = None,
     years: List[int] = None,
@@ -283,101 +378,32 @@ def get_lender_target_counties(
 
 def load_all_lenders18() -> List[Dict[str, Any]]:
     """
-    Load all lenders from Lenders18 table with LAR count, sorted by LAR count descending.
-    Results are cached for 1 hour to avoid expensive re-queries.
+    Load all lenders from the precomputed lender directory, sorted by LAR count descending.
+    The directory is built offline (see lender_directory.py), so this does not query BigQuery.
     
     Returns:
         List of all lenders with name (uppercase), city, state, LEI, RSSD, sorted by LAR count
     """
-    global _lenders_cache, _lenders_cache_timestamp
-    
-    # Check cache first
-    current_time = time.time()
-    if (_lenders_cache is not None and 
-        _lenders_cache_timestamp is not None and 
-        (current_time - _lenders_cache_timestamp) < _lenders_cache_ttl):
-        logger.info(f"Returning {len(_lenders_cache)} lenders from cache")
-        return _lenders_cache
-    
     try:
-        # Query Lenders18 table for all lenders with LAR count
-        # Join with lender_names_gleif to get cleaned/display names
-        # Order by LAR count descending, then by name
-        query = f"""
-        SELECT
-            COALESCE(g.display_name, g.cleaned_name, UPPER(l.respondent_name)) as lender_name,
-            l.lei as lender_id,
-            l.respondent_rssd,
-            l.type_name,
-            COALESCE(g.headquarters_city, l.respondent_city) as respondent_city,
-            COALESCE(
-                CASE
-                    WHEN g.headquarters_state LIKE 'US-%%' THEN SUBSTR(g.headquarters_state, 4)
-                    ELSE g.headquarters_state
-                END,
-                l.respondent_state
-            ) as respondent_state,
-            COUNT(h.lei) as lar_count
-        FROM `{PROJECT_ID}.lendsight.lenders18` l
-        LEFT JOIN `{PROJECT_ID}.shared.lender_names_gleif` g
-            ON l.lei = g.lei
-        LEFT JOIN `{PROJECT_ID}.shared.de_hmda` h
-            ON l.lei = h.lei
-        WHERE l.respondent_name IS NOT NULL
-          AND l.lei IS NOT NULL
-        GROUP BY
-            lender_name,
-            lender_id,
-            l.respondent_rssd,
-            l.type_name,
-            respondent_city,
-            respondent_state
-        ORDER BY lar_count DESC, lender_name, lender_id
-        """
-        
-        logger.info("Loading all lenders from Lenders18 table (with LAR count)")
-        client = get_bigquery_client(PROJECT_ID, app_name=APP_NAME)
-        results = execute_query(client, query)
-        logger.info(f"Loaded {len(results)} lenders from Lenders18")
-        
-        # Format results with proper field names
-        formatted_results = []
-        for row in results:
-            formatted_results.append({
-                'name': row.get('lender_name', '').upper(),
-                'lender_name': row.get('lender_name', '').upper(),
-                'lei': row.get('lender_id'),
-                'lender_id': row.get('lender_id'),
-                'rssd': row.get('respondent_rssd'),
-                'rssd_id': row.get('respondent_rssd'),
-                'city': row.get('respondent_city', ''),
-                'respondent_city': row.get('respondent_city', ''),
-                'state': row.get('respondent_state', ''),
-                'respondent_state': row.get('respondent_state', ''),
-                'type_name': row.get('type_name'),
-                'type': row.get('type_name'),  # Also as 'type' for compatibility
-                'lar_count': row.get('lar_count', 0)
-            })
-        
-        # Cache the results
-        _lenders_cache = formatted_results
-        _lenders_cache_timestamp = current_time
-        logger.info(f"Cached {len(formatted_results)} lenders for {_lenders_cache_ttl} seconds")
-        
-        return formatted_results
+        from justdata.apps.dataexplorer.lender_directory import get_lender_directory
+        directory = get_lender_directory()
+        logger.info(f"Returning {len(directory)} lenders from lender directory (built {directory.built_at})")
+        return directory.lenders
         
     except Exception as e:
-        logger.error(f"Error loading all lenders from Lenders18: {e}", exc_info=True)
+        logger.error(f"Error loading all lenders from lender directory: {e}", exc_info=True)
         raise Exception(f"Error loading lenders: {str(e)}")
 
 
 def search_lenders18(lender_name: str, limit: int = 20, include_verification: bool = True) -> List[Dict[str, Any]]:
     """
-    Search lenders directly from Lenders18 table with respondent_city and respondent_state.
-    Returns lenders with names in ALL CAPS and city/state information.
+    Search Lenders18 lenders (display and HMDA respondent names) in the lender directory.
+    Returns lenders with names in ALL CAPS and city/state information, ranked by
+    match quality (exact, prefix, word prefix, substring, typo-tolerant) and LAR count.
     
     Enhanced to include verification data from GLEIF and CFPB APIs to help users
     distinguish between similarly named lenders (e.g., multiple Citizens Banks).
+    Verification comes from the directory artifact or a local cache when available.
     
     Args:
         lender_name: Lender name to search for
@@ -391,67 +417,21 @@ def search_lenders18(lender_name: str, limit: int = 20, include_verification: bo
         if not lender_name or len(lender_name.strip()) < 2:
             raise ValueError("Lender name must be at least 2 characters")
         
-        escaped_name = escape_sql_string(lender_name.strip())
-        
-        # Query Lenders18 table directly
-        query = f"""
-        SELECT DISTINCT
-            UPPER(respondent_name) as lender_name,
-            lei as lender_id,
-            respondent_rssd,
-            respondent_city,
-            respondent_state,
-            type_name
-        FROM `{PROJECT_ID}.lendsight.lenders18`
-        WHERE LOWER(respondent_name) LIKE LOWER('%{escaped_name}%')
-          AND respondent_name IS NOT NULL
-          AND lei IS NOT NULL
-        ORDER BY lender_name, lender_id
-        LIMIT {limit}
-        """
-        
-        logger.info(f"Searching Lenders18 for: '{lender_name}' (escaped: '{escaped_name}')")
-        client = get_bigquery_client(PROJECT_ID, app_name=APP_NAME)
-        
-        try:
-            results = execute_query(client, query)
-            logger.info(f"Query executed successfully, returned {len(results)} results")
-            
-            if len(results) == 0:
-                # Try a test query to see if table has any data
-                test_query = f"SELECT COUNT(*) as cnt FROM `{PROJECT_ID}.lendsight.lenders18` LIMIT 1"
-                test_results = execute_query(client, test_query)
-                if test_results:
-                    logger.warning(f"Table exists but search returned 0 results. Table has {test_results[0].get('cnt', 'unknown')} total rows")
-        except Exception as query_error:
-            logger.error(f"Query execution failed: {query_error}", exc_info=True)
-            raise
+        from justdata.apps.dataexplorer.lender_directory import get_lender_directory, get_lender_verification
+        results = get_lender_directory().search(lender_name.strip(), limit=limit)
         
         if not results:
             logger.warning(f"No results found for search term: {lender_name}")
         
-        # Format results with proper field names and add verification data
+        # Copy records (directory entries are shared) and add verification data
         formatted_results = []
         for row in results:
-            lender_data = {
-                'name': row.get('lender_name', '').upper(),
-                'lender_name': row.get('lender_name', '').upper(),
-                'lei': row.get('lender_id'),
-                'lender_id': row.get('lender_id'),
-                'rssd': row.get('respondent_rssd'),
-                'rssd_id': row.get('respondent_rssd'),
-                'city': row.get('respondent_city', ''),
-                'respondent_city': row.get('respondent_city', ''),
-                'state': row.get('respondent_state', ''),
-                'respondent_state': row.get('respondent_state', ''),
-                'type_name': row.get('type_name'),
-                'type': row.get('type_name')  # Also include as 'type' for compatibility
-            }
+            lender_data = dict(row)
             
             # Add verification data if requested
             if include_verification and lender_data.get('lei'):
                 try:
-                    verification = verify_lender_with_external_sources(
+                    verification = get_lender_verification(
                         lei=lender_data['lei'],
                         name=lender_data['name'],
                         city=lender_data.get('city'),
@@ -472,7 +452,7 @@ def search_lenders18(lender_name: str, limit: int = 20, include_verification: bo
             
             formatted_results.append(lender_data)
         
-        logger.info(f"Found {len(formatted_results)} lenders from Lenders18 for: {lender_name}")
+        logger.info(f"Found {len(formatted_results)} lenders in lender directory for: {lender_name}")
         return formatted_results
         
     except Exception as e:
@@ -530,27 +510,21 @@ def lookup_lender(lender_name: str, exact_match: bool = False) -> List[Dict[str,
             logger.debug(f"CFPB API unavailable or error: {cfpb_error}")
             # Continue to BigQuery fallback
         
-        # Fallback to BigQuery-only lookup if CFPB didn't return results
-        # Note: This requires the hmda.lenders or hmda.lenders18 tables to exist
-        # If those tables don't exist, we'll skip BigQuery lookup
+        # Fallback to the lender directory if CFPB didn't return results
         if not results:
             try:
-                # Build query
-                query = build_lender_lookup_query(lender_name.strip(), exact_match)
-                
-                # Execute query
-                client = get_bigquery_client(PROJECT_ID, app_name=APP_NAME)
-                bq_results = execute_query(client, query)
+                from justdata.apps.dataexplorer.lender_directory import get_lender_directory, normalize_name
+                matches = get_lender_directory().search(lender_name.strip(), limit=MAX_LENDERS)
+                if exact_match:
+                    wanted = normalize_name(lender_name)
+                    matches = [m for m in matches
+                               if wanted in (normalize_name(m['name']), normalize_name(m['respondent_name']))]
                 
                 # Add source indicator
-                for result in bq_results:
-                    result['source'] = 'bigquery'
-                
-                results = bq_results
-                logger.info(f"Found {len(results)} lenders matching '{lender_name}' via BigQuery")
-            except Exception as bq_error:
-                logger.warning(f"BigQuery lender lookup failed (this is expected if lenders tables don't exist): {bq_error}")
-                # Return empty results if BigQuery lookup fails
+                results = [dict(match, source='directory') for match in matches]
+                logger.info(f"Found {len(results)} lenders matching '{lender_name}' in lender directory")
+            except Exception as directory_error:
+                logger.warning(f"Lender directory lookup failed: {directory_error}")
                 # The CFPB API should be the primary method anyway
                 results = []
         
@@ -573,6 +547,21 @@ def get_lender_from_bigquery_tables(lei: str = None, rssd: str = None) -> Option
     Returns:
         Lender metadata dictionary or None
     """
+    try:
+        # Served from the lender directory when the lender is in it
+        from justdata.apps.dataexplorer.lender_directory import get_lender_directory
+        directory = get_lender_directory()
+        lender = directory.by_lei.get(lei) if lei else directory.by_rssd.get(str(rssd)) if rssd else None
+        if lender:
+            return {
+                'lender_id': lender['lei'],
+                'lender_name': lender['name'],
+                'rssd_id': lender['rssd'],
+                'source': 'HMDA'
+            }
+    except Exception as e:
+        logger.debug(f"Lender directory unavailable for LEI/RSSD lookup: {e}")
+
     try:
         client = get_bigquery_client(PROJECT_ID, app_name=APP_NAME)
         
@@ -32,6 +32,7 @@ from justdata.apps.dataexplorer.lender_analysis.formatters import (
     _format_all_metros_for_excel,
     _generate_peer_data_sheet_for_excel,
 )
+from justdata.shared.utils.job_scheduler import JobCancelled
 
 logger = logging.getLogger(__name__)
 
@@ -1104,6 +1105,8 @@ def run_lender_analysis(
                 batch_results = execute_query(client, sql)
                 if batch_results:
                     subject_results.extend(batch_results)
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.warning(f"Error querying subject lender: {e}")
         
@@ -1329,6 +1332,8 @@ def run_lender_analysis(
                     batch_results = execute_query(client, sql)
                     if batch_results:
                         peer_results.extend(batch_results)
+            except JobCancelled:
+                raise
             except Exception as e:
                 logger.warning(f"Error querying peers: {e}")
             
@@ -1475,6 +1480,8 @@ def run_lender_analysis(
         
         return result_dict
         
+    except JobCancelled:
+        raise
     except Exception as e:
         logger.error(f"Error in lender analysis: {e}", exc_info=True)
         if progress_tracker:
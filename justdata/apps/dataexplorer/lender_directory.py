@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Precomputed lender directory for DataExplorer lender search.
+
+The directory is a JSON artifact built offline (daily) with one row per
+Lenders18 lender: display name, HMDA respondent name, LEI, RSSD, city,
+state, type and LAR count. Optionally it also carries GLEIF/CFPB
+verification results. Each worker loads it once into memory, indexes the
+names by sorted prefix and character trigrams (shared NgramIndex), and
+answers autocomplete searches without BigQuery. Workers never build the
+directory themselves: without an artifact, search returns no results (and
+logs an error) until the offline build has run.
+
+Search ranking: exact name, name prefix, word prefix, substring, then
+trigram (typo-tolerant) matches; ties go to the lender with more LAR
+records.
+
+Build it daily (cron / Cloud Scheduler):
+    python -m justdata.apps.dataexplorer.lender_directory --build [--verify]
+
+Settings (environment):
+    LENDER_DIRECTORY_PATH          Local artifact path
+    LENDER_DIRECTORY_GCS_PATH      Optional blob path; builds upload there and
+                                   workers download each new generation of it
+    LENDER_DIRECTORY_MAX_AGE_HOURS Age after which a loaded artifact is reported stale
+    LENDER_VERIFICATION_TTL_HOURS  How long runtime GLEIF/CFPB verifications are cached
+"""
+
+import argparse
+import bisect
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from justdata.apps.dataexplorer.config import DATA_DIR, PROJECT_ID
+from justdata.shared.utils.local_cache import LocalTTLCache
+from justdata.shared.utils.ngram_index import NgramIndex
+
+logger = logging.getLogger(__name__)
+
+DIRECTORY_VERSION = 1
+LENDER_DIRECTORY_PATH = Path(os.getenv('LENDER_DIRECTORY_PATH') or DATA_DIR / 'dataexplorer' / 'lender_directory.json')
+LENDER_DIRECTORY_GCS_PATH = os.getenv('LENDER_DIRECTORY_GCS_PATH', '')
+LENDER_DIRECTORY_MAX_AGE_HOURS = float(os.getenv('LENDER_DIRECTORY_MAX_AGE_HOURS', '36'))
+# How often a worker checks whether the artifact (on disk / in GCS) was rebuilt
+RELOAD_CHECK_SECONDS = 300
+
+# Minimum trigram similarity (Dice) for a fuzzy-only match
+FUZZY_MIN_SCORE = 0.35
+# Trigram candidates considered per search
+FUZZY_CANDIDATES = 200
+
+_verification_cache = LocalTTLCache(
+    'lender_verification',
+    max_entries=20000,
+    max_bytes=64 * 1024 * 1024,
+    ttl_seconds=float(os.getenv('LENDER_VERIFICATION_TTL_HOURS', '168')) * 3600,
+    disk_dir=os.path.join(tempfile.gettempdir(), 'justdata_cache'),
+)
+
+_NON_ALNUM = re.compile(r'[^A-Z0-9]+')
+
+
+def normalize_name(name: str) -> str:
+    """Uppercase, punctuation to spaces, whitespace collapsed."""
+    return _NON_ALNUM.sub(' ', (name or '').upper()).strip()
+
+
+def build_directory_query() -> str:
+    """Lenders18 lenders with display names and LAR counts (counted once per LEI before the join)."""
+    return f"""
+    WITH lar AS (
+        SELECT lei, COUNT(*) as lar_count
+        FROM `{PROJECT_ID}.shared.de_hmda`
+        GROUP BY lei
+    )
+    SELECT DISTINCT
+        COALESCE(g.display_name, g.cleaned_name, UPPER(l.respondent_name)) as lender_name,
+        UPPER(l.respondent_name) as respondent_name,
+        l.lei as lender_id,
+        l.respondent_rssd,
+        l.type_name,
+        COALESCE(g.headquarters_city, l.respondent_city) as respondent_city,
+        COALESCE(
+            CASE
+                WHEN g.headquarters_state LIKE 'US-%%' THEN SUBSTR(g.headquarters_state, 4)
+                ELSE g.headquarters_state
+            END,
+            l.respondent_state
+        ) as respondent_state,
+        COALESCE(lar.lar_count, 0) as lar_count
+    FROM `{PROJECT_ID}.lendsight.lenders18` l
+    LEFT JOIN `{PROJECT_ID}.shared.lender_names_gleif` g
+        ON l.lei = g.lei
+    LEFT JOIN lar
+        ON l.lei = lar.lei
+    WHERE l.respondent_name IS NOT NULL
+      AND l.lei IS NOT NULL
+    ORDER BY lar_count DESC, lender_name, lender_id
+    """
+
+
+def format_lender(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Directory row -> the lender record shape returned by the lender APIs."""
+    name = (row.get('lender_name') or '').upper()
+    return {
+        'name': name,
+        'lender_name': name,
+        'respondent_name': (row.get('respondent_name') or name).upper(),
+        'lei': row.get('lender_id'),
+        'lender_id': row.get('lender_id'),
+        'rssd': row.get('respondent_rssd'),
+        'rssd_id': row.get('respondent_rssd'),
+        'city': row.get('respondent_city', ''),
+        'respondent_city': row.get('respondent_city', ''),
+        'state': row.get('respondent_state', ''),
+        'respondent_state': row.get('respondent_state', ''),
+        'type_name': row.get('type_name'),
+        'type': row.get('type_name'),  # Also as 'type' for compatibility
+        'lar_count': int(row.get('lar_count') or 0)
+    }
+
+
+class LenderDirectory:
+    """In-memory lender directory with prefix and trigram search."""
+
+    def __init__(self, lenders: List[Dict[str, Any]], verification: Optional[Dict[str, Any]] = None,
+                 built_at: Optional[str] = None):
+        """
+        Args:
+            lenders: Lender records (format_lender shape), in LAR-count order
+            verification: Optional precomputed verification results by LEI
+            built_at: ISO timestamp of the build
+        """
+        self.lenders = lenders
+        self.verification = verification or {}
+        self.built_at = built_at
+        self.by_lei = {}
+        self.by_rssd = {}
+        names: Dict[str, List[int]] = {}
+        for position, lender in enumerate(lenders):
+            if lender.get('lei'):
+                self.by_lei.setdefault(lender['lei'], lender)
+            if lender.get('rssd'):
+                self.by_rssd.setdefault(str(lender['rssd']), lender)
+            for name in {normalize_name(lender.get('name')), normalize_name(lender.get('respondent_name'))}:
+                if name:
+                    names.setdefault(name, []).append(position)
+
+        # Sorted names for prefix search; word suffixes ('BANK OF X' -> 'OF X', 'X') for word prefixes
+        self._names = names
+        self._sorted_names = sorted(names)
+        word_starts = sorted(
+            (name[i + 1:], name) for name in names for i, char in enumerate(name) if char == ' '
+        )
+        self._word_keys = [suffix for suffix, _ in word_starts]
+        self._word_names = [name for _, name in word_starts]
+        self._ngrams = NgramIndex(self._sorted_names)
+
+    def __len__(self) -> int:
+        return len(self.lenders)
+
+    @property
+    def age_hours(self) -> Optional[float]:
+        if not self.built_at:
+            return None
+        built = datetime.fromisoformat(self.built_at)
+        if built.tzinfo is None:
+            built = built.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - built).total_seconds() / 3600
+
+    @staticmethod
+    def _prefixed(sorted_keys: List[str], prefix: str, limit: int) -> range:
+        """Positions of (at most limit) sorted_keys starting with prefix."""
+        start = bisect.bisect_left(sorted_keys, prefix)
+        end = start
+        while end < len(sorted_keys) and end - start < limit and sorted_keys[end].startswith(prefix):
+            end += 1
+        return range(start, end)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Ranked, typo-tolerant lender search.
+
+        Args:
+            query: Free-text lender name
+            limit: Maximum number of lenders returned
+
+        Returns:
+            Matching lender records, best first
+        """
+        normalized = normalize_name(query)
+        if not normalized or not self.lenders:
+            return []
+
+        # (tier, -score) per matched name; lower is better
+        ranks: Dict[str, tuple] = {}
+
+        def rank(name: str, tier: int, score: float = 1.0):
+            current = ranks.get(name)
+            if current is None or (tier, -score) < current:
+                ranks[name] = (tier, -score)
+
+        pool = max(limit * 10, 100)
+        if normalized in self._names:
+            rank(normalized, 0)
+        for i in self._prefixed(self._sorted_names, normalized, pool):
+            rank(self._sorted_names[i], 1)
+        for i in self._prefixed(self._word_keys, normalized, pool):
+            rank(self._word_names[i], 2)
+        for name, score in self._ngrams.scored_candidates(normalized, FUZZY_CANDIDATES):
+            if normalized in name:
+                rank(name, 3, score)
+            elif score >= FUZZY_MIN_SCORE:
+                rank(name, 4, score)
+
+        scored = {}
+        for name, (tier, negative_score) in ranks.items():
+            for position in self._names[name]:
+                key = (tier, negative_score, -self.lenders[position]['lar_count'], position)
+                if position not in scored or key < scored[position]:
+                    scored[position] = key
+        best = sorted(scored, key=scored.__getitem__)[:limit]
+        return [self.lenders[position] for position in best]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': DIRECTORY_VERSION,
+            'built_at': self.built_at,
+            'lenders': self.lenders,
+            'verification': self.verification,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LenderDirectory':
+        if data.get('version') != DIRECTORY_VERSION:
+            raise ValueError(f"Unsupported lender directory version: {data.get('version')}")
+        return cls(data.get('lenders', []), data.get('verification'), data.get('built_at'))
+
+
+# ----------------------------------------------------------------------
+# Building and loading the artifact
+# ----------------------------------------------------------------------
+
+def fetch_directory_rows() -> List[Dict[str, Any]]:
+    """Run the directory query against BigQuery."""
+    from justdata.apps.dataexplorer.data_utils import APP_NAME
+    from justdata.shared.utils.bigquery_client import execute_query, get_bigquery_client
+
+    client = get_bigquery_client(PROJECT_ID, app_name=APP_NAME)
+    return execute_query(client, build_directory_query(), timeout=600)
+
+
+def build_lender_directory(path: Path = None, verify: bool = False,
+                           fetch_rows: Callable[[], List[Dict[str, Any]]] = None,
+                           upload: bool = True) -> LenderDirectory:
+    """
+    Build the directory artifact from BigQuery and write it.
+
+    Args:
+        path: Output path (default LENDER_DIRECTORY_PATH)
+        verify: Also run GLEIF/CFPB verification for every lender and store it
+        fetch_rows: Row source (default: the BigQuery directory query)
+        upload: Upload to LENDER_DIRECTORY_GCS_PATH when configured
+
+    Returns:
+        The built LenderDirectory
+    """
+    path = Path(path or LENDER_DIRECTORY_PATH)
+    start = time.time()
+    rows = (fetch_rows or fetch_directory_rows)()
+    lenders = [format_lender(row) for row in rows]
+
+    verification = {}
+    if verify:
+        from concurrent.futures import ThreadPoolExecutor
+        from justdata.apps.dataexplorer.data_utils import verify_lender_with_external_sources
+
+        def run(lender):
+            try:
+                return lender['lei'], verify_lender_with_external_sources(
+                    lei=lender['lei'], name=lender['name'], city=lender.get('city'), state=lender.get('state'))
+            except Exception as e:
+                logger.warning(f"Verification failed for {lender['lei']}: {e}")
+                return lender['lei'], None
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            verification = {lei: result for lei, result in pool.map(run, lenders) if result}
+
+    directory = LenderDirectory(lenders, verification, datetime.now(timezone.utc).isoformat())
+    data = directory.to_dict()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(data, default=str))
+    os.replace(tmp_path, path)
+    logger.info(f"Built lender directory: {len(lenders)} lenders, {len(verification)} verified, "
+                f"{path.stat().st_size / 1024:.0f}KB in {time.time() - start:.1f}s -> {path}")
+
+    if upload and LENDER_DIRECTORY_GCS_PATH:
+        from justdata.shared.utils.gcs_storage import upload_file
+        upload_file(LENDER_DIRECTORY_GCS_PATH, str(path))
+    return directory
+
+
+def sync_from_gcs(path: Path = None) -> bool:
+    """
+    Download the artifact from LENDER_DIRECTORY_GCS_PATH when the blob's
+    generation differs from the one last downloaded to path.
+
+    Returns:
+        True if a new copy was downloaded
+    """
+    path = Path(path or LENDER_DIRECTORY_PATH)
+    if not LENDER_DIRECTORY_GCS_PATH:
+        return False
+    marker = path.with_name(path.name + '.generation')
+    try:
+        from justdata.shared.utils.gcs_storage import get_bucket
+        blob = get_bucket().get_blob(LENDER_DIRECTORY_GCS_PATH)
+        if blob is None:
+            logger.warning(f"Lender directory blob {LENDER_DIRECTORY_GCS_PATH} not found")
+            return False
+        generation = str(blob.generation)
+        if path.exists() and marker.exists() and marker.read_text().strip() == generation:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.download')
+        blob.download_to_filename(str(tmp_path))
+        os.replace(tmp_path, path)
+        marker.write_text(generation)
+        logger.info(f"Downloaded lender directory generation {generation} from {LENDER_DIRECTORY_GCS_PATH}")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not sync lender directory from GCS: {e}")
+        return False
+
+
+def load_lender_directory(path: Path = None) -> Optional[LenderDirectory]:
+    """Load the artifact from disk (downloading it from GCS if configured and missing)."""
+    path = Path(path or LENDER_DIRECTORY_PATH)
+    if not path.exists():
+        sync_from_gcs(path)
+    if not path.exists():
+        return None
+    try:
+        directory = LenderDirectory.from_dict(json.loads(path.read_text()))
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable lender directory {path}: {e}")
+        return None
+    age = directory.age_hours
+    if age is not None and age > LENDER_DIRECTORY_MAX_AGE_HOURS:
+        logger.warning(f"Lender directory {path} is {age:.0f}h old - rebuild it with "
+                       f"'python -m justdata.apps.dataexplorer.lender_directory --build'")
+    logger.info(f"Loaded lender directory: {len(directory)} lenders built {directory.built_at}")
+    return directory
+
+
+_EMPTY_DIRECTORY = LenderDirectory([])
+_directory: Optional[LenderDirectory] = None
+_directory_mtime: Optional[float] = None
+_directory_checked = 0.0
+_directory_lock = threading.Lock()
+_refreshing = threading.Event()
+
+
+def _refresh_directory_locked():
+    """Pull a new GCS generation if there is one, and (re)load the artifact if the file changed."""
+    global _directory, _directory_mtime
+    sync_from_gcs()
+    try:
+        mtime = LENDER_DIRECTORY_PATH.stat().st_mtime
+    except OSError:
+        return
+    if _directory is not None and mtime == _directory_mtime:
+        return
+    directory = load_lender_directory()
+    if directory is not None:
+        _directory, _directory_mtime = directory, mtime
+
+
+def _refresh_in_background():
+    try:
+        with _directory_lock:
+            _refresh_directory_locked()
+    except Exception as e:
+        logger.warning(f"Lender directory refresh failed: {e}")
+    finally:
+        _refreshing.clear()
+
+
+def get_lender_directory() -> LenderDirectory:
+    """
+    This worker's lender directory.
+
+    Loaded from the artifact (or its GCS copy) on first use. Every
+    RELOAD_CHECK_SECONDS a background refresh picks up a rebuilt artifact,
+    so searches never wait on GCS. Without an artifact this returns an
+    empty directory; it is never built from BigQuery here.
+    """
+    global _directory_checked
+    now = time.time()
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None and now - _directory_checked >= RELOAD_CHECK_SECONDS:
+                _directory_checked = now
+                _refresh_directory_locked()
+                if _directory is None:
+                    logger.error(f"No lender directory artifact at {LENDER_DIRECTORY_PATH}"
+                                 f"{' or in GCS at ' + LENDER_DIRECTORY_GCS_PATH if LENDER_DIRECTORY_GCS_PATH else ''}; "
+                                 f"lender search returns no results until "
+                                 f"'python -m justdata.apps.dataexplorer.lender_directory --build' has run")
+        return _directory if _directory is not None else _EMPTY_DIRECTORY
+
+    if now - _directory_checked >= RELOAD_CHECK_SECONDS and not _refreshing.is_set():
+        _directory_checked = now
+        _refreshing.set()
+        threading.Thread(target=_refresh_in_background, name='lender-directory-refresh', daemon=True).start()
+    return _directory
+
+
+def get_lender_verification(lei: str, name: str, city: str = None, state: str = None) -> Dict[str, Any]:
+    """
+    GLEIF/CFPB verification for a lender, from the directory artifact or the
+    verification cache; only a miss calls the external APIs.
+    """
+    directory = _directory
+    if directory is not None and lei in directory.verification:
+        lender = directory.by_lei.get(lei, {})
+        if (lender.get('name'), lender.get('city'), lender.get('state')) == (name, city, state):
+            return directory.verification[lei]
+
+    key = json.dumps([lei, name, city, state])
+    verification = _verification_cache.get(key)
+    if verification is None:
+        from justdata.apps.dataexplorer.data_utils import verify_lender_with_external_sources
+        verification = verify_lender_with_external_sources(lei=lei, name=name, city=city, state=state)
+        _verification_cache.set(key, verification)
+    return verification
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the DataExplorer lender directory artifact')
+    parser.add_argument('--build', action='store_true', help='Query BigQuery and write the artifact')
+    parser.add_argument('--verify', action='store_true', help='Include GLEIF/CFPB verification (slow)')
+    parser.add_argument('--output', type=Path, default=None, help=f'Output path (default {LENDER_DIRECTORY_PATH})')
+    parser.add_argument('--search', help='Search the existing artifact (for checking a build)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.build:
+        build_lender_directory(args.output, verify=args.verify)
+    if args.search:
+        directory = load_lender_directory(args.output)
+        if directory is None:
+            parser.error('No lender directory artifact found; run with --build first')
+        for lender in directory.search(args.search, limit=10):
+            print(f"{lender['lar_count']:>10,}  {lender['lei']}  {lender['name']} ({lender['city']}, {lender['state']})")
+    if not args.build and not args.search:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -33,7 +33,7 @@ def validate_inputs(years: List[int] = None, geoids: List[str] = None):
         raise ValueError(f"Maximum {MAX_GEOIDS} GEOIDs allowed per query. Received {len(geoids)} GEOIDs.")
 
 
-def build_hmda_query(
+def _hmda_where_clauses(
     geoids: List[str],
     years: List[int],
     action_taken: List[str] = None,
@@ -46,34 +46,8 @@ def build_hmda_query(
     lender_id: str = None,
     min_loan_amount: float = None,
     max_loan_amount: float = None
-) -> str:
-    """
-    Build HMDA query with proper filters and SQL injection protection.
-
-    Default filters match the mortgage_report.sql template:
-    - action_taken = '1' (originations only)
-    - occupancy_type = '1' (owner-occupied)
-    - total_units IN ('1','2','3','4') (1-4 family)
-    - construction_method = '1' (site-built)
-    - reverse_mortgage != '1' (exclude reverse mortgages)
-
-    Args:
-        geoids: List of GEOIDs (county FIPS codes)
-        years: List of years
-        action_taken: List of action taken codes (default: ['1'] for originations only)
-        loan_purpose: List of loan purpose codes
-        occupancy: List of occupancy codes (default: ['1'] for owner-occupied)
-        total_units: List of total unit codes (default: ['1','2','3','4'] for 1-4 family)
-        construction: List of construction method codes (default: ['1'] for site-built)
-        property_type: List of property type codes
-        exclude_reverse_mortgages: Whether to exclude reverse mortgages
-        lender_id: Optional lender LEI to filter by
-        min_loan_amount: Minimum loan amount filter
-        max_loan_amount: Maximum loan amount filter
-
-    Returns:
-        SQL query string
-    """
+) -> List[str]:
+    """WHERE conditions for the HMDA table (see build_hmda_query for the filters and defaults)."""
     # Validate inputs
     validate_inputs(years=years, geoids=geoids)
 
@@ -154,6 +128,57 @@ def build_hmda_query(
         where_clauses.append(f"loan_amount >= {float(min_loan_amount)}")
     if max_loan_amount is not None:
         where_clauses.append(f"loan_amount <= {float(max_loan_amount)}")
+
+    return where_clauses
+
+
+def build_hmda_query(
+    geoids: List[str],
+    years: List[int],
+    action_taken: List[str] = None,
+    loan_purpose: List[str] = None,
+    occupancy: List[str] = None,
+    total_units: List[str] = None,
+    construction: List[str] = None,
+    property_type: List[str] = None,
+    exclude_reverse_mortgages: bool = True,
+    lender_id: str = None,
+    min_loan_amount: float = None,
+    max_loan_amount: float = None
+) -> str:
+    """
+    Build HMDA query with proper filters and SQL injection protection.
+
+    Default filters match the mortgage_report.sql template:
+    - action_taken = '1' (originations only)
+    - occupancy_type = '1' (owner-occupied)
+    - total_units IN ('1','2','3','4') (1-4 family)
+    - construction_method = '1' (site-built)
+    - reverse_mortgage != '1' (exclude reverse mortgages)
+
+    Args:
+        geoids: List of GEOIDs (county FIPS codes)
+        years: List of years
+        action_taken: List of action taken codes (default: ['1'] for originations only)
+        loan_purpose: List of loan purpose codes
+        occupancy: List of occupancy codes (default: ['1'] for owner-occupied)
+        total_units: List of total unit codes (default: ['1','2','3','4'] for 1-4 family)
+        construction: List of construction method codes (default: ['1'] for site-built)
+        property_type: List of property type codes
+        exclude_reverse_mortgages: Whether to exclude reverse mortgages
+        lender_id: Optional lender LEI to filter by
+        min_loan_amount: Minimum loan amount filter
+        max_loan_amount: Maximum loan amount filter
+
+    Returns:
+        SQL query string
+    """
+    where_clauses = _hmda_where_clauses(
+        geoids, years, action_taken=action_taken, loan_purpose=loan_purpose, occupancy=occupancy,
+        total_units=total_units, construction=construction, property_type=property_type,
+        exclude_reverse_mortgages=exclude_reverse_mortgages, lender_id=lender_id,
+        min_loan_amount=min_loan_amount, max_loan_amount=max_loan_amount
+    )
     
     # Build query
     where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
@@ -185,26 +210,14 @@ def build_hmda_query(
     return query
 
 
-def build_sb_query(
+def _sb_where_clauses(
     geoids: List[str],
     years: List[int],
     lender_id: str = None,
     min_loan_amount: float = None,
     max_loan_amount: float = None
-) -> str:
-    """
-    Build Small Business (Section 1071) query with proper SQL injection protection.
-    
-    Args:
-        geoids: List of GEOIDs (county FIPS codes)
-        years: List of years
-        lender_id: Optional lender LEI to filter by
-        min_loan_amount: Minimum loan amount filter
-        max_loan_amount: Maximum loan amount filter
-        
-    Returns:
-        SQL query string
-    """
+) -> List[str]:
+    """WHERE conditions for the Small Business table (see build_sb_query)."""
     # Validate inputs
     validate_inputs(years=years, geoids=geoids)
     
@@ -231,6 +244,34 @@ def build_sb_query(
         where_clauses.append(f"loan_amount >= {float(min_loan_amount)}")
     if max_loan_amount is not None:
         where_clauses.append(f"loan_amount <= {float(max_loan_amount)}")
+
+    return where_clauses
+
+
+def build_sb_query(
+    geoids: List[str],
+    years: List[int],
+    lender_id: str = None,
+    min_loan_amount: float = None,
+    max_loan_amount: float = None
+) -> str:
+    """
+    Build Small Business (Section 1071) query with proper SQL injection protection.
+    
+    Args:
+        geoids: List of GEOIDs (county FIPS codes)
+        years: List of years
+        lender_id: Optional lender LEI to filter by
+        min_loan_amount: Minimum loan amount filter
+        max_loan_amount: Maximum loan amount filter
+        
+    Returns:
+        SQL query string
+    """
+    where_clauses = _sb_where_clauses(
+        geoids, years, lender_id=lender_id,
+        min_loan_amount=min_loan_amount, max_loan_amount=max_loan_amount
+    )
     
     # Build query
     where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
@@ -255,6 +296,86 @@ def build_sb_query(
     return query
 
 
+def build_hmda_lender_summary_query(
+    geoids: List[str],
+    years: List[int],
+    **filters
+) -> str:
+    """
+    Build a grouped HMDA query summarizing several lenders in one job.
+
+    Uses the same filters as build_hmda_query, but restricted to the LEIs in
+    the @leis array parameter and aggregated in BigQuery, so only one row per
+    lender, year and loan purpose is returned instead of every loan.
+
+    Args:
+        geoids: List of GEOIDs (county FIPS codes)
+        years: List of years
+        **filters: Any build_hmda_query filter except lender_id
+
+    Returns:
+        SQL query string (expects an ARRAY<STRING> query parameter @leis)
+    """
+    filters.pop('lender_id', None)
+    where_clauses = _hmda_where_clauses(geoids, years, **filters)
+    where_clauses.append("lei IN UNNEST(@leis)")
+    where_clause = " AND ".join(where_clauses)
+
+    query = f"""
+    SELECT 
+        lei as lender_id,
+        activity_year as year,
+        loan_purpose,
+        MIN(lender_name) as lender_name,
+        COUNT(*) as total_loans,
+        SUM(loan_amount) as total_volume
+    FROM `{PROJECT_ID}.{HMDA_DATASET}.{HMDA_TABLE}`
+    WHERE {where_clause}
+    GROUP BY lei, activity_year, loan_purpose
+    ORDER BY lei, activity_year DESC, loan_purpose
+    """
+
+    return query
+
+
+def build_sb_lender_summary_query(
+    geoids: List[str],
+    years: List[int],
+    **filters
+) -> str:
+    """
+    Build a grouped Small Business query summarizing several lenders in one job.
+
+    Args:
+        geoids: List of GEOIDs (county FIPS codes)
+        years: List of years
+        **filters: Any build_sb_query filter except lender_id
+
+    Returns:
+        SQL query string (expects an ARRAY<STRING> query parameter @leis)
+    """
+    filters.pop('lender_id', None)
+    where_clauses = _sb_where_clauses(geoids, years, **filters)
+    where_clauses.append("lei IN UNNEST(@leis)")
+    where_clause = " AND ".join(where_clauses)
+
+    query = f"""
+    SELECT 
+        lei as lender_id,
+        activity_year as year,
+        MIN(lender_name) as lender_name,
+        SUM(number_of_loans) as total_loans,
+        SUM(loan_amount) as total_volume,
+        SUM(number_of_borrowers) as total_borrowers
+    FROM `{PROJECT_ID}.{SB_DATASET}.{SB_DISCLOSURE_TABLE}`
+    WHERE {where_clause}
+    GROUP BY lei, activity_year
+    ORDER BY lei, activity_year DESC
+    """
+
+    return query
+
+
 def build_branch_query(
     geoids: List[str] = None,
     years: List[int] = None,
@@ -332,45 +453,3 @@ def build_branch_query(
     """
     
     return query
-
-
-def build_lender_lookup_query(lender_name: str, exact_match: bool = False) -> str:
-    """
-    Build lender lookup query with proper SQL injection protection.
-    
-    FIXED ISSUES FROM V1:
-    - Deterministic ORDER BY clause
-    - Proper SQL escaping
-    - Query hmda.hmda table and group by LEI to get distinct lenders
-    
-    Args:
-        lender_name: Lender name to search for
-        exact_match: Whether to use exact match or LIKE search
-        
-    Returns:
-        SQL query string
-    """
-    escaped_name = escape_sql_string(str(lender_name))
-    
-    if exact_match:
-        where_clause = f"lender_name = '{escaped_name}'"
-    else:
-        where_clause = f"LOWER(lender_name) LIKE LOWER('%{escaped_name}%')"
-    
-    # Query hmda.hmda table and group by LEI to get distinct lenders
-    # Use most recent year's data for better accuracy
-    query = f"""
-    SELECT 
-        lei as lender_id,
-        MAX(lender_name) as lender_name,
-        'HMDA' as source
-    FROM `{PROJECT_ID}.{HMDA_DATASET}.{HMDA_TABLE}`
-    WHERE {where_clause}
-      AND lender_name IS NOT NULL
-      AND lei IS NOT NULL
-    GROUP BY lei
-    ORDER BY lender_name, lei
-    LIMIT 100
-    """
-    
-    return query
@@ -46,6 +46,16 @@ electwatch_bp = Blueprint(
     static_url_path='/electwatch/static'
 )
 
+
+@electwatch_bp.record_once
+def _enable_read_snapshot(state):
+    """Serve ElectWatch reads from the in-memory snapshot once the app registers us."""
+    try:
+        from justdata.apps.electwatch.services.data_store import enable_read_snapshot
+        enable_read_snapshot()
+    except Exception as e:
+        logger.warning(f"ElectWatch read snapshot not enabled: {e}")
+
 # Import version
 try:
     from justdata.apps.electwatch.version import __version__
@@ -19,6 +19,7 @@ from justdata.apps.electwatch.config import ElectWatchConfig
 from justdata.apps.electwatch.services.firm_mapper import (
     FirmMapper, get_mapper, AmountRange, parse_stock_amount
 )
+from justdata.shared.utils.job_scheduler import JobCancelled
 
 logger = logging.getLogger(__name__)
 
@@ -174,6 +175,8 @@ def run_official_analysis(
 
         return result
 
+    except JobCancelled:
+        raise
     except Exception as e:
         logger.error(f"Analysis failed: {e}")
         return {'success': False, 'error': str(e)}
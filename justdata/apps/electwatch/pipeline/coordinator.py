@@ -20,6 +20,7 @@ import os
 import sys
 import json
 import logging
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
@@ -286,7 +287,9 @@ def fetch_bioguide_photo(name: str, bioguide_id: str = None, chamber: str = 'hou
 class WeeklyDataUpdate:
     """Comprehensive weekly data update process."""
 
-    def __init__(self, use_cache: bool = True, cache_max_age_hours: int = 24):
+    def __init__(self, use_cache: bool = True, cache_max_age_hours: int = 24, incremental: bool = True):
+        from justdata.apps.electwatch.services.pipeline_state import PipelineState
+
         self.start_time = datetime.now()
         # Data is stored in BigQuery, weekly_dir kept for backward compatibility
         self.weekly_dir = None  # No longer using file-based storage
@@ -299,9 +302,19 @@ class WeeklyDataUpdate:
         self.cache_dir = Path(__file__).resolve().parent.parent / 'data' / 'cache'
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # Watermarks and input hashes from the last successful run; with
+        # incremental=False every official and AI section counts as changed.
+        # Saving writes back only what this run changed, so the FEC bulk
+        # loader's watermarks in the same state are kept either way
+        self.incremental = incremental
+        self.state = PipelineState.load() if incremental else PipelineState()
+        self.changed_officials = None  # bioguide ids, set by detect_changes()
+        self.firms_changed = True
+
         # Data containers
         self.officials_data = []
         self.firms_data = []
+        self.firm_stats = []
         self.industries_data = []
         self.committees_data = []
         self.news_data = []
@@ -399,6 +412,7 @@ class WeeklyDataUpdate:
             logger.info("PHASE 2: PROCESSING AND AGGREGATING DATA")
             logger.info("=" * 70)
             self.process_data()
+            self.detect_changes()
 
             # Phase 3: Generate AI summaries
             logger.info("\n" + "=" * 70)
@@ -421,6 +435,10 @@ class WeeklyDataUpdate:
             # Final summary
             self.print_summary(verified)
 
+            # Advance watermarks only after a clean run, so failures are redone
+            if verified and not self.errors:
+                self.state.save()
+
             return verified and len(self.errors) == 0
 
         except Exception as e:
@@ -442,17 +460,39 @@ class WeeklyDataUpdate:
         - FEC IDs from crosswalk (no API calls)
         - Incremental FEC updates for last 7 days only
         """
-        # FIRST: Get ALL Congress members (not just those with financial activity)
-        self.fetch_all_congress_members()
+        from justdata.apps.electwatch.pipeline.fetchers.fmp import fetch_fmp_data, pull_fmp_trades
+
+        def timed(name, func):
+            started = time.time()
+            try:
+                return func()
+            finally:
+                logger.info(f"  [{name}] fetched in {time.time() - started:.1f}s")
+
+        # The Congress.gov roster and the FMP trade pull are independent network
+        # fetches, so they run side by side (each under its own rate limiter);
+        # merging trades into officials needs the roster, so it waits for both
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='phase1') as pool:
+            roster = pool.submit(timed, 'congress', self.fetch_all_congress_members)
+            trades = pool.submit(timed, 'fmp', lambda: pull_fmp_trades(self))
+            roster.result()
+            try:
+                pulled = trades.result()
+            except Exception as e:
+                logger.error(f"FMP fetch failed: {e}")
+                self.errors.append(f"FMP: {e}")
+                self.source_status['fmp'] = {'status': 'failed', 'error': str(e)}
+                pulled = None
 
         # Then enrich with financial activity data
-        self.fetch_fmp_data()  # FMP for congressional stock trades (replaced Quiver)
+        if pulled is not None:
+            fetch_fmp_data(self, pulled)  # FMP for congressional stock trades (replaced Quiver)
         self.fetch_fec_crosswalk_ids()  # Get FEC IDs from crosswalk (no API calls)
 
         # Financial sector data comes from BigQuery (bulk loaded)
         # Only fetch incremental updates for the last 7 days
-        self.fetch_incremental_fec_updates()
-    
+        timed('fec', self.fetch_incremental_fec_updates)
+
     def fetch_fec_crosswalk_ids(self):
         """Populate FEC IDs from crosswalk (no API calls needed)."""
         from justdata.apps.electwatch.pipeline.fetchers.fec import fetch_fec_crosswalk_ids
@@ -558,6 +598,11 @@ class WeeklyDataUpdate:
         from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firms import process_firms
         process_firms(self)
 
+    def process_firm_stats(self):
+        """Compute per-firm trade statistics for the firms pages."""
+        from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firm_stats import process_firm_stats
+        process_firm_stats(self)
+
     def process_industries(self):
         """Build industry aggregations from firms and officials data."""
         from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_industries import process_industries
@@ -568,6 +613,21 @@ class WeeklyDataUpdate:
         from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_committees import process_committees
         process_committees(self)
 
+    def detect_changes(self):
+        """Compare this run's officials and firm stats with the last successful run."""
+        from justdata.apps.electwatch.services.pipeline_state import content_hash
+
+        self.changed_officials = self.state.changed_officials(self.officials_data)
+        logger.info(f"Officials with changed inputs since last run: "
+                    f"{len(self.changed_officials)} of {len(self.officials_data)}")
+
+        firms_hash = content_hash([
+            {k: row.get(k) for k in ('ticker', 'industry', 'total', 'officials', 'stock_trades')}
+            for row in self.firm_stats
+        ])
+        self.firms_changed = self.state.source('firm_stats').get('hash') != firms_hash
+        self.state.set_source('firm_stats', {'hash': firms_hash, 'count': len(self.firm_stats)})
+
     # =========================================================================
     # PHASE 3: GENERATE AI SUMMARIES
     # =========================================================================
@@ -589,7 +649,10 @@ class WeeklyDataUpdate:
     def save_all_data(self):
         """Save all processed data to storage."""
         from justdata.apps.electwatch.pipeline.loaders.bigquery import save_all_data
-        save_all_data(self)
+        from justdata.apps.electwatch.services.snapshot import bypassed
+        # Reads during the save (AI insights) must see this run's rows
+        with bypassed():
+            save_all_data(self)
 
     def _generate_matching_report(self) -> Dict:
         """Generate report of matching success/failure rates."""
@@ -70,9 +70,6 @@ def fetch_incremental_fec_updates(coordinator):
     """
     logger.info("\n--- Fetching Incremental FEC Updates (Last 7 Days) ---")
 
-    import requests
-    import time
-
     api_key = os.getenv('FEC_API_KEY')
     if not api_key:
         logger.warning("FEC_API_KEY not set - skipping incremental updates")
@@ -108,19 +105,15 @@ def fetch_incremental_fec_updates(coordinator):
                       for o in coordinator.officials_data if o.get('fec_candidate_id')}
 
     try:
-        # Query recent PAC contributions (Schedule A from committees)
+        # Query recent PAC contributions (Schedule A from committees); candidates
+        # are fetched concurrently under the shared 'fec' rate limiter
+        from justdata.apps.electwatch.services.source_http import get_source_client
+        client = get_source_client('fec')
         logger.info("  Fetching recent PAC contributions...")
         url = 'https://api.open.fec.gov/v1/schedules/schedule_a/'
 
-        for fec_id in fec_ids[:100]:  # Limit to 100 for speed
-            if api_calls >= max_api_calls:
-                logger.info(f"  Reached API limit ({max_api_calls}), stopping")
-                break
-
-            bioguide_id = fec_to_bioguide.get(fec_id)
-            if not bioguide_id:
-                continue
-
+        def fetch_candidate(fec_id):
+            bioguide_id = fec_to_bioguide[fec_id]
             params = {
                 'api_key': api_key,
                 'candidate_id': fec_id,
@@ -130,14 +123,13 @@ def fetch_incremental_fec_updates(coordinator):
                 'per_page': 100
             }
 
+            contributions = []
             try:
-                time.sleep(0.3)
-                r = requests.get(url, params=params, timeout=30)
-                api_calls += 1
+                r = client.get(url, params=params, timeout=30)
 
                 if r.status_code == 429:
-                    logger.warning("  Rate limited - stopping")
-                    break
+                    logger.warning(f"  Rate limited - skipping {fec_id}")
+                    return contributions
 
                 if r.ok:
                     data = r.json()
@@ -147,7 +139,7 @@ def fetch_incremental_fec_updates(coordinator):
 
                         if amt > 0:
                             is_financial = any(kw in name for kw in FINANCIAL_KEYWORDS)
-                            new_pac_contributions.append({
+                            contributions.append({
                                 'bioguide_id': bioguide_id,
                                 'committee_id': c.get('contributor_id', ''),
                                 'committee_name': c.get('contributor_name', ''),
@@ -158,7 +150,13 @@ def fetch_incremental_fec_updates(coordinator):
                             })
             except Exception as e:
                 logger.debug(f"  Error for {fec_id}: {e}")
+            return contributions
 
+        # Limit to 100 candidates for speed, and to the API call budget
+        candidates = [fec_id for fec_id in fec_ids[:100] if fec_to_bioguide.get(fec_id)][:max_api_calls]
+        for contributions in client.map(fetch_candidate, candidates):
+            api_calls += 1
+            new_pac_contributions.extend(contributions)
             if api_calls % 50 == 0:
                 logger.info(f"  Progress: {api_calls} API calls, {len(new_pac_contributions)} new PAC contributions")
 
@@ -1,7 +1,7 @@
 """Financial Modeling Prep (FMP) congressional trading fetcher."""
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from justdata.apps.electwatch.pipeline.coordinator import (
     ELECTION_CYCLE_START,
@@ -11,56 +11,79 @@ from justdata.apps.electwatch.pipeline.coordinator import (
 logger = logging.getLogger(__name__)
 
 
-def fetch_fmp_data(coordinator):
-    """Fetch congressional trading data from Financial Modeling Prep (FMP).
+def pull_fmp_trades(coordinator) -> Dict:
+    """Pull financial sector congressional trades from FMP (or the phase cache).
 
-    FMP provides comprehensive STOCK Act disclosure data for both House and Senate,
-    focused on financial sector stocks only.
-    """
-    logger.info("\n--- Fetching FMP Congressional Trading (Financial Sector) ---")
+    Network only - nothing is merged into the officials - so the coordinator
+    can run it alongside the Congress.gov roster fetch.
+
+    Returns:
+        {'data': {'house': [...], 'senate': [...]}, 'from_cache': bool}
 
+    Raises:
+        Exception: If the FMP API is unreachable
+    """
     # Try to load from cache first
     cached = coordinator.load_cache('fmp_trades')
     if cached:
         trades_data = cached.get('data', {})
-        house_trades = trades_data.get('house', [])
-        senate_trades = trades_data.get('senate', [])
-        all_trades = house_trades + senate_trades
-        if all_trades:
-            logger.info(f"  [CACHE] Loaded {len(all_trades)} trades from cache")
-            _process_fmp_trades(coordinator, all_trades, len(house_trades), len(senate_trades), from_cache=True)
-            return
+        total = len(trades_data.get('house', [])) + len(trades_data.get('senate', []))
+        if total:
+            logger.info(f"  [CACHE] Loaded {total} trades from cache")
+            return {'data': trades_data, 'from_cache': True}
 
-    try:
-        from justdata.apps.electwatch.services.fmp_client import FMPClient, ALL_FINANCIAL_SYMBOLS
-        client = FMPClient()
+    from justdata.apps.electwatch.services.fmp_client import FMPClient, ALL_FINANCIAL_SYMBOLS
+    client = FMPClient()
 
-        if not client.test_connection():
-            raise Exception("FMP API connection failed")
+    if not client.test_connection():
+        raise Exception("FMP API connection failed")
 
-        # Use election cycle start date (covers 2023-2024 and 2025-2026 cycles)
-        from_date = ELECTION_CYCLE_START
+    # Use election cycle start date (covers 2023-2024 and 2025-2026 cycles)
+    from_date = ELECTION_CYCLE_START
 
-        # Fetch financial sector trades only
-        logger.info(f"Fetching trades for {len(ALL_FINANCIAL_SYMBOLS)} financial sector symbols...")
-        trades_data = client.get_financial_sector_trades(from_date=from_date)
+    # Fetch financial sector trades only (symbols run concurrently under the 'fmp' limiter)
+    logger.info(f"Fetching trades for {len(ALL_FINANCIAL_SYMBOLS)} financial sector symbols...")
+    trades_data = client.get_financial_sector_trades(from_date=from_date)
 
+    house_trades = trades_data.get('house', [])
+    senate_trades = trades_data.get('senate', [])
+    logger.info(f"Fetched {len(house_trades)} House trades, {len(senate_trades)} Senate trades")
+
+    # Save to cache immediately after successful fetch
+    coordinator.save_cache('fmp_trades', trades_data, {
+        'house_trades': len(house_trades),
+        'senate_trades': len(senate_trades),
+        'total_trades': len(house_trades) + len(senate_trades)
+    })
+    return {'data': trades_data, 'from_cache': False}
+
+
+def fetch_fmp_data(coordinator, pulled: Optional[Dict] = None):
+    """Fetch congressional trading data from Financial Modeling Prep (FMP).
+
+    FMP provides comprehensive STOCK Act disclosure data for both House and Senate,
+    focused on financial sector stocks only.
+
+    Args:
+        coordinator: WeeklyDataUpdate instance
+        pulled: Result of pull_fmp_trades() if it already ran (None pulls now)
+    """
+    logger.info("\n--- Fetching FMP Congressional Trading (Financial Sector) ---")
+
+    try:
+        if pulled is None:
+            pulled = pull_fmp_trades(coordinator)
+
+        trades_data = pulled['data']
         house_trades = trades_data.get('house', [])
         senate_trades = trades_data.get('senate', [])
         all_trades = house_trades + senate_trades
-
-        logger.info(f"Fetched {len(house_trades)} House trades, {len(senate_trades)} Senate trades")
         logger.info(f"Total: {len(all_trades)} financial sector trades")
 
-        # Save to cache immediately after successful fetch
-        coordinator.save_cache('fmp_trades', trades_data, {
-            'house_trades': len(house_trades),
-            'senate_trades': len(senate_trades),
-            'total_trades': len(all_trades)
-        })
-
         # Process the trades
-        _process_fmp_trades(coordinator, all_trades, len(house_trades), len(senate_trades), from_cache=False)
+        _record_trade_watermark(coordinator, all_trades)
+        _process_fmp_trades(coordinator, all_trades, len(house_trades), len(senate_trades),
+                            from_cache=pulled['from_cache'])
 
     except Exception as e:
         logger.error(f"FMP fetch failed: {e}")
@@ -70,6 +93,25 @@ def fetch_fmp_data(coordinator):
         coordinator.source_status['fmp'] = {'status': 'failed', 'error': str(e)}
 
 
+def _record_trade_watermark(coordinator, all_trades: List[Dict]):
+    """Record the trade pull's hash and latest trade date in the pipeline state.
+
+    FMP only serves full per-symbol histories, so the pull itself cannot be
+    incremental; the watermark tells the later phases whether anything new
+    arrived (officials' input hashes then narrow it down per official).
+    """
+    from justdata.apps.electwatch.services.pipeline_state import trade_watermark
+
+    watermark = trade_watermark(all_trades)
+    previous = coordinator.state.source('fmp_trades')
+    if previous.get('hash') == watermark['hash']:
+        logger.info(f"  No new trades since last run (latest trade {watermark['last_trade_date']})")
+    elif previous:
+        logger.info(f"  Trades changed since last run: {previous.get('count', 0)} -> {watermark['count']} "
+                    f"(latest trade {previous.get('last_trade_date')} -> {watermark['last_trade_date']})")
+    coordinator.state.set_source('fmp_trades', watermark)
+
+
 def _build_crosswalk_name_lookup(coordinator) -> Dict[str, Dict]:
     """Build comprehensive name lookup using crosswalk nicknames.
 
@@ -2,39 +2,91 @@
 import logging
 import os
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-def generate_summaries(coordinator):
-    """Generate AI summaries using Claude."""
-    logger.info("\n--- Generating AI Summaries ---")
+def _weekly_overview_inputs(coordinator) -> Dict[str, Any]:
+    """Everything the weekly overview prompt reads."""
+    return {
+        'officials': [
+            {k: o.get(k) for k in ('name', 'party', 'state', 'total_trades', 'stock_trades_display')}
+            for o in coordinator.officials_data[:10]
+        ],
+        'news': [n.get('title', '')[:80] for n in coordinator.news_data[:10]],
+    }
 
-    try:
-        from anthropic import Anthropic
-        api_key = os.getenv('CLAUDE_API_KEY')
 
-        if not api_key:
-            logger.warning("CLAUDE_API_KEY not set - skipping AI summaries")
-            coordinator.summaries = {'status': 'skipped', 'reason': 'No API key'}
-            return
+def _top_movers_inputs(coordinator) -> Dict[str, Any]:
+    """Everything the top movers prompt reads."""
+    return {
+        'officials': [
+            {k: o.get(k) for k in ('name', 'purchase_count', 'sale_count', 'stock_trades_display')}
+            for o in coordinator.officials_data[:5]
+        ],
+    }
+
+
+def _industry_highlights_inputs(coordinator) -> Dict[str, Any]:
+    """Everything the industry highlights prompt reads."""
+    return {'sector_trades': _sector_trade_counts(coordinator)}
+
 
-        client = Anthropic(api_key=api_key)
+def generate_summaries(coordinator):
+    """Generate AI summaries using Claude.
+
+    Each section is keyed on a hash of exactly the officials' fields (and
+    news) its prompt reads; a section whose inputs match the last successful
+    run reuses that run's text instead of calling the API again.
+    """
+    from justdata.apps.electwatch.services.pipeline_state import content_hash
 
-        # Generate weekly overview
-        coordinator.summaries['weekly_overview'] = _generate_weekly_overview(coordinator, client)
+    logger.info("\n--- Generating AI Summaries ---")
 
-        # Generate top movers summary
-        coordinator.summaries['top_movers'] = _generate_top_movers(coordinator, client)
+    sections = {
+        'weekly_overview': (_weekly_overview_inputs, _generate_weekly_overview),
+        'top_movers': (_top_movers_inputs, _generate_top_movers),
+        'industry_highlights': (_industry_highlights_inputs, _generate_industry_highlights),
+    }
 
-        # Generate industry highlights
-        coordinator.summaries['industry_highlights'] = _generate_industry_highlights(coordinator, client)
+    try:
+        pending = {}
+        reused = []
+        for section, (inputs, generate) in sections.items():
+            inputs_hash = content_hash(inputs(coordinator))
+            text = coordinator.state.summary(section, inputs_hash)
+            if text:
+                coordinator.summaries[section] = text
+                reused.append(section)
+            else:
+                pending[section] = (inputs_hash, generate)
+
+        if reused:
+            logger.info(f"Inputs unchanged since last run - reusing {', '.join(reused)}")
+
+        if pending:
+            api_key = os.getenv('CLAUDE_API_KEY')
+
+            if not api_key:
+                logger.warning("CLAUDE_API_KEY not set - skipping AI summaries")
+                coordinator.summaries = {'status': 'skipped', 'reason': 'No API key'}
+                return
+
+            from anthropic import Anthropic
+            client = Anthropic(api_key=api_key)
+
+            for section, (inputs_hash, generate) in pending.items():
+                text, generated = generate(coordinator, client)
+                coordinator.summaries[section] = text
+                # Fallback text is not remembered, so the next run retries
+                if generated:
+                    coordinator.state.set_summary(section, inputs_hash, text)
 
         coordinator.summaries['status'] = 'generated'
         coordinator.summaries['generated_at'] = datetime.now().isoformat()
 
-        logger.info("AI summaries generated successfully")
+        logger.info(f"AI summaries ready ({len(pending)} generated, {len(reused)} reused)")
 
     except Exception as e:
         logger.error(f"AI summary generation failed: {e}")
@@ -42,8 +94,8 @@ def generate_summaries(coordinator):
         coordinator.summaries = {'status': 'failed', 'error': str(e)}
 
 
-def _generate_weekly_overview(coordinator, client) -> str:
-    """Generate weekly overview summary."""
+def _generate_weekly_overview(coordinator, client) -> Tuple[str, bool]:
+    """Generate weekly overview summary; returns (text, generated)."""
     try:
         # Build context from data
         top_officials = coordinator.officials_data[:10]
@@ -73,15 +125,15 @@ Write a concise summary suitable for a dashboard overview."""
             messages=[{"role": "user", "content": prompt}]
         )
 
-        return response.content[0].text
+        return response.content[0].text, True
 
     except Exception as e:
         logger.warning(f"Weekly overview generation failed: {e}")
-        return "Weekly summary unavailable."
+        return "Weekly summary unavailable.", False
 
 
-def _generate_top_movers(coordinator, client) -> str:
-    """Generate summary of notable trading activity."""
+def _generate_top_movers(coordinator, client) -> Tuple[str, bool]:
+    """Generate summary of notable trading activity; returns (text, generated)."""
     try:
         top_officials = coordinator.officials_data[:5]
         context = "\n".join([
@@ -101,29 +153,35 @@ Be factual and avoid speculation."""
             messages=[{"role": "user", "content": prompt}]
         )
 
-        return response.content[0].text
+        return response.content[0].text, True
 
     except Exception as e:
         logger.warning(f"Top movers generation failed: {e}")
-        return "Top movers summary unavailable."
-
-
-def _generate_industry_highlights(coordinator, client) -> str:
-    """Generate industry-focused summary."""
+        return "Top movers summary unavailable.", False
+
+
+def _sector_trade_counts(coordinator) -> Dict[str, int]:
+    """Count officials' (first 10) trades per coarse sector."""
+    sector_trades = {}
+    for official in coordinator.officials_data:
+        for trade in official.get('trades', [])[:10]:
+            ticker = trade.get('ticker', '')
+            # Simple sector mapping
+            if ticker in ['WFC', 'JPM', 'BAC', 'C', 'GS', 'MS']:
+                sector = 'banking'
+            elif ticker in ['COIN', 'HOOD']:
+                sector = 'crypto'
+            else:
+                sector = 'other'
+            sector_trades[sector] = sector_trades.get(sector, 0) + 1
+    return sector_trades
+
+
+def _generate_industry_highlights(coordinator, client) -> Tuple[str, bool]:
+    """Generate industry-focused summary; returns (text, generated)."""
     try:
         # Find most-traded sectors
-        sector_trades = {}
-        for official in coordinator.officials_data:
-            for trade in official.get('trades', [])[:10]:
-                ticker = trade.get('ticker', '')
-                # Simple sector mapping
-                if ticker in ['WFC', 'JPM', 'BAC', 'C', 'GS', 'MS']:
-                    sector = 'banking'
-                elif ticker in ['COIN', 'HOOD']:
-                    sector = 'crypto'
-                else:
-                    sector = 'other'
-                sector_trades[sector] = sector_trades.get(sector, 0) + 1
+        sector_trades = _sector_trade_counts(coordinator)
 
         prompt = f"""Based on congressional trading patterns showing {sector_trades.get('banking', 0)} banking trades and {sector_trades.get('crypto', 0)} crypto trades, write 2 sentences about industry focus."""
 
@@ -133,11 +191,11 @@ def _generate_industry_highlights(coordinator, client) -> str:
             messages=[{"role": "user", "content": prompt}]
         )
 
-        return response.content[0].text
+        return response.content[0].text, True
 
     except Exception as e:
         logger.warning(f"Industry highlights generation failed: {e}")
-        return "Industry highlights unavailable."
+        return "Industry highlights unavailable.", False
 
 
 def generate_pattern_insights(coordinator) -> List[Dict[str, Any]]:
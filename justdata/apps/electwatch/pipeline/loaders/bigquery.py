@@ -1,8 +1,8 @@
 """BigQuery write operations for the ElectWatch weekly pipeline.
 
-Wraps the data_store service: trend snapshot, officials/firms/industries/
-committees/news/summaries/insights/metadata writes plus the matching
-report and post-write validation.
+Wraps the data_store service: trend snapshot, officials/firms/firm stats/
+industries/committees/news/summaries/insights/metadata writes, the app's
+read snapshot, plus the matching report and post-write validation.
 """
 import json
 import logging
@@ -18,10 +18,10 @@ logger = logging.getLogger(__name__)
 def save_all_data(coordinator):
     """Save all processed data to storage."""
     from justdata.apps.electwatch.services.data_store import (
-        save_officials, save_firms, save_industries,
-        save_committees, save_news, save_summaries, save_insights, save_metadata,
+        save_officials, save_firms, save_firm_stats, save_industries,
+        save_committees, save_news, save_summaries, save_insights, save_metadata, get_insights,
         save_trend_snapshot, enrich_officials_with_trends,
-        enrich_officials_with_time_series
+        enrich_officials_with_time_series, publish_read_snapshot
     )
 
     # Save trend snapshot BEFORE enriching (captures raw current state)
@@ -42,6 +42,9 @@ def save_all_data(coordinator):
     logger.info("Saving firms data...")
     save_firms(coordinator.firms_data, coordinator.weekly_dir)
 
+    logger.info("Saving firm trade stats...")
+    save_firm_stats(coordinator.firm_stats, coordinator.weekly_dir)
+
     logger.info("Saving industries data...")
     save_industries(coordinator.industries_data, coordinator.weekly_dir)
 
@@ -54,15 +57,22 @@ def save_all_data(coordinator):
     logger.info("Saving AI summaries...")
     save_summaries(coordinator.summaries, coordinator.weekly_dir)
 
-    logger.info("Generating AI pattern insights...")
-    insights = coordinator._generate_pattern_insights()
-    if insights:
-        logger.info(f"Saving {len(insights)} AI insights...")
-        save_insights(insights, coordinator.weekly_dir)
+    # Pattern insights read every official and firm: keep the last run's
+    # when none of their inputs changed
+    unchanged = coordinator.changed_officials == set() and not coordinator.firms_changed
+    kept_insights = get_insights() if unchanged else []
+    if kept_insights:
+        logger.info(f"Officials and firms unchanged since last run - keeping {len(kept_insights)} AI insights")
     else:
-        logger.warning("No insights generated - using sample insights")
-        from justdata.apps.electwatch.services.ai_pattern_insights import get_sample_insights
-        save_insights(get_sample_insights(), coordinator.weekly_dir)
+        logger.info("Generating AI pattern insights...")
+        insights = coordinator._generate_pattern_insights()
+        if insights:
+            logger.info(f"Saving {len(insights)} AI insights...")
+            save_insights(insights, coordinator.weekly_dir)
+        else:
+            logger.warning("No insights generated - using sample insights")
+            from justdata.apps.electwatch.services.ai_pattern_insights import get_sample_insights
+            save_insights(get_sample_insights(), coordinator.weekly_dir)
 
     # Calculate next update time (next Sunday midnight)
     now = datetime.now()
@@ -117,6 +127,10 @@ def save_all_data(coordinator):
 
     logger.info("All data saved to BigQuery")
 
+    # Versioned in-memory snapshot the app serves reads from
+    logger.info("Publishing read snapshot...")
+    publish_read_snapshot()
+
     # Generate and save matching report
     logger.info("Generating matching report...")
     matching_report = _generate_matching_report(coordinator)
@@ -4,8 +4,8 @@
 industries, scores, and trade flags. It then delegates to
 `_build_top_donors` and `_normalize_scores_to_zscore`.
 
-`process_data` is the orchestrator — runs officials, firms, industries,
-committees in order. It's kept here next to `process_officials` because
+`process_data` is the orchestrator — runs officials, firms, firm trade
+stats, industries, committees in order. It's kept here next to `process_officials` because
 the coordinator's `process_data` method is the canonical entry into
 this whole transformer subsystem.
 """
@@ -26,6 +26,9 @@ from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_scores
 from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firms import (
     process_firms,
 )
+from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firm_stats import (
+    process_firm_stats,
+)
 from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_industries import (
     process_industries,
 )
@@ -44,6 +47,9 @@ def process_data(coordinator):
     logger.info("\n--- Processing Firms Data ---")
     process_firms(coordinator)
 
+    logger.info("\n--- Processing Firm Trade Stats ---")
+    process_firm_stats(coordinator)
+
     logger.info("\n--- Processing Industries Data ---")
     process_industries(coordinator)
 
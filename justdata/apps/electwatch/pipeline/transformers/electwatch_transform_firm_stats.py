@@ -0,0 +1,140 @@
+"""ElectWatch pipeline: firm-level trade statistics for the firms pages.
+
+Computed once per run from the officials' trades and persisted to the
+firm_stats table (and the app's read snapshot), so the firms list no
+longer walks every trade on each request.
+"""
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Industry mapping (lowercase for consistent matching)
+INDUSTRY_MAP = {
+    'Banking': 'banking',
+    'Investment': 'investment',
+    'Insurance': 'insurance',
+    'Crypto': 'crypto',
+    'Fintech': 'fintech',
+    'Mortgage': 'mortgage',
+    'Consumer': 'consumer_lending',
+    'Consumer Lending': 'consumer_lending',
+}
+
+# Columns a firm_stats query may sort on
+SORT_COLUMNS = ('rank', 'total', 'officials', 'stock_trades', 'name', 'ticker')
+
+
+def build_firm_stats(officials: List[Dict], firms: List[Dict]) -> List[Dict]:
+    """
+    Aggregate officials' trades per ticker and merge them onto the firm records.
+
+    Args:
+        officials: Officials with 'name' and 'trades' (amount as {min, max})
+        firms: Firm records with ticker, name, industry (and optionally quote)
+
+    Returns:
+        One row per firm, sorted by total trade value (descending), with:
+        rank, name, ticker, industry, total (sum of range midpoints),
+        officials (distinct officials who traded it), stock_trades (trade
+        count), quote and news (at most 3 items)
+    """
+    firm_stats = {}
+    for official in officials:
+        for trade in official.get('trades', []):
+            ticker = trade.get('ticker', '')
+            if not ticker:
+                continue
+
+            if ticker not in firm_stats:
+                firm_stats[ticker] = {
+                    'trade_count': 0,
+                    'officials': set(),
+                    'total_value': 0,
+                    'company_name': trade.get('company', ''),
+                }
+
+            stats = firm_stats[ticker]
+            stats['trade_count'] += 1
+            stats['officials'].add(official.get('name', ''))
+
+            # Trade value is the midpoint of the disclosed range
+            amount = trade.get('amount', {})
+            if isinstance(amount, dict):
+                stats['total_value'] += (amount.get('min', 0) + amount.get('max', 0)) / 2
+
+    result = []
+    processed_tickers = set()
+
+    # Firms from the firms table, with or without trade activity
+    for firm in firms:
+        ticker = firm.get('ticker', '')
+        stats = firm_stats.get(ticker, {})
+        industry = firm.get('industry', '')
+
+        result.append({
+            'name': firm.get('name', ''),
+            'ticker': ticker,
+            'industry': INDUSTRY_MAP.get(industry, industry.lower()) if industry else 'other',
+            'total': stats.get('total_value', 0),
+            'officials': len(stats.get('officials', set())),
+            'stock_trades': stats.get('trade_count', 0),
+            'quote': firm.get('quote'),
+            'news': firm.get('news', [])[:3] if firm.get('news') else [],
+        })
+        processed_tickers.add(ticker)
+
+    # Traded tickers missing from the firms table
+    for ticker, stats in firm_stats.items():
+        if ticker not in processed_tickers:
+            result.append({
+                'name': stats.get('company_name', ticker),
+                'ticker': ticker,
+                'industry': 'other',
+                'total': stats.get('total_value', 0),
+                'officials': len(stats.get('officials', set())),
+                'stock_trades': stats.get('trade_count', 0),
+                'quote': None,
+                'news': [],
+            })
+
+    result.sort(key=lambda x: x.get('total', 0), reverse=True)
+    for rank, row in enumerate(result, start=1):
+        row['rank'] = rank
+    return result
+
+
+def query_firm_stats(rows: List[Dict], industry: Optional[str] = None, sort: str = 'rank',
+                     descending: bool = False, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+    """
+    Filter, sort and page firm stat rows (in rank order) in memory.
+
+    Same semantics as ElectWatchBQClient.get_firm_stats; ties keep rank order.
+
+    Raises:
+        ValueError: If sort is not one of SORT_COLUMNS
+    """
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Unsupported firm stats sort: {sort}")
+    if industry:
+        industry = industry.lower()
+        rows = [row for row in rows if str(row.get('industry', '')).lower() == industry]
+    if sort != 'rank' or descending:
+        text_sort = sort in ('name', 'ticker')
+        rows = sorted(
+            rows,
+            key=lambda row: str(row.get(sort) or '') if text_sort else (row.get(sort) or 0),
+            reverse=descending
+        )
+    return rows[offset:offset + limit] if limit else rows[offset:]
+
+
+def process_firm_stats(coordinator):
+    """Compute coordinator.firm_stats from this run's officials and firms."""
+    # Same order the firms table is read in, so ties in total rank the same way
+    firms = sorted(
+        coordinator.firms_data,
+        key=lambda f: (-len(f.get('officials', [])), f.get('ticker', ''))
+    )
+    coordinator.firm_stats = build_firm_stats(coordinator.officials_data, firms)
+    logger.info(f"Computed trade stats for {len(coordinator.firm_stats)} firms")
@@ -1,44 +1,29 @@
 """ElectWatch pipeline: convert raw involvement scores into 1-100 percentile-rank scores."""
 import logging
 
+from justdata.apps.electwatch.services.influence_scoring import percentile_rank_scores
+
 logger = logging.getLogger(__name__)
 
 
 def _normalize_scores_to_zscore(coordinator):
     """Convert raw involvement scores to percentile rank normalized to 1-100 range."""
-    raw_scores = [(i, o.get('involvement_score', 0) or 0) for i, o in enumerate(coordinator.officials_data)]
+    raw_scores = [o.get('involvement_score', 0) or 0 for o in coordinator.officials_data]
 
     if len(raw_scores) < 2:
         return
 
-    sorted_scores = sorted(raw_scores, key=lambda x: (x[1], coordinator.officials_data[x[0]].get('name', '')))
-    n = len(sorted_scores)
-
-    rank_lookup = {}
-    current_rank = 0
-    prev_score = None
-    prev_percentile = None
-
-    for rank, (idx, score) in enumerate(sorted_scores):
-        if score != prev_score:
-            if score == 0:
-                percentile = 1
-            else:
-                percentile = round(((rank + 1) / n) * 99 + 1)
-            prev_score = score
-            prev_percentile = percentile
-        else:
-            percentile = prev_percentile
-
-        rank_lookup[idx] = percentile
+    # Ties share the rank of the first of them; zero activity ranks 1
+    ranks = percentile_rank_scores(raw_scores)
+    n = len(raw_scores)
 
-    with_activity = sum(1 for i, s in raw_scores if s > 0)
+    with_activity = sum(1 for s in raw_scores if s > 0)
     without_activity = n - with_activity
     logger.info(f"Score normalization: {n} officials ({with_activity} with activity, {without_activity} without)")
 
     for i, official in enumerate(coordinator.officials_data):
         raw_score = official.get('involvement_score', 0)
-        percentile = rank_lookup.get(i, 50)
+        percentile = int(ranks[i])
 
         official['raw_score'] = raw_score
         official['involvement_score'] = percentile
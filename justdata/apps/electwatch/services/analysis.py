@@ -25,7 +25,9 @@ from justdata.shared.utils.progress_tracker import (
     create_progress_tracker,
     get_analysis_result,
     get_progress,
+    get_progress_version,
     store_analysis_result,
+    wait_for_progress,
 )
 
 # Import version
@@ -254,8 +256,8 @@ def api_analyze():
 def electwatch_progress_stream(job_id: str):
     """Progress tracking endpoint using Server-Sent Events."""
     def event_stream():
-        import time
         last_percent = -1
+        version = get_progress_version(job_id)
         while True:
             progress = get_progress(job_id)
             percent = progress.get("percent", 0)
@@ -270,7 +272,7 @@ def electwatch_progress_stream(job_id: str):
             if done or error:
                 break
 
-            time.sleep(0.5)
+            version = wait_for_progress(job_id, version)
 
     return Response(event_stream(), mimetype="text/event-stream")
 
@@ -513,6 +513,48 @@ class ElectWatchBQClient:
             return dict(rows[0])
         return None
     
+    def get_firm_stats(self, industry: Optional[str] = None, sort: str = 'rank',
+                       descending: bool = False, limit: Optional[int] = None,
+                       offset: int = 0) -> List[Dict]:
+        """
+        Get precomputed firm trade statistics, filtered, sorted and paged in BigQuery.
+
+        Args:
+            industry: Only firms in this sector code (case-insensitive)
+            sort: One of SORT_COLUMNS ('rank' = by total, largest first)
+            descending: Sort direction
+            limit: Maximum rows (None = all)
+            offset: Rows to skip (applies with limit)
+
+        Returns:
+            List of firm stat dicts (with the firm's quote and news)
+        """
+        from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firm_stats import SORT_COLUMNS
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unsupported firm stats sort: {sort}")
+
+        where = f"WHERE LOWER(s.industry) = LOWER('{escape_sql_string(industry)}')" if industry else ""
+        page = f"LIMIT {int(limit)} OFFSET {int(offset)}" if limit else ""
+        query = f"""
+        SELECT
+            s.name, s.ticker, s.industry, s.total, s.officials, s.stock_trades, s.rank,
+            s.news, f.quote
+        FROM {self._table_ref('firm_stats')} s
+        LEFT JOIN {self._table_ref('firms')} f ON f.ticker = s.ticker
+        {where}
+        ORDER BY s.{sort} {'DESC' if descending else 'ASC'}, s.rank ASC
+        {page}
+        """
+
+        rows = []
+        for row in self._execute_query(query):
+            row = dict(row)
+            if isinstance(row.get('news'), str):
+                row['news'] = json.loads(row['news'])
+            row['news'] = row.get('news') or []
+            rows.append(row)
+        return rows
+
     # =========================================================================
     # INDUSTRIES
     # =========================================================================
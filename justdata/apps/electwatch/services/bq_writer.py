@@ -16,7 +16,8 @@ Usage:
 
 import logging
 import hashlib
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 from google.cloud import bigquery
 
@@ -30,6 +31,9 @@ PROJECT_ID = ElectWatchConfig.GCP_PROJECT_ID
 DATASET_ID = 'electwatch'
 APP_NAME = 'ELECTWATCH'
 
+# Staging tables left behind by a crashed run expire on their own
+STAGING_TABLE_TTL = timedelta(hours=1)
+
 
 def _generate_id(*args) -> str:
     """Generate a deterministic ID from multiple values."""
@@ -48,8 +52,12 @@ class ElectWatchBQWriter:
     
     Each write method:
     1. Transforms data from the current JSON format to BigQuery schema
-    2. Deletes existing data (full refresh approach)
-    3. Inserts new data
+    2. Writes it with one load job - replacing the table (full refresh),
+       appending, or loading a staging table that is MERGEd into the target
+       (upsert)
+    
+    No streaming inserts are used, so written rows are never stuck in the
+    streaming buffer and a weekly run needs a handful of jobs.
     """
     
     def __init__(self):
@@ -71,20 +79,77 @@ class ElectWatchBQWriter:
         except Exception as e:
             logger.warning(f"Could not truncate {table_name}: {e}")
     
-    def _insert_rows(self, table_name: str, rows: List[Dict]) -> int:
-        """Insert rows into a table."""
+    def _create_staging_table(self, table_name: str, schema: List[bigquery.SchemaField]) -> str:
+        """
+        Create an empty, expiring staging table for a MERGE into table_name.
+        
+        Args:
+            table_name: Target table name
+            schema: Target table schema
+            
+        Returns:
+            Fully qualified staging table reference
+        """
+        staging_ref = self._table_ref(f"_staging_{table_name}_{uuid.uuid4().hex[:8]}")
+        table = bigquery.Table(staging_ref, schema=schema)
+        table.expires = datetime.now(timezone.utc) + STAGING_TABLE_TTL
+        self.client.create_table(table)
+        return staging_ref
+    
+    def _load_rows(self, destination: str, rows: List[Dict], schema: List[bigquery.SchemaField],
+                   write_disposition: str) -> int:
+        """
+        Write rows with a single load job (NDJSON from memory).
+        
+        Load jobs avoid the streaming buffer (rows are immediately visible to
+        DML and queries) and are not billed per row like streaming inserts.
+        
+        Args:
+            destination: Fully qualified destination table
+            rows: Row dicts
+            schema: Destination schema
+            write_disposition: bigquery.WriteDisposition value
+            
+        Returns:
+            Number of rows loaded
+        """
+        job_config = bigquery.LoadJobConfig(
+            schema=schema,
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition=write_disposition,
+            create_disposition=bigquery.CreateDisposition.CREATE_IF_NEEDED,
+        )
+        job = self.client.load_table_from_json(rows, destination, job_config=job_config)
+        job.result()
+        return len(rows)
+    
+    def _insert_rows(self, table_name: str, rows: List[Dict], replace: bool = False) -> int:
+        """
+        Insert rows into a table with a load job.
+        
+        Args:
+            table_name: Target table name
+            rows: Row dicts
+            replace: Replace the table contents (full refresh) instead of appending
+            
+        Returns:
+            Number of rows inserted
+        """
         if not rows:
+            if replace:
+                self._truncate_table(table_name)
             logger.info(f"No rows to insert into {table_name}")
             return 0
-            
-        table_ref = self.client.dataset(DATASET_ID).table(table_name)
-        errors = self.client.insert_rows_json(table_ref, rows)
         
-        if errors:
-            logger.error(f"Errors inserting into {table_name}: {errors[:5]}")
-            raise Exception(f"BigQuery insert errors: {errors[:5]}")
+        table = self.client.get_table(self._table_ref(table_name))
+        disposition = bigquery.WriteDisposition.WRITE_TRUNCATE if replace else bigquery.WriteDisposition.WRITE_APPEND
+        try:
+            self._load_rows(self._table_ref(table_name), rows, table.schema, disposition)
+        except Exception as e:
+            logger.error(f"Errors inserting into {table_name}: {e}")
+            raise Exception(f"BigQuery load errors: {e}") from e
         
-        logger.info(f"Inserted {len(rows)} rows into {table_name}")
+        logger.info(f"{'Replaced' if replace else 'Inserted'} {len(rows)} rows into {table_name}")
         return len(rows)
     
     def _merge_rows(self, table_name: str, rows: List[Dict], key_column: str = 'id') -> int:
@@ -92,7 +157,9 @@ class ElectWatchBQWriter:
         Merge rows into a table (upsert: insert if new, update if exists).
         
         This preserves existing data while adding new records - no data loss!
-        Uses delete-then-insert pattern: only deletes rows that will be replaced.
+        Rows are loaded into a temporary staging table with one load job, then
+        applied with a single MERGE, and the staging table is dropped (it also
+        expires after STAGING_TABLE_TTL if the run dies before the drop).
         
         Args:
             table_name: Target table name
@@ -106,42 +173,50 @@ class ElectWatchBQWriter:
             logger.info(f"No rows to merge into {table_name}")
             return 0
         
-        # Get all IDs we're about to insert
-        ids_to_upsert = [r.get(key_column) for r in rows if r.get(key_column)]
-        
-        if ids_to_upsert:
-            # Delete ONLY existing rows with these specific IDs (in batches)
-            # This preserves all other data in the table!
-            id_batch_size = 1000
-            deleted_count = 0
-            for j in range(0, len(ids_to_upsert), id_batch_size):
-                id_batch = ids_to_upsert[j:j + id_batch_size]
-                # Escape single quotes properly
-                escaped_ids = [f"'{str(id).replace(chr(39), chr(39)+chr(39))}'" for id in id_batch]
-                delete_query = f"""
-                DELETE FROM `{self._table_ref(table_name)}`
-                WHERE {key_column} IN ({', '.join(escaped_ids)})
-                """
-                try:
-                    job = self.client.query(delete_query)
-                    result = job.result()
-                    deleted_count += job.num_dml_affected_rows or 0
-                except Exception as e:
-                    logger.warning(f"Could not delete existing rows from {table_name}: {e}")
-            
-            if deleted_count > 0:
-                logger.info(f"Deleted {deleted_count} existing rows from {table_name} for upsert")
-        
-        # Now insert all rows
-        table_ref = self.client.dataset(DATASET_ID).table(table_name)
-        errors = self.client.insert_rows_json(table_ref, rows)
+        # MERGE rejects several source rows matching one target row; last one wins
+        keyed = {}
+        for row in rows:
+            if row.get(key_column):
+                keyed[row[key_column]] = row
+        if len(keyed) < len(rows):
+            logger.info(f"Merging {len(keyed)} of {len(rows)} rows into {table_name} (missing or repeated {key_column})")
+        rows = list(keyed.values())
+        if not rows:
+            return 0
         
-        if errors:
-            logger.error(f"Errors merging into {table_name}: {errors[:5]}")
+        staging_ref = None
+        try:
+            table = self.client.get_table(self._table_ref(table_name))
+            columns = [field.name for field in table.schema]
+            staging_ref = self._create_staging_table(table_name, table.schema)
+            self._load_rows(staging_ref, rows, table.schema, bigquery.WriteDisposition.WRITE_APPEND)
+            
+            update_columns = [c for c in columns if c != key_column]
+            merge_query = f"""
+            MERGE `{self._table_ref(table_name)}` T
+            USING `{staging_ref}` S
+            ON T.{key_column} = S.{key_column}
+            WHEN MATCHED THEN
+                UPDATE SET {', '.join(f'{c} = S.{c}' for c in update_columns)}
+            WHEN NOT MATCHED THEN
+                INSERT ({', '.join(columns)})
+                VALUES ({', '.join(f'S.{c}' for c in columns)})
+            """
+            job = self.client.query(merge_query)
+            job.result()
+            logger.info(f"Merged {len(rows)} rows into {table_name} "
+                        f"({job.num_dml_affected_rows or 0} affected, upsert - preserves existing data)")
+            return len(rows)
+        except Exception as e:
             # Don't raise - log and continue
-        
-        logger.info(f"Merged {len(rows)} rows into {table_name} (upsert - preserves existing data)")
-        return len(rows)
+            logger.error(f"Errors merging into {table_name}: {e}")
+            return 0
+        finally:
+            try:
+                if staging_ref:
+                    self.client.delete_table(staging_ref, not_found_ok=True)
+            except Exception as e:
+                logger.warning(f"Could not drop staging table {staging_ref}: {e}")
     
     # =========================================================================
     # OFFICIALS
@@ -317,8 +392,7 @@ class ElectWatchBQWriter:
                 rows.append(row)
         
         logger.info(f"Writing {len(rows)} trades to BigQuery")
-        self._truncate_table('official_trades')
-        return self._insert_rows('official_trades', rows)
+        return self._insert_rows('official_trades', rows, replace=True)
     
     def _transform_trade(self, bioguide_id: str, trade: Dict) -> Dict:
         """Transform trade dict to BigQuery row format."""
@@ -464,8 +538,7 @@ class ElectWatchBQWriter:
             row = self._transform_firm(firm)
             rows.append(row)
         
-        self._truncate_table('firms')
-        return self._insert_rows('firms', rows)
+        return self._insert_rows('firms', rows, replace=True)
     
     def _transform_firm(self, firm: Dict) -> Dict:
         """Transform firm dict to BigQuery row format."""
@@ -512,6 +585,37 @@ class ElectWatchBQWriter:
             'updated_at': _now()
         }
     
+    def write_firm_stats(self, firm_stats: List[Dict]) -> int:
+        """
+        Write precomputed firm trade statistics to BigQuery (full refresh).
+        
+        Args:
+            firm_stats: Rows from build_firm_stats (the quote is read from firms)
+            
+        Returns:
+            Number of rows inserted
+        """
+        logger.info(f"Writing {len(firm_stats)} firm stats to BigQuery")
+        
+        import json
+        updated_at = _now()
+        rows = [
+            {
+                'ticker': row.get('ticker', ''),
+                'name': row.get('name', ''),
+                'industry': row.get('industry', ''),
+                'total': float(row.get('total', 0) or 0),
+                'officials': int(row.get('officials', 0) or 0),
+                'stock_trades': int(row.get('stock_trades', 0) or 0),
+                'rank': int(row.get('rank', 0) or 0),
+                'news': json.dumps(row.get('news') or []),
+                'updated_at': updated_at
+            }
+            for row in firm_stats
+        ]
+        
+        return self._insert_rows('firm_stats', rows, replace=True)
+    
     # =========================================================================
     # INDUSTRIES
     # =========================================================================
@@ -533,8 +637,7 @@ class ElectWatchBQWriter:
             row = self._transform_industry(industry)
             rows.append(row)
         
-        self._truncate_table('industries')
-        return self._insert_rows('industries', rows)
+        return self._insert_rows('industries', rows, replace=True)
     
     def _transform_industry(self, industry: Dict) -> Dict:
         """Transform industry dict to BigQuery row format."""
@@ -593,8 +696,7 @@ class ElectWatchBQWriter:
                 'updated_at': _now()
             })
         
-        self._truncate_table('committees')
-        return self._insert_rows('committees', rows)
+        return self._insert_rows('committees', rows, replace=True)
     
     # =========================================================================
     # NEWS
@@ -626,8 +728,7 @@ class ElectWatchBQWriter:
                 'fetched_at': _now()
             })
         
-        self._truncate_table('news')
-        return self._insert_rows('news', rows)
+        return self._insert_rows('news', rows, replace=True)
     
     # =========================================================================
     # INSIGHTS
@@ -714,8 +815,7 @@ class ElectWatchBQWriter:
                 'generated_at': _now()
             })
         
-        self._truncate_table('insights')
-        return self._insert_rows('insights', rows)
+        return self._insert_rows('insights', rows, replace=True)
     
     # =========================================================================
     # SUMMARIES
@@ -742,8 +842,7 @@ class ElectWatchBQWriter:
             'generated_at': _now()
         }
         
-        self._truncate_table('summaries')
-        return self._insert_rows('summaries', [row])
+        return self._insert_rows('summaries', [row], replace=True)
     
     # =========================================================================
     # METADATA
@@ -808,8 +907,7 @@ class ElectWatchBQWriter:
             'warnings': metadata.get('warnings', [])
         }
         
-        self._truncate_table('metadata')
-        return self._insert_rows('metadata', [row])
+        return self._insert_rows('metadata', [row], replace=True)
     
     # =========================================================================
     # TREND SNAPSHOTS
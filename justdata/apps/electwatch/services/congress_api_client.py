@@ -15,6 +15,8 @@ from typing import Dict, List, Optional, Any
 from functools import lru_cache
 import logging
 
+from justdata.apps.electwatch.services.source_http import get_source_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,9 +70,6 @@ class CongressAPIClient:
             api_key: Congress.gov API key. If not provided, uses CONGRESS_API_KEY env var.
         """
         self.api_key = api_key or os.getenv('CONGRESS_GOV_API_KEY', '')
-        self.session = requests.Session()
-        if self.api_key:
-            self.session.params = {'api_key': self.api_key}
 
     
     def get_all_members(self, congress: str = '119') -> List[Dict]:
@@ -221,7 +220,7 @@ class CongressAPIClient:
             if self.api_key:
                 params['api_key'] = self.api_key
 
-            response = self.session.get(url, params=params, timeout=30)
+            response = get_source_client('congress').get(url, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
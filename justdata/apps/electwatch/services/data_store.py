@@ -18,6 +18,10 @@ Tables (justdata-ncrc.electwatch):
 
 Note: This module was migrated from JSON file storage to BigQuery.
 All the name normalization constants and helper functions are preserved.
+
+In the web app, reads are served from an in-memory snapshot of these tables
+(services/snapshot.py) that is published by the weekly pipeline and swapped
+when a new run lands; BigQuery is only queried when no snapshot is loaded.
 """
 
 import logging
@@ -343,12 +347,31 @@ def _get_bq_client():
     return get_client()
 
 
+def _get_snapshot():
+    """Current in-memory read snapshot, or None to query BigQuery."""
+    try:
+        from justdata.apps.electwatch.services import snapshot
+        return snapshot.current()
+    except Exception as e:
+        logger.warning(f"Snapshot unavailable, reading BigQuery: {e}")
+        return None
+
+
+def enable_read_snapshot():
+    """Serve reads in this process from the in-memory snapshot (web app startup)."""
+    from justdata.apps.electwatch.services import snapshot
+    return snapshot.enable(_get_bq_client, _normalize_official)
+
+
 # =============================================================================
 # DATA READING (for app endpoints)
 # =============================================================================
 
 def get_metadata() -> Dict[str, Any]:
     """Get metadata about the current data."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        return dict(snapshot.metadata)
     try:
         client = _get_bq_client()
         metadata = client.get_metadata()
@@ -370,6 +393,11 @@ def get_officials(include_trades: bool = False) -> List[Dict]:
         include_trades: If True, load trades for each official (slow for large datasets).
                        Default False for list views, set True for detail views.
     """
+    snapshot = _get_snapshot()
+    if snapshot:
+        # Already normalized, with trades; copies so callers can annotate freely
+        return [dict(official) for official in snapshot.officials]
+
     try:
         client = _get_bq_client()
         officials = client.get_officials()
@@ -402,6 +430,11 @@ def get_officials(include_trades: bool = False) -> List[Dict]:
 
 def get_official(official_id: str) -> Optional[Dict]:
     """Get a specific official by ID (bioguide_id is the primary identifier)."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        official = snapshot.official(official_id)
+        return dict(official) if official else None
+
     try:
         client = _get_bq_client()
         
@@ -508,6 +541,9 @@ def _normalize_official(official: Dict) -> Dict:
 
 def get_firms() -> List[Dict]:
     """Get all firms data."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        return [dict(firm) for firm in snapshot.firms]
     try:
         client = _get_bq_client()
         return client.get_firms()
@@ -518,6 +554,10 @@ def get_firms() -> List[Dict]:
 
 def get_firm(firm_name: str) -> Optional[Dict]:
     """Get a specific firm by name or ticker."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        firm = snapshot.firm(firm_name)
+        return dict(firm) if firm else None
     try:
         client = _get_bq_client()
         return client.get_firm(firm_name)
@@ -526,9 +566,10 @@ def get_firm(firm_name: str) -> Optional[Dict]:
         return None
 
 
-def get_firms_with_stats() -> List[Dict]:
+def get_firms_with_stats(industry: Optional[str] = None, sort: str = 'rank', descending: bool = False,
+                         limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
     """
-    Get all firms data with computed statistics from officials' trades.
+    Get firms with trade statistics precomputed by the weekly pipeline.
     
     Returns firms with the following fields expected by the frontend:
     - name: Company name
@@ -537,99 +578,46 @@ def get_firms_with_stats() -> List[Dict]:
     - total: Total trade value (using midpoint of ranges)
     - officials: Count of officials who traded this firm
     - stock_trades: Total number of stock trades for this firm
-    """
-    # Get raw firms data
-    raw_firms = get_firms()
-    
-    # Get officials data to aggregate trades by firm
-    officials = get_officials()
-    
-    # Build aggregated stats by ticker
-    firm_stats = {}
-    for official in officials:
-        trades = official.get('trades', [])
-        for trade in trades:
-            ticker = trade.get('ticker', '')
-            if not ticker:
-                continue
-            
-            if ticker not in firm_stats:
-                firm_stats[ticker] = {
-                    'trade_count': 0,
-                    'officials': set(),
-                    'total_value': 0,
-                    'company_name': trade.get('company', ''),
-                }
-            
-            firm_stats[ticker]['trade_count'] += 1
-            firm_stats[ticker]['officials'].add(official.get('name', ''))
-            
-            # Calculate trade value using midpoint of range
-            amount = trade.get('amount', {})
-            if isinstance(amount, dict):
-                min_val = amount.get('min', 0)
-                max_val = amount.get('max', 0)
-                midpoint = (min_val + max_val) / 2
-                firm_stats[ticker]['total_value'] += midpoint
-    
-    # Industry mapping (lowercase for consistent matching)
-    industry_map = {
-        'Banking': 'banking',
-        'Investment': 'investment',
-        'Insurance': 'insurance',
-        'Crypto': 'crypto',
-        'Fintech': 'fintech',
-        'Mortgage': 'mortgage',
-        'Consumer': 'consumer_lending',
-        'Consumer Lending': 'consumer_lending',
-    }
-    
-    # Merge raw firm data with aggregated stats
-    result = []
-    processed_tickers = set()
     
-    # First, process firms from firms table that have trade activity
-    for firm in raw_firms:
-        ticker = firm.get('ticker', '')
-        stats = firm_stats.get(ticker, {})
-        
-        industry = firm.get('industry', '')
-        industry_lower = industry_map.get(industry, industry.lower()) if industry else 'other'
-        
-        result.append({
-            'name': firm.get('name', ''),
-            'ticker': ticker,
-            'industry': industry_lower,
-            'total': stats.get('total_value', 0),
-            'officials': len(stats.get('officials', set())),
-            'stock_trades': stats.get('trade_count', 0),
-            'quote': firm.get('quote'),
-            'news': firm.get('news', [])[:3] if firm.get('news') else [],
-        })
-        processed_tickers.add(ticker)
-    
-    # Add any firms from trades that aren't in firms table
-    for ticker, stats in firm_stats.items():
-        if ticker not in processed_tickers:
-            result.append({
-                'name': stats.get('company_name', ticker),
-                'ticker': ticker,
-                'industry': 'other',
-                'total': stats.get('total_value', 0),
-                'officials': len(stats.get('officials', set())),
-                'stock_trades': stats.get('trade_count', 0),
-                'quote': None,
-                'news': [],
-            })
-    
-    # Sort by total trade value (descending)
-    result.sort(key=lambda x: x.get('total', 0), reverse=True)
+    Args:
+        industry: Only firms in this sector code
+        sort: 'rank' (total trade value, largest first), 'total', 'officials',
+              'stock_trades', 'name' or 'ticker'
+        descending: Sort direction
+        limit: Maximum number of firms (None = all)
+        offset: Firms to skip (with limit, for pagination)
     
-    return result
+    Raises:
+        ValueError: If sort is not supported
+    """
+    from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firm_stats import (
+        SORT_COLUMNS, build_firm_stats, query_firm_stats
+    )
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Unsupported firm stats sort: {sort}")
+
+    snapshot = _get_snapshot()
+    if snapshot:
+        return [dict(row) for row in snapshot.firm_stats_page(industry, sort, descending, limit, offset)]
+
+    try:
+        client = _get_bq_client()
+        rows = client.get_firm_stats(industry, sort, descending, limit, offset)
+        if rows or offset:
+            return rows
+    except Exception as e:
+        logger.warning(f"Error loading firm stats from BigQuery, computing from trades: {e}")
+
+    # firm_stats not populated yet: aggregate the officials' trades here
+    firm_stats = build_firm_stats(get_officials(), get_firms())
+    return query_firm_stats(firm_stats, industry, sort, descending, limit, offset)
 
 
 def get_industries() -> List[Dict]:
     """Get all industries data."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        return [dict(industry) for industry in snapshot.industries]
     try:
         client = _get_bq_client()
         return client.get_industries()
@@ -640,6 +628,10 @@ def get_industries() -> List[Dict]:
 
 def get_industry(sector: str) -> Optional[Dict]:
     """Get a specific industry sector."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        industry = snapshot.industry(sector)
+        return dict(industry) if industry else None
     try:
         client = _get_bq_client()
         return client.get_industry(sector)
@@ -650,6 +642,9 @@ def get_industry(sector: str) -> Optional[Dict]:
 
 def get_committees() -> List[Dict]:
     """Get all committees data."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        return [dict(committee) for committee in snapshot.committees]
     try:
         client = _get_bq_client()
         return client.get_committees()
@@ -660,6 +655,10 @@ def get_committees() -> List[Dict]:
 
 def get_committee(committee_id: str) -> Optional[Dict]:
     """Get a specific committee by ID."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        committee = snapshot.committee(committee_id)
+        return dict(committee) if committee else None
     try:
         client = _get_bq_client()
         return client.get_committee(committee_id)
@@ -670,6 +669,9 @@ def get_committee(committee_id: str) -> Optional[Dict]:
 
 def get_news() -> List[Dict]:
     """Get all news articles."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        return [dict(article) for article in snapshot.news]
     try:
         client = _get_bq_client()
         return client.get_news()
@@ -680,6 +682,9 @@ def get_news() -> List[Dict]:
 
 def get_summaries() -> Dict[str, str]:
     """Get AI-generated summaries."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        return dict(snapshot.summaries)
     try:
         client = _get_bq_client()
         return client.get_summaries()
@@ -690,6 +695,9 @@ def get_summaries() -> Dict[str, str]:
 
 def get_insights() -> List[Dict[str, Any]]:
     """Get AI-generated pattern insights from storage."""
+    snapshot = _get_snapshot()
+    if snapshot:
+        return [dict(insight) for insight in snapshot.insights]
     try:
         client = _get_bq_client()
         return client.get_insights()
@@ -796,6 +804,13 @@ def save_firms(firms: List[Dict], weekly_dir=None):
     logger.info(f"Saved {len(firms)} firms to BigQuery")
 
 
+def save_firm_stats(firm_stats: List[Dict], weekly_dir=None):
+    """Save precomputed firm trade statistics to BigQuery."""
+    writer = _get_bq_writer()
+    writer.write_firm_stats(firm_stats)
+    logger.info(f"Saved trade stats for {len(firm_stats)} firms to BigQuery")
+
+
 def save_industries(industries: List[Dict], weekly_dir=None):
     """Save industries data to BigQuery."""
     writer = _get_bq_writer()
@@ -838,6 +853,21 @@ def save_metadata(metadata: Dict[str, Any], weekly_dir=None):
     logger.info("Saved metadata to BigQuery")
 
 
+def publish_read_snapshot():
+    """
+    Publish the in-memory read snapshot for the run just saved.
+
+    Call after all tables and the metadata row are written; the snapshot
+    version is metadata.last_updated. Failures are logged - the app then
+    builds the snapshot from BigQuery on its next freshness check.
+    """
+    from justdata.apps.electwatch.services import snapshot
+    published = snapshot.publish(_get_bq_client, _normalize_official)
+    if published:
+        logger.info(f"Published read snapshot {published.version}")
+    return published
+
+
 # =============================================================================
 # TREND SNAPSHOTS - For historical trend tracking
 # =============================================================================
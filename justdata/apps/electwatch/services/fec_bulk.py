@@ -5,6 +5,10 @@ FEC Bulk Data Processor for ElectWatch
 Downloads and processes FEC bulk data files instead of hitting the API.
 This avoids rate limits and processes data much faster.
 
+Archives are downloaded with parallel, resumable range requests (skipped
+when the server copy is unchanged) and read in place from the zip, so the
+extracted text files never touch disk.
+
 Bulk files used:
 - pas224.txt: PAC/Committee contributions to candidates (2023-2024)
 - indiv24.txt: Individual contributions (2023-2024)
@@ -24,12 +28,15 @@ import io
 import json
 import logging
 import os
-import zipfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
-import requests
+
+from justdata.apps.electwatch.services.fec_bulk_reader import aggregate_individual_chunk, open_text, scan_file
+from justdata.apps.electwatch.services.keyword_matcher import KeywordMatcher
+from justdata.shared.utils.range_download import RangeDownloader
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +68,60 @@ BULK_FILES = {
     'cn': f"{FEC_BULK_BASE}/cn24.zip",
 }
 
+# Data file inside each bulk archive
+BULK_MEMBERS = {
+    'pas2': 'itpas2.txt',
+    'indiv': 'itcont.txt',
+    'cm': 'cm.txt',
+    'cn': 'cn.txt',
+}
+
+# Download settings: parallel range requests per archive, range size, and
+# archives downloaded at once
+DOWNLOAD_PARTS = int(os.getenv('FEC_DOWNLOAD_PARTS', '4'))
+DOWNLOAD_PART_BYTES = int(float(os.getenv('FEC_DOWNLOAD_PART_MB', '32')) * 1024 * 1024)
+DOWNLOAD_FILES_AT_ONCE = int(os.getenv('FEC_DOWNLOAD_FILES', '4'))
+
+
+def download_archives(targets: Dict[str, Tuple[str, Path]], force: bool = False,
+                      strict: bool = False) -> Dict[str, Path]:
+    """
+    Download FEC bulk archives concurrently with resumable range requests.
+
+    An archive whose size and validators still match the server is not
+    downloaded again; an interrupted download resumes.
+
+    Args:
+        targets: Dict mapping a label (e.g. '2024/indiv') -> (url, local zip path)
+        force: Re-download archives that are already current
+        strict: Raise the first failure instead of logging it and moving on
+
+    Returns:
+        Dict mapping label -> local zip path, for the archives now present
+    """
+    if not targets:
+        return {}
+    downloader = RangeDownloader(parts=DOWNLOAD_PARTS, part_bytes=DOWNLOAD_PART_BYTES)
+
+    def fetch(item):
+        label, (url, path) = item
+        logger.info(f"  {label}: Downloading from {url}...")
+        try:
+            return label, downloader.download(url, path, force=force)['path'], None
+        except Exception as e:
+            logger.error(f"  {label}: Download failed: {e}")
+            return label, None, e
+
+    downloaded = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(DOWNLOAD_FILES_AT_ONCE, len(targets))),
+                            thread_name_prefix='fec-download') as pool:
+        for label, path, error in pool.map(fetch, targets.items()):
+            if error is not None and strict:
+                raise error
+            if path is not None:
+                downloaded[label] = path
+    return downloaded
+
 # Column indices for cn file (candidate master)
 CN_COLS = {
     'cand_id': 0,
@@ -230,6 +291,10 @@ class FECBulkProcessor:
             'RIVER BANK', 'WEST BANK', 'BANK SHOT',
         }
 
+        # Compiled once per processor; is_financial_entity runs for every PAC/employer
+        self._financial_matcher = KeywordMatcher(sorted(self.financial_keywords))
+        self._exclude_matcher = KeywordMatcher(sorted(self.exclude_keywords))
+
     def is_financial_entity(self, name: str) -> bool:
         """Check if an entity name indicates financial sector."""
         if not name:
@@ -237,21 +302,17 @@ class FECBulkProcessor:
 
         name_upper = name.upper()
 
-        # Check exclusions first
-        for exclude in self.exclude_keywords:
-            if exclude in name_upper:
-                return False
-
-        # Check for financial keywords
-        for keyword in self.financial_keywords:
-            if keyword in name_upper:
-                return True
-
-        return False
+        # Check exclusions first, then financial keywords
+        if self._exclude_matcher.contains_any(name_upper):
+            return False
+        return self._financial_matcher.contains_any(name_upper)
 
     def download_bulk_files(self, force: bool = False) -> Dict[str, Path]:
         """
-        Download FEC bulk data files.
+        Download FEC bulk data files (legacy 2024 layout in data_dir).
+
+        Archives are kept as downloaded (data_dir/{file_type}.zip) and read
+        in place; previously extracted .txt files are still used.
 
         Args:
             force: If True, re-download even if files exist
@@ -260,9 +321,9 @@ class FECBulkProcessor:
             Dict mapping file type to local path
         """
         downloaded = {}
+        targets = {}
 
         for file_type, url in BULK_FILES.items():
-            zip_path = self.data_dir / f"{file_type}.zip"
             txt_path = self.data_dir / f"{file_type}.txt"
 
             # Skip if already extracted and not forcing
@@ -270,68 +331,20 @@ class FECBulkProcessor:
                 logger.info(f"  {file_type}: Using existing {txt_path.name}")
                 downloaded[file_type] = txt_path
                 continue
+            targets[file_type] = (url, self.data_dir / f"{file_type}.zip")
 
-            # Download zip file
-            logger.info(f"  {file_type}: Downloading from {url}...")
-            try:
-                response = requests.get(url, stream=True, timeout=300)
-                response.raise_for_status()
-
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded_size = 0
-
-                with open(zip_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        if total_size > 0:
-                            pct = downloaded_size / total_size * 100
-                            if downloaded_size % (10 * 1024 * 1024) < 8192:  # Log every 10MB
-                                logger.info(f"    Progress: {pct:.1f}%")
-
-                logger.info(f"  {file_type}: Downloaded {downloaded_size / 1024 / 1024:.1f}MB")
-
-                # Extract
-                logger.info(f"  {file_type}: Extracting...")
-                with zipfile.ZipFile(zip_path, 'r') as zf:
-                    # Find the .txt file in the archive
-                    txt_files = [n for n in zf.namelist() if n.endswith('.txt')]
-                    if txt_files:
-                        # Extract and rename
-                        zf.extract(txt_files[0], self.data_dir)
-                        extracted = self.data_dir / txt_files[0]
-                        if extracted != txt_path:
-                            extracted.rename(txt_path)
-
-                # Clean up zip
-                zip_path.unlink()
-
-                downloaded[file_type] = txt_path
-                logger.info(f"  {file_type}: Ready at {txt_path}")
-
-            except Exception as e:
-                logger.error(f"  {file_type}: Download failed: {e}")
-                raise
-
+        downloaded.update(download_archives(targets, force=force, strict=True))
         return downloaded
 
-    def download_cycle_files(self, cycle: str, force: bool = False) -> Dict[str, Path]:
-        """
-        Download FEC bulk data files for a specific election cycle.
-
-        Args:
-            cycle: Election cycle year (e.g., "2024" or "2026")
-            force: If True, re-download even if files exist
-
-        Returns:
-            Dict mapping file type to local path
-        """
+    def _cycle_targets(self, cycle: str, force: bool) -> Tuple[Dict[str, Path], Dict[str, Tuple[str, Path]]]:
+        """Split a cycle's files into (already extracted, archives to download)."""
         if cycle not in FEC_BULK_CYCLES:
             raise ValueError(f"Unknown cycle {cycle}. Available: {list(FEC_BULK_CYCLES.keys())}")
 
         cycle_info = FEC_BULK_CYCLES[cycle]
         base_url = cycle_info['base']
-        downloaded = {}
+        existing = {}
+        targets = {}
 
         # Create cycle-specific subdirectory
         cycle_dir = self.data_dir / cycle
@@ -342,115 +355,86 @@ class FECBulkProcessor:
             if not filename:
                 continue
 
-            url = f"{base_url}/{filename}"
-            zip_path = cycle_dir / filename
             txt_path = cycle_dir / f"{file_type}.txt"
 
             # Skip if already extracted and not forcing
             if txt_path.exists() and not force:
                 logger.info(f"  {cycle}/{file_type}: Using existing {txt_path.name}")
-                downloaded[file_type] = txt_path
+                existing[file_type] = txt_path
                 continue
+            targets[file_type] = (f"{base_url}/{filename}", cycle_dir / filename)
 
-            # Download zip file
-            logger.info(f"  {cycle}/{file_type}: Downloading from {url}...")
-            try:
-                response = requests.get(url, stream=True, timeout=300)
-                response.raise_for_status()
-
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded_size = 0
-
-                with open(zip_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        if total_size > 0:
-                            pct = downloaded_size / total_size * 100
-                            if downloaded_size % (10 * 1024 * 1024) < 8192:
-                                logger.info(f"    Progress: {pct:.1f}%")
-
-                logger.info(f"  {cycle}/{file_type}: Downloaded {downloaded_size / 1024 / 1024:.1f}MB")
-
-                # Extract
-                logger.info(f"  {cycle}/{file_type}: Extracting...")
-                with zipfile.ZipFile(zip_path, 'r') as zf:
-                    txt_files = [n for n in zf.namelist() if n.endswith('.txt')]
-                    if txt_files:
-                        zf.extract(txt_files[0], cycle_dir)
-                        extracted = cycle_dir / txt_files[0]
-                        if extracted != txt_path:
-                            extracted.rename(txt_path)
-
-                # Clean up zip
-                zip_path.unlink()
+        return existing, targets
 
-                downloaded[file_type] = txt_path
-                logger.info(f"  {cycle}/{file_type}: Ready at {txt_path}")
+    def download_cycle_files(self, cycle: str, force: bool = False) -> Dict[str, Path]:
+        """
+        Download FEC bulk data files for a specific election cycle.
 
-            except Exception as e:
-                logger.error(f"  {cycle}/{file_type}: Download failed: {e}")
-                # Don't raise - continue with other files/cycles
-                continue
+        Archives are kept as downloaded (e.g. 2024/indiv24.zip) and read in
+        place; a download that fails is logged and left out.
 
-        return downloaded
+        Args:
+            cycle: Election cycle year (e.g., "2024" or "2026")
+            force: If True, re-download even if files exist
+
+        Returns:
+            Dict mapping file type to local path
+        """
+        downloaded, targets = self._cycle_targets(cycle, force)
+        downloaded.update(download_archives(
+            {f"{cycle}/{file_type}": target for file_type, target in targets.items()}, force=force
+        ))
+        return {key.split('/')[-1]: path for key, path in downloaded.items()}
 
     def download_all_cycles(self, force: bool = False) -> Dict[str, Dict[str, Path]]:
         """
         Download FEC bulk data files for all configured cycles (2024 + 2026).
 
+        All archives download concurrently.
+
         Returns:
             Dict mapping cycle to file paths
         """
         all_downloaded = {}
+        targets = {}
         for cycle in FEC_BULK_CYCLES.keys():
-            logger.info(f"Downloading FEC bulk files for cycle {cycle}...")
-            all_downloaded[cycle] = self.download_cycle_files(cycle, force)
+            all_downloaded[cycle], cycle_targets = self._cycle_targets(cycle, force)
+            targets.update({f"{cycle}/{file_type}": target for file_type, target in cycle_targets.items()})
+
+        logger.info(f"Downloading {len(targets)} FEC bulk archive(s) for cycles {list(FEC_BULK_CYCLES.keys())}...")
+        for key, path in download_archives(targets, force=force).items():
+            cycle, file_type = key.split('/')
+            all_downloaded[cycle][file_type] = path
         return all_downloaded
 
-    def get_pas2_files(self) -> List[Path]:
-        """Get all available PAC contribution files from all cycles."""
+    def _bulk_files(self, file_type: str) -> List[Path]:
+        """Available files of one type: extracted .txt, else the cycle's archive."""
         files = []
         # Check both legacy location and cycle-specific directories
-        legacy_path = self.data_dir / 'pas2.txt'
-        if legacy_path.exists():
-            files.append(legacy_path)
+        for legacy_path in (self.data_dir / f"{file_type}.txt", self.data_dir / f"{file_type}.zip"):
+            if legacy_path.exists():
+                files.append(legacy_path)
+                break
 
-        for cycle in FEC_BULK_CYCLES.keys():
-            cycle_path = self.data_dir / cycle / 'pas2.txt'
-            if cycle_path.exists():
-                files.append(cycle_path)
+        for cycle, cycle_info in FEC_BULK_CYCLES.items():
+            for cycle_path in (self.data_dir / cycle / f"{file_type}.txt", self.data_dir / cycle / cycle_info[file_type]):
+                if cycle_path.exists():
+                    files.append(cycle_path)
+                    break
 
         return files
 
+    def get_pas2_files(self) -> List[Path]:
+        """Get all available PAC contribution files from all cycles."""
+        return self._bulk_files('pas2')
+
     def get_indiv_files(self) -> List[Path]:
         """Get all available individual contribution files from all cycles."""
-        files = []
-        # Check both legacy location and cycle-specific directories
-        legacy_path = self.data_dir / 'indiv.txt'
-        if legacy_path.exists():
-            files.append(legacy_path)
-
-        for cycle in FEC_BULK_CYCLES.keys():
-            cycle_path = self.data_dir / cycle / 'indiv.txt'
-            if cycle_path.exists():
-                files.append(cycle_path)
-
-        return files
+        return self._bulk_files('indiv')
 
     def get_cm_files(self) -> List[Path]:
         """Get all available committee master files from all cycles."""
-        files = []
-        legacy_path = self.data_dir / 'cm.txt'
-        if legacy_path.exists():
-            files.append(legacy_path)
-
-        for cycle in FEC_BULK_CYCLES.keys():
-            cycle_path = self.data_dir / cycle / 'cm.txt'
-            if cycle_path.exists():
-                files.append(cycle_path)
-
-        return files
+        return self._bulk_files('cm')
 
     def load_committee_master(self) -> Dict[str, Dict]:
         """
@@ -479,7 +463,7 @@ class FECBulkProcessor:
 
         for cm_path in cm_files:
             logger.info(f"  Loading {cm_path}...")
-            with open(cm_path, 'r', encoding='latin-1') as f:
+            with open_text(cm_path, BULK_MEMBERS['cm']) as f:
                 reader = csv.reader(f, delimiter='|')
                 for row in reader:
                     if len(row) < 15:  # Need at least 15 columns for cand_id at index 14
@@ -624,9 +608,11 @@ class FECBulkProcessor:
             Number of officials matched
         """
         cn_path = self.data_dir / 'cn.txt'
+        if not cn_path.exists():
+            cn_path = self.data_dir / 'cn.zip'
         if not cn_path.exists():
             logger.info("Candidate master file not found, downloading...")
-            self.download_bulk_files()
+            cn_path = self.download_bulk_files()['cn']
 
         # State name to abbreviation mapping
         state_abbrevs = {
@@ -653,7 +639,7 @@ class FECBulkProcessor:
         # Group by state and office for faster matching
         candidates_by_state_office = defaultdict(list)
 
-        with open(cn_path, 'r', encoding='latin-1') as f:
+        with open_text(cn_path, BULK_MEMBERS['cn']) as f:
             reader = csv.reader(f, delimiter='|')
             for row in reader:
                 if len(row) < 10:
@@ -816,7 +802,7 @@ class FECBulkProcessor:
             logger.info(f"  Processing {pas2_path}...")
             file_row_count = 0
 
-            with open(pas2_path, 'r', encoding='latin-1') as f:
+            with open_text(pas2_path, BULK_MEMBERS['pas2']) as f:
                 reader = csv.reader(f, delimiter='|')
                 for row in reader:
                     row_count += 1
@@ -1001,9 +987,6 @@ class FECBulkProcessor:
         logger.info(f"Processing individual contributions for {len(candidate_ids)} candidates...")
         logger.info(f"Found {len(committee_to_candidate)} committees linked to our candidates")
 
-        # Parse min_date
-        min_date_parsed = datetime.strptime(min_date, "%Y-%m-%d")
-
         # Load firm matcher for employer->firm matching (uses PAC connected orgs)
         from justdata.apps.electwatch.services.firm_matcher import FirmMatcher
         firm_matcher = FirmMatcher()
@@ -1022,79 +1005,49 @@ class FECBulkProcessor:
 
         row_count = 0
         matched_count = 0
+        employer_matches: Dict[Tuple[str, str], Optional[Dict]] = {}
 
-        # Process all available individual contribution files (from all cycles)
+        # Process all available individual contribution files (from all cycles).
+        # Chunks are parsed and filtered on committee id in worker processes and
+        # come back aggregated by (candidate, employer, occupation), so firm
+        # matching runs once per distinct employer/occupation pair.
+        context = {'committee_to_candidate': committee_to_candidate, 'min_date': min_date}
         for indiv_path in indiv_files:
             logger.info(f"  Processing {indiv_path}...")
             file_row_count = 0
 
-            with open(indiv_path, 'r', encoding='latin-1') as f:
-                reader = csv.reader(f, delimiter='|')
-                for row in reader:
-                    row_count += 1
-                    file_row_count += 1
-                    if file_row_count % 1000000 == 0:
-                        logger.info(f"    Processed {file_row_count:,} rows, {matched_count:,} matched...")
-
-                    if len(row) < 16:
-                        continue
-
-                    cmte_id = row[INDIV_COLS['cmte_id']]
-                    cand_id = committee_to_candidate.get(cmte_id)
-                    if not cand_id:
-                        continue
-
-                    # Parse date
-                    date_str = row[INDIV_COLS['transaction_dt']]
-                    if date_str and len(date_str) == 8:
-                        try:
-                            trans_date = datetime.strptime(date_str, "%m%d%Y")
-                            if trans_date < min_date_parsed:
-                                continue
-                        except:
-                            pass
-
-                    # Parse amount
-                    try:
-                        amount = float(row[INDIV_COLS['transaction_amt']])
-                    except:
-                        continue
-
-                    if amount <= 0:
-                        continue
-
-                    matched_count += 1
-                    employer = row[INDIV_COLS['employer']] or ''
-                    occupation = row[INDIV_COLS['occupation']] or ''
-
-                    # Match employer against known financial firms (from PAC data)
-                    match = firm_matcher.match_employer(employer)
-                    is_financial = match is not None
-                    sector = match.get('sector') if match else None
-                    subsector = match.get('subsector') if match else None
-                    matched_firm = match.get('matched_firm') if match else None
-
-                    # If employer didn't match, try occupation (some list job title as employer)
-                    if not is_financial and occupation:
-                        occ_match = firm_matcher.match_employer(occupation)
-                        if occ_match:
-                            is_financial = True
-                            sector = occ_match.get('sector')
-                            subsector = occ_match.get('subsector')
-                            matched_firm = occ_match.get('matched_firm')
+            for chunk_rows, chunk in scan_file(indiv_path, aggregate_individual_chunk, context,
+                                               member=BULK_MEMBERS['indiv']):
+                row_count += chunk_rows
+                file_row_count += chunk_rows
+                matched_count += int(chunk['count'].sum()) if not chunk.empty else 0
+
+                for cand_id, employer, occupation, amount, count in chunk.itertuples(index=False, name=None):
+                    amount, count = float(amount), int(count)
+                    key = (employer, occupation)
+                    if key not in employer_matches:
+                        # Match employer against known financial firms (from PAC data);
+                        # if it didn't match, try occupation (some list job title as employer)
+                        match = firm_matcher.match_employer(employer)
+                        if match is None and occupation:
+                            match = firm_matcher.match_employer(occupation)
+                        employer_matches[key] = match
+                    match = employer_matches[key]
 
                     # Update totals
                     contributions[cand_id]['total_individual'] += amount
-                    contributions[cand_id]['total_individual_count'] += 1
+                    contributions[cand_id]['total_individual_count'] += count
 
-                    if is_financial:
+                    if match is not None:
+                        sector = match.get('sector')
+                        subsector = match.get('subsector')
                         contributions[cand_id]['financial_individual'] += amount
-                        contributions[cand_id]['financial_individual_count'] += 1
+                        contributions[cand_id]['financial_individual_count'] += count
                         contributions[cand_id]['financial_employers'][employer]['amount'] += amount
-                        contributions[cand_id]['financial_employers'][employer]['count'] += 1
+                        contributions[cand_id]['financial_employers'][employer]['count'] += count
                         contributions[cand_id]['financial_employers'][employer]['sector'] = sector
                         contributions[cand_id]['financial_employers'][employer]['subsector'] = subsector
-                        contributions[cand_id]['financial_employers'][employer]['matched_firm'] = matched_firm
+                        contributions[cand_id]['financial_employers'][employer]['matched_firm'] = match.get('matched_firm')
 
                         # Track by sector and subsector
                         if sector:
@@ -1102,6 +1055,8 @@ class FECBulkProcessor:
                         if subsector:
                             contributions[cand_id]['by_subsector'][f"{sector}/{subsector}"] += amount
 
+                logger.info(f"    Processed {file_row_count:,} rows, {matched_count:,} matched...")
+
             logger.info(f"    File complete: {file_row_count:,} rows processed")
 
         logger.info(f"Processed {row_count:,} total rows, {matched_count:,} matched to our candidates")
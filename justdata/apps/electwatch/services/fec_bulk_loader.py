@@ -9,26 +9,49 @@ Bulk files:
 - pas2.txt/itpas2.txt - PAC to Candidate contributions
 - itcont.txt - Individual contributions
 
+Loads are incremental: each contribution file's fingerprint and highest
+sub_id are kept in the pipeline state (services/pipeline_state.py). An
+unchanged file is skipped, a grown file only contributes rows past its
+sub_id watermark (MERGEd by id), and aggregates are recomputed for the
+officials those rows belong to. The table is rebuilt from every file on
+the first load, when a file shrinks, when the set of Congress members or
+their committees changes (cn/cm files, crosswalk), or with --full.
+
+The downloaded archives (cm24.zip, pas224.zip, indiv24.zip, ...) are read
+in place, so the multi-GB text files never need to be extracted to disk;
+extracted files are still used when present.
+
 Usage:
     python -m justdata.apps.electwatch.services.fec_bulk_loader \
-        --data-dir /path/to/unzipped/files \
-        --cycles 2024 2026
+        --downloads-dir /path/to/fec/zips [--download] \
+        --cycles 2024 2026 [--full]
 """
 
 import argparse
 import csv
 import hashlib
+import json
 import logging
 import os
 import re
+import tempfile
+import uuid
 import zipfile
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+import pandas as pd
 from google.cloud import bigquery
 
+from justdata.apps.electwatch.services.bq_writer import STAGING_TABLE_TTL
+from justdata.apps.electwatch.services.fec_bulk_reader import (
+    INDIV_COLUMNS, filter_individual_chunk, open_text, scan_file
+)
+from justdata.apps.electwatch.services.keyword_matcher import KeywordMatcher
+from justdata.apps.electwatch.services.pipeline_state import PipelineState, content_hash, file_fingerprint
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -58,12 +81,18 @@ PAS2_COLUMNS = [
     'other_id', 'cand_id', 'tran_id', 'file_num', 'memo_cd', 'memo_text', 'sub_id'
 ]
 
-# Individual Contributions (itcont.txt)
-ITCONT_COLUMNS = [
-    'cmte_id', 'amndt_ind', 'rpt_tp', 'transaction_pgi', 'image_num',
-    'transaction_tp', 'entity_tp', 'name', 'city', 'state', 'zip_code',
-    'employer', 'occupation', 'transaction_dt', 'transaction_amt',
-    'other_id', 'cand_id', 'tran_id', 'file_num', 'memo_cd', 'memo_text', 'sub_id'
+# Individual Contributions (itcont.txt) - unlike pas2 there is no cand_id column
+ITCONT_COLUMNS = INDIV_COLUMNS
+
+# BigQuery columns written for each contribution table
+PAC_TABLE_FIELDS = [
+    'id', 'bioguide_id', 'committee_id', 'committee_name', 'amount',
+    'contribution_date', 'sector', 'sub_sector', 'is_financial', 'updated_at'
+]
+INDIV_TABLE_FIELDS = [
+    'id', 'bioguide_id', 'contributor_name', 'employer', 'occupation', 'city',
+    'state', 'amount', 'contribution_date', 'sector', 'is_financial',
+    'match_reason', 'updated_at'
 ]
 
 # =============================================================================
@@ -104,6 +133,11 @@ FINANCIAL_OCCUPATIONS = [
 ]
 
 
+# Compiled once; see keyword_matcher for the matching semantics
+_KEYWORD_MATCHER = KeywordMatcher(FINANCIAL_KEYWORDS)
+_OCCUPATION_MATCHER = KeywordMatcher(FINANCIAL_OCCUPATIONS)
+
+
 def is_financial_sector(name: str, employer: str = '', occupation: str = '') -> Tuple[bool, str]:
     """
     Determine if a contributor/PAC is in the financial sector.
@@ -111,34 +145,55 @@ def is_financial_sector(name: str, employer: str = '', occupation: str = '') ->
     Returns:
         Tuple of (is_financial, match_reason)
     """
-    name_lower = (name or '').lower()
-    employer_lower = (employer or '').lower()
-    occupation_lower = (occupation or '').lower()
+    # Check PAC/committee name, then employer, then occupation
+    keyword = _KEYWORD_MATCHER.first((name or '').lower())
+    if keyword:
+        return True, f'name:{keyword}'
     
-    # Check PAC/committee name
-    for keyword in FINANCIAL_KEYWORDS:
-        if keyword in name_lower:
-            return True, f'name:{keyword}'
+    keyword = _KEYWORD_MATCHER.first((employer or '').lower())
+    if keyword:
+        return True, f'employer:{keyword}'
     
-    # Check employer
-    for keyword in FINANCIAL_KEYWORDS:
-        if keyword in employer_lower:
-            return True, f'employer:{keyword}'
-    
-    # Check occupation
-    for keyword in FINANCIAL_OCCUPATIONS:
-        if keyword in occupation_lower:
-            return True, f'occupation:{keyword}'
+    keyword = _OCCUPATION_MATCHER.first((occupation or '').lower())
+    if keyword:
+        return True, f'occupation:{keyword}'
     
     return False, ''
 
 
+def classify_financial_sector(names: pd.Series, employers: pd.Series, occupations: pd.Series) -> pd.DataFrame:
+    """
+    Batch version of is_financial_sector over aligned columns.
+    
+    Returns:
+        DataFrame (same index as names) with 'is_financial' and 'match_reason'
+    """
+    reason = pd.Series('', index=names.index, dtype=object)
+    for prefix, values, matcher in (
+        ('occupation', occupations, _OCCUPATION_MATCHER),
+        ('employer', employers, _KEYWORD_MATCHER),
+        ('name', names, _KEYWORD_MATCHER),
+    ):
+        # Applied lowest priority first so name matches win, as in is_financial_sector
+        keywords = matcher.first_many(values.fillna('').astype(str).str.lower())
+        reason = reason.mask(keywords.notna(), prefix + ':' + keywords.fillna(''))
+    return pd.DataFrame({'is_financial': reason != '', 'match_reason': reason})
+
+
 def _generate_id(*parts) -> str:
     """Generate a deterministic ID from parts."""
     combined = '|'.join(str(p) for p in parts if p)
     return hashlib.md5(combined.encode()).hexdigest()[:16]
 
 
+def _parse_sub_id(value: str) -> int:
+    """FEC sub_id as an integer (0 if missing or malformed)."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+
 def _parse_fec_date(date_str: str) -> Optional[str]:
     """Parse FEC date format (MMDDYYYY) to ISO format."""
     if not date_str or len(date_str) != 8:
@@ -178,6 +233,9 @@ class FECBulkLoader:
         self.congress_fec_ids: Set[str] = set()  # All FEC IDs for Congress members
         self.congress_committee_ids: Set[str] = set()  # Principal campaign committees
         
+        # Highest sub_id seen per processed file (incremental watermark)
+        self.max_sub_ids: Dict[str, int] = {}
+        
         # Statistics
         self.stats = {
             'committees_loaded': 0,
@@ -220,7 +278,7 @@ class FECBulkLoader:
         logger.info(f"Loading committee master from {file_path}...")
         
         count = 0
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        with open_text(file_path, 'cm.txt', encoding='utf-8', errors='replace') as f:
             for line in f:
                 parts = line.strip().split('|')
                 if len(parts) >= len(CM_COLUMNS):
@@ -246,7 +304,7 @@ class FECBulkLoader:
         count = 0
         congress_count = 0
         
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        with open_text(file_path, 'cn.txt', encoding='utf-8', errors='replace') as f:
             for line in f:
                 parts = line.strip().split('|')
                 if len(parts) >= 10:  # At least through cand_pcc
@@ -282,20 +340,30 @@ class FECBulkLoader:
         self,
         file_path: str,
         batch_size: int = 10000,
+        min_sub_id: int = 0,
     ) -> List[Dict]:
         """
         Process PAC to candidate contributions (pas2.txt/itpas2.txt).
         
         Only includes contributions to current Congress members.
+        
+        Args:
+            file_path: pas2 file
+            batch_size: Unused, kept for callers
+            min_sub_id: Only rows with a larger sub_id are kept (incremental
+                loads); the file's highest sub_id is recorded in max_sub_ids
         """
         logger.info(f"Processing PAC contributions from {file_path}...")
+        if min_sub_id:
+            logger.info(f"  Only rows after sub_id {min_sub_id}")
         
         contributions = []
         total_rows = 0
         congress_rows = 0
         financial_rows = 0
+        max_sub_id = min_sub_id
         
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        with open_text(file_path, 'itpas2.txt', encoding='utf-8', errors='replace') as f:
             for line in f:
                 total_rows += 1
                 parts = line.strip().split('|')
@@ -304,6 +372,12 @@ class FECBulkLoader:
                     continue
                 
                 row = dict(zip(PAS2_COLUMNS, parts[:len(PAS2_COLUMNS)]))
+                sub_id = _parse_sub_id(row.get('sub_id'))
+                if sub_id > max_sub_id:
+                    max_sub_id = sub_id
+                if min_sub_id and sub_id <= min_sub_id:
+                    continue
+                
                 cand_id = row.get('cand_id', '')
                 
                 # Skip if not a Congress member
@@ -365,6 +439,7 @@ class FECBulkLoader:
         self.stats['pac_contributions_total'] = total_rows
         self.stats['pac_contributions_congress'] = congress_rows
         self.stats['pac_contributions_financial'] = financial_rows
+        self.max_sub_ids[file_path] = max_sub_id
         
         logger.info(f"PAC contributions: {total_rows:,} total, {congress_rows:,} to Congress, {financial_rows:,} financial sector")
         return contributions
@@ -373,38 +448,46 @@ class FECBulkLoader:
         self,
         file_path: str,
         financial_only: bool = True,
+        min_sub_id: int = 0,
     ) -> List[Dict]:
         """
         Process individual contributions (itcont.txt).
         
         Only includes contributions to current Congress member committees,
         optionally filtered to financial sector contributors only.
+        
+        Args:
+            file_path: itcont file
+            financial_only: Keep financial sector contributors only
+            min_sub_id: Only rows with a larger sub_id are kept (incremental
+                loads); the highest Congress-committee sub_id is recorded in
+                max_sub_ids
         """
         logger.info(f"Processing individual contributions from {file_path}...")
         logger.info(f"  Financial sector filter: {financial_only}")
         logger.info(f"  Congress committees to match: {len(self.congress_committee_ids)}")
+        if min_sub_id:
+            logger.info(f"  Only rows after sub_id {min_sub_id}")
         
         contributions = []
         total_rows = 0
         congress_rows = 0
         financial_rows = 0
-        
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            for line in f:
-                total_rows += 1
-                parts = line.strip().split('|')
-                
-                if len(parts) < 15:
-                    continue
-                
-                row = dict(zip(ITCONT_COLUMNS, parts[:len(ITCONT_COLUMNS)]))
-                cmte_id = row.get('cmte_id', '')
-                
-                # Skip if not a Congress member's committee
-                if cmte_id not in self.congress_committee_ids:
-                    continue
-                
-                congress_rows += 1
+        max_sub_id = min_sub_id
+        
+        # Chunks are parsed and filtered to Congress committees (and past the
+        # watermark) in worker processes; only those rows are classified and
+        # turned into records here
+        context = {'committee_ids': self.congress_committee_ids, 'min_sub_id': min_sub_id}
+        for chunk_rows, chunk in scan_file(file_path, filter_individual_chunk, context, member='itcont.txt'):
+            total_rows += chunk_rows
+            congress_rows += len(chunk)
+            if not chunk.empty:
+                max_sub_id = max(max_sub_id, int(chunk['sub_id_num'].max()))
+            chunk = chunk.join(classify_financial_sector(chunk['name'], chunk['employer'], chunk['occupation']))
+            
+            for row in chunk.to_dict('records'):
+                cmte_id = row['cmte_id']
                 
                 # Get candidate ID from committee
                 cand_id = self.committee_to_candidate.get(cmte_id)
@@ -416,25 +499,16 @@ class FECBulkLoader:
                 if not bioguide_id:
                     continue
                 
-                # Parse amount
-                try:
-                    amount = float(row.get('transaction_amt', 0))
-                except (ValueError, TypeError):
-                    amount = 0
-                
+                amount = row['amount']
                 if amount == 0:
                     continue
                 
-                # Check if financial sector contributor
-                contributor_name = row.get('name', '')
-                employer = row.get('employer', '')
-                occupation = row.get('occupation', '')
-                
-                is_financial, match_reason = is_financial_sector(
-                    contributor_name,
-                    employer,
-                    occupation
-                )
+                # Financial sector classification (batched per chunk above)
+                contributor_name = row['name']
+                employer = row['employer']
+                occupation = row['occupation']
+                is_financial = row['is_financial']
+                match_reason = row['match_reason']
                 
                 if is_financial:
                     financial_rows += 1
@@ -445,15 +519,15 @@ class FECBulkLoader:
                 
                 # Build contribution record
                 contribution = {
-                    'id': _generate_id(bioguide_id, row.get('sub_id', '')),
+                    'id': _generate_id(bioguide_id, row['sub_id']),
                     'bioguide_id': bioguide_id,
                     'contributor_name': contributor_name,
                     'employer': employer,
                     'occupation': occupation,
-                    'city': row.get('city', ''),
-                    'state': row.get('state', ''),
+                    'city': row['city'],
+                    'state': row['state'],
                     'amount': amount,
-                    'contribution_date': _parse_fec_date(row.get('transaction_dt', '')),
+                    'contribution_date': _parse_fec_date(row['transaction_dt']),
                     'sector': 'financial' if is_financial else '',
                     'is_financial': is_financial,
                     'match_reason': match_reason,
@@ -461,111 +535,141 @@ class FECBulkLoader:
                     'updated_at': datetime.now().isoformat(),
                 }
                 contributions.append(contribution)
-                
-                if total_rows % 1000000 == 0:
-                    logger.info(f"  Processed {total_rows:,} rows, {congress_rows:,} for Congress, {len(contributions):,} kept")
+            
+            logger.info(f"  Processed {total_rows:,} rows, {congress_rows:,} for Congress, {len(contributions):,} kept")
         
         self.stats['individual_contributions_total'] = total_rows
         self.stats['individual_contributions_congress'] = congress_rows
         self.stats['individual_contributions_financial'] = financial_rows
+        self.max_sub_ids[file_path] = max_sub_id
         
         logger.info(f"Individual contributions: {total_rows:,} total, {congress_rows:,} to Congress, {financial_rows:,} financial")
         return contributions
     
-    def write_pac_contributions_to_bq(self, contributions: List[Dict]) -> int:
-        """Write PAC contributions to BigQuery using load job."""
-        if not contributions:
-            logger.warning("No PAC contributions to write")
-            return 0
-        
-        table_id = f"{self.project_id}.{self.dataset_id}.official_pac_contributions"
-        logger.info(f"Writing {len(contributions):,} PAC contributions to {table_id}...")
+    def _write_contributions(self, table_name: str, contributions: List[Dict],
+                             fields: List[str], merge: bool = False) -> int:
+        """
+        Load contribution rows into a table with one load job.
         
-        # Truncate existing data
-        self.client.query(f"TRUNCATE TABLE `{table_id}`").result()
+        Args:
+            table_name: Contribution table
+            contributions: Contribution records (extra keys are dropped)
+            fields: Table columns to write
+            merge: Upsert the rows by id (incremental delta) instead of
+                replacing the table contents
+            
+        Returns:
+            Number of rows written
+        """
+        table_id = f"{self.project_id}.{self.dataset_id}.{table_name}"
         
         # Write to temp file and load (faster than streaming for large data)
-        import json
-        import tempfile
-        
         with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
             for row in contributions:
-                # Remove fields not in schema
-                clean_row = {k: v for k, v in row.items() 
-                            if k in ['id', 'bioguide_id', 'committee_id', 'committee_name',
-                                    'amount', 'contribution_date', 'sector', 'sub_sector',
-                                    'is_financial', 'updated_at']}
-                f.write(json.dumps(clean_row) + '\n')
+                f.write(json.dumps({k: row.get(k) for k in fields}) + '\n')
             temp_path = f.name
         
         logger.info(f"Wrote temp file, loading to BigQuery...")
         
+        if merge:
+            # Delta goes to a staging table (same schema) that is MERGEd by id
+            destination = f"{self.project_id}.{self.dataset_id}._staging_{table_name}_{uuid.uuid4().hex[:8]}"
+            schema = self.client.get_table(table_id).schema
+            staging = bigquery.Table(destination, schema=schema)
+            staging.expires = datetime.now(timezone.utc) + STAGING_TABLE_TTL
+            self.client.create_table(staging)
+            disposition = bigquery.WriteDisposition.WRITE_APPEND
+        else:
+            # Truncate existing data
+            self.client.query(f"TRUNCATE TABLE `{table_id}`").result()
+            destination = table_id
+            schema = None
+            disposition = bigquery.WriteDisposition.WRITE_TRUNCATE
+        
         # Configure load job
         job_config = bigquery.LoadJobConfig(
             source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
-            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            write_disposition=disposition,
         )
+        if schema:
+            job_config.schema = schema
         
-        with open(temp_path, 'rb') as f:
-            job = self.client.load_table_from_file(f, table_id, job_config=job_config)
-        
-        job.result()  # Wait for job to complete
-        
-        # Clean up temp file
-        os.unlink(temp_path)
+        try:
+            with open(temp_path, 'rb') as f:
+                job = self.client.load_table_from_file(f, destination, job_config=job_config)
+            job.result()  # Wait for job to complete
+            
+            if merge:
+                update_columns = [c for c in fields if c != 'id']
+                self.client.query(f"""
+                MERGE `{table_id}` T
+                USING (
+                    SELECT * FROM `{destination}`
+                    WHERE TRUE
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY id) = 1
+                ) S
+                ON T.id = S.id
+                WHEN MATCHED THEN
+                    UPDATE SET {', '.join(f'{c} = S.{c}' for c in update_columns)}
+                WHEN NOT MATCHED THEN
+                    INSERT ({', '.join(fields)})
+                    VALUES ({', '.join(f'S.{c}' for c in fields)})
+                """).result()
+        finally:
+            # Clean up temp file (and staging table)
+            os.unlink(temp_path)
+            if merge:
+                self.client.delete_table(destination, not_found_ok=True)
         
-        logger.info(f"Successfully wrote {len(contributions):,} PAC contributions")
         return len(contributions)
     
-    def write_individual_contributions_to_bq(self, contributions: List[Dict]) -> int:
-        """Write individual contributions to BigQuery using load job."""
+    def write_pac_contributions_to_bq(self, contributions: List[Dict], merge: bool = False) -> int:
+        """Write PAC contributions to BigQuery (replace, or merge a delta by id)."""
         if not contributions:
-            logger.warning("No individual contributions to write")
+            logger.warning("No PAC contributions to write")
             return 0
         
-        table_id = f"{self.project_id}.{self.dataset_id}.official_individual_contributions"
-        logger.info(f"Writing {len(contributions):,} individual contributions to {table_id}...")
-        
-        # Truncate existing data
-        self.client.query(f"TRUNCATE TABLE `{table_id}`").result()
-        
-        # Write to temp file and load (faster than streaming for large data)
-        import json
-        import tempfile
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as f:
-            for row in contributions:
-                # Remove fields not in schema
-                clean_row = {k: v for k, v in row.items() 
-                            if k in ['id', 'bioguide_id', 'contributor_name', 'employer',
-                                    'occupation', 'city', 'state', 'amount', 
-                                    'contribution_date', 'sector', 'is_financial',
-                                    'match_reason', 'updated_at']}
-                f.write(json.dumps(clean_row) + '\n')
-            temp_path = f.name
-        
-        logger.info(f"Wrote temp file, loading to BigQuery...")
-        
-        # Configure load job
-        job_config = bigquery.LoadJobConfig(
-            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
-            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
-        )
-        
-        with open(temp_path, 'rb') as f:
-            job = self.client.load_table_from_file(f, table_id, job_config=job_config)
-        
-        job.result()  # Wait for job to complete
-        
-        # Clean up temp file
-        os.unlink(temp_path)
+        logger.info(f"{'Merging' if merge else 'Writing'} {len(contributions):,} PAC contributions "
+                    f"into official_pac_contributions...")
+        count = self._write_contributions('official_pac_contributions', contributions, PAC_TABLE_FIELDS, merge)
+        logger.info(f"Successfully wrote {count:,} PAC contributions")
+        return count
+    
+    def write_individual_contributions_to_bq(self, contributions: List[Dict], merge: bool = False) -> int:
+        """Write individual contributions to BigQuery (replace, or merge a delta by id)."""
+        if not contributions:
+            logger.warning("No individual contributions to write")
+            return 0
         
-        logger.info(f"Successfully wrote {len(contributions):,} individual contributions")
-        return len(contributions)
+        logger.info(f"{'Merging' if merge else 'Writing'} {len(contributions):,} individual contributions "
+                    f"into official_individual_contributions...")
+        count = self._write_contributions('official_individual_contributions', contributions, INDIV_TABLE_FIELDS, merge)
+        logger.info(f"Successfully wrote {count:,} individual contributions")
+        return count
     
-    def update_officials_aggregates(self):
-        """Update officials table with aggregated contribution totals."""
-        logger.info("Updating officials table with contribution aggregates...")
+    def update_officials_aggregates(self, bioguide_ids: Optional[Set[str]] = None):
+        """
+        Update officials table with aggregated contribution totals.
+        
+        Args:
+            bioguide_ids: Only recompute these officials (the ones an incremental
+                load touched); the contribution tables are clustered on
+                bioguide_id, so the scans shrink with the delta. None = all.
+        """
+        if bioguide_ids is not None and not bioguide_ids:
+            logger.info("No officials touched - contribution aggregates unchanged")
+            return
+        logger.info("Updating officials table with contribution aggregates"
+                    f"{f' for {len(bioguide_ids)} officials' if bioguide_ids else ''}...")
+        
+        job_config = None
+        where_scope = and_scope = ''
+        if bioguide_ids:
+            job_config = bigquery.QueryJobConfig(query_parameters=[
+                bigquery.ArrayQueryParameter('bioguide_ids', 'STRING', sorted(bioguide_ids))
+            ])
+            where_scope = 'WHERE bioguide_id IN UNNEST(@bioguide_ids)'
+            and_scope = 'AND bioguide_id IN UNNEST(@bioguide_ids)'
         
         # Aggregate PAC contributions - SUM by committee first, then pick top 10 financial
         pac_query = f"""
@@ -599,6 +703,7 @@ class FECBulkLoader:
                         SUM(amount) as total_amount,
                         MAX(is_financial) as is_financial
                     FROM `{self.project_id}.{self.dataset_id}.official_pac_contributions`
+                    {where_scope}
                     GROUP BY bioguide_id, committee_name
                 )
                 GROUP BY bioguide_id
@@ -619,7 +724,7 @@ class FECBulkLoader:
                         SUM(amount) as total_amount,
                         MAX(sector) as sector
                     FROM `{self.project_id}.{self.dataset_id}.official_pac_contributions`
-                    WHERE is_financial = TRUE
+                    WHERE is_financial = TRUE {and_scope}
                     GROUP BY bioguide_id, committee_name
                 )
                 GROUP BY bioguide_id
@@ -629,7 +734,7 @@ class FECBulkLoader:
         """
         
         try:
-            job = self.client.query(pac_query)
+            job = self.client.query(pac_query, job_config=job_config)
             job.result()  # Wait for completion
             logger.info(f"Updated PAC contribution aggregates: {job.num_dml_affected_rows} rows")
         except Exception as e:
@@ -669,6 +774,7 @@ class FECBulkLoader:
                     WHERE employer IS NOT NULL 
                       AND TRIM(employer) != ''
                       AND UPPER(employer) NOT IN ('SELF', 'SELF EMPLOYED', 'SELF-EMPLOYED', 'RETIRED', 'NOT EMPLOYED', 'N/A', 'NONE', 'HOMEMAKER')
+                      {and_scope}
                     GROUP BY bioguide_id, employer
                 )
                 GROUP BY bioguide_id
@@ -700,6 +806,7 @@ class FECBulkLoader:
                       AND employer IS NOT NULL 
                       AND TRIM(employer) != ''
                       AND UPPER(employer) NOT IN ('SELF', 'SELF EMPLOYED', 'SELF-EMPLOYED', 'RETIRED', 'NOT EMPLOYED', 'N/A', 'NONE', 'HOMEMAKER')
+                      {and_scope}
                     GROUP BY bioguide_id, employer
                 )
                 GROUP BY bioguide_id
@@ -709,31 +816,124 @@ class FECBulkLoader:
         """
         
         try:
-            job = self.client.query(individual_query)
+            job = self.client.query(individual_query, job_config=job_config)
             job.result()  # Wait for completion
             logger.info(f"Updated individual contribution aggregates: {job.num_dml_affected_rows} rows")
         except Exception as e:
             logger.error(f"Failed to update individual aggregates: {e}")
     
+    def _find_file(self, data_path: Path, prefix: str, cycle: str, file_name: str) -> Optional[Path]:
+        """
+        Bulk file for a cycle: extracted {prefix}{yy}/{file_name}, else the
+        downloaded {prefix}{yy}.zip (read in place), else {file_name} in data_path.
+        """
+        suffix = cycle[-2:]
+        for path in (data_path / f"{prefix}{suffix}" / file_name,
+                     data_path / f"{prefix}{suffix}.zip",
+                     data_path / file_name):
+            if path.exists():
+                return path
+        return None
+    
+    def _contribution_files(self, data_path: Path, cycles: List[str], prefix: str,
+                            file_name: str) -> Dict[str, Path]:
+        """Contribution file per cycle (see _find_file)."""
+        files = {}
+        for cycle in cycles:
+            path = self._find_file(data_path, prefix, cycle, file_name)
+            if path:
+                files[cycle] = path
+        return files
+    
+    def _scope_hash(self, kind: str) -> str:
+        """
+        Hash of the Congress members / committees a contribution file is
+        filtered to. Rows below a watermark were only kept for the scope of
+        that load, so a new member or committee needs the file reread.
+        """
+        if kind == 'indiv':
+            return content_hash({
+                'fec_to_bioguide': self.fec_to_bioguide,
+                'committees': {cmte_id: self.committee_to_candidate.get(cmte_id)
+                               for cmte_id in self.congress_committee_ids},
+            })
+        return content_hash({'fec_to_bioguide': self.fec_to_bioguide})
+    
+    def _plan_updates(self, state: PipelineState, kind: str, files: Dict[str, Path],
+                      full: bool = False) -> Tuple[bool, Dict[str, Dict]]:
+        """
+        Decide which contribution files to process against their watermarks.
+        
+        Args:
+            state: Pipeline state with the last load's watermarks
+            kind: Watermark namespace ('pas2' or 'indiv')
+            files: Contribution file per cycle
+            full: Ignore watermarks and rebuild the table
+            
+        Returns:
+            (reload, plan): reload is True when the table must be rebuilt from
+            every file (first load, a file shrank, the member/committee scope
+            changed, or full); plan maps cycle -> {'path', 'fingerprint',
+            'min_sub_id'} for the files to process
+        """
+        reload = full
+        plan = {}
+        scope = self._scope_hash(kind)
+        for cycle, path in files.items():
+            fingerprint = file_fingerprint(path)
+            previous = state.source(f"fec/{kind}/{cycle}")
+            if previous and previous.get('scope') != scope and not reload:
+                logger.info(f"Congress members or committees changed since {previous.get('recorded_at')} "
+                            f"- reloading {kind} contributions")
+                reload = True
+            if previous.get('digest') == fingerprint['digest'] and not reload:
+                logger.info(f"{path} unchanged since {previous.get('recorded_at')} - skipping")
+                continue
+            if not previous or fingerprint['size'] < previous.get('size', 0):
+                reload = True
+            plan[cycle] = {'path': path, 'fingerprint': fingerprint, 'min_sub_id': previous.get('max_sub_id', 0)}
+        
+        if reload:
+            for cycle, path in files.items():
+                fingerprint = plan[cycle]['fingerprint'] if cycle in plan else file_fingerprint(path)
+                plan[cycle] = {'path': path, 'fingerprint': fingerprint, 'min_sub_id': 0}
+        return reload, plan
+    
+    def _record_watermarks(self, state: PipelineState, kind: str, plan: Dict[str, Dict]):
+        """Store fingerprint, highest sub_id and member/committee scope for every processed file."""
+        scope = self._scope_hash(kind)
+        for cycle, item in plan.items():
+            state.set_source(f"fec/{kind}/{cycle}", dict(
+                item['fingerprint'],
+                max_sub_id=max(self.max_sub_ids.get(str(item['path']), 0), item['min_sub_id']),
+                scope=scope,
+            ))
+    
     def run(
         self,
         data_dir: str,
         cycles: List[str] = None,
+        full: bool = False,
+        state: Optional[PipelineState] = None,
     ):
         """
-        Run the full bulk load process.
+        Run the bulk load process (incremental unless full).
         
         Args:
-            data_dir: Directory containing unzipped FEC files
+            data_dir: Directory containing FEC archives or extracted files
             cycles: Election cycles to load (e.g., ['2024', '2026'])
+            full: Ignore watermarks and truncate + reload both tables
+            state: Pipeline state (default: loaded from local disk / GCS)
         """
         cycles = cycles or ['2024', '2026']
         data_path = Path(data_dir)
+        state = state or PipelineState.load()
         
         logger.info("=" * 70)
         logger.info("FEC BULK DATA LOAD")
         logger.info(f"Data directory: {data_path}")
         logger.info(f"Cycles: {cycles}")
+        logger.info(f"Mode: {'full reload' if full else 'incremental'}")
         logger.info("=" * 70)
         
         # Step 1: Load crosswalk
@@ -741,63 +941,69 @@ class FECBulkLoader:
         
         # Step 2: Load reference files for each cycle
         for cycle in cycles:
-            suffix = cycle[-2:]  # '24' or '26'
-            
             # Committee master
-            cm_file = data_path / f"cm{suffix}" / "cm.txt"
-            if not cm_file.exists():
-                cm_file = data_path / "cm.txt"
-            if cm_file.exists():
+            cm_file = self._find_file(data_path, 'cm', cycle, 'cm.txt')
+            if cm_file:
                 self.load_committee_master(str(cm_file))
             else:
                 logger.warning(f"Committee file not found for cycle {cycle}")
             
             # Candidate master
-            cn_file = data_path / f"cn{suffix}" / "cn.txt"
-            if not cn_file.exists():
-                cn_file = data_path / "cn.txt"
-            if cn_file.exists():
+            cn_file = self._find_file(data_path, 'cn', cycle, 'cn.txt')
+            if cn_file:
                 self.load_candidate_master(str(cn_file))
             else:
                 logger.warning(f"Candidate file not found for cycle {cycle}")
         
-        # Step 3: Process PAC contributions
+        # Step 3: Process PAC contributions (changed files, past their watermark)
+        pac_reload, pac_plan = self._plan_updates(
+            state, 'pas2', self._contribution_files(data_path, cycles, 'pas2', 'itpas2.txt'), full
+        )
         all_pac_contributions = []
-        for cycle in cycles:
-            suffix = cycle[-2:]
-            pas2_file = data_path / f"pas2{suffix}" / "itpas2.txt"
-            if not pas2_file.exists():
-                pas2_file = data_path / "itpas2.txt"
-            if pas2_file.exists():
-                contributions = self.process_pac_contributions(str(pas2_file))
-                all_pac_contributions.extend(contributions)
-                logger.info(f"Cycle {cycle}: {len(contributions):,} PAC contributions")
+        for cycle, item in pac_plan.items():
+            contributions = self.process_pac_contributions(str(item['path']), min_sub_id=item['min_sub_id'])
+            all_pac_contributions.extend(contributions)
+            logger.info(f"Cycle {cycle}: {len(contributions):,} PAC contributions")
         
         # Step 4: Process individual contributions  
+        indiv_reload, indiv_plan = self._plan_updates(
+            state, 'indiv', self._contribution_files(data_path, cycles, 'indiv', 'itcont.txt'), full
+        )
         all_individual_contributions = []
-        for cycle in cycles:
-            suffix = cycle[-2:]
-            itcont_file = data_path / f"indiv{suffix}" / "itcont.txt"
-            if not itcont_file.exists():
-                itcont_file = data_path / "itcont.txt"
-            if itcont_file.exists():
-                contributions = self.process_individual_contributions(
-                    str(itcont_file),
-                    financial_only=False  # Include ALL contributions for proper percentage calculation
-                )
-                all_individual_contributions.extend(contributions)
-                logger.info(f"Cycle {cycle}: {len(contributions):,} individual contributions")
-        
-        # Step 5: Write to BigQuery
+        for cycle, item in indiv_plan.items():
+            contributions = self.process_individual_contributions(
+                str(item['path']),
+                financial_only=False,  # Include ALL contributions for proper percentage calculation
+                min_sub_id=item['min_sub_id'],
+            )
+            all_individual_contributions.extend(contributions)
+            logger.info(f"Cycle {cycle}: {len(contributions):,} individual contributions")
+        
+        # Step 5: Write to BigQuery (rebuild, or merge the delta by id)
         logger.info("\n" + "=" * 70)
         logger.info("WRITING TO BIGQUERY")
         logger.info("=" * 70)
         
-        pac_count = self.write_pac_contributions_to_bq(all_pac_contributions)
-        indiv_count = self.write_individual_contributions_to_bq(all_individual_contributions)
+        pac_count = self.write_pac_contributions_to_bq(all_pac_contributions, merge=not pac_reload)
+        indiv_count = self.write_individual_contributions_to_bq(all_individual_contributions, merge=not indiv_reload)
         
-        # Step 6: Update aggregates
-        self.update_officials_aggregates()
+        # Step 6: Update aggregates (only officials with new rows, unless rebuilt)
+        if pac_reload or indiv_reload:
+            self.update_officials_aggregates()
+        else:
+            self.update_officials_aggregates({
+                c['bioguide_id'] for c in all_pac_contributions + all_individual_contributions
+            })
+        
+        # Step 7: Advance watermarks now that the rows are written
+        self._record_watermarks(state, 'pas2', pac_plan)
+        self._record_watermarks(state, 'indiv', indiv_plan)
+        state.save()
+        
+        modes = {
+            'pac_contributions': 'reload' if pac_reload else ('delta' if pac_plan else 'unchanged'),
+            'individual_contributions': 'reload' if indiv_reload else ('delta' if indiv_plan else 'unchanged'),
+        }
         
         # Summary
         logger.info("\n" + "=" * 70)
@@ -806,12 +1012,13 @@ class FECBulkLoader:
         logger.info(f"Congress members mapped: {self.stats['congress_members_mapped']}")
         logger.info(f"Committees loaded: {self.stats['committees_loaded']}")
         logger.info(f"Candidates loaded: {self.stats['candidates_loaded']}")
-        logger.info(f"PAC contributions written: {pac_count:,}")
-        logger.info(f"Individual contributions written: {indiv_count:,}")
+        logger.info(f"PAC contributions written: {pac_count:,} ({modes['pac_contributions']})")
+        logger.info(f"Individual contributions written: {indiv_count:,} ({modes['individual_contributions']})")
         
         return {
             'pac_contributions': pac_count,
             'individual_contributions': indiv_count,
+            'modes': modes,
             'stats': self.stats,
         }
     
@@ -825,7 +1032,7 @@ class FECBulkLoader:
         Reload just individual contributions (faster than full bulk load).
         
         Args:
-            data_dir: Directory containing extracted FEC files
+            data_dir: Directory containing FEC archives or extracted files
             cycles: List of cycles to process (e.g., ['2024', '2026'])
             financial_only: If True, only load financial sector contributions
         """
@@ -844,30 +1051,21 @@ class FECBulkLoader:
         
         # Step 2: Load reference files for each cycle (needed for committee->candidate mapping)
         for cycle in cycles:
-            suffix = cycle[-2:]
-            
             # Committee master
-            cm_file = data_path / f"cm{suffix}" / "cm.txt"
-            if not cm_file.exists():
-                cm_file = data_path / "cm.txt"
-            if cm_file.exists():
+            cm_file = self._find_file(data_path, 'cm', cycle, 'cm.txt')
+            if cm_file:
                 self.load_committee_master(str(cm_file))
             
             # Candidate master
-            cn_file = data_path / f"cn{suffix}" / "cn.txt"
-            if not cn_file.exists():
-                cn_file = data_path / "cn.txt"
-            if cn_file.exists():
+            cn_file = self._find_file(data_path, 'cn', cycle, 'cn.txt')
+            if cn_file:
                 self.load_candidate_master(str(cn_file))
         
         # Step 3: Process individual contributions
         all_individual_contributions = []
         for cycle in cycles:
-            suffix = cycle[-2:]
-            itcont_file = data_path / f"indiv{suffix}" / "itcont.txt"
-            if not itcont_file.exists():
-                itcont_file = data_path / "itcont.txt"
-            if itcont_file.exists():
+            itcont_file = self._find_file(data_path, 'indiv', cycle, 'itcont.txt')
+            if itcont_file:
                 logger.info(f"\nProcessing cycle {cycle}...")
                 contributions = self.process_individual_contributions(
                     str(itcont_file),
@@ -888,6 +1086,16 @@ class FECBulkLoader:
         # Step 5: Update aggregates
         self.update_officials_aggregates()
         
+        # Step 6: The table no longer matches the incremental watermarks; a
+        # financial-only table must be rebuilt by the next incremental run
+        state = PipelineState.load()
+        state.clear_sources('fec/indiv/')
+        if not financial_only:
+            files = self._contribution_files(data_path, cycles, 'indiv', 'itcont.txt')
+            _, plan = self._plan_updates(state, 'indiv', files, full=True)
+            self._record_watermarks(state, 'indiv', plan)
+        state.save()
+        
         # Summary
         logger.info("\n" + "=" * 70)
         logger.info("RELOAD COMPLETE")
@@ -935,15 +1143,19 @@ def extract_zip_files(downloads_dir: str, output_dir: str, cycles: List[str] = N
 def main():
     parser = argparse.ArgumentParser(description='Load FEC bulk data into BigQuery')
     parser.add_argument('--downloads-dir', default='/Users/jadedlebi/Downloads',
-                        help='Directory containing FEC zip files')
+                        help='Directory containing FEC zip files (loaded without extracting)')
+    parser.add_argument('--download', action='store_true',
+                        help='Download (resume, or skip if current) the cycle archives into --downloads-dir first')
     parser.add_argument('--data-dir', default='/tmp/fec_data',
-                        help='Directory for extracted files')
+                        help='Directory for extracted files (--extract-only / --skip-extract)')
     parser.add_argument('--cycles', nargs='+', default=['2024', '2026'],
                         help='Election cycles to load')
     parser.add_argument('--extract-only', action='store_true',
                         help='Only extract zip files, do not load')
     parser.add_argument('--skip-extract', action='store_true',
-                        help='Skip extraction, assume files are already extracted')
+                        help='Load already-extracted files from --data-dir instead of the zip files')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore load watermarks and truncate + reload the contribution tables')
     
     args = parser.parse_args()
     
@@ -955,23 +1167,32 @@ def main():
     # Convert cycles to 2-digit suffixes
     cycle_suffixes = [c[-2:] for c in args.cycles]
     
-    # Extract zip files
-    if not args.skip_extract:
-        extract_zip_files(args.downloads_dir, args.data_dir, cycle_suffixes)
+    if args.download:
+        from justdata.apps.electwatch.services.fec_bulk import FEC_BULK_CYCLES, download_archives
+        targets = {}
+        for cycle in args.cycles:
+            info = FEC_BULK_CYCLES[cycle]
+            for file_type in ('cm', 'cn', 'pas2', 'indiv'):
+                targets[f"{cycle}/{file_type}"] = (f"{info['base']}/{info[file_type]}",
+                                                   Path(args.downloads_dir) / info[file_type])
+        download_archives(targets, strict=True)
     
+    # Extract zip files (only needed to inspect them; loads read the archives)
     if args.extract_only:
+        extract_zip_files(args.downloads_dir, args.data_dir, cycle_suffixes)
         logger.info("Extraction complete (--extract-only specified)")
         return
     
     # Run bulk load
     loader = FECBulkLoader()
-    results = loader.run(args.data_dir, args.cycles)
+    source_dir = args.data_dir if args.skip_extract else args.downloads_dir
+    results = loader.run(source_dir, args.cycles, full=args.full)
     
     print("\n" + "=" * 70)
     print("RESULTS")
     print("=" * 70)
-    print(f"PAC contributions loaded: {results['pac_contributions']:,}")
-    print(f"Individual contributions loaded: {results['individual_contributions']:,}")
+    print(f"PAC contributions loaded: {results['pac_contributions']:,} ({results['modes']['pac_contributions']})")
+    print(f"Individual contributions loaded: {results['individual_contributions']:,} ({results['modes']['individual_contributions']})")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Chunked, multi-process reader for FEC bulk files.
+
+The individual contribution files (itcont.txt / indiv.txt) are several GB.
+Instead of walking them one line at a time, each file is split into
+newline-aligned byte ranges that are parsed in parallel on a process pool
+with pandas' C reader (only the needed columns, all as strings). Every chunk
+is filtered on committee id by set membership before any other work, and the
+per-chunk results are handed back to the caller to merge.
+
+Files can also be read straight out of the FEC zip archives, so nothing is
+extracted to disk: the member is decompressed as a stream in the parent
+process and cut into newline-aligned blocks that are handed to the workers
+(decompression overlaps with parsing). open_text() does the same for the
+small line-by-line readers.
+
+Settings (environment):
+    FEC_BULK_WORKERS   Worker processes (default: CPU count; 1 = in-process)
+    FEC_BULK_CHUNK_MB  Target chunk size in MB (default: 64)
+
+Usage:
+    from justdata.apps.electwatch.services.fec_bulk_reader import scan_file, aggregate_individual_chunk
+
+    for chunk in scan_file(path, aggregate_individual_chunk, {'committee_to_candidate': lookup}):
+        ...
+
+    # Same, reading itcont.txt inside the downloaded archive
+    for chunk in scan_file('indiv24.zip', aggregate_individual_chunk, context, member='itcont.txt'):
+        ...
+"""
+
+import csv
+import io
+import logging
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv('FEC_BULK_WORKERS', '0')) or (os.cpu_count() or 1)
+DEFAULT_CHUNK_BYTES = int(float(os.getenv('FEC_BULK_CHUNK_MB', '64')) * 1024 * 1024)
+
+# Individual contribution file layout (itcont.txt / indiv.txt)
+INDIV_COLUMNS = [
+    'cmte_id', 'amndt_ind', 'rpt_tp', 'transaction_pgi', 'image_num',
+    'transaction_tp', 'entity_tp', 'name', 'city', 'state', 'zip_code',
+    'employer', 'occupation', 'transaction_dt', 'transaction_amt',
+    'other_id', 'tran_id', 'file_num', 'memo_cd', 'memo_text', 'sub_id'
+]
+
+# Columns kept when individual contributions are returned row by row
+INDIV_RECORD_COLUMNS = [
+    'cmte_id', 'name', 'city', 'state', 'employer', 'occupation',
+    'transaction_dt', 'transaction_amt', 'sub_id'
+]
+
+# Context shared by every chunk of a scan, set once per worker process
+_worker_context: Dict[str, Any] = {}
+
+
+def chunk_ranges(path: Union[str, Path], chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """
+    Split a file into byte ranges that start and end on line boundaries.
+
+    Args:
+        path: File to split
+        chunk_bytes: Target size of each range
+
+    Returns:
+        List of (start, end) offsets covering the whole file
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    chunk_bytes = max(1, chunk_bytes)
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        while boundaries[-1] + chunk_bytes < size:
+            f.seek(boundaries[-1] + chunk_bytes)
+            f.readline()  # Move to the start of the next line
+            position = f.tell()
+            if position >= size:
+                break
+            boundaries.append(position)
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def is_zip(path: Union[str, Path]) -> bool:
+    return str(path).lower().endswith('.zip')
+
+
+def zip_member(zf: zipfile.ZipFile, member: Optional[str] = None) -> str:
+    """
+    Name of the data file inside an FEC archive.
+
+    Prefers a member whose base name is `member` (e.g. 'itcont.txt'), then
+    the first top-level .txt file, then any .txt file.
+
+    Raises:
+        FileNotFoundError: If the archive has no .txt member
+    """
+    names = [info.filename for info in zf.infolist() if not info.is_dir()]
+    if member:
+        for name in names:
+            if name.rsplit('/', 1)[-1] == member:
+                return name
+    txt_names = [name for name in names if name.lower().endswith('.txt')]
+    top_level = [name for name in txt_names if '/' not in name]
+    if top_level or txt_names:
+        return (top_level or txt_names)[0]
+    raise FileNotFoundError(f"No .txt member in {zf.filename}")
+
+
+@contextmanager
+def open_text(path: Union[str, Path], member: Optional[str] = None, encoding: str = 'latin-1',
+              errors: str = 'strict') -> Iterator[IO[str]]:
+    """
+    Open an FEC bulk file for reading text, whether extracted or inside a zip.
+
+    Args:
+        path: .txt file, or .zip archive
+        member: Preferred member name inside a zip (see zip_member)
+        encoding: Text encoding
+        errors: Decoding error handling
+    """
+    if not is_zip(path):
+        with open(path, 'r', encoding=encoding, errors=errors) as f:
+            yield f
+        return
+    with zipfile.ZipFile(path) as zf:
+        with zf.open(zip_member(zf, member)) as raw:
+            yield io.TextIOWrapper(raw, encoding=encoding, errors=errors)
+
+
+def stream_blocks(raw: IO[bytes], chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[bytes]:
+    """Read a binary stream in blocks of about chunk_bytes that end on line boundaries."""
+    chunk_bytes = max(1, chunk_bytes)
+    carry = b''
+    while True:
+        block = raw.read(chunk_bytes)
+        if not block:
+            break
+        block = carry + block
+        cut = block.rfind(b'\n') + 1
+        if cut == 0:
+            carry = block
+            continue
+        carry = block[cut:]
+        yield block[:cut]
+    if carry:
+        yield carry
+
+
+def read_chunk(path: Union[str, Path, bytes], start: int, end: int,
+               columns: Sequence[str] = INDIV_COLUMNS,
+               usecols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Parse one byte range of a pipe-delimited FEC file.
+
+    path may also be the data itself (a block streamed out of a zip).
+    All values are read as strings; missing values become ''. Malformed
+    lines (too many fields) are skipped, short lines are padded.
+    """
+    if isinstance(path, (bytes, bytearray)):
+        data = path[start:end]
+    else:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+    if not data:
+        return pd.DataFrame(columns=list(usecols or columns))
+    return pd.read_csv(
+        io.BytesIO(data),
+        sep='|',
+        header=None,
+        names=list(columns),
+        usecols=list(usecols) if usecols else None,
+        dtype=str,
+        na_filter=False,
+        quoting=csv.QUOTE_NONE,
+        encoding='latin-1',
+        on_bad_lines='skip',
+        engine='c',
+    )
+
+
+def _filter_committees(df: pd.DataFrame, committee_ids) -> pd.DataFrame:
+    """Keep rows for the committees of interest - done before any other parsing."""
+    return df[df['cmte_id'].isin(committee_ids)]
+
+
+def _parse_amounts(df: pd.DataFrame) -> pd.Series:
+    return pd.to_numeric(df['transaction_amt'], errors='coerce')
+
+
+def aggregate_individual_chunk(path: str, start: int, end: int) -> Tuple[int, pd.DataFrame]:
+    """
+    Aggregate one chunk of individual contributions by candidate and employer.
+
+    Worker context:
+        committee_to_candidate: cmte_id -> candidate id
+        min_date: Optional minimum transaction date (YYYY-MM-DD); rows with
+            unparseable dates are kept
+
+    Returns:
+        (rows read, DataFrame of cand_id, employer, occupation, amount, count)
+    """
+    committee_to_candidate = _worker_context['committee_to_candidate']
+    df = read_chunk(path, start, end, usecols=['cmte_id', 'employer', 'occupation',
+                                                'transaction_dt', 'transaction_amt'])
+    rows_read = len(df)
+    df = _filter_committees(df, committee_to_candidate.keys())
+    if df.empty:
+        return rows_read, pd.DataFrame(columns=['cand_id', 'employer', 'occupation', 'amount', 'count'])
+
+    min_date = _worker_context.get('min_date')
+    if min_date:
+        dates = pd.to_datetime(df['transaction_dt'], format='%m%d%Y', errors='coerce')
+        df = df[~(dates < pd.Timestamp(min_date))]
+
+    amounts = _parse_amounts(df)
+    keep = amounts > 0
+    df = df[keep].assign(amount=amounts[keep], cand_id=df.loc[keep, 'cmte_id'].map(committee_to_candidate))
+    grouped = (
+        df.groupby(['cand_id', 'employer', 'occupation'], sort=False)['amount']
+        .agg(amount='sum', count='size')
+        .reset_index()
+    )
+    return rows_read, grouped
+
+
+def filter_individual_chunk(path: str, start: int, end: int) -> Tuple[int, pd.DataFrame]:
+    """
+    Return the rows of one chunk that go to committees of interest.
+
+    Worker context:
+        committee_ids: Set of committee ids to keep
+        min_sub_id: Optional watermark; only rows with a larger numeric
+            sub_id are kept (incremental loads)
+
+    Returns:
+        (rows read, DataFrame of INDIV_RECORD_COLUMNS plus a float 'amount'
+        and an integer 'sub_id_num' (0 if unparseable); unparseable amounts are 0)
+    """
+    df = read_chunk(path, start, end, usecols=INDIV_RECORD_COLUMNS)
+    rows_read = len(df)
+    df = _filter_committees(df, _worker_context['committee_ids'])
+    sub_ids = pd.to_numeric(df['sub_id'], errors='coerce').fillna(0).astype('int64')
+    min_sub_id = _worker_context.get('min_sub_id')
+    if min_sub_id:
+        keep = sub_ids > min_sub_id
+        df, sub_ids = df[keep], sub_ids[keep]
+    return rows_read, df.assign(amount=_parse_amounts(df).fillna(0), sub_id_num=sub_ids)
+
+
+def _init_worker(context: Dict[str, Any]):
+    global _worker_context
+    _worker_context = context
+
+
+def _scan_zip(path: str, chunk_func: Callable, context: Dict[str, Any], workers: int,
+              chunk_bytes: int, member: Optional[str]) -> Iterator[Any]:
+    """scan_file for a member of a zip archive: blocks are streamed, never extracted."""
+    with zipfile.ZipFile(path) as zf:
+        name = zip_member(zf, member)
+        logger.info(f"  Streaming {path}:{name} with {max(workers, 1)} worker(s)")
+        with zf.open(name) as raw:
+            blocks = stream_blocks(raw, chunk_bytes)
+            if workers <= 1:
+                previous = _worker_context
+                _init_worker(context)
+                try:
+                    for block in blocks:
+                        yield chunk_func(block, 0, len(block))
+                finally:
+                    _init_worker(previous)
+                return
+
+            # Keep a bounded number of blocks in flight so memory stays flat
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(context,)) as pool:
+                pending = deque()
+                for block in blocks:
+                    pending.append(pool.submit(chunk_func, block, 0, len(block)))
+                    if len(pending) >= workers * 2:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+
+
+def scan_file(path: Union[str, Path], chunk_func: Callable[[str, int, int], Any], context: Dict[str, Any],
+              workers: Optional[int] = None, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+              member: Optional[str] = None) -> Iterator[Any]:
+    """
+    Run chunk_func over every chunk of a file, in parallel when worthwhile.
+
+    Args:
+        path: FEC bulk file, or a .zip archive containing it
+        chunk_func: Module-level function (path, start, end) -> result; it
+            reads shared lookups from the worker context. For archives it is
+            called with the block's bytes in place of the path.
+        context: Lookups shared by all chunks (sent to each worker once)
+        workers: Worker processes (default FEC_BULK_WORKERS / CPU count)
+        chunk_bytes: Target chunk size
+        member: Preferred member name inside a zip (see zip_member)
+
+    Yields:
+        chunk_func results in file order
+    """
+    path = str(path)
+    if is_zip(path):
+        yield from _scan_zip(path, chunk_func, context, workers or DEFAULT_WORKERS, chunk_bytes, member)
+        return
+    ranges = chunk_ranges(path, chunk_bytes)
+    workers = min(workers or DEFAULT_WORKERS, len(ranges))
+    logger.info(f"  Scanning {path} in {len(ranges)} chunk(s) with {max(workers, 1)} worker(s)")
+
+    if workers <= 1:
+        previous = _worker_context
+        _init_worker(context)
+        try:
+            for start, end in ranges:
+                yield chunk_func(path, start, end)
+        finally:
+            _init_worker(previous)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(context,)) as pool:
+        futures = [pool.submit(chunk_func, path, start, end) for start, end in ranges]
+        for future in futures:
+            yield future.result()
@@ -25,6 +25,8 @@ from pathlib import Path
 if __name__ == '__main__':
     sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
+from justdata.apps.electwatch.services.source_http import get_source_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,7 +79,7 @@ class FinnhubClient:
 
         try:
             logger.info(f"Finnhub API request: {endpoint}")
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = get_source_client('finnhub').get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -15,6 +15,9 @@ import logging
 from typing import Dict, List, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
+from functools import lru_cache
+
+from justdata.shared.utils.ngram_index import NgramIndex
 
 logger = logging.getLogger(__name__)
 
@@ -1262,11 +1265,18 @@ class FirmMapper:
         industries = mapper.get_industry_from_pac('WELLS FARGO & COMPANY PAC')  # ['banking']
     """
 
+    # Fuzzy lookups re-score only this many n-gram candidates with SequenceMatcher
+    FUZZY_CANDIDATES = 8
+    FUZZY_MEMO_SIZE = 8192
+
     def __init__(self):
         self._ticker_index: Dict[str, FirmRecord] = {}
         self._pac_index: Dict[str, FirmRecord] = {}
         self._name_index: Dict[str, FirmRecord] = {}
         self._build_indexes()
+        # Unmatched PAC/employer names repeat across a pipeline run
+        self._fuzzy_pac_memo = lru_cache(maxsize=self.FUZZY_MEMO_SIZE)(self._best_fuzzy_pac)
+        self._fuzzy_name_memo = lru_cache(maxsize=self.FUZZY_MEMO_SIZE)(self._best_fuzzy_name)
 
     def _build_indexes(self):
         """Build lookup indexes for fast search."""
@@ -1285,6 +1295,10 @@ class FirmMapper:
             for alias in firm.aliases or []:
                 self._name_index[alias.lower()] = firm
 
+        # Trigram candidate indexes for fuzzy matching
+        self._pac_ngrams = NgramIndex(self._pac_index)
+        self._name_ngrams = NgramIndex(self._name_index)
+
     def _normalize_pac_name(self, pac_name: str) -> str:
         """Normalize PAC name for matching."""
         # Remove common suffixes and normalize
@@ -1336,14 +1350,18 @@ class FirmMapper:
 
     def _fuzzy_match_pac(self, normalized_pac: str, threshold: float = 0.7) -> Optional[FirmRecord]:
         """Fuzzy match a PAC name to a firm."""
+        return self._fuzzy_pac_memo(normalized_pac, threshold)
+
+    def _best_fuzzy_pac(self, normalized_pac: str, threshold: float) -> Optional[FirmRecord]:
         best_match = None
         best_score = 0
 
-        for pac_key, firm in self._pac_index.items():
+        # Only the PAC names sharing the most trigrams are scored
+        for pac_key in self._pac_ngrams.candidates(normalized_pac, self.FUZZY_CANDIDATES):
             score = SequenceMatcher(None, normalized_pac, pac_key).ratio()
             if score > best_score and score >= threshold:
                 best_score = score
-                best_match = firm
+                best_match = self._pac_index[pac_key]
 
         return best_match
 
@@ -1398,14 +1416,17 @@ class FirmMapper:
             return self._name_index[cleaned]
 
         # Fuzzy match
+        return self._fuzzy_name_memo(normalized)
+
+    def _best_fuzzy_name(self, normalized: str) -> Optional[FirmRecord]:
         best_match = None
         best_ratio = 0.7  # Minimum threshold
 
-        for name, firm in self._name_index.items():
+        for name in self._name_ngrams.candidates(normalized, self.FUZZY_CANDIDATES):
             ratio = SequenceMatcher(None, normalized, name).ratio()
             if ratio > best_ratio:
                 best_ratio = ratio
-                best_match = firm
+                best_match = self._name_index[name]
 
         return best_match
 
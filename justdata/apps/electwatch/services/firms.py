@@ -421,14 +421,31 @@ def api_firm(firm_name):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 def api_firms():
-    """Firms API endpoint."""
+    """
+    Firms API endpoint.
+
+    Query params:
+        - industry: Sector code filter
+        - sort: 'rank' (default, by total trade value), 'total', 'officials',
+          'stock_trades', 'name', 'ticker'
+        - order: 'asc' or 'desc' (default 'desc', except for rank/name/ticker)
+        - limit: Number of results (default 100)
+        - offset: Results to skip (default 0)
+    """
     try:
         from justdata.apps.electwatch.services.data_store import get_firms_with_stats
+        from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firm_stats import SORT_COLUMNS
+        industry = request.args.get('industry')
+        sort_by = request.args.get('sort', 'rank')
+        if sort_by not in SORT_COLUMNS:
+            return jsonify({'success': False, 'error': f'Unsupported sort: {sort_by}'}), 400
+        default_order = 'asc' if sort_by in ('rank', 'name', 'ticker') else 'desc'
+        descending = request.args.get('order', default_order).lower() == 'desc'
         limit = request.args.get('limit', 100, type=int)
-        firms = get_firms_with_stats()
-        # Apply limit after fetching
-        if limit:
-            firms = firms[:limit]
+        offset = max(request.args.get('offset', 0, type=int), 0)
+
+        # Filtering, sorting and paging run against the precomputed stats
+        firms = get_firms_with_stats(industry, sort_by, descending, limit or None, offset)
         return jsonify({'success': True, 'firms': firms})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -18,6 +18,8 @@ from typing import Dict, Any, List, Optional, Set
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from justdata.apps.electwatch.services.source_http import get_source_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -293,7 +295,7 @@ class FMPClient:
         params['apikey'] = self.api_key
 
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = get_source_client('fmp').get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
             return data if isinstance(data, list) else []
@@ -457,19 +459,16 @@ class FMPClient:
         house_trades = []
         senate_trades = []
 
-        for i, symbol in enumerate(symbols):
+        # Symbols are fetched concurrently; the shared 'fmp' client paces the
+        # requests under the plan's rate limit
+        def fetch_symbol(symbol):
+            return self.get_house_trades(symbol), self.get_senate_trades(symbol)
+
+        for i, (house, senate) in enumerate(get_source_client('fmp').map(fetch_symbol, symbols)):
             if (i + 1) % 20 == 0:
                 logger.info(f"  Progress: {i + 1}/{len(symbols)} symbols...")
-
-            # Get house trades
-            trades = self.get_house_trades(symbol)
-            if trades:
-                house_trades.extend(trades)
-
-            # Get senate trades
-            trades = self.get_senate_trades(symbol)
-            if trades:
-                senate_trades.extend(trades)
+            house_trades.extend(house)
+            senate_trades.extend(senate)
 
         # Filter by date if specified
         if from_date or to_date:
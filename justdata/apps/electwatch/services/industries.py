@@ -216,7 +216,6 @@ def api_industry(industry_code):
 
         mapper = get_mapper()
         officials = get_officials()
-        all_firms = get_firms_with_stats()
 
         # Filter officials who have activity in this sector
         sector_officials = []
@@ -277,21 +276,17 @@ def api_industry(industry_code):
         # Sort officials by total (descending)
         sector_officials.sort(key=lambda x: x.get('total', 0), reverse=True)
 
-        # Filter firms by industry
-        sector_firms = []
-        for firm in all_firms:
-            firm_industry = firm.get('industry', '').lower()
-            if firm_industry == sector_code:
-                sector_firms.append({
-                    'name': firm.get('name', ''),
-                    'ticker': firm.get('ticker', ''),
-                    'total': firm.get('total', 0),
-                    'officials_count': firm.get('officials', 0),
-                    'stock_trades': firm.get('stock_trades', 0)
-                })
-
-        # Sort firms by total (descending)
-        sector_firms.sort(key=lambda x: x.get('total', 0), reverse=True)
+        # Firms in this industry, already ordered by total (descending)
+        sector_firms = [
+            {
+                'name': firm.get('name', ''),
+                'ticker': firm.get('ticker', ''),
+                'total': firm.get('total', 0),
+                'officials_count': firm.get('officials', 0),
+                'stock_trades': firm.get('stock_trades', 0)
+            }
+            for firm in get_firms_with_stats(industry=sector_code)
+        ]
 
         # Calculate party split percentages
         total_party = party_totals['R'] + party_totals['D'] + party_totals.get('I', 0)
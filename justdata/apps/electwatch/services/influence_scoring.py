@@ -8,13 +8,19 @@ Calculates a three-dimensional influence score for Congress members based on:
 3. PERSONAL INVOLVEMENT - Trading relative to personal wealth
 
 Each dimension is scored 0-100, with a composite score also 0-100.
+
+Scores are computed column-wise: the engine flattens every official's trades
+and PAC contributions into arrays once, then derives all components, the
+composite and the leaderboard with NumPy/pandas operations. Changing the
+weights only recomputes the composite column.
 """
 
 import logging
-import math
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+
+import numpy as np
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +50,41 @@ class InfluenceScore:
         }
 
 
+def _trade_amount(trade: Dict) -> float:
+    """Lower bound of a trade's disclosed amount range (or its plain amount)."""
+    amount = trade.get('amount', {})
+    if isinstance(amount, dict):
+        return amount.get('min', 0) or 0
+    return amount or 0
+
+
+def _per_official(index: np.ndarray, n: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Sum weights (or count rows) per official index."""
+    return np.bincount(index, weights=weights, minlength=n).astype(float)
+
+
+def percentile_rank_scores(values) -> np.ndarray:
+    """
+    Percentile ranks on a 1-100 scale.
+
+    Tied values share the rank of the first of them in sorted order, and a
+    value of 0 (no activity) always ranks 1.
+
+    Args:
+        values: Raw scores, one per official
+
+    Returns:
+        Integer array of 1-100 ranks in the order of values
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    below = np.searchsorted(np.sort(values), values, side='left')
+    ranks = np.round(((below + 1) / n) * 99 + 1)
+    return np.where(values == 0, 1, ranks).astype(int)
+
+
 class InfluenceScoringEngine:
     """
     Calculates influence scores for Congress members.
@@ -84,10 +125,22 @@ class InfluenceScoringEngine:
     FINANCIAL_SIC_MIN = 6000
     FINANCIAL_SIC_MAX = 6799
 
+    # Data window is Jan 2023 - present (~36 months)
+    TRADE_WINDOW_MONTHS = 36
+
+    # Leaderboard dimension -> score column
+    DIMENSIONS = {
+        'composite': 'composite_score',
+        'scale': 'scale_score',
+        'concentration': 'concentration_score',
+        'personal': 'personal_involvement_score',
+    }
+
     def __init__(self,
                  officials: List[Dict],
                  ticker_classifications: Optional[Dict[str, Dict]] = None,
-                 net_worth_data: Optional[Dict[str, float]] = None):
+                 net_worth_data: Optional[Dict[str, float]] = None,
+                 weights: Optional[Dict[str, float]] = None):
         """
         Initialize the scoring engine.
 
@@ -95,25 +148,32 @@ class InfluenceScoringEngine:
             officials: List of official records with trades, contributions
             ticker_classifications: Dict mapping ticker -> {is_financial, sector, subsector}
             net_worth_data: Dict mapping bioguide_id -> estimated net worth in dollars
+            weights: Composite weights by dimension ('scale', 'concentration',
+                'personal'); missing dimensions keep the class defaults
         """
         self.officials = officials
         self.ticker_classifications = ticker_classifications or {}
         self.net_worth_data = net_worth_data or {}
+        self.weights = {
+            'scale': self.WEIGHT_SCALE,
+            'concentration': self.WEIGHT_CONCENTRATION,
+            'personal': self.WEIGHT_PERSONAL,
+        }
+        self.weights.update(weights or {})
+
+        # Per-official feature matrix, built once for every official
+        self._features = self._build_features(officials)
+        self._positions = {id(official): i for i, official in enumerate(officials)}
 
         # Pre-calculate population statistics for percentile scoring
         self._calculate_population_stats()
+        self._scores = self._score_features(self._features)
 
     def _calculate_population_stats(self):
         """Calculate population-level statistics for percentile scoring."""
-        # Collect all scale values for percentile calculation
-        scale_values = []
-        for official in self.officials:
-            scale = self._calculate_raw_scale(official)
-            if scale > 0:
-                scale_values.append(scale)
-
-        self._scale_values_sorted = sorted(scale_values)
-        self._scale_population_size = len(scale_values)
+        raw_scale = self._features['raw_scale'].to_numpy()
+        self._scale_values_sorted = np.sort(raw_scale[raw_scale > 0])
+        self._scale_population_size = len(self._scale_values_sorted)
 
         logger.info(f"Population stats: {self._scale_population_size} officials with financial activity")
 
@@ -134,276 +194,267 @@ class InfluenceScoringEngine:
             return self.ticker_classifications[ticker].get('subsector')
         return None
 
-    def _calculate_raw_scale(self, official: Dict) -> float:
+    def _build_features(self, officials: List[Dict]) -> pd.DataFrame:
         """
-        Calculate raw scale value (total financial sector dollars).
-
-        Components:
-        - Financial sector stock trades (min amount)
-        - Financial sector PAC contributions
-        - Financial sector individual contributions
+        Flatten officials' trades and PACs into arrays and reduce them to one
+        row of raw features per official (same order as officials).
+
+        Columns:
+        - Scale: financial_trades, financial_pac, financial_individual, raw_scale
+        - Concentration: n_trades, ticker_amount, unique_tickers, top3_amount,
+          top_tickers, subsector_amount, dominant_subsector
+        - Personal involvement: trade_volume, direct_trades
         """
-        total = 0.0
-
-        # Stock trades in financial sector
-        for trade in official.get('trades', []):
-            ticker = trade.get('ticker', '')
-            if self._is_financial_ticker(ticker):
-                amount = trade.get('amount', {})
-                if isinstance(amount, dict):
-                    total += amount.get('min', 0)
-                else:
-                    total += amount or 0
+        n = len(officials)
+        trade_index, tickers, amounts, direct = [], [], [], []
+        pac_index, pac_amounts = [], []
+        for i, official in enumerate(officials):
+            for trade in official.get('trades', []):
+                trade_index.append(i)
+                tickers.append((trade.get('ticker') or '').upper())
+                amounts.append(_trade_amount(trade))
+                owner_type = (trade.get('owner_type') or '').lower()
+                direct.append(owner_type in ('self', 'joint', '') or 'self' in owner_type)
+            for pac in official.get('top_financial_pacs', []):
+                pac_index.append(i)
+                pac_amounts.append(pac.get('amount', 0))
+
+        trade_index = np.asarray(trade_index, dtype=np.int64)
+        amounts = np.asarray(amounts, dtype=float)
+        tickers = np.asarray(tickers, dtype=object)
+
+        # Classify each distinct ticker once
+        codes, unique_tickers = pd.factorize(pd.Series(tickers, dtype=object).str.strip())
+        is_financial = np.array([bool(self._is_financial_ticker(t)) for t in unique_tickers], dtype=bool)
+        subsectors = np.array([self._get_ticker_subsector(t) or '' for t in unique_tickers], dtype=object)
+        trade_financial = is_financial[codes] if len(codes) else np.zeros(0, dtype=bool)
+        trade_subsector = subsectors[codes] if len(codes) else np.zeros(0, dtype=object)
+
+        features = pd.DataFrame({
+            'bioguide_id': [official.get('bioguide_id') for official in officials],
+            'n_trades': _per_official(trade_index, n),
+            'trade_volume': _per_official(trade_index, n, amounts),
+            'direct_trades': _per_official(trade_index, n, np.asarray(direct, dtype=float)),
+            'financial_trades': _per_official(trade_index, n, amounts * trade_financial),
+            'financial_pac': _per_official(np.asarray(pac_index, dtype=np.int64), n,
+                                           np.asarray(pac_amounts, dtype=float)),
+            'financial_individual': [float(o.get('financial_individual_total', 0) or 0) for o in officials],
+        })
+        features['raw_scale'] = (features['financial_trades'] + features['financial_pac'] +
+                                 features['financial_individual'])
+
+        # Concentration only looks at trades with a ticker
+        has_ticker = tickers != ''
+        ticker_trades = pd.DataFrame({
+            'official': trade_index[has_ticker],
+            'ticker': tickers[has_ticker],
+            'subsector': trade_subsector[has_ticker],
+            'amount': amounts[has_ticker],
+            'row': np.arange(int(has_ticker.sum())),
+        })
+        features['ticker_amount'] = _per_official(ticker_trades['official'].to_numpy(), n,
+                                                  ticker_trades['amount'].to_numpy())
+
+        # Per-ticker totals, largest first (ties keep first-traded order)
+        by_ticker = self._ranked_groups(ticker_trades, 'ticker')
+        features['unique_tickers'] = _per_official(by_ticker['official'].to_numpy(), n)
+        top3 = by_ticker[by_ticker.groupby('official').cumcount() < 3]
+        features['top3_amount'] = _per_official(top3['official'].to_numpy(), n, top3['amount'].to_numpy())
+        top_tickers = {}
+        for official, ticker in zip(top3['official'].to_numpy(), top3['ticker'].to_numpy()):
+            top_tickers.setdefault(official, []).append(ticker)
+        features['top_tickers'] = [top_tickers.get(i, []) for i in range(n)]
+
+        # Dominant subsector (largest total; ties keep first-traded order)
+        by_subsector = self._ranked_groups(ticker_trades[ticker_trades['subsector'] != ''], 'subsector')
+        dominant = by_subsector.drop_duplicates('official').set_index('official')
+        features['subsector_amount'] = dominant['amount'].reindex(range(n), fill_value=0.0).to_numpy()
+        dominant_subsector = dominant['subsector'].to_dict()
+        features['dominant_subsector'] = [dominant_subsector.get(i) for i in range(n)]
+        return features
+
+    @staticmethod
+    def _ranked_groups(trades: pd.DataFrame, key: str) -> pd.DataFrame:
+        """Sum trade amounts per (official, key), ordered by official then amount descending."""
+        groups = trades.groupby(['official', key], sort=False).agg(
+            amount=('amount', 'sum'), first=('row', 'min')
+        ).reset_index()
+        order = np.lexsort((groups['first'].to_numpy(), -groups['amount'].to_numpy(),
+                            groups['official'].to_numpy()))
+        return groups.iloc[order].reset_index(drop=True)
+
+    def _score_features(self, features: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute every dimension for a feature matrix in column operations.
 
-        # Financial PAC contributions (already filtered to financial in pipeline)
-        for pac in official.get('top_financial_pacs', []):
-            total += pac.get('amount', 0)
+        Scale percentiles are ranked against this engine's population, so
+        officials outside it can be scored on the same scale.
+        """
+        n_trades = features['n_trades'].to_numpy()
+        has_trades = n_trades > 0
+        scores = pd.DataFrame({'bioguide_id': features['bioguide_id']})
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # SCALE: percentile of raw dollars among officials with activity
+            raw_scale = features['raw_scale'].to_numpy()
+            if self._scale_population_size > 0:
+                position = np.searchsorted(self._scale_values_sorted, raw_scale, side='right')
+                percentile = (position / self._scale_population_size) * 100
+            else:
+                percentile = np.zeros(len(raw_scale))
+            scores['percentile'] = np.where(raw_scale == 0, 0.0, percentile)
+            scores['scale_score'] = scores['percentile']
+
+            # CONCENTRATION: 50% top3, 30% subsector, 20% repeat
+            ticker_amount = features['ticker_amount'].to_numpy()
+            scores['top3_concentration'] = np.where(
+                ticker_amount > 0, features['top3_amount'].to_numpy() / ticker_amount * 100, 0.0)
+            scores['subsector_concentration'] = np.where(
+                ticker_amount > 0, features['subsector_amount'].to_numpy() / ticker_amount * 100, 0.0)
+            unique_tickers = features['unique_tickers'].to_numpy()
+            scores['repeat_trading_ratio'] = np.where(unique_tickers > 0, n_trades / unique_tickers, 0.0)
+            # Normalize: 1 trade per ticker = 0, 10+ trades per ticker = 100
+            repeat_score = np.minimum(100, (scores['repeat_trading_ratio'].to_numpy() - 1) * 11.1)
+            scores['concentration_score'] = np.where(has_trades, (
+                scores['top3_concentration'] * 0.5 +
+                scores['subsector_concentration'] * 0.3 +
+                repeat_score * 0.2
+            ), 0.0)
+
+            # PERSONAL INVOLVEMENT: trading relative to wealth, frequency, direct ownership
+            net_worth = np.array([self.net_worth_data.get(b) or np.nan for b in features['bioguide_id']],
+                                 dtype=float)
+            net_worth_available = net_worth > 0
+            trade_volume = features['trade_volume'].to_numpy()
+            scores['trade_to_wealth_ratio'] = np.where(net_worth_available, (trade_volume / net_worth) * 100, np.nan)
+            # Cap at 100% for scoring
+            wealth_score = np.minimum(100, scores['trade_to_wealth_ratio'].to_numpy())
+            scores['trades_per_month'] = n_trades / self.TRADE_WINDOW_MONTHS
+            # Normalize: 0 = 0, 10+ per month = 100
+            frequency_score = np.minimum(100, scores['trades_per_month'].to_numpy() * 10)
+            scores['direct_ownership_ratio'] = np.where(
+                has_trades, features['direct_trades'].to_numpy() / n_trades * 100, 0.0)
+            direct_ratio = scores['direct_ownership_ratio'].to_numpy()
+            scores['personal_involvement_score'] = np.where(
+                has_trades,
+                np.where(net_worth_available,
+                         wealth_score * 0.5 + frequency_score * 0.3 + direct_ratio * 0.2,
+                         # Without net worth, weight frequency more
+                         frequency_score * 0.6 + direct_ratio * 0.4),
+                0.0)
+            scores['net_worth_available'] = net_worth_available
+
+        scores['composite_score'] = self._composite(scores)
+        return scores
 
-        # Financial individual contributions
-        total += official.get('financial_individual_total', 0)
+    def _composite(self, scores: pd.DataFrame) -> pd.Series:
+        return (scores['scale_score'] * self.weights['scale'] +
+                scores['concentration_score'] * self.weights['concentration'] +
+                scores['personal_involvement_score'] * self.weights['personal'])
 
-        return total
+    def set_weights(self, **weights: float):
+        """
+        Change composite weights ('scale', 'concentration', 'personal').
 
-    def _calculate_scale_score(self, official: Dict) -> Tuple[float, Dict]:
+        Only the composite column is recomputed; the dimension scores stay.
         """
-        Calculate scale score (0-100) based on percentile ranking.
+        unknown = set(weights) - set(self.weights)
+        if unknown:
+            raise ValueError(f"Unknown score dimensions: {sorted(unknown)}")
+        self.weights.update(weights)
+        self._scores['composite_score'] = self._composite(self._scores)
 
-        Uses log-scaled values to handle the wide range of activity levels.
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Scores and raw features for every official, one row each (same order
+        as officials), for bulk analysis and exports.
         """
-        raw_scale = self._calculate_raw_scale(official)
+        features = self._features.drop(columns=['bioguide_id'])
+        return pd.concat([self._scores, features], axis=1)
 
-        if raw_scale == 0:
-            return 0.0, {
+    def _to_score(self, scores: Dict, features: Dict, bioguide_id: Optional[str]) -> InfluenceScore:
+        """Build the InfluenceScore (with detail dicts) for one row of scores/features."""
+        if features['raw_scale'] == 0:
+            scale_details = {
                 'raw_dollars': 0,
                 'percentile': 0,
                 'financial_trades_dollars': 0,
                 'financial_pac_dollars': 0,
                 'financial_individual_dollars': 0,
             }
+        else:
+            scale_details = {
+                'raw_dollars': round(float(features['raw_scale']), 2),
+                'percentile': round(float(scores['percentile']), 1),
+                'financial_trades_dollars': round(float(features['financial_trades']), 2),
+                'financial_pac_dollars': round(float(features['financial_pac']), 2),
+                'financial_individual_dollars': round(float(features['financial_individual']), 2),
+            }
 
-        # Calculate percentile
-        # Find position in sorted list
-        position = 0
-        for val in self._scale_values_sorted:
-            if val <= raw_scale:
-                position += 1
-            else:
-                break
-
-        percentile = (position / self._scale_population_size) * 100 if self._scale_population_size > 0 else 0
-
-        # Component breakdown
-        financial_trades = sum(
-            (t.get('amount', {}).get('min', 0) if isinstance(t.get('amount'), dict) else t.get('amount', 0))
-            for t in official.get('trades', [])
-            if self._is_financial_ticker(t.get('ticker', ''))
-        )
-
-        financial_pac = sum(p.get('amount', 0) for p in official.get('top_financial_pacs', []))
-        financial_individual = official.get('financial_individual_total', 0)
-
-        details = {
-            'raw_dollars': round(raw_scale, 2),
-            'percentile': round(percentile, 1),
-            'financial_trades_dollars': round(financial_trades, 2),
-            'financial_pac_dollars': round(financial_pac, 2),
-            'financial_individual_dollars': round(financial_individual, 2),
-        }
-
-        return percentile, details
-
-    def _calculate_concentration_score(self, official: Dict) -> Tuple[float, Dict]:
-        """
-        Calculate concentration score (0-100).
-
-        Higher concentration = higher score (more focused on specific entities).
-
-        Components:
-        - Top 3 ticker concentration (% of trade value in top 3 tickers)
-        - Subsector concentration (% in dominant subsector)
-        - Repeat trading (average trades per ticker)
-        """
-        trades = official.get('trades', [])
-
-        if not trades:
-            return 0.0, {
+        if not features['n_trades']:
+            concentration_details = {
                 'top3_concentration': 0,
                 'subsector_concentration': 0,
                 'repeat_trading_ratio': 0,
                 'top_tickers': [],
                 'dominant_subsector': None,
             }
-
-        # Calculate ticker concentration
-        ticker_amounts = defaultdict(float)
-        ticker_counts = defaultdict(int)
-        subsector_amounts = defaultdict(float)
-
-        total_amount = 0
-        for trade in trades:
-            ticker = trade.get('ticker', '').upper()
-            if not ticker:
-                continue
-
-            amount = trade.get('amount', {})
-            if isinstance(amount, dict):
-                amt = amount.get('min', 0)
-            else:
-                amt = amount or 0
-
-            ticker_amounts[ticker] += amt
-            ticker_counts[ticker] += 1
-            total_amount += amt
-
-            subsector = self._get_ticker_subsector(ticker)
-            if subsector:
-                subsector_amounts[subsector] += amt
-
-        # Top 3 ticker concentration
-        sorted_tickers = sorted(ticker_amounts.items(), key=lambda x: -x[1])
-        top3 = sorted_tickers[:3]
-        top3_amount = sum(amt for _, amt in top3)
-        top3_concentration = (top3_amount / total_amount * 100) if total_amount > 0 else 0
-
-        # Subsector concentration
-        if subsector_amounts:
-            dominant_subsector = max(subsector_amounts.items(), key=lambda x: x[1])
-            subsector_concentration = (dominant_subsector[1] / total_amount * 100) if total_amount > 0 else 0
-            dominant_subsector_name = dominant_subsector[0]
-        else:
-            subsector_concentration = 0
-            dominant_subsector_name = None
-
-        # Repeat trading ratio (avg trades per ticker, normalized)
-        unique_tickers = len(ticker_counts)
-        total_trades = len(trades)
-        repeat_ratio = (total_trades / unique_tickers) if unique_tickers > 0 else 0
-        # Normalize: 1 trade per ticker = 0, 10+ trades per ticker = 100
-        repeat_score = min(100, (repeat_ratio - 1) * 11.1)
-
-        # Composite concentration score
-        # Weight: 50% top3, 30% subsector, 20% repeat
-        concentration_score = (
-            top3_concentration * 0.5 +
-            subsector_concentration * 0.3 +
-            repeat_score * 0.2
-        )
-
-        details = {
-            'top3_concentration': round(top3_concentration, 1),
-            'subsector_concentration': round(subsector_concentration, 1),
-            'repeat_trading_ratio': round(repeat_ratio, 2),
-            'top_tickers': [t[0] for t in top3],
-            'dominant_subsector': dominant_subsector_name,
-        }
-
-        return concentration_score, details
-
-    def _calculate_personal_involvement_score(self, official: Dict) -> Tuple[float, Dict]:
-        """
-        Calculate personal involvement score (0-100).
-
-        Measures trading activity relative to personal wealth.
-
-        Components:
-        - Trade volume as % of net worth (if available)
-        - Trading frequency (trades per month)
-        - Direct ownership ratio (vs spouse/dependent)
-        """
-        trades = official.get('trades', [])
-        bioguide_id = official.get('bioguide_id', '')
-
-        if not trades:
-            return 0.0, {
+            personal_details = {
                 'trade_to_wealth_ratio': None,
                 'trades_per_month': 0,
                 'direct_ownership_ratio': 0,
                 'net_worth_available': False,
             }
-
-        # Calculate total trade volume
-        total_trade_volume = 0
-        direct_trades = 0
-
-        for trade in trades:
-            amount = trade.get('amount', {})
-            if isinstance(amount, dict):
-                total_trade_volume += amount.get('min', 0)
-            else:
-                total_trade_volume += amount or 0
-
-            owner_type = trade.get('owner_type', '').lower()
-            if owner_type in ['self', 'joint', ''] or 'self' in owner_type:
-                direct_trades += 1
-
-        # Trade to wealth ratio
-        net_worth = self.net_worth_data.get(bioguide_id)
-        if net_worth and net_worth > 0:
-            trade_to_wealth = (total_trade_volume / net_worth) * 100
-            # Cap at 100% for scoring
-            wealth_score = min(100, trade_to_wealth)
-            net_worth_available = True
         else:
-            trade_to_wealth = None
-            wealth_score = 50  # Neutral if unknown
-            net_worth_available = False
-
-        # Trading frequency (trades per month over 3-year window)
-        # Data window is Jan 2023 - present (~36 months)
-        months = 36
-        trades_per_month = len(trades) / months
-        # Normalize: 0 = 0, 10+ per month = 100
-        frequency_score = min(100, trades_per_month * 10)
-
-        # Direct ownership ratio
-        direct_ratio = (direct_trades / len(trades) * 100) if trades else 0
-
-        # Composite score
-        if net_worth_available:
-            # Weight: 50% wealth ratio, 30% frequency, 20% direct ownership
-            score = wealth_score * 0.5 + frequency_score * 0.3 + direct_ratio * 0.2
-        else:
-            # Without net worth, weight frequency more
-            score = frequency_score * 0.6 + direct_ratio * 0.4
-
-        details = {
-            'trade_to_wealth_ratio': round(trade_to_wealth, 2) if trade_to_wealth else None,
-            'total_trade_volume': round(total_trade_volume, 2),
-            'trades_per_month': round(trades_per_month, 2),
-            'direct_ownership_ratio': round(direct_ratio, 1),
-            'net_worth': net_worth,
-            'net_worth_available': net_worth_available,
-        }
+            concentration_details = {
+                'top3_concentration': round(float(scores['top3_concentration']), 1),
+                'subsector_concentration': round(float(scores['subsector_concentration']), 1),
+                'repeat_trading_ratio': round(float(scores['repeat_trading_ratio']), 2),
+                'top_tickers': list(features['top_tickers']),
+                'dominant_subsector': features['dominant_subsector'] if isinstance(features['dominant_subsector'], str) else None,
+            }
+            trade_to_wealth = scores['trade_to_wealth_ratio']
+            if np.isnan(trade_to_wealth):
+                trade_to_wealth = None
+            personal_details = {
+                'trade_to_wealth_ratio': round(float(trade_to_wealth), 2) if trade_to_wealth else None,
+                'total_trade_volume': round(float(features['trade_volume']), 2),
+                'trades_per_month': round(float(scores['trades_per_month']), 2),
+                'direct_ownership_ratio': round(float(scores['direct_ownership_ratio']), 1),
+                'net_worth': self.net_worth_data.get(bioguide_id or ''),
+                'net_worth_available': bool(scores['net_worth_available']),
+            }
 
-        return score, details
+        return InfluenceScore(
+            scale_score=float(scores['scale_score']),
+            concentration_score=float(scores['concentration_score']),
+            personal_involvement_score=float(scores['personal_involvement_score']),
+            composite_score=float(scores['composite_score']),
+            scale_details=scale_details,
+            concentration_details=concentration_details,
+            personal_involvement_details=personal_details,
+        )
+
+    def _score_at(self, i: int) -> InfluenceScore:
+        return self._to_score(self._scores.iloc[i].to_dict(), self._features.iloc[i].to_dict(),
+                              self._features['bioguide_id'].iat[i])
 
     def calculate_score(self, official: Dict) -> InfluenceScore:
         """
         Calculate the complete influence score for an official.
 
+        Officials the engine was built with are read from the precomputed
+        scores; others are scored against the same population.
+
         Returns:
             InfluenceScore with all three dimensions and composite
         """
-        scale_score, scale_details = self._calculate_scale_score(official)
-        concentration_score, concentration_details = self._calculate_concentration_score(official)
-        personal_score, personal_details = self._calculate_personal_involvement_score(official)
-
-        # Weighted composite
-        composite = (
-            scale_score * self.WEIGHT_SCALE +
-            concentration_score * self.WEIGHT_CONCENTRATION +
-            personal_score * self.WEIGHT_PERSONAL
-        )
-
-        return InfluenceScore(
-            scale_score=scale_score,
-            concentration_score=concentration_score,
-            personal_involvement_score=personal_score,
-            composite_score=composite,
-            scale_details=scale_details,
-            concentration_details=concentration_details,
-            personal_involvement_details=personal_details,
-        )
+        i = self._positions.get(id(official))
+        if i is not None:
+            return self._score_at(i)
+        features = self._build_features([official])
+        scores = self._score_features(features)
+        return self._to_score(scores.iloc[0].to_dict(), features.iloc[0].to_dict(), official.get('bioguide_id'))
 
     def calculate_all_scores(self) -> Dict[str, InfluenceScore]:
         """
@@ -413,10 +464,10 @@ class InfluenceScoringEngine:
             Dict mapping bioguide_id -> InfluenceScore
         """
         scores = {}
-        for official in self.officials:
-            bioguide_id = official.get('bioguide_id')
+        for row_scores, row_features in zip(self._scores.to_dict('records'), self._features.to_dict('records')):
+            bioguide_id = row_features['bioguide_id']
             if bioguide_id:
-                scores[bioguide_id] = self.calculate_score(official)
+                scores[bioguide_id] = self._to_score(row_scores, row_features, bioguide_id)
 
         logger.info(f"Calculated influence scores for {len(scores)} officials")
         return scores
@@ -434,28 +485,37 @@ class InfluenceScoringEngine:
         Returns:
             List of (official, score) tuples, sorted descending
         """
-        results = []
-
-        for official in self.officials:
-            score = self.calculate_score(official)
-
-            if dimension == 'composite':
-                sort_value = score.composite_score
-            elif dimension == 'scale':
-                sort_value = score.scale_score
-            elif dimension == 'concentration':
-                sort_value = score.concentration_score
-            elif dimension == 'personal':
-                sort_value = score.personal_involvement_score
-            else:
-                sort_value = score.composite_score
+        column = self.DIMENSIONS.get(dimension, 'composite_score')
+        # Stable sort keeps officials' input order among ties
+        order = np.argsort(-self._scores[column].to_numpy(), kind='stable')[:limit]
+        return [(self.officials[i], self._score_at(i)) for i in order]
+
 
-            results.append((official, score, sort_value))
+def score_snapshots(snapshots: Dict[str, List[Dict]],
+                    ticker_classifications: Optional[Dict[str, Dict]] = None,
+                    net_worth_data: Optional[Dict[str, float]] = None,
+                    weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Score several officials snapshots (e.g. historical weekly runs) in bulk.
 
-        # Sort by the chosen dimension
-        results.sort(key=lambda x: -x[2])
+    Each snapshot is ranked against its own population.
 
-        return [(official, score) for official, score, _ in results[:limit]]
+    Args:
+        snapshots: Dict mapping snapshot label (e.g. '2026-01-31') -> officials
+        ticker_classifications: As for InfluenceScoringEngine
+        net_worth_data: As for InfluenceScoringEngine
+        weights: As for InfluenceScoringEngine
+
+    Returns:
+        DataFrame of InfluenceScoringEngine.to_frame() rows with a 'snapshot' column
+    """
+    frames = []
+    for label, officials in snapshots.items():
+        engine = InfluenceScoringEngine(officials, ticker_classifications, net_worth_data, weights)
+        frame = engine.to_frame()
+        frame.insert(0, 'snapshot', label)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
 
 def test_scoring():
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compiled multi-keyword substring matcher for ElectWatch classifiers.
+
+The financial-sector classifiers (fec_bulk_loader.is_financial_sector,
+FECBulkProcessor.is_financial_entity, PACClassifier) all ask the same
+question of tens of millions of contribution rows: "which keyword in this
+ordered list is the first one contained in the text?". Checking each keyword
+with a Python `in` loop costs one pass per keyword; here the whole list is
+compiled into a regex (a prefix trie for the "any keyword?" check, an
+ordered alternation to rank hits) and results are memoized, since employer and
+occupation strings repeat heavily.
+
+Matching semantics are identical to the loops they replace: the keyword
+returned is the one with the lowest index in the list that occurs anywhere
+in the text (not the one that occurs earliest in the text). Matching is
+case-sensitive; callers normalize case exactly as before.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+MEMO_SIZE = 200_000
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regex matching any of the keywords, factored into a prefix trie.
+
+    A flat alternation makes the regex engine try every keyword at every
+    position; the trie form only follows branches whose prefix matches.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return f'(?:{body})?'
+        return body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """An ordered keyword list compiled into regexes, with memoized lookups."""
+
+    def __init__(self, keywords: Sequence[str], memo_size: int = MEMO_SIZE):
+        """
+        Args:
+            keywords: Keywords in priority order (duplicates keep their first position)
+            memo_size: Distinct texts remembered per matcher
+        """
+        self.keywords: List[str] = []
+        self._rank: Dict[str, int] = {}
+        for keyword in keywords:
+            if keyword and keyword not in self._rank:
+                self._rank[keyword] = len(self.keywords)
+                self.keywords.append(keyword)
+
+        alternation = '|'.join(re.escape(k) for k in self.keywords)
+        # Trie search answers "any keyword?" for the common non-matching case.
+        self._any = re.compile(_trie_pattern(self.keywords)) if self.keywords else None
+        # A zero-width lookahead reports, at every position, the highest-priority
+        # keyword starting there (alternation is tried in list order), so
+        # overlapping keywords are all seen.
+        self._every = re.compile(f'(?=({alternation}))') if self.keywords else None
+        self.first = lru_cache(maxsize=memo_size)(self._first)
+
+    def _first(self, text: str) -> Optional[str]:
+        found = self._any.search(text) if text and self._any is not None else None
+        if found is None:
+            return None
+        # No keyword starts before the leftmost hit
+        return min((m.group(1) for m in self._every.finditer(text, found.start())), key=self._rank.__getitem__)
+
+    def contains_any(self, text: str) -> bool:
+        """True if any keyword occurs in text."""
+        return self.first(text) is not None
+
+    def first_many(self, texts: Iterable[str]) -> pd.Series:
+        """
+        Batch version of first() over a column of strings.
+
+        Each distinct value is matched once.
+
+        Args:
+            texts: Series or iterable of strings (None/NaN allowed)
+
+        Returns:
+            Series (aligned with texts when it is a Series) of the matched
+            keyword or None
+        """
+        series = texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object)
+        values = series.fillna('').astype(str)
+        lookup = {value: self.first(value) for value in values.unique()}
+        matched = values.map(lookup).astype(object)
+        return matched.where(matched.notna(), None)
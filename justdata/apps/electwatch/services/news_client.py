@@ -18,12 +18,13 @@ Sources are tiered by reliability:
 import logging
 import os
 import re
-import requests
 from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
 from collections import defaultdict
 
+from justdata.apps.electwatch.services.source_http import get_source_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -349,7 +350,7 @@ class NewsClient:
         from_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
         try:
-            response = requests.get(
+            response = get_source_client('newsapi').get(
                 f"{self.NEWSAPI_BASE}/everything",
                 params={
                     'apiKey': self.api_key,
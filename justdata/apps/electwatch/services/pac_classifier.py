@@ -14,6 +14,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from justdata.apps.electwatch.services.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 # Cache directory
@@ -222,6 +224,36 @@ EXCLUSION_PATTERNS = [
 ]
 
 
+# Generic financial keyword matching (lower confidence)
+# Aligned with FINANCIAL_SECTORS: banking, mortgage, consumer_lending, investment,
+# insurance, crypto, fintech, proptech, payments
+GENERIC_KEYWORDS = [
+    ('BANK', 'banking', 'unknown'),
+    ('CREDIT', 'consumer_lending', 'unknown'),
+    ('INSURANCE', 'insurance', 'unknown'),
+    ('INVESTMENT', 'investment', 'unknown'),
+    ('SECURITIES', 'investment', 'unknown'),
+    ('MORTGAGE', 'mortgage', 'unknown'),
+    ('FINANCIAL', 'fintech', 'unknown'),
+    ('REALTOR', 'mortgage', 'unknown'),
+    ('REALTY', 'mortgage', 'unknown'),
+    ('CRYPTO', 'crypto', 'unknown'),
+    ('BLOCKCHAIN', 'crypto', 'unknown'),
+    ('FINTECH', 'fintech', 'unknown'),
+    ('PAYMENT', 'payments', 'unknown'),
+]
+
+# Pattern lists compiled once (first keyword in list order wins, as before)
+_PATTERN_SECTORS: Dict[str, Tuple[str, str]] = {}
+for _keywords, _sector, _subsector in FINANCIAL_PATTERNS:
+    for _kw in _keywords:
+        _PATTERN_SECTORS.setdefault(_kw, (_sector, _subsector))
+_PATTERN_MATCHER = KeywordMatcher([kw for keywords, _, _ in FINANCIAL_PATTERNS for kw in keywords])
+_GENERIC_SECTORS = {kw: (sector, subsector) for kw, sector, subsector in GENERIC_KEYWORDS}
+_GENERIC_MATCHER = KeywordMatcher([kw for kw, _, _ in GENERIC_KEYWORDS])
+_EXCLUSION_MATCHER = KeywordMatcher(EXCLUSION_PATTERNS)
+
+
 class PACClassifier:
     """Classifies PACs into financial sector subsectors."""
 
@@ -269,57 +301,23 @@ class PACClassifier:
         }
 
         # Check exclusions first
-        for exclusion in EXCLUSION_PATTERNS:
-            if exclusion in pac_name or exclusion in connected_org.upper():
-                self._cache[cache_key] = result
-                return result
+        if _EXCLUSION_MATCHER.contains_any(pac_name) or _EXCLUSION_MATCHER.contains_any(connected_org.upper()):
+            self._cache[cache_key] = result
+            return result
 
-        # Try matching patterns
+        # Try matching patterns, then generic financial keywords (lower confidence)
         names_to_check = [pac_name, connected_org.upper()]
 
-        for name in names_to_check:
-            if not name:
-                continue
-
-            for keywords, sector, subsector in FINANCIAL_PATTERNS:
-                for kw in keywords:
-                    if kw in name:
-                        result['is_financial'] = True
-                        result['sector'] = sector
-                        result['subsector'] = subsector
-                        result['confidence'] = 'high' if len(kw) > 5 else 'medium'
-                        self._cache[cache_key] = result
-                        return result
-
-        # Generic financial keyword matching (lower confidence)
-        # Aligned with FINANCIAL_SECTORS: banking, mortgage, consumer_lending, investment,
-        # insurance, crypto, fintech, proptech, payments
-        GENERIC_KEYWORDS = [
-            ('BANK', 'banking', 'unknown'),
-            ('CREDIT', 'consumer_lending', 'unknown'),
-            ('INSURANCE', 'insurance', 'unknown'),
-            ('INVESTMENT', 'investment', 'unknown'),
-            ('SECURITIES', 'investment', 'unknown'),
-            ('MORTGAGE', 'mortgage', 'unknown'),
-            ('FINANCIAL', 'fintech', 'unknown'),
-            ('REALTOR', 'mortgage', 'unknown'),
-            ('REALTY', 'mortgage', 'unknown'),
-            ('CRYPTO', 'crypto', 'unknown'),
-            ('BLOCKCHAIN', 'crypto', 'unknown'),
-            ('FINTECH', 'fintech', 'unknown'),
-            ('PAYMENT', 'payments', 'unknown'),
-        ]
-
-        for name in names_to_check:
-            if not name:
-                continue
-
-            for kw, sector, subsector in GENERIC_KEYWORDS:
-                if kw in name:
+        for matcher, sectors in ((_PATTERN_MATCHER, _PATTERN_SECTORS), (_GENERIC_MATCHER, _GENERIC_SECTORS)):
+            for name in names_to_check:
+                kw = matcher.first(name)
+                if kw:
                     result['is_financial'] = True
-                    result['sector'] = sector
-                    result['subsector'] = subsector
-                    result['confidence'] = 'low'
+                    result['sector'], result['subsector'] = sectors[kw]
+                    if matcher is _GENERIC_MATCHER:
+                        result['confidence'] = 'low'
+                    else:
+                        result['confidence'] = 'high' if len(kw) > 5 else 'medium'
                     self._cache[cache_key] = result
                     return result
 
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Watermarks and content hashes for incremental ElectWatch pipeline runs.
+
+Each run records what it consumed so the next one only redoes what changed:
+
+- FEC bulk files: a fingerprint (size plus a hash of the first and last MB)
+  and the highest sub_id loaded from the file
+- Stock trades: a hash of the fetched trades and the latest trade date
+- Officials: one hash over the fields that feed scores and AI text
+- AI summaries: the hash of each section's prompt inputs and the text
+
+The state is a small JSON document kept next to the phase cache and
+mirrored to GCS, since the weekly job runs in a fresh container. It is
+only saved after a successful run, so a failed run is redone in full.
+
+The weekly coordinator and the standalone FEC bulk loader share the
+document, so save() re-reads it and writes back only the entries this
+instance changed; a run never overwrites another job's watermarks.
+
+Settings (environment):
+    ELECTWATCH_STATE_PATH     Local state file (default data/cache/pipeline_state.json)
+    ELECTWATCH_STATE_GCS      '0' keeps the state on local disk only
+    ELECTWATCH_STATE_BUCKET   GCS bucket for the state (default GCS_BUCKET_NAME)
+
+Usage:
+    from justdata.apps.electwatch.services.pipeline_state import PipelineState
+
+    state = PipelineState.load()
+    changed = state.changed_officials(officials)
+    ...
+    state.save()
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from justdata.apps.electwatch.config import APP_DIR
+
+logger = logging.getLogger(__name__)
+
+STATE_FORMAT = 1
+STATE_PATH = Path(os.getenv('ELECTWATCH_STATE_PATH') or APP_DIR / 'data' / 'cache' / 'pipeline_state.json')
+STATE_GCS = os.getenv('ELECTWATCH_STATE_GCS', '1') != '0'
+STATE_BUCKET = os.getenv('ELECTWATCH_STATE_BUCKET') or None
+STATE_BLOB = 'electwatch/pipeline_state.json'
+
+# Bytes hashed at each end of a file for its fingerprint
+FINGERPRINT_SAMPLE_BYTES = 1024 * 1024
+
+# Official fields that feed scores, firm/industry stats and AI text
+OFFICIAL_INPUT_FIELDS = (
+    'name', 'party', 'state', 'chamber', 'committees', 'fec_candidate_id',
+    'trades', 'total_trades', 'purchase_count', 'sale_count',
+    'stock_trades_display', 'stock_trades_max', 'purchases_max',
+    'contributions', 'pac_contributions', 'financial_sector_pac', 'top_financial_pacs',
+    'individual_contributions_total', 'individual_financial_total', 'top_individual_financial',
+    'involvement_score',
+)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, set):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def content_hash(value: Any) -> str:
+    """Stable SHA-256 of a JSON-serializable value (key order does not matter)."""
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), default=_json_default)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(path: Union[str, Path], sample_bytes: int = FINGERPRINT_SAMPLE_BYTES) -> Dict[str, Any]:
+    """
+    Cheap content fingerprint of a (large) file.
+
+    Re-extracting the same zip changes mtime but not the fingerprint; a new
+    FEC export changes its size or its first/last rows.
+
+    Returns:
+        {'size': bytes, 'digest': SHA-256 of size, head and tail}
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, 'rb') as f:
+        digest.update(f.read(sample_bytes))
+        if size > sample_bytes:
+            f.seek(max(size - sample_bytes, sample_bytes))
+            digest.update(f.read(sample_bytes))
+    return {'size': size, 'digest': digest.hexdigest()}
+
+
+def official_input_hash(official: Dict) -> str:
+    """Hash of the official fields listed in OFFICIAL_INPUT_FIELDS."""
+    return content_hash({field: official.get(field) for field in OFFICIAL_INPUT_FIELDS})
+
+
+def trade_watermark(trades: List[Dict]) -> Dict[str, Any]:
+    """
+    Watermark for a full trade pull: count, latest transaction date and a
+    hash that does not depend on the order the API returned the trades in.
+    """
+    hashes = sorted(content_hash(trade) for trade in trades)
+    dates = [str(t.get('transaction_date') or '') for t in trades]
+    return {
+        'count': len(trades),
+        'last_trade_date': max(dates) if dates else '',
+        'hash': content_hash(hashes),
+    }
+
+
+class PipelineState:
+    """Watermarks and input hashes from the last successful pipeline run."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, path: Union[str, Path] = STATE_PATH,
+                 bucket_name: Optional[str] = STATE_BUCKET, use_gcs: bool = STATE_GCS):
+        """
+        Args:
+            data: Previously saved state (None starts empty - everything is new)
+            path: Local state file
+            bucket_name: GCS bucket for the state
+            use_gcs: Read/write the state in GCS as well
+        """
+        self.path = Path(path)
+        self.bucket_name = bucket_name
+        self.use_gcs = use_gcs
+        self.data = {'format': STATE_FORMAT, 'sources': {}, 'officials': {}, 'summaries': {}}
+        if data and data.get('format') == STATE_FORMAT:
+            self.data.update(data)
+        # Entries this instance set or removed ((section, key)), and sections it replaced
+        self._changed: Set[Tuple[str, str]] = set()
+        self._replaced: Set[str] = set()
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = STATE_PATH, bucket_name: Optional[str] = STATE_BUCKET,
+             use_gcs: bool = STATE_GCS) -> 'PipelineState':
+        """
+        Load the saved state, preferring GCS (shared by all job runs) over the
+        local file. An unreadable or missing state loads empty.
+        """
+        state = cls(path=path, bucket_name=bucket_name, use_gcs=use_gcs)
+        raw = None
+        if use_gcs:
+            try:
+                from justdata.shared.utils.gcs_storage import get_bucket
+                blob = get_bucket(bucket_name).blob(STATE_BLOB)
+                if blob.exists():
+                    raw = blob.download_as_text()
+            except Exception as e:
+                logger.warning(f"Could not read pipeline state from GCS: {e}")
+        if raw is None and state.path.exists():
+            try:
+                raw = state.path.read_text()
+            except Exception as e:
+                logger.warning(f"Could not read pipeline state {state.path}: {e}")
+        if raw:
+            try:
+                return cls(json.loads(raw), path=path, bucket_name=bucket_name, use_gcs=use_gcs)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable pipeline state: {e}")
+        return state
+
+    def _merge_saved(self):
+        """Apply this instance's changes on top of the currently saved state."""
+        saved = PipelineState.load(self.path, self.bucket_name, self.use_gcs).data
+        for section in self._replaced:
+            saved[section] = self.data[section]
+        for section, key in self._changed:
+            if section in self._replaced:
+                continue
+            if key in self.data[section]:
+                saved[section][key] = self.data[section][key]
+            else:
+                saved[section].pop(key, None)
+        self.data = saved
+
+    def save(self) -> bool:
+        """
+        Write the state locally and to GCS; failures are logged.
+
+        Only entries changed through this instance are written; everything
+        else keeps its currently saved value (another job may have advanced it).
+        """
+        self._merge_saved()
+        self.data['saved_at'] = datetime.now().isoformat()
+        raw = json.dumps(self.data, indent=2, sort_keys=True, default=_json_default)
+        saved = True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(raw)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logger.warning(f"Could not write pipeline state {self.path}: {e}")
+            saved = False
+        if self.use_gcs:
+            try:
+                from justdata.shared.utils.gcs_storage import get_bucket
+                get_bucket(self.bucket_name).blob(STATE_BLOB).upload_from_string(
+                    raw, content_type='application/json'
+                )
+            except Exception as e:
+                logger.warning(f"Could not write pipeline state to GCS: {e}")
+                saved = False
+        return saved
+
+    # Sources (FEC files, trade pulls)
+
+    def source(self, key: str) -> Dict[str, Any]:
+        """Watermark recorded for a source ({} if never seen)."""
+        return dict(self.data['sources'].get(key) or {})
+
+    def set_source(self, key: str, values: Dict[str, Any]):
+        self.data['sources'][key] = dict(values, recorded_at=datetime.now().isoformat())
+        self._changed.add(('sources', key))
+
+    def clear_sources(self, prefix: str = ''):
+        """Forget source watermarks (all, or those whose key starts with prefix)."""
+        for key in [k for k in self.data['sources'] if k.startswith(prefix)]:
+            del self.data['sources'][key]
+            self._changed.add(('sources', key))
+
+    # Officials
+
+    def changed_officials(self, officials: Iterable[Dict]) -> Set[str]:
+        """
+        Record each official's input hash and return the bioguide ids that are
+        new or whose inputs differ from the last run. Officials no longer
+        present are forgotten.
+        """
+        previous = self.data['officials']
+        current = {}
+        changed = set()
+        for official in officials:
+            bioguide_id = official.get('bioguide_id')
+            if not bioguide_id:
+                continue
+            current[bioguide_id] = official_input_hash(official)
+            if previous.get(bioguide_id) != current[bioguide_id]:
+                changed.add(bioguide_id)
+        self.data['officials'] = current
+        self._replaced.add('officials')
+        return changed
+
+    # AI summary sections
+
+    def summary(self, section: str, inputs_hash: str) -> Optional[str]:
+        """Text generated last run for a section, if its inputs are unchanged."""
+        entry = self.data['summaries'].get(section) or {}
+        return entry.get('text') if entry.get('hash') == inputs_hash else None
+
+    def set_summary(self, section: str, inputs_hash: str, text: str):
+        self.data['summaries'][section] = {'hash': inputs_hash, 'text': text}
+        self._changed.add(('summaries', section))
@@ -23,6 +23,7 @@ import json
 # Local imports
 from justdata.apps.electwatch.config import ElectWatchConfig
 from justdata.apps.electwatch.services.firm_mapper import AmountRange, parse_stock_amount
+from justdata.apps.electwatch.services.source_http import get_source_client
 
 logger = logging.getLogger(__name__)
 
@@ -124,7 +125,7 @@ class QuiverClient:
         for attempt in range(retries):
             try:
                 logger.info(f"Quiver API request: {endpoint} (attempt {attempt + 1}/{retries})")
-                response = requests.get(url, headers=headers, params=params, timeout=self.timeout)
+                response = get_source_client('quiver').get(url, headers=headers, params=params, timeout=self.timeout)
                 response.raise_for_status()
 
                 data = response.json()
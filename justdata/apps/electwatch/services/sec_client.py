@@ -15,6 +15,8 @@ from functools import lru_cache
 import logging
 from datetime import datetime
 
+from justdata.apps.electwatch.services.source_http import get_source_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -110,8 +112,6 @@ class SECClient:
 
     def __init__(self):
         """Initialize the SEC client."""
-        self.session = requests.Session()
-        self.session.headers.update(self.HEADERS)
 
     def _get_cik(self, firm_name: str) -> Optional[str]:
         """Get CIK number for a firm."""
@@ -137,7 +137,7 @@ class SECClient:
     def _make_request(self, url: str) -> Optional[Dict]:
         """Make a request to SEC EDGAR."""
         try:
-            response = self.session.get(url, timeout=30)
+            response = get_source_client('sec').get(url, headers=self.HEADERS, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+In-memory read model for ElectWatch.
+
+ElectWatch data changes once a week, but every page and API call used to
+rebuild it from BigQuery (the officials query aggregates
+official_pac_contributions, then trades and trend snapshots are fetched on
+top). The weekly pipeline now publishes a versioned snapshot bundle - every
+read table in the shape ElectWatchBQClient returns, as gzipped JSON - and
+the app loads it once into memory with lookup indexes by bioguide_id,
+ticker, sector and committee id.
+
+The bundle version is the run's metadata.last_updated. The app checks
+get_freshness() at most every ELECTWATCH_SNAPSHOT_CHECK_SECONDS in the
+background; when a new run appears, the new bundle is loaded and indexed
+off to the side and then swapped in with a single reference assignment, so
+requests never see a half-built snapshot.
+
+Bundle lookup order: local file, GCS, then a one-time build from BigQuery.
+
+Settings (environment):
+    ELECTWATCH_SNAPSHOT                 '0' disables the read model (BigQuery per request)
+    ELECTWATCH_SNAPSHOT_BUCKET          GCS bucket for bundles (default GCS_BUCKET_NAME)
+    ELECTWATCH_SNAPSHOT_CHECK_SECONDS   Freshness check interval (default 300)
+
+Usage:
+    from justdata.apps.electwatch.services import snapshot
+
+    snapshot.enable(get_client)          # once, at app startup
+    current = snapshot.current()
+    if current:
+        official = current.official('P000197')
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from justdata.apps.electwatch.config import APP_DIR
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_ENABLED = os.getenv('ELECTWATCH_SNAPSHOT', '1') != '0'
+SNAPSHOT_BUCKET = os.getenv('ELECTWATCH_SNAPSHOT_BUCKET') or None
+SNAPSHOT_CHECK_SECONDS = float(os.getenv('ELECTWATCH_SNAPSHOT_CHECK_SECONDS', '300'))
+SNAPSHOT_PREFIX = 'electwatch/snapshots/'
+LOCAL_SNAPSHOT_DIR = APP_DIR / 'data' / 'current' / 'snapshots'
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _normalize_id(value: str) -> str:
+    """Same folding as ElectWatchBQClient.get_official's fallback match."""
+    return str(value or '').upper().replace('_', '').replace('-', '')
+
+
+def version_slug(version: str) -> str:
+    """File-name-safe form of a bundle version."""
+    return re.sub(r'[^0-9A-Za-z]+', '-', str(version)).strip('-') or 'unversioned'
+
+
+def dump_bundle(bundle: Dict[str, Any]) -> bytes:
+    """Serialize a bundle to compact gzipped JSON."""
+    payload = json.dumps(bundle, separators=(',', ':'), default=_json_default)
+    return gzip.compress(payload.encode('utf-8'), compresslevel=6)
+
+
+def load_bundle(data: bytes) -> Dict[str, Any]:
+    """
+    Deserialize a bundle written by dump_bundle.
+
+    Raises:
+        ValueError: If the bundle was written in a different format version
+    """
+    bundle = json.loads(gzip.decompress(data).decode('utf-8'))
+    if bundle.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {bundle.get('format')!r} (expected {SNAPSHOT_FORMAT})")
+    return bundle
+
+
+def build_bundle(client) -> Dict[str, Any]:
+    """
+    Read every ElectWatch read table through the BigQuery client.
+
+    Args:
+        client: ElectWatchBQClient
+
+    Returns:
+        Bundle dict; its 'version' is metadata.last_updated
+    """
+    metadata = client.get_metadata()
+    try:
+        firm_stats = client.get_firm_stats()
+    except Exception as e:
+        # firm_stats not migrated yet: ElectWatchSnapshot computes it on load
+        logger.warning(f"Could not read firm_stats, computing on load: {e}")
+        firm_stats = None
+    bundle = {
+        'format': SNAPSHOT_FORMAT,
+        'version': str(metadata.get('last_updated') or ''),
+        'built_at': datetime.now().isoformat(),
+        'metadata': metadata,
+        'officials': client.get_officials(),
+        'firms': client.get_firms(),
+        'firm_stats': firm_stats or None,
+        'industries': client.get_industries(),
+        'committees': client.get_committees(),
+        'news': client.get_news(),
+        'insights': client.get_insights(),
+        'summaries': client.get_summaries(),
+    }
+    # Round-trip once so the bundle holds exactly what a reader will load
+    return json.loads(json.dumps(bundle, default=_json_default))
+
+
+class ElectWatchSnapshot:
+    """One immutable version of the ElectWatch read tables plus lookup indexes."""
+
+    def __init__(self, bundle: Dict[str, Any],
+                 normalize_official: Optional[Callable[[Dict], Dict]] = None):
+        """
+        Args:
+            bundle: Bundle from build_bundle/load_bundle
+            normalize_official: Applied once to every official at load time
+        """
+        self.version: str = bundle.get('version', '')
+        self.built_at: Optional[str] = bundle.get('built_at')
+        self.metadata: Dict = bundle.get('metadata') or {}
+        self.firms: List[Dict] = bundle.get('firms') or []
+        self.industries: List[Dict] = bundle.get('industries') or []
+        self.committees: List[Dict] = bundle.get('committees') or []
+        self.news: List[Dict] = bundle.get('news') or []
+        self.insights: List[Dict] = bundle.get('insights') or []
+        self.summaries: Dict = bundle.get('summaries') or {}
+
+        self.officials: List[Dict] = []
+        self._officials_by_id: Dict[str, Dict] = {}
+        for raw in bundle.get('officials') or []:
+            stored_id = _normalize_id(raw.get('bioguide_id'))
+            official = normalize_official(raw) if normalize_official else raw
+            self.officials.append(official)
+            # Look-ups work with both the stored id and any corrected one
+            for key in (stored_id, _normalize_id(official.get('bioguide_id'))):
+                if key:
+                    self._officials_by_id.setdefault(key, official)
+
+        self._officials_by_score = sorted(
+            self.officials, key=lambda o: o.get('involvement_score') or 0, reverse=True
+        )
+        firm_stats = bundle.get('firm_stats')
+        if firm_stats is None:
+            from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firm_stats import (
+                build_firm_stats
+            )
+            firm_stats = build_firm_stats(self.officials, self.firms)
+        self.firm_stats: List[Dict] = sorted(firm_stats, key=lambda row: row.get('rank') or 0)
+        self._firm_stats_by_industry: Dict[str, List[Dict]] = {}
+        for row in self.firm_stats:
+            self._firm_stats_by_industry.setdefault(str(row.get('industry') or '').lower(), []).append(row)
+
+        self._firms_by_ticker = {}
+        for firm in self.firms:
+            self._firms_by_ticker.setdefault(str(firm.get('ticker') or '').upper(), firm)
+        self._industries_by_sector = {}
+        for industry in self.industries:
+            self._industries_by_sector.setdefault(str(industry.get('sector') or '').lower(), industry)
+        self._committees_by_id = {}
+        for committee in self.committees:
+            self._committees_by_id.setdefault(committee.get('id'), committee)
+
+    def official(self, official_id: str) -> Optional[Dict]:
+        """Official by bioguide_id (case, '_' and '-' insensitive)."""
+        return self._officials_by_id.get(_normalize_id(official_id))
+
+    def official_by_name(self, name: str) -> Optional[Dict]:
+        """Highest-scoring official whose name contains name (case-insensitive)."""
+        needle = name.lower()
+        return next((o for o in self._officials_by_score if needle in str(o.get('name') or '').lower()), None)
+
+    def firm(self, ticker_or_name: str) -> Optional[Dict]:
+        """Firm by ticker, else the first firm whose name contains the text."""
+        firm = self._firms_by_ticker.get(ticker_or_name.upper())
+        if firm is not None:
+            return firm
+        needle = ticker_or_name.lower()
+        return next((f for f in self.firms if needle in str(f.get('name') or '').lower()), None)
+
+    def firm_stats_page(self, industry: Optional[str] = None, sort: str = 'rank',
+                        descending: bool = False, limit: Optional[int] = None,
+                        offset: int = 0) -> List[Dict]:
+        """Firm trade stats filtered by industry, sorted and paged (see query_firm_stats)."""
+        from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firm_stats import (
+            query_firm_stats
+        )
+        rows = self._firm_stats_by_industry.get(industry.lower(), []) if industry else self.firm_stats
+        return query_firm_stats(rows, None, sort, descending, limit, offset)
+
+    def industry(self, sector: str) -> Optional[Dict]:
+        return self._industries_by_sector.get(sector.lower())
+
+    def committee(self, committee_id: str) -> Optional[Dict]:
+        return self._committees_by_id.get(committee_id)
+
+
+class SnapshotStore:
+    """
+    Holds the current ElectWatchSnapshot and replaces it when a new run lands.
+
+    get() never waits on BigQuery once a snapshot is loaded: freshness
+    checks and reloads run on a background thread, one at a time.
+    """
+
+    def __init__(self, client_factory: Callable[[], Any],
+                 normalize_official: Optional[Callable[[Dict], Dict]] = None,
+                 check_seconds: float = SNAPSHOT_CHECK_SECONDS,
+                 local_dir: Path = LOCAL_SNAPSHOT_DIR,
+                 bucket_name: Optional[str] = SNAPSHOT_BUCKET,
+                 use_gcs: bool = True):
+        """
+        Args:
+            client_factory: Returns an ElectWatchBQClient (freshness checks and fallback builds)
+            normalize_official: Passed to every ElectWatchSnapshot
+            check_seconds: Minimum time between freshness checks
+            local_dir: Directory for cached bundles
+            bucket_name: GCS bucket for published bundles
+            use_gcs: Read/write bundles in GCS
+        """
+        self.client_factory = client_factory
+        self.normalize_official = normalize_official
+        self.check_seconds = check_seconds
+        self.local_dir = Path(local_dir)
+        self.bucket_name = bucket_name
+        self.use_gcs = use_gcs
+        self._snapshot: Optional[ElectWatchSnapshot] = None
+        self._checked_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self) -> Optional[ElectWatchSnapshot]:
+        """
+        The current snapshot, or None if none could be loaded.
+
+        The first call loads synchronously; later calls schedule a background
+        freshness check when one is due and return immediately.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            if time.monotonic() - self._checked_at >= self.check_seconds or not self._checked_at:
+                self.refresh()
+            return self._snapshot
+        if time.monotonic() - self._checked_at >= self.check_seconds:
+            self._refresh_in_background()
+        return snapshot
+
+    def install(self, bundle: Dict[str, Any]) -> ElectWatchSnapshot:
+        """Index a bundle and make it current."""
+        snapshot = ElectWatchSnapshot(bundle, self.normalize_official)
+        self._snapshot = snapshot
+        self._checked_at = time.monotonic()
+        logger.info(f"ElectWatch snapshot {snapshot.version or '(unversioned)'} active: "
+                    f"{len(snapshot.officials)} officials, {len(snapshot.firms)} firms")
+        return snapshot
+
+    def refresh(self) -> Optional[ElectWatchSnapshot]:
+        """Load the latest run's bundle if it differs from the current one."""
+        with self._refresh_lock:
+            try:
+                client = self.client_factory()
+                version = str(client.get_freshness().get('last_updated') or '')
+                current = self._snapshot
+                if current is not None and current.version == version:
+                    return current
+                bundle = self._read_bundle(version)
+                if bundle is None:
+                    logger.info(f"No snapshot bundle for {version or '(unversioned)'}; building from BigQuery")
+                    bundle = build_bundle(client)
+                    self.write_local(bundle)
+                return self.install(bundle)
+            except Exception as e:
+                logger.warning(f"Could not refresh ElectWatch snapshot: {e}")
+                return self._snapshot
+            finally:
+                self._checked_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        if self._refresh_lock.locked() or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self.refresh, name='electwatch-snapshot', daemon=True)
+        self._thread.start()
+
+    # -- bundle storage -----------------------------------------------------
+
+    def _local_path(self, version: str) -> Path:
+        return self.local_dir / f"{version_slug(version)}.json.gz"
+
+    def _blob_path(self, version: str) -> str:
+        return f"{SNAPSHOT_PREFIX}{version_slug(version)}.json.gz"
+
+    def _read_bundle(self, version: str) -> Optional[Dict[str, Any]]:
+        path = self._local_path(version)
+        if path.exists():
+            try:
+                return load_bundle(path.read_bytes())
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        if not self.use_gcs:
+            return None
+        try:
+            from justdata.shared.utils.gcs_storage import get_bucket
+            blob = get_bucket(self.bucket_name).blob(self._blob_path(version))
+            if not blob.exists():
+                return None
+            data = blob.download_as_bytes()
+            bundle = load_bundle(data)
+            self._write_local_bytes(version, data)
+            return bundle
+        except Exception as e:
+            logger.warning(f"Could not read snapshot {self._blob_path(version)} from GCS: {e}")
+            return None
+
+    def _write_local_bytes(self, version: str, data: bytes) -> Path:
+        path = self._local_path(version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return path
+
+    def write_local(self, bundle: Dict[str, Any]) -> Optional[Path]:
+        """Cache a bundle on local disk; failures are logged."""
+        try:
+            return self._write_local_bytes(bundle.get('version', ''), dump_bundle(bundle))
+        except Exception as e:
+            logger.warning(f"Could not write local snapshot: {e}")
+            return None
+
+    def publish(self, client=None) -> Optional[ElectWatchSnapshot]:
+        """
+        Build a bundle for the run just saved, store it locally and in GCS,
+        and make it current in this process.
+
+        Failures are logged and return None; the app then falls back to
+        building the bundle itself on its next freshness check.
+        """
+        try:
+            bundle = build_bundle(client or self.client_factory())
+            data = dump_bundle(bundle)
+            self._write_local_bytes(bundle['version'], data)
+            if self.use_gcs:
+                from justdata.shared.utils.gcs_storage import get_bucket
+                blob_path = self._blob_path(bundle['version'])
+                get_bucket(self.bucket_name).blob(blob_path).upload_from_string(
+                    data, content_type='application/gzip'
+                )
+                logger.info(f"Published snapshot {blob_path} ({len(data):,} bytes)")
+            with self._refresh_lock:
+                return self.install(bundle)
+        except Exception as e:
+            logger.error(f"Could not publish ElectWatch snapshot: {e}")
+            return None
+
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+_bypass = threading.local()
+
+
+def enable(client_factory: Callable[[], Any],
+           normalize_official: Optional[Callable[[Dict], Dict]] = None) -> Optional[SnapshotStore]:
+    """
+    Turn on snapshot reads for this process and start loading in the background.
+
+    Called by the web app at startup; other processes (the weekly pipeline,
+    scripts) keep reading BigQuery directly. Does nothing when
+    ELECTWATCH_SNAPSHOT=0.
+    """
+    global _store
+    if not SNAPSHOT_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SnapshotStore(client_factory, normalize_official)
+            threading.Thread(target=_store.get, name='electwatch-snapshot-warm', daemon=True).start()
+    return _store
+
+
+def current() -> Optional[ElectWatchSnapshot]:
+    """The active snapshot, or None when snapshot reads are off or nothing is loaded."""
+    store = _store
+    if store is None or getattr(_bypass, 'active', False):
+        return None
+    return store.get()
+
+
+@contextmanager
+def bypassed():
+    """
+    Read BigQuery directly on this thread, e.g. while the weekly pipeline
+    runs inside the web process and must see the rows it just wrote.
+    """
+    previous = getattr(_bypass, 'active', False)
+    _bypass.active = True
+    try:
+        yield
+    finally:
+        _bypass.active = previous
+
+
+def publish(client_factory: Callable[[], Any],
+            normalize_official: Optional[Callable[[Dict], Dict]] = None) -> Optional[ElectWatchSnapshot]:
+    """
+    Publish a bundle for the run just written to BigQuery.
+
+    Uses the process store when snapshot reads are enabled here (so this
+    process switches over immediately), otherwise a one-off store.
+    """
+    store = _store or SnapshotStore(client_factory, normalize_official)
+    return store.publish()
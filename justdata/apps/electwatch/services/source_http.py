@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Shared, rate-limited HTTP clients for ElectWatch's external data sources.
+
+One RateLimitedClient per source (see shared/utils/rate_limited_http.py),
+created on first use and shared by every API client module and pipeline
+fetcher, so concurrent fetches of the same vendor draw on one token bucket.
+All sources share one on-disk response cache for conditional requests.
+
+Settings (environment), per source name in SOURCE_LIMITS:
+    ELECTWATCH_<SOURCE>_RPS          Requests per second
+    ELECTWATCH_<SOURCE>_CONCURRENCY  Requests in flight at once
+    ELECTWATCH_HTTP_CACHE            '0' disables the conditional response cache
+
+Usage:
+    from justdata.apps.electwatch.services.source_http import get_source_client
+
+    response = get_source_client('fmp').get(url, params=params)
+"""
+
+import os
+import threading
+from typing import Dict
+
+from justdata.apps.electwatch.config import APP_DIR
+from justdata.shared.utils.rate_limited_http import RateLimitedClient, ResponseCache
+
+# Default limits per source: (requests/second, burst, concurrent requests),
+# kept under each vendor's documented quota
+SOURCE_LIMITS = {
+    'congress': (1.2, 5, 2),    # Congress.gov: 5,000 requests/hour
+    'fec': (3.0, 5, 3),         # OpenFEC: paced like the old 0.3s sleep
+    'finnhub': (1.0, 5, 2),     # Finnhub free tier: 60 requests/minute
+    'fmp': (4.0, 8, 4),         # FMP Starter: 300 requests/minute
+    'newsapi': (1.0, 2, 1),     # NewsAPI: small daily quota, no bursts
+    'quiver': (2.0, 4, 2),
+    'sec': (8.0, 10, 4),        # SEC EDGAR fair access: 10 requests/second
+}
+
+HTTP_CACHE_DIR = APP_DIR / 'data' / 'cache' / 'http'
+HTTP_CACHE_ENABLED = os.getenv('ELECTWATCH_HTTP_CACHE', '1') != '0'
+
+_clients: Dict[str, RateLimitedClient] = {}
+_clients_lock = threading.Lock()
+_response_cache = ResponseCache(HTTP_CACHE_DIR) if HTTP_CACHE_ENABLED else None
+
+
+def get_source_client(source: str) -> RateLimitedClient:
+    """
+    Shared rate-limited client for a source in SOURCE_LIMITS.
+
+    Raises:
+        KeyError: If the source has no configured limits
+    """
+    with _clients_lock:
+        client = _clients.get(source)
+        if client is None:
+            rate, burst, concurrency = SOURCE_LIMITS[source]
+            prefix = f"ELECTWATCH_{source.upper()}"
+            rate = float(os.getenv(f"{prefix}_RPS", rate))
+            concurrency = int(os.getenv(f"{prefix}_CONCURRENCY", concurrency))
+            client = RateLimitedClient(source, rate=rate, burst=max(burst, 1), max_concurrency=concurrency,
+                                       cache=_response_cache)
+            _clients[source] = client
+        return client
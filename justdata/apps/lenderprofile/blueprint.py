@@ -6,7 +6,6 @@ Converts the standalone LenderProfile app into a blueprint.
 from flask import Blueprint, render_template, request, jsonify, Response, current_app
 from jinja2 import ChoiceLoader, FileSystemLoader
 import json
-import time
 import logging
 from pathlib import Path
 
@@ -191,10 +190,13 @@ def api_search_lender():
 def api_generate_report():
     """Generate lender profile report."""
     from .report_generator import generate_report
+    from justdata.shared.utils.job_scheduler import QueueFull
     try:
         data = request.get_json()
         result = generate_report(data)
         return jsonify(result)
+    except QueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         logger.error(f"Error generating report: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -265,10 +267,11 @@ def view_report(report_id: str):
 @login_required
 def progress(job_id):
     """Get progress of report generation."""
-    from justdata.shared.utils.progress_tracker import get_progress
+    from justdata.shared.utils.progress_tracker import get_progress, get_progress_version, wait_for_progress
     
     def event_stream():
         last_percent = -1
+        version = get_progress_version(job_id)
         while True:
             progress = get_progress(job_id)
             percent = progress.get("percent", 0)
@@ -280,5 +283,5 @@ def progress(job_id):
                 last_percent = percent
             if done or error:
                 break
-            time.sleep(0.5)
+            version = wait_for_progress(job_id, version)
     return Response(event_stream(), mimetype="text/event-stream")
@@ -11,6 +11,7 @@ from datetime import datetime
 
 from justdata.apps.lenderprofile.processors.ai_summarizer import LenderProfileAnalyzer
 from justdata.apps.lenderprofile.report_builder.coordinator import build_complete_report_v2
+from justdata.shared.utils.job_scheduler import JobCancelled
 
 logger = logging.getLogger(__name__)
 
@@ -97,6 +98,8 @@ class ReportBuilder:
             logger.info("Report building complete")
             return report
 
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Error building report: {e}", exc_info=True)
             if progress_tracker:
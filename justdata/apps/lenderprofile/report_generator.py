@@ -4,11 +4,12 @@ Provides the generate_report function for creating lender intelligence reports.
 """
 
 import uuid
-import threading
 import logging
 from typing import Dict, Any
 
 from justdata.shared.utils.progress_tracker import create_progress_tracker, store_analysis_result
+from justdata.shared.utils.analysis_cache import generate_cache_key
+from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, JobCancelled
 from justdata.shared.utils.name_utils import strip_trailing_punctuation
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,7 @@ def generate_report(data: Dict[str, Any]) -> Dict[str, Any]:
             - success: True if report generation started successfully
             - report_id: UUID for tracking progress and retrieving report
             - institution: Name of the institution
+            - queue_position: Position in the job queue (0 if started immediately)
             - error: Error message if failed
     """
     from .processors.identifier_resolver import IdentifierResolver
@@ -67,6 +69,11 @@ def generate_report(data: Dict[str, Any]) -> Dict[str, Any]:
 
     # Create job ID
     job_id = str(uuid.uuid4())
+    dedup_key = generate_cache_key('lenderprofile', {
+        'name': institution_name,
+        'identifiers': dict(identifiers),
+        'report_focus': report_focus,
+    })
 
     try:
         progress_tracker = create_progress_tracker(job_id)
@@ -133,6 +140,8 @@ def generate_report(data: Dict[str, Any]) -> Dict[str, Any]:
             progress_tracker.complete(success=True)
             logger.info(f"Report generation completed for {institution_name}")
 
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Error in report generation job: {e}", exc_info=True)
             progress_tracker.complete(success=False, error=str(e))
@@ -141,12 +150,13 @@ def generate_report(data: Dict[str, Any]) -> Dict[str, Any]:
                 'error': str(e)
             })
 
-    # Start job in background thread
-    thread = threading.Thread(target=run_job, daemon=True)
-    thread.start()
+    # Queue on the shared scheduler; an identical in-flight request reuses its report
+    submitted = get_job_scheduler().submit('lenderprofile', run_job, job_id, dedup_key=dedup_key,
+                                           requester=job_requester_id())
 
     return {
         'success': True,
-        'report_id': job_id,
-        'institution': institution_name
+        'report_id': submitted.job_id,
+        'institution': institution_name,
+        'queue_position': submitted.queue_position
     }
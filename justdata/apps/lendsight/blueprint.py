@@ -8,15 +8,17 @@ from jinja2 import ChoiceLoader, FileSystemLoader
 import os
 import tempfile
 import uuid
-import threading
 import time
 import json
 from datetime import datetime
 from pathlib import Path
 
 from justdata.main.auth import require_access, get_user_permissions, get_user_type, login_required, get_current_user
-from justdata.shared.utils.progress_tracker import get_progress, update_progress, create_progress_tracker
+from justdata.shared.utils.progress_tracker import (
+    get_progress, update_progress, create_progress_tracker, get_progress_version, wait_for_progress
+)
 from justdata.shared.utils.analysis_cache import get_cached_result, store_cached_result, log_usage, generate_cache_key, get_analysis_result_by_job_id
+from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, QueueFull, JobCancelled
 
 # In-memory fallback for when BigQuery cache store fails
 _result_fallback = {}
@@ -189,6 +191,8 @@ def progress_handler(job_id):
     """Progress tracking endpoint using Server-Sent Events"""
     def event_stream():
         last_percent = -1
+        last_step = ""
+        version = get_progress_version(job_id)
         while True:
             try:
                 progress = get_progress(job_id)
@@ -197,14 +201,15 @@ def progress_handler(job_id):
                 done = progress.get("done", False)
                 error = progress.get("error", None)
                 
-                if percent != last_percent or done or error:
+                if percent != last_percent or step != last_step or done or error:
                     yield f"data: {{\"percent\": {percent}, \"step\": \"{step}\", \"done\": {str(done).lower()}, \"error\": {json.dumps(error) if error else 'null'}}}\n\n"
                     last_percent = percent
+                    last_step = step
                 
                 if done or error:
                     break
                 
-                time.sleep(0.5)
+                version = wait_for_progress(job_id, version)
             except Exception as e:
                 yield f"data: {{\"percent\": 0, \"step\": \"Error: {str(e)}\", \"done\": true, \"error\": \"{str(e)}\"}}\n\n"
                 break
@@ -212,6 +217,14 @@ def progress_handler(job_id):
     return Response(event_stream(), mimetype="text/event-stream")
 
 
+@lendsight_bp.route('/cancel/<job_id>', methods=['POST'])
+@login_required
+def cancel(job_id):
+    """Cancel a queued or running analysis job."""
+    cancelled = get_job_scheduler().cancel(job_id, requester=job_requester_id())
+    return jsonify({'success': True, 'cancelled': cancelled})
+
+
 @lendsight_bp.route('/analyze', methods=['POST'])
 @login_required
 @require_access('lendsight', 'partial')
@@ -481,6 +494,8 @@ def analyze():
                     user_email=user_email
                 )
                 
+            except JobCancelled:
+                raise
             except Exception as e:
                 error_msg = str(e)
                 progress_tracker.complete(success=False, error=error_msg)
@@ -502,12 +517,17 @@ def analyze():
                     user_email=user_email
                 )
         
-        print(f"[DEBUG] Starting background thread for job {job_id}")
-        threading.Thread(target=run_job, daemon=True).start()
+        # Queue on the shared scheduler; an identical in-flight request reuses its job
+        submitted = get_job_scheduler().submit('lendsight', run_job, job_id,
+                                               dedup_key=generate_cache_key('lendsight', cache_params),
+                                               requester=job_requester_id())
+        session['job_id'] = submitted.job_id
         
-        print(f"[DEBUG] Returning success response with job_id: {job_id}")
-        return jsonify({'success': True, 'job_id': job_id})
+        print(f"[DEBUG] Returning success response with job_id: {submitted.job_id} (queue position {submitted.queue_position})")
+        return jsonify({'success': True, 'job_id': submitted.job_id, 'queue_position': submitted.queue_position})
             
+    except QueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         print(f"[ERROR] Exception in analyze endpoint: {e}")
         import traceback
@@ -668,8 +688,9 @@ def download():
         if not job_id:
             return jsonify({'error': 'No analysis session found. Please run an analysis first.'}), 400
         
-        # Retrieve from BigQuery cache, with in-memory fallback
-        analysis_result = get_analysis_result_by_job_id(job_id)
+        # Retrieve from BigQuery cache, with in-memory fallback.
+        # The Excel/PDF builders take DataFrames, so columnar tables skip the row-dict step.
+        analysis_result = get_analysis_result_by_job_id(job_id, as_dataframes=True)
         if not analysis_result and job_id in _result_fallback:
             analysis_result = _result_fallback.get(job_id)
             print(f"[INFO] Using in-memory fallback for download job_id={job_id}")
@@ -18,9 +18,14 @@ API Key:
 """
 
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Optional, List
 import requests
 
+from justdata.shared.utils.local_cache import LocalTTLCache
+from justdata.shared.utils.job_scheduler import JobCancelled
+
 
 def get_most_recent_acs_year() -> str:
     """
@@ -207,6 +212,8 @@ def get_census_demographics_for_county(
                     }
                     acs_data_fetched = True
                     print(f"  [OK] Successfully fetched ACS 5-year data for {display_name}")
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"  [WARNING] Failed to fetch ACS 5-year data for {display_name}: {e}")
             print(f"  [INFO] Trying ACS 1-year estimates instead...")
@@ -257,6 +264,8 @@ def get_census_demographics_for_county(
                         }
                         acs_data_fetched = True
                         print(f"  [OK] Successfully fetched ACS 1-year data for {display_name}")
+            except JobCancelled:
+                raise
             except Exception as e:
                 print(f"  [WARNING] Failed to fetch ACS 1-year data for {display_name}: {e}")
                 # Try previous year as fallback
@@ -376,6 +385,8 @@ def get_census_demographics_for_county(
                             'hispanic_percentage': (hispanic / total_pop * 100) if hispanic else 0
                         }
                     }
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Warning: Failed to fetch 2020 Census data for {display_name}: {e}")
         
@@ -484,6 +495,8 @@ def get_census_demographics_for_county(
                             'hispanic_percentage': (hispanic / total_pop * 100) if hispanic else 0
                         }
                     }
+        except JobCancelled:
+            raise
         except Exception as e:
             print(f"Warning: Failed to fetch 2010 Census data for {display_name}: {e}")
             import traceback
@@ -502,6 +515,8 @@ def get_census_demographics_for_county(
     except ImportError:
         print("Warning: 'census' package not installed. Install with: pip install census us requests")
         return {}
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"Error fetching census data for {display_name}: {e}")
         import traceback
@@ -509,6 +524,206 @@ def get_census_demographics_for_county(
         return {}
 
 
+# ---------------------------------------------------------------------------
+# Batched, cached Census fetches
+# ---------------------------------------------------------------------------
+
+CENSUS_API_BASE = 'https://api.census.gov/data'
+
+# ACS variables (same as get_census_demographics_for_county)
+ACS_VARIABLES = ['NAME', 'B01003_001E', 'B03002_001E', 'B03002_003E', 'B03002_004E', 'B03002_005E',
+                 'B03002_006E', 'B03002_007E', 'B03002_009E', 'B03002_012E']
+CENSUS2020_VARIABLES = ['NAME', 'P1_001N', 'P2_001N', 'P2_002N', 'P2_005N', 'P2_006N',
+                        'P2_007N', 'P2_008N', 'P2_009N', 'P2_011N']
+CENSUS2010_VARIABLES = ['NAME', 'P001001', 'P005001', 'P005003', 'P005004', 'P005005',
+                        'P005006', 'P005007', 'P005009', 'P004003']
+
+# Variable names for (total_pop, white, black, asian, native_am, hopi, multi_racial, hispanic)
+_ACS_COUNTS = ('B01003_001E', 'B03002_003E', 'B03002_004E', 'B03002_006E', 'B03002_005E',
+               'B03002_007E', 'B03002_009E', 'B03002_012E')
+_CENSUS2020_COUNTS = ('P1_001N', 'P2_005N', 'P2_006N', 'P2_008N', 'P2_007N',
+                      'P2_009N', 'P2_011N', 'P2_002N')
+_CENSUS2010_COUNTS = ('P001001', 'P005003', 'P005004', 'P005006', 'P005005',
+                      'P005007', 'P005009', 'P004003')
+
+# Published Census tables do not change; ACS vintages are replaced yearly, so
+# a month-long TTL keeps repeat reports off the network without going stale.
+CENSUS_CACHE_TTL_SECONDS = float(os.getenv('CENSUS_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+CENSUS_CACHE_DIR = os.getenv('CENSUS_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'justdata_cache'))
+CENSUS_MAX_WORKERS = int(os.getenv('CENSUS_MAX_WORKERS', '6'))
+
+_census_cache = LocalTTLCache('census_api', max_entries=512, max_bytes=64 * 1024 * 1024,
+                              ttl_seconds=CENSUS_CACHE_TTL_SECONDS, disk_dir=CENSUS_CACHE_DIR)
+
+
+def fetch_census_counties(dataset: str, year: int, variables: List[str], state_fips: str,
+                          api_key: str, county_fips: str = '*') -> Dict[str, Dict[str, str]]:
+    """
+    Fetch Census API variables for every county in a state with one request.
+
+    Responses are cached per (dataset, year, geography, variables) in memory
+    and on disk, so repeat reports for the same state make no HTTP calls.
+
+    Args:
+        dataset: API dataset path, e.g. 'acs/acs5', 'dec/pl', 'dec/sf1'
+        year: Dataset vintage
+        variables: Variable names to request
+        state_fips: Two-digit state FIPS code
+        api_key: Census API key
+        county_fips: Three-digit county FIPS, or '*' for all counties in the state
+
+    Returns:
+        Dictionary mapping three-digit county FIPS to {variable: value}
+
+    Raises:
+        requests.RequestException: If the API call fails (failures are not cached)
+    """
+    state_fips = str(state_fips).zfill(2)
+    geography = f"county:{county_fips}|state:{state_fips}"
+    cache_key = f"{dataset}|{year}|{geography}|{','.join(variables)}"
+    cached = _census_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    response = requests.get(
+        f"{CENSUS_API_BASE}/{year}/{dataset}",
+        params={
+            'get': ','.join(variables),
+            'for': f'county:{county_fips}',
+            'in': f'state:{state_fips}',
+            'key': api_key
+        },
+        timeout=30
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    counties = {}
+    if data and len(data) > 1:
+        headers = data[0]
+        county_idx = headers.index('county')
+        for row in data[1:]:
+            counties[str(row[county_idx]).zfill(3)] = dict(zip(headers, row))
+    _census_cache.set(cache_key, counties)
+    return counties
+
+
+def _build_time_period(record: Dict[str, str], count_vars: tuple, year_label: str,
+                       data_year: str) -> Optional[Dict]:
+    """Turn one county's raw Census counts into a time_periods entry (None if no population)."""
+    total_pop, white, black, asian, native_am, hopi, multi_racial, hispanic = (
+        _safe_int(record.get(var)) for var in count_vars
+    )
+    if not total_pop or total_pop <= 0:
+        return None
+    return {
+        'year': year_label,
+        'data_year': data_year,
+        'demographics': {
+            'total_population': total_pop or 0,
+            'white_percentage': (white / total_pop * 100) if white else 0,
+            'black_percentage': (black / total_pop * 100) if black else 0,
+            'asian_percentage': (asian / total_pop * 100) if asian else 0,
+            'native_american_percentage': (native_am / total_pop * 100) if native_am else 0,
+            'hopi_percentage': (hopi / total_pop * 100) if hopi else 0,
+            'multi_racial_percentage': (multi_racial / total_pop * 100) if multi_racial else 0,
+            'hispanic_percentage': (hispanic / total_pop * 100) if hispanic else 0
+        }
+    }
+
+
+def _fetch_state_census_data(state_fips: str, counties: List[tuple], api_key: str) -> Dict[str, Dict]:
+    """
+    Build census data for every requested county in one state from state-wide requests.
+
+    Mirrors the per-county fallback order: ACS 5-year, then ACS 1-year, then the
+    prior year's ACS 5-year, plus the 2020 and 2010 decennial counts.
+
+    Args:
+        state_fips: Two-digit state FIPS code
+        counties: List of (county_name, county_fips) tuples in this state
+        api_key: Census API key
+
+    Returns:
+        Dictionary mapping county name to census data for counties with any data
+    """
+    acs_year = int(get_most_recent_acs_year())
+    acs_sources = [
+        ('acs/acs5', acs_year, f"{acs_year} ACS", f"{acs_year} (ACS 5-year estimates)"),
+        ('acs/acs1', acs_year, f"{acs_year} ACS", f"{acs_year} (ACS 1-year estimates)"),
+        ('acs/acs5', acs_year - 1, f"{acs_year - 1} ACS", f"{acs_year - 1} (ACS 5-year estimates)"),
+    ]
+    decennial_sources = [
+        ('census2020', 'dec/pl', 2020, CENSUS2020_VARIABLES, _CENSUS2020_COUNTS, '2020 Census', '2020 (Decennial Census)'),
+        ('census2010', 'dec/sf1', 2010, CENSUS2010_VARIABLES, _CENSUS2010_COUNTS, '2010 Census', '2010 (Decennial Census)'),
+    ]
+
+    periods = {county_fips: {} for _, county_fips in counties}
+
+    for dataset, year, year_label, data_year in acs_sources:
+        missing = [fips for fips in periods if 'acs' not in periods[fips]]
+        if not missing:
+            break
+        try:
+            table = fetch_census_counties(dataset, year, ACS_VARIABLES, state_fips, api_key)
+        except Exception as e:
+            print(f"  [WARNING] State-wide {dataset} {year} request failed for state {state_fips}: {e}")
+            continue
+        for fips in missing:
+            period = _build_time_period(table.get(fips, {}), _ACS_COUNTS, year_label, data_year)
+            if period:
+                periods[fips]['acs'] = period
+
+    for key, dataset, year, variables, count_vars, year_label, data_year in decennial_sources:
+        try:
+            table = fetch_census_counties(dataset, year, variables, state_fips, api_key)
+        except Exception as e:
+            print(f"  [WARNING] State-wide {dataset} {year} request failed for state {state_fips}: {e}")
+            continue
+        for fips in periods:
+            period = _build_time_period(table.get(fips, {}), count_vars, year_label, data_year)
+            if period:
+                periods[fips][key] = period
+
+    result = {}
+    for county_name, county_fips in counties:
+        if periods[county_fips]:
+            result[county_name] = {
+                'county_name': county_name,
+                'state_fips': state_fips,
+                'county_fips': county_fips,
+                'time_periods': periods[county_fips]
+            }
+    return result
+
+
+def _resolve_county_fips(county_info, state_code: str) -> tuple:
+    """Return (county_name, state_fips, county_fips) for a county dict or "County, State" string."""
+    if isinstance(county_info, dict):
+        county_name = county_info.get('name', 'Unknown')
+        geoid5_str = str(county_info.get('geoid5')).zfill(5) if county_info.get('geoid5') else None
+        # Prefer explicit FIPS fields; otherwise split geoid5 (SSCCC)
+        if county_info.get('county_fips'):
+            county_fips = str(county_info.get('county_fips')).zfill(3)
+        else:
+            county_fips = geoid5_str[2:] if geoid5_str else None
+        if county_info.get('state_fips'):
+            state_fips = str(county_info.get('state_fips')).zfill(2)
+        elif geoid5_str:
+            state_fips = geoid5_str[:2]
+        else:
+            state_fips = str(state_code).zfill(2) if state_code else None
+        return county_name, state_fips, county_fips
+
+    # Backward compatibility: "County, State" string needs a FIPS lookup
+    county_name = str(county_info)
+    print(f"  [WARNING] County data is string format, attempting to extract FIPS codes...")
+    fips_data = extract_fips_from_county_state(county_name)
+    if fips_data:
+        return county_name, fips_data['state_fips'], fips_data['county_fips']
+    return county_name, None, None
+
+
 def get_census_data_for_multiple_counties(
     counties_data: List[Dict],
     state_code: str,
@@ -518,6 +733,11 @@ def get_census_data_for_multiple_counties(
     """
     Get census data for multiple counties using FIPS codes.
     
+    Counties are grouped by state and filled from state-wide requests
+    (for=county:*&in=state:XX), one per dataset, which are cached on disk.
+    Counties a state-wide request could not fill fall back to concurrent
+    per-county fetches.
+    
     Args:
         counties_data: List of county dicts with 'name', 'geoid5', 'state_fips', 'county_fips'
         state_code: Two-digit state FIPS code (e.g., "10" for Delaware)
@@ -526,7 +746,6 @@ def get_census_data_for_multiple_counties(
     Returns:
         Dictionary mapping county name to census data
     """
-    import os
     if api_key is None:
         api_key = os.getenv('CENSUS_API_KEY')
     
@@ -535,130 +754,82 @@ def get_census_data_for_multiple_counties(
         return {}
     
     # Ensure state_code is properly formatted
-    state_code = str(state_code).zfill(2)
-    
-    print(f"  [INFO] Fetching Census data for {len(counties_data)} counties in state {state_code}...")
-    print(f"  [INFO] Note: Each county requires 3-4 API calls (ACS, 2020 Census, 2010 Census), so this may take 30-60 seconds...")
-    result = {}
-    for idx, county_info in enumerate(counties_data, 1):
-        # Extract FIPS codes from county data
-        if isinstance(county_info, dict):
-            county_name = county_info.get('name', 'Unknown')
-            # Extract county_fips: prefer explicit county_fips, otherwise extract from geoid5
-            # geoid5 format: SSCCC (2-digit state + 3-digit county)
-            if county_info.get('county_fips'):
-                county_fips = str(county_info.get('county_fips')).zfill(3)  # Ensure 3 digits
-            elif county_info.get('geoid5'):
-                geoid5_str = str(county_info.get('geoid5')).zfill(5)  # Ensure 5 digits
-                county_fips = geoid5_str[2:]  # Last 3 digits (positions 2, 3, 4)
-            else:
-                county_fips = None
-            
-            # Extract state_fips: prefer explicit state_fips, otherwise extract from geoid5 or use state_code
-            if county_info.get('state_fips'):
-                state_fips = str(county_info.get('state_fips')).zfill(2)  # Ensure 2 digits
-            elif county_info.get('geoid5'):
-                geoid5_str = str(county_info.get('geoid5')).zfill(5)  # Ensure 5 digits
-                state_fips = geoid5_str[:2]  # First 2 digits
-            elif state_code:
-                state_fips = str(state_code).zfill(2)
-            else:
-                state_fips = None
-        else:
-            # Fallback: if it's still a string, try to extract FIPS (backward compatibility)
-            county_name = str(county_info)
-            print(f"  [WARNING] County data is string format, attempting to extract FIPS codes...")
-            # extract_fips_from_county_state is in the same module, no import needed
-            fips_data = extract_fips_from_county_state(county_name)
-            if fips_data:
-                state_fips = fips_data['state_fips']
-                county_fips = fips_data['county_fips']
-            else:
-                print(f"  [ERROR] Could not extract FIPS codes for {county_name}, skipping...")
-                continue
-        
-        # Validate FIPS codes before making API call
+    state_code = str(state_code).zfill(2) if state_code else state_code
+    total = len(counties_data)
+    print(f"  [INFO] Fetching Census data for {total} counties in state {state_code}...")
+
+    # Resolve FIPS codes and group counties by state
+    by_state: Dict[str, List[tuple]] = {}
+    order = []
+    for county_info in counties_data:
+        county_name, state_fips, county_fips = _resolve_county_fips(county_info, state_code)
         if not state_fips or not county_fips:
             print(f"    [ERROR] Invalid FIPS codes for {county_name}: state_fips={state_fips}, county_fips={county_fips}")
-            print(f"    [DEBUG] County info: {county_info}")
             continue
-        
-        # Ensure FIPS codes are properly formatted (2 digits for state, 3 digits for county)
-        state_fips = str(state_fips).zfill(2)
-        county_fips = str(county_fips).zfill(3)
-        
-        print(f"    [{idx}/{len(counties_data)}] Processing {county_name} (State: {state_fips}, County: {county_fips})...")
-        print(f"    [DEBUG] Census API will use: for=county:{county_fips}, in=state:{state_fips}")
-        if progress_tracker:
-            # Update progress: 50% base + up to 10% for Census (50-60% range)
-            progress_pct = 50 + int((idx - 1) / len(counties_data) * 10)
-            progress_tracker.update_progress('fetching_census_data', progress_pct, 
-                f'Starting Census data fetch: {county_name} ({idx}/{len(counties_data)})...')
-        try:
-            data = get_census_demographics_for_county(
-                state_fips, county_fips, county_name, api_key, progress_tracker, idx, len(counties_data)
-            )
-            print(f"    [DEBUG] get_census_demographics_for_county returned: type={type(data)}, len={len(data) if data else 0}, keys={list(data.keys()) if data else []}")
-            
-            # Check for new structure (time_periods) or old structure (demographics) for compatibility
-            has_time_periods = data and data.get('time_periods')
-            has_demographics = data and data.get('demographics')
-            print(f"    [DEBUG] has_time_periods={bool(has_time_periods)}, has_demographics={bool(has_demographics)}")
-            
-            if data and (has_time_periods or has_demographics):
-                result[county_name] = data
-                print(f"    [OK] Retrieved Census data for {county_name}")
-                if progress_tracker:
-                    # Mark this county as complete
-                    base_pct = 50 + int((idx / len(counties_data)) * 10)
-                    progress_tracker.update_progress('fetching_census_data', base_pct, 
-                        f'Completed Census data: {county_name} ({idx}/{len(counties_data)})...')
-                if has_time_periods:
-                    time_periods = data.get('time_periods', {})
-                    print(f"      - Time periods: {list(time_periods.keys())}")
-                    for period_key, period_data in time_periods.items():
-                        demo = period_data.get('demographics', {})
-                        pop = demo.get('total_population', 'N/A')
-                        print(f"        - {period_key}: population={pop}")
-                elif has_demographics:
-                    print(f"      - Using legacy demographics format")
-            else:
-                print(f"    [WARNING] No Census data returned for {county_name} - data is empty or missing time_periods/demographics")
-                if data:
-                    print(f"      - Data keys: {list(data.keys())}")
+        by_state.setdefault(str(state_fips).zfill(2), []).append((county_name, str(county_fips).zfill(3)))
+        order.append(county_name)
+
+    result = {}
+    completed = 0
+
+    def report(step_message):
+        if progress_tracker and total:
+            # Census occupies the 50-60% range of the report
+            progress_tracker.update_progress('fetching_census_data', 50 + int(completed / total * 10),
+                                             step_message)
+
+    # 1. One request per dataset per state, states in parallel
+    with ThreadPoolExecutor(max_workers=CENSUS_MAX_WORKERS, thread_name_prefix='census') as pool:
+        futures = {pool.submit(_fetch_state_census_data, state_fips, counties, api_key): state_fips
+                   for state_fips, counties in by_state.items()}
+        for future in as_completed(futures):
+            state_fips = futures[future]
+            try:
+                state_result = future.result()
+            except Exception as e:
+                print(f"    [WARNING] Batched Census fetch failed for state {state_fips}: {e}")
+                state_result = {}
+            result.update(state_result)
+            completed += len(state_result)
+            print(f"    [OK] State {state_fips}: Census data for {len(state_result)}/{len(by_state[state_fips])} counties")
+            report(f'Census data: state {state_fips} ({completed}/{total} counties)...')
+
+    # 2. Per-county fallback, concurrently, for anything the batch could not fill
+    fallback = [(name, state_fips, county_fips)
+                for state_fips, counties in by_state.items()
+                for name, county_fips in counties if name not in result]
+    if fallback:
+        print(f"  [INFO] Falling back to per-county Census requests for {len(fallback)} counties...")
+        with ThreadPoolExecutor(max_workers=CENSUS_MAX_WORKERS, thread_name_prefix='census') as pool:
+            futures = {pool.submit(get_census_demographics_for_county, state_fips, county_fips, name, api_key): name
+                       for name, state_fips, county_fips in fallback}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    print(f"    [ERROR] Failed to get Census data for {name}: {e}")
+                    data = {}
+                if data and (data.get('time_periods') or data.get('demographics')):
+                    result[name] = data
+                    print(f"    [OK] Retrieved Census data for {name}")
                 else:
-                    print(f"      - Data is None or empty")
-                if progress_tracker:
-                    # Still mark as attempted
-                    base_pct = 50 + int((idx / len(counties_data)) * 10)
-                    progress_tracker.update_progress('fetching_census_data', base_pct, 
-                        f'No Census data: {county_name} ({idx}/{len(counties_data)})...')
-        except Exception as e:
-            print(f"    [ERROR] Failed to get Census data for {county_name}: {e}")
-            import traceback
-            traceback.print_exc()
-            if progress_tracker:
-                # Mark as failed
-                base_pct = 50 + int((idx / len(counties_data)) * 10)
-                progress_tracker.update_progress('fetching_census_data', base_pct, 
-                    f'Failed Census data: {county_name} ({idx}/{len(counties_data)})...')
+                    print(f"    [WARNING] No Census data returned for {name}")
+                completed += 1
+                report(f'Census data: {name} ({completed}/{total} counties)...')
+    
+    # Keep the caller's county order (fetches complete in arbitrary order)
+    result = {name: result[name] for name in order if name in result}
     
-    print(f"  [INFO] Retrieved Census data for {len(result)} out of {len(counties_data)} counties")
+    print(f"  [INFO] Retrieved Census data for {len(result)} out of {total} counties")
     if progress_tracker:
         progress_tracker.update_progress('fetching_census_data', 60, 
-            f'Census data fetch complete ({len(result)}/{len(counties_data)} counties)...')
+            f'Census data fetch complete ({len(result)}/{total} counties)...')
     if len(result) == 0:
         print(f"  [WARNING] No Census data retrieved for any counties!")
         print(f"  [DEBUG] Counties requested: {[c.get('name', 'Unknown') if isinstance(c, dict) else c for c in counties_data]}")
-        print(f"  [DEBUG] API key present: {api_key is not None}")
     else:
         print(f"  [DEBUG] Census data counties: {list(result.keys())}")
-        # Print sample to verify structure
-        sample_county = list(result.keys())[0]
-        sample_data = result[sample_county]
-        print(f"  [DEBUG] Sample county '{sample_county}' structure: {list(sample_data.keys())}")
-        if 'demographics' in sample_data:
-            print(f"  [DEBUG] Demographics keys: {list(sample_data['demographics'].keys())}")
     return result
 
 
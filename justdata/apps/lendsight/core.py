@@ -13,12 +13,16 @@ from justdata.apps.lendsight.data_utils import (
     find_exact_county_match, 
     execute_mortgage_query,
     execute_tiered_queries,
+    find_exact_county_matches,
+    execute_batched_tiered_queries,
     USE_SUMMARY_TABLES,
+    USE_BATCHED_TIERED_QUERIES,
     SUMMARY_PROJECT_ID
 )
 from justdata.apps.lendsight.report_builder import build_mortgage_report, save_mortgage_excel_report
 from justdata.apps.lendsight.hud_processor import get_hud_data_for_counties
 from justdata.apps.lendsight.version import __version__
+from justdata.shared.utils.job_scheduler import JobCancelled
 
 
 def parse_web_parameters(counties_str: str, years_str: str, selection_type: str = 'county', 
@@ -120,9 +124,28 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
         if progress_tracker:
             progress_tracker.update_progress('preparing_data', 10, 'Matching counties... Making sure we have the right places! 📍')
         
+        # Batched mode resolves every county (and its geoid5) in a single query
+        batch_matches = None
+        if USE_SUMMARY_TABLES and USE_BATCHED_TIERED_QUERIES:
+            try:
+                batch_matches = find_exact_county_matches(counties)
+                print(f"[BATCHED] Matched {len(batch_matches)}/{len(counties)} counties in one query")
+            except Exception as e:
+                print(f"[BATCHED] County batch match failed, falling back to per-county matching: {e}")
+        
         clarified_counties = []
+        county_geoids = {}
         total_counties = len(counties)
         for idx, county in enumerate(counties, 1):
+            if batch_matches is not None:
+                match = batch_matches.get(county)
+                if match:
+                    clarified_counties.append(match['county_state'])
+                    county_geoids[match['county_state']] = match['geoid5']
+                else:
+                    print(f"Warning: No matches found for {county}, using input as-is")
+                    clarified_counties.append(county)
+                continue
             try:
                 if progress_tracker:
                     progress_tracker.update_progress('preparing_data', 
@@ -137,6 +160,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                 else:
                     clarified_counties.append(matches[0])
                     print(f"Using county: {matches[0]}")
+            except JobCancelled:
+                raise
             except Exception as e:
                 print(f"Error matching county {county}: {e}, using input as-is")
                 clarified_counties.append(county)
@@ -146,6 +171,9 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
             progress_tracker.update_progress('connecting_db', 15, 'Connecting to BigQuery... Time to tap into that data goldmine! 💎')
         
         all_results = []
+        # Batched tiered fetches arrive as DataFrames; they are combined with any
+        # per-county row dicts once fetching is done
+        result_frames = []
         
         if USE_SUMMARY_TABLES:
             # =================================================================
@@ -155,6 +183,17 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
             if progress_tracker:
                 progress_tracker.update_progress('fetching_data', 20, 'Fetching from optimized summary tables... Lightning fast! ⚡')
             
+            # Batched mode: one job per summary table for all counties and years,
+            # split locally by geoid5. Counties without a geoid5 (or a failed
+            # batch) fall back to the per-county/per-year queries below.
+            batched_data = None
+            if county_geoids:
+                try:
+                    print(f"  [BATCHED] Querying {len(county_geoids)} counties for years {years}...")
+                    batched_data = execute_batched_tiered_queries(list(county_geoids.values()), years, loan_purpose)
+                except Exception as e:
+                    print(f"  [BATCHED] Batched tiered query failed, falling back to per-county queries: {e}")
+            
             total_counties = len(clarified_counties)
             for idx, county in enumerate(clarified_counties, 1):
                 try:
@@ -163,18 +202,27 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                             20 + int((idx / total_counties) * 25),
                             f'Fetching data: {county}... ⚡ Using optimized tables!')
                     
-                    print(f"  [TIERED] Querying {county} for years {years}...")
-                    tiered_data = execute_tiered_queries(county, years, loan_purpose)
+                    if batched_data is not None and county_geoids.get(county) in batched_data:
+                        tiered_data = batched_data[county_geoids[county]]
+                    else:
+                        print(f"  [TIERED] Querying {county} for years {years}...")
+                        tiered_data = execute_tiered_queries(county, years, loan_purpose)
                     
                     # Get both county and tract level data
                     county_data = tiered_data.get('county_data', [])
                     tract_data = tiered_data.get('tract_data', [])
                     
                     # Add county_code column (alias for geoid5) to match report builder expectations
-                    for row in county_data:
-                        row['county_code'] = row.get('geoid5', '')
-                    for row in tract_data:
-                        row['county_code'] = row.get('geoid5', '')
+                    if isinstance(county_data, pd.DataFrame):
+                        county_data = county_data.assign(county_code=county_data.get('geoid5', ''))
+                        tract_data = tract_data.assign(county_code=tract_data.get('geoid5', ''))
+                        collected = result_frames.append
+                    else:
+                        for row in county_data:
+                            row['county_code'] = row.get('geoid5', '')
+                        for row in tract_data:
+                            row['county_code'] = row.get('geoid5', '')
+                        collected = all_results.extend
                     
                     # Strategy: Use COUNTY data for most sections (has all demographic/income columns)
                     # The county summary has all the columns needed for:
@@ -188,22 +236,28 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                     # Tract-specific sections will be less detailed but still functional.
                     # TODO: Add option to fetch tract data for detailed tract analysis
                     
-                    if county_data:
-                        all_results.extend(county_data)
+                    if len(county_data):
+                        collected(county_data)
                         print(f"    [OK] Found {len(county_data)} county-level records for {county}")
-                    elif tract_data:
+                    elif len(tract_data):
                         # Fallback to tract data if county data unavailable
-                        all_results.extend(tract_data)
+                        collected(tract_data)
                         print(f"    [OK] Found {len(tract_data)} tract-level records for {county} (fallback)")
                     else:
                         print(f"    [WARN] No data found for {county}")
                         
+                except JobCancelled:
+                    raise
                 except Exception as e:
                     print(f"    [ERROR] Error with tiered query for {county}: {e}")
                     import traceback
                     traceback.print_exc()
                     continue
             
+            if result_frames:
+                if all_results:
+                    result_frames.append(pd.DataFrame(all_results))
+                all_results = pd.concat(result_frames, ignore_index=True)
             print(f"[DEBUG] Tiered data fetch complete: {len(all_results)} total records", flush=True)
         else:
             # =================================================================
@@ -237,6 +291,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                         if progress_tracker:
                             progress_tracker.update_query_progress(query_index, total_queries)
                             
+                    except JobCancelled:
+                        raise
                     except Exception as e:
                         print(f"    [ERROR] Error querying {county} {year}: {e}")
                         import traceback
@@ -246,7 +302,7 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
             
             print(f"[DEBUG] Data fetch complete: {len(all_results)} total records", flush=True)
         
-        if not all_results:
+        if len(all_results) == 0:
             print(f"[ERROR] No data found for the specified parameters", flush=True)
             return {'success': False, 'error': 'No data found for the specified parameters'}
         
@@ -398,6 +454,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                 else:
                     print(f"  [ERROR] CENSUS_API_KEY is missing - Census data cannot be fetched")
                 census_data = {}  # Ensure it's an empty dict, not None
+        except JobCancelled:
+            raise
         except Exception as census_error:
             print(f"  [WARNING] Error fetching Census data: {census_error}")
             import traceback
@@ -425,7 +483,7 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
             print(f"[DEBUG] Extracted {len(geoids)} GEOIDs from counties_with_fips: {geoids}")
 
         # If no GEOIDs from counties_with_fips, fall back to BigQuery results
-        if not geoids and all_results:
+        if not geoids and len(all_results):
             county_df = pd.DataFrame(all_results)
             if 'geoid5' in county_df.columns:
                 raw_geoids = county_df['geoid5'].unique().tolist()
@@ -613,177 +671,95 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
             # are hardcoded in JavaScript, so we don't need AI calls for those.
             
             if analyzer:
-                # Combined call 1: All table discussions (reduces 3 calls to 1)
-                if progress_tracker:
-                    progress_tracker.update_ai_progress(1, 3, 'Table Discussions (Combined)')
-                print("  Generating all table discussions (combined call)...")
-                try:
-                    discussions = analyzer.generate_all_table_discussions(ai_data)
-                    print(f"  [DEBUG] Discussions returned: {list(discussions.keys())}")
-                    
-                    # Extract and validate each discussion
-                    demo_disc = discussions.get('demographic_overview_discussion', '')
-                    income_disc = discussions.get('income_neighborhood_discussion', '')
-                    lenders_disc = discussions.get('top_lenders_detailed_discussion', '')
-                    market_conc_disc = discussions.get('market_concentration_discussion', '')
-                    
-                    print(f"  [DEBUG] demographic_overview_discussion length: {len(demo_disc)}")
-                    print(f"  [DEBUG] income_neighborhood_discussion length: {len(income_disc)}")
-                    print(f"  [DEBUG] top_lenders_detailed_discussion length: {len(lenders_disc)}")
-                    print(f"  [DEBUG] market_concentration_discussion length: {len(market_conc_disc)}")
-                    
-                    # Check if discussions are empty and count how many are empty
-                    empty_count = 0
-                    if not demo_disc or len(demo_disc.strip()) == 0:
-                        print(f"  [WARNING] demographic_overview_discussion is empty or whitespace only")
-                        empty_count += 1
-                    if not income_disc or len(income_disc.strip()) == 0:
-                        print(f"  [WARNING] income_neighborhood_discussion is empty or whitespace only")
-                        empty_count += 1
-                    if not lenders_disc or len(lenders_disc.strip()) == 0:
-                        print(f"  [WARNING] top_lenders_detailed_discussion is empty or whitespace only")
-                        empty_count += 1
-                    if not market_conc_disc or len(market_conc_disc.strip()) == 0:
-                        print(f"  [WARNING] market_concentration_discussion is empty or whitespace only")
-                        empty_count += 1
-
-                    # If ALL discussions are empty, trigger fallback to individual calls
-                    if empty_count == 4:
-                        print(f"  [WARNING] All 4 discussions are empty, triggering fallback to individual calls")
-                        raise ValueError("All discussions returned empty from combined call")
-
-                    # Store the discussions (even if some are empty, so frontend knows they were attempted)
-                    ai_insights['demographic_overview_discussion'] = demo_disc
-                    ai_insights['income_neighborhood_discussion'] = income_disc
-                    ai_insights['top_lenders_detailed_discussion'] = lenders_disc
-                    ai_insights['market_concentration_discussion'] = market_conc_disc
-
-                    print("  [OK] All table discussions generated successfully")
+                # All narrative calls are independent of each other, so they run
+                # concurrently; each result is stored in ai_insights as it completes.
+                from justdata.shared.analysis.narrative_scheduler import NarrativeScheduler
+                table_introductions = {}
+                table_narratives = {}
+                scheduler = NarrativeScheduler(progress_tracker=progress_tracker)
 
-                    # Generate individual Section 2 narratives (one per table)
-                    print("  Generating individual Section 2 table narratives...")
-                    try:
-                        ai_insights['income_borrowers_discussion'] = analyzer.generate_income_borrowers_discussion(ai_data)
-                        print(f"    [OK] income_borrowers_discussion length: {len(ai_insights.get('income_borrowers_discussion', ''))}")
-                    except Exception as e:
-                        print(f"    [WARNING] Failed to generate income_borrowers_discussion: {e}")
-                        ai_insights['income_borrowers_discussion'] = ''
+                def store(key, default=None):
+                    """Callbacks saving a result under key (and default on failure, if given)."""
+                    def on_result(value):
+                        ai_insights[key] = value
+                        print(f"    [OK] {key} length: {len(value or '')}")
 
-                    try:
-                        ai_insights['income_tracts_discussion'] = analyzer.generate_income_tracts_discussion(ai_data)
-                        print(f"    [OK] income_tracts_discussion length: {len(ai_insights.get('income_tracts_discussion', ''))}")
-                    except Exception as e:
-                        print(f"    [WARNING] Failed to generate income_tracts_discussion: {e}")
-                        ai_insights['income_tracts_discussion'] = ''
+                    def on_error(error):
+                        if default is not None:
+                            ai_insights[key] = default
+                    return {'on_result': on_result, 'on_error': on_error}
 
-                    try:
-                        ai_insights['minority_tracts_discussion'] = analyzer.generate_minority_tracts_discussion(ai_data)
-                        print(f"    [OK] minority_tracts_discussion length: {len(ai_insights.get('minority_tracts_discussion', ''))}")
-                    except Exception as e:
-                        print(f"    [WARNING] Failed to generate minority_tracts_discussion: {e}")
-                        ai_insights['minority_tracts_discussion'] = ''
-                    print(f"  [DEBUG] ai_insights keys after storing: {list(ai_insights.keys())}")
-                    print(f"  [DEBUG] Stored demographic_overview_discussion length: {len(ai_insights.get('demographic_overview_discussion', ''))}")
-                    print(f"  [DEBUG] Stored income_neighborhood_discussion length: {len(ai_insights.get('income_neighborhood_discussion', ''))}")
-                    print(f"  [DEBUG] Stored top_lenders_detailed_discussion length: {len(ai_insights.get('top_lenders_detailed_discussion', ''))}")
-                    print(f"  [DEBUG] Stored market_concentration_discussion length: {len(ai_insights.get('market_concentration_discussion', ''))}")
-                except Exception as gen_error:
-                    print(f"  [ERROR] Error generating table discussions: {gen_error}")
-                    import traceback
-                    traceback.print_exc()
+                def submit_individual_discussions(reason):
                     # Fallback to individual calls if combined call fails
-                    print("  Falling back to individual discussion calls...")
-                    try:
-                        print("    Generating demographic_overview_discussion individually...")
-                        ai_insights['demographic_overview_discussion'] = analyzer.generate_demographic_overview_discussion(ai_data)
-                        print(f"    [OK] demographic_overview_discussion length: {len(ai_insights.get('demographic_overview_discussion', ''))}")
-
-                        print("    Generating income_neighborhood_discussion individually...")
-                        ai_insights['income_neighborhood_discussion'] = analyzer.generate_income_neighborhood_discussion(ai_data)
-                        print(f"    [OK] income_neighborhood_discussion length: {len(ai_insights.get('income_neighborhood_discussion', ''))}")
-
-                        print("    Generating top_lenders_detailed_discussion individually...")
-                        ai_insights['top_lenders_detailed_discussion'] = analyzer.generate_top_lenders_detailed_discussion(ai_data)
-                        print(f"    [OK] top_lenders_detailed_discussion length: {len(ai_insights.get('top_lenders_detailed_discussion', ''))}")
-
-                        # Note: market_concentration_discussion is only available via combined call
-                        print("    [INFO] market_concentration_discussion not available in fallback mode")
-                        ai_insights['market_concentration_discussion'] = ''
+                    print(f"  [WARNING] Combined table discussions unavailable ({reason}), "
+                          f"falling back to individual discussion calls...")
+                    scheduler.submit('demographic_overview_discussion', analyzer.generate_demographic_overview_discussion,
+                                     ai_data, label='Demographic Overview', **store('demographic_overview_discussion'))
+                    scheduler.submit('income_neighborhood_discussion', analyzer.generate_income_neighborhood_discussion,
+                                     ai_data, label='Income & Neighborhood', **store('income_neighborhood_discussion'))
+                    scheduler.submit('top_lenders_detailed_discussion', analyzer.generate_top_lenders_detailed_discussion,
+                                     ai_data, label='Top Lenders', **store('top_lenders_detailed_discussion'))
+                    # Note: market_concentration_discussion is only available via combined call
+                    print("    [INFO] market_concentration_discussion not available in fallback mode")
+                    ai_insights['market_concentration_discussion'] = ''
+
+                def on_discussions(discussions):
+                    print(f"  [DEBUG] Discussions returned: {list(discussions.keys())}")
+                    keys = ['demographic_overview_discussion', 'income_neighborhood_discussion',
+                            'top_lenders_detailed_discussion', 'market_concentration_discussion']
+                    empty = [key for key in keys if not (discussions.get(key) or '').strip()]
+                    for key in empty:
+                        print(f"  [WARNING] {key} is empty or whitespace only")
 
-                        # Generate individual Section 2 narratives in fallback mode
-                        print("    Generating individual Section 2 table narratives...")
-                        try:
-                            ai_insights['income_borrowers_discussion'] = analyzer.generate_income_borrowers_discussion(ai_data)
-                            print(f"      [OK] income_borrowers_discussion length: {len(ai_insights.get('income_borrowers_discussion', ''))}")
-                        except Exception as e:
-                            print(f"      [WARNING] Failed to generate income_borrowers_discussion: {e}")
-                            ai_insights['income_borrowers_discussion'] = ''
+                    # If ALL discussions are empty, trigger fallback to individual calls
+                    if len(empty) == len(keys):
+                        submit_individual_discussions("all 4 discussions returned empty")
+                        return
+                    # Store the discussions (even if some are empty, so frontend knows they were attempted)
+                    for key in keys:
+                        ai_insights[key] = discussions.get(key, '')
+                    print("  [OK] All table discussions generated successfully")
 
-                        try:
-                            ai_insights['income_tracts_discussion'] = analyzer.generate_income_tracts_discussion(ai_data)
-                            print(f"      [OK] income_tracts_discussion length: {len(ai_insights.get('income_tracts_discussion', ''))}")
-                        except Exception as e:
-                            print(f"      [WARNING] Failed to generate income_tracts_discussion: {e}")
-                            ai_insights['income_tracts_discussion'] = ''
+                # Combined call: all table discussions (reduces 3 calls to 1)
+                scheduler.submit('table_discussions', analyzer.generate_all_table_discussions, ai_data,
+                                 label='Table Discussions (Combined)', on_result=on_discussions,
+                                 on_error=lambda error: submit_individual_discussions(error))
+
+                # Individual Section 2 narratives (one per table)
+                scheduler.submit('income_borrowers_discussion', analyzer.generate_income_borrowers_discussion,
+                                 ai_data, label='Income Borrowers', **store('income_borrowers_discussion', ''))
+                scheduler.submit('income_tracts_discussion', analyzer.generate_income_tracts_discussion,
+                                 ai_data, label='Income Tracts', **store('income_tracts_discussion', ''))
+                scheduler.submit('minority_tracts_discussion', analyzer.generate_minority_tracts_discussion,
+                                 ai_data, label='Minority Tracts', **store('minority_tracts_discussion', ''))
+
+                # Key findings (intro paragraph is generated in JavaScript) and trends analysis
+                scheduler.submit('key_findings', analyzer.generate_key_findings, ai_data,
+                                 label='Key Findings', **store('key_findings'))
+                scheduler.submit('trends_analysis', analyzer.generate_trends_analysis, ai_data,
+                                 label='Trends Analysis', **store('trends_analysis', ''))
 
-                        try:
-                            ai_insights['minority_tracts_discussion'] = analyzer.generate_minority_tracts_discussion(ai_data)
-                            print(f"      [OK] minority_tracts_discussion length: {len(ai_insights.get('minority_tracts_discussion', ''))}")
-                        except Exception as e:
-                            print(f"      [WARNING] Failed to generate minority_tracts_discussion: {e}")
-                            ai_insights['minority_tracts_discussion'] = ''
-                    except Exception as fallback_error:
-                        print(f"  [ERROR] Fallback also failed: {fallback_error}")
-                        traceback.print_exc()
-                        # Don't raise - continue without these insights
-                
-                # Call 2: Key findings (intro paragraph is now generated in JavaScript)
-                if progress_tracker:
-                    progress_tracker.update_ai_progress(2, 3, 'Key Findings')
-                print("  Generating key findings...")
-                try:
-                    ai_insights['key_findings'] = analyzer.generate_key_findings(ai_data)
-                    print("  [OK] Key findings generated successfully")
-                except Exception as gen_error:
-                    print(f"  [ERROR] Error generating key findings: {gen_error}")
-                    import traceback
-                    traceback.print_exc()
-                    # Don't raise - continue without key findings
-                
-                # Optional calls (only if needed - these may not be displayed in the report)
-                # Call 3: Trends analysis (if needed)
-                if progress_tracker:
-                    progress_tracker.update_ai_progress(3, 3, 'Trends Analysis')
-                print("  Generating trends analysis...")
-                try:
-                    ai_insights['trends_analysis'] = analyzer.generate_trends_analysis(ai_data)
-                    print("  [OK] Trends analysis generated successfully")
-                except Exception as gen_error:
-                    print(f"  [WARNING] Error generating trends analysis (non-critical): {gen_error}")
-                    ai_insights['trends_analysis'] = ""
-                
                 # Note: lender_strategies and community_impact are not currently displayed in the report template
                 # so we skip them to reduce API calls
-                
-                # Generate table-specific introductions and narratives
-                print("Generating table introductions and narratives...")
-                table_introductions = {}
-                table_narratives = {}
-                try:
-                    if not report_data.get('summary', pd.DataFrame()).empty:
-                        table_introductions['table1'] = analyzer.generate_table_introduction('table1', ai_data)
-                        table_narratives['table1'] = analyzer.generate_table_narrative('table1', ai_data)
-                    if not report_data.get('by_lender', pd.DataFrame()).empty:
-                        table_introductions['table2'] = analyzer.generate_table_introduction('table2', ai_data)
-                        table_narratives['table2'] = analyzer.generate_table_narrative('table2', ai_data)
-                    if not report_data.get('by_county', pd.DataFrame()).empty and len(clarified_counties) > 1:
-                        table_introductions['table3'] = analyzer.generate_table_introduction('table3', ai_data)
-                        table_narratives['table3'] = analyzer.generate_table_narrative('table3', ai_data)
-                except Exception as intro_error:
-                    print(f"Error generating table introductions/narratives: {intro_error}")
-                    import traceback
-                    traceback.print_exc()
-                    # Don't raise - continue without table intros/narratives
+
+                # Table-specific introductions and narratives
+                tables = []
+                if not report_data.get('summary', pd.DataFrame()).empty:
+                    tables.append('table1')
+                if not report_data.get('by_lender', pd.DataFrame()).empty:
+                    tables.append('table2')
+                if not report_data.get('by_county', pd.DataFrame()).empty and len(clarified_counties) > 1:
+                    tables.append('table3')
+                for table_id in tables:
+                    scheduler.submit(f'{table_id}_introduction', analyzer.generate_table_introduction, table_id, ai_data,
+                                     label=f'Table Introduction ({table_id})',
+                                     on_result=lambda value, t=table_id: table_introductions.__setitem__(t, value))
+                    scheduler.submit(f'{table_id}_narrative', analyzer.generate_table_narrative, table_id, ai_data,
+                                     label=f'Table Narrative ({table_id})',
+                                     on_result=lambda value, t=table_id: table_narratives.__setitem__(t, value))
+
+                print(f"  Generating {len(scheduler)} AI narratives concurrently...")
+                scheduler.run()
                 
                 ai_insights['table_introductions'] = table_introductions
                 ai_insights['table_narratives'] = table_narratives
@@ -794,6 +770,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
                 ai_insights = {}
                 ai_insights_enabled = False  # Ensure flag is set when skipping
             
+        except JobCancelled:
+            raise
         except Exception as e:
             import traceback
             error_type = type(e).__name__
@@ -905,6 +883,8 @@ def run_analysis(counties_str: str, years_str: str, run_id: str = None, progress
             'records': len(all_results)
         }
         
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"\nError: {str(e)}")
         if progress_tracker:
@@ -5,7 +5,8 @@ Similar to BranchSight but for HMDA mortgage data.
 """
 
 import os
-from justdata.shared.utils.bigquery_client import get_bigquery_client, execute_query, escape_sql_string
+import pandas as pd
+from justdata.shared.utils.bigquery_client import get_bigquery_client, execute_query, execute_query_df, run_query, escape_sql_string
 from typing import List, Optional, Dict, Any
 from justdata.apps.lendsight.config import PROJECT_ID
 
@@ -396,6 +397,109 @@ SUMMARY_PROJECT_ID = os.environ.get('JUSTDATA_PROJECT_ID', 'justdata-ncrc')
 USE_SUMMARY_TABLES = os.environ.get('USE_SUMMARY_TABLES', 'true').lower() == 'true'
 
 
+# Column lists shared by the per-county and batched summary table queries.
+# The tract list adds placeholder columns (0) for columns that exist in the
+# county summary but not the tract summary, so the report builder can process
+# both shapes without errors.
+_COUNTY_SUMMARY_COLUMNS = """
+            lei,
+            year,
+            geoid5,
+            county_state,
+            loan_purpose,
+            lender_name,
+            total_originations,
+            hispanic_originations,
+            black_originations,
+            asian_originations,
+            white_originations,
+            native_american_originations,
+            hopi_originations,
+            multi_racial_originations,
+            lmib_originations,
+            low_income_borrower_originations,
+            moderate_income_borrower_originations,
+            middle_income_borrower_originations,
+            upper_income_borrower_originations,
+            lmict_originations,
+            mmct_originations,
+            total_loan_amount,
+            avg_loan_amount,
+            avg_property_value,
+            avg_interest_rate,
+            avg_total_loan_costs,
+            avg_origination_charges,
+            loans_with_demographic_data"""
+
+# dtype hints for summary-table DataFrames; year is always populated, so keep
+# it integer rather than letting a stray NULL promote it to float
+_SUMMARY_DTYPES = {'year': 'int64'}
+
+_TRACT_SUMMARY_COLUMNS = """
+            lei,
+            year,
+            geoid5,
+            county_state,
+            tract_code,
+            tract_minority_population_percent,
+            tract_to_msa_income_percentage,
+            loan_purpose,
+            lender_name,
+            total_originations,
+            -- Race/ethnicity columns (some are placeholders)
+            hispanic_originations,
+            black_originations,
+            asian_originations,
+            white_originations,
+            0 as native_american_originations,  -- Placeholder: not in tract summary
+            0 as hopi_originations,              -- Placeholder: not in tract summary
+            0 as multi_racial_originations,      -- Placeholder: not in tract summary
+            -- Borrower income columns (placeholders - not in tract summary)
+            0 as lmib_originations,
+            0 as low_income_borrower_originations,
+            0 as moderate_income_borrower_originations,
+            0 as middle_income_borrower_originations,
+            0 as upper_income_borrower_originations,
+            -- Tract income columns
+            lmict_originations,
+            low_income_tract_originations,
+            moderate_income_tract_originations,
+            middle_income_tract_originations,
+            upper_income_tract_originations,
+            mmct_originations,
+            -- Loan metrics
+            total_loan_amount,
+            0.0 as avg_loan_amount,              -- Placeholder: not in tract summary
+            0.0 as avg_property_value,           -- Placeholder: not in tract summary
+            0.0 as avg_interest_rate,            -- Placeholder: not in tract summary
+            0.0 as avg_total_loan_costs,         -- Placeholder: not in tract summary
+            0.0 as avg_origination_charges,      -- Placeholder: not in tract summary
+            0 as loans_with_demographic_data     -- Placeholder: not in tract summary"""
+
+
+def _build_purpose_filter(loan_purpose: list = None) -> str:
+    """
+    Build the SQL loan_purpose predicate used by the summary table queries.
+    
+    Args:
+        loan_purpose: List of loan purpose filters or None for all
+        
+    Returns:
+        SQL boolean expression ("1=1" when no filtering is needed)
+    """
+    if loan_purpose is None or len(loan_purpose) == 0 or set(loan_purpose) == {'purchase', 'refinance', 'equity'}:
+        return "1=1"  # No filter
+    
+    purpose_conditions = []
+    if 'purchase' in loan_purpose:
+        purpose_conditions.append("loan_purpose = '1'")
+    if 'refinance' in loan_purpose:
+        purpose_conditions.append("loan_purpose IN ('31','32')")
+    if 'equity' in loan_purpose:
+        purpose_conditions.append("loan_purpose IN ('2','4')")
+    return f"({' OR '.join(purpose_conditions)})" if purpose_conditions else "1=1"
+
+
 def execute_county_summary_query(county: str, year: int, loan_purpose: list = None) -> List[dict]:
     """
     Query the pre-aggregated county summary table for ~99% cost reduction.
@@ -422,55 +526,10 @@ def execute_county_summary_query(county: str, year: int, loan_purpose: list = No
         exact_county = county_matches[0]
         escaped_county = escape_sql_string(exact_county)
         
-        # Convert loan_purpose to filter string
-        if loan_purpose is None or len(loan_purpose) == 0 or set(loan_purpose) == {'purchase', 'refinance', 'equity'}:
-            loan_purpose_str = 'all'
-        else:
-            loan_purpose_str = ','.join(sorted(loan_purpose))
-        
-        # Build loan purpose filter
-        if loan_purpose_str == 'all':
-            purpose_filter = "1=1"  # No filter
-        else:
-            purpose_conditions = []
-            if 'purchase' in loan_purpose_str:
-                purpose_conditions.append("loan_purpose = '1'")
-            if 'refinance' in loan_purpose_str:
-                purpose_conditions.append("loan_purpose IN ('31','32')")
-            if 'equity' in loan_purpose_str:
-                purpose_conditions.append("loan_purpose IN ('2','4')")
-            purpose_filter = f"({' OR '.join(purpose_conditions)})" if purpose_conditions else "1=1"
+        purpose_filter = _build_purpose_filter(loan_purpose)
         
         sql = f"""
-        SELECT
-            lei,
-            year,
-            geoid5,
-            county_state,
-            loan_purpose,
-            lender_name,
-            total_originations,
-            hispanic_originations,
-            black_originations,
-            asian_originations,
-            white_originations,
-            native_american_originations,
-            hopi_originations,
-            multi_racial_originations,
-            lmib_originations,
-            low_income_borrower_originations,
-            moderate_income_borrower_originations,
-            middle_income_borrower_originations,
-            upper_income_borrower_originations,
-            lmict_originations,
-            mmct_originations,
-            total_loan_amount,
-            avg_loan_amount,
-            avg_property_value,
-            avg_interest_rate,
-            avg_total_loan_costs,
-            avg_origination_charges,
-            loans_with_demographic_data
+        SELECT{_COUNTY_SUMMARY_COLUMNS}
         FROM `{SUMMARY_PROJECT_ID}.lendsight.de_hmda_county_summary`
         WHERE county_state = '{escaped_county}'
             AND year = {year}
@@ -514,68 +573,12 @@ def execute_tract_summary_query(county: str, year: int, loan_purpose: list = Non
         exact_county = county_matches[0]
         escaped_county = escape_sql_string(exact_county)
         
-        # Convert loan_purpose to filter string
-        if loan_purpose is None or len(loan_purpose) == 0 or set(loan_purpose) == {'purchase', 'refinance', 'equity'}:
-            loan_purpose_str = 'all'
-        else:
-            loan_purpose_str = ','.join(sorted(loan_purpose))
-        
-        # Build loan purpose filter
-        if loan_purpose_str == 'all':
-            purpose_filter = "1=1"
-        else:
-            purpose_conditions = []
-            if 'purchase' in loan_purpose_str:
-                purpose_conditions.append("loan_purpose = '1'")
-            if 'refinance' in loan_purpose_str:
-                purpose_conditions.append("loan_purpose IN ('31','32')")
-            if 'equity' in loan_purpose_str:
-                purpose_conditions.append("loan_purpose IN ('2','4')")
-            purpose_filter = f"({' OR '.join(purpose_conditions)})" if purpose_conditions else "1=1"
+        purpose_filter = _build_purpose_filter(loan_purpose)
         
         # Query includes placeholder columns (0) for columns in county summary but not tract summary
         # This ensures report builder compatibility
         sql = f"""
-        SELECT
-            lei,
-            year,
-            geoid5,
-            county_state,
-            tract_code,
-            tract_minority_population_percent,
-            tract_to_msa_income_percentage,
-            loan_purpose,
-            lender_name,
-            total_originations,
-            -- Race/ethnicity columns (some are placeholders)
-            hispanic_originations,
-            black_originations,
-            asian_originations,
-            white_originations,
-            0 as native_american_originations,  -- Placeholder: not in tract summary
-            0 as hopi_originations,              -- Placeholder: not in tract summary
-            0 as multi_racial_originations,      -- Placeholder: not in tract summary
-            -- Borrower income columns (placeholders - not in tract summary)
-            0 as lmib_originations,
-            0 as low_income_borrower_originations,
-            0 as moderate_income_borrower_originations,
-            0 as middle_income_borrower_originations,
-            0 as upper_income_borrower_originations,
-            -- Tract income columns
-            lmict_originations,
-            low_income_tract_originations,
-            moderate_income_tract_originations,
-            middle_income_tract_originations,
-            upper_income_tract_originations,
-            mmct_originations,
-            -- Loan metrics
-            total_loan_amount,
-            0.0 as avg_loan_amount,              -- Placeholder: not in tract summary
-            0.0 as avg_property_value,           -- Placeholder: not in tract summary
-            0.0 as avg_interest_rate,            -- Placeholder: not in tract summary
-            0.0 as avg_total_loan_costs,         -- Placeholder: not in tract summary
-            0.0 as avg_origination_charges,      -- Placeholder: not in tract summary
-            0 as loans_with_demographic_data     -- Placeholder: not in tract summary
+        SELECT{_TRACT_SUMMARY_COLUMNS}
         FROM `{SUMMARY_PROJECT_ID}.lendsight.de_hmda_tract_summary`
         WHERE county_state = '{escaped_county}'
             AND year = {year}
@@ -630,3 +633,130 @@ def execute_tiered_queries(county: str, years: List[int], loan_purpose: list = N
         'tract_data': tract_results
     }
 
+
+
+# =============================================================================
+# BATCHED TIERED QUERIES (one job per summary table for all counties/years)
+# =============================================================================
+
+# Batched mode sends every county and year in a single parameterized query per
+# summary table instead of one query per (county, year) pair.
+USE_BATCHED_TIERED_QUERIES = os.environ.get('LENDSIGHT_BATCHED_TIERED_QUERIES', 'true').lower() == 'true'
+
+
+def _normalize_geoid5(value) -> Optional[str]:
+    """Return a zero-padded 5-digit GEOID string, or None if missing."""
+    if value is None or str(value).strip() == '':
+        return None
+    return str(value).strip().zfill(5)
+
+
+def find_exact_county_matches(counties: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Resolve many county names to their exact county_state and geoid5 in one query.
+    
+    Batched equivalent of find_exact_county_match: exact matches win, then
+    case-insensitive matches. Counties with no match are omitted from the result.
+    
+    Args:
+        counties: County inputs in "County, State" format
+    
+    Returns:
+        Dictionary mapping each input county to {'county_state': ..., 'geoid5': ...}
+    """
+    if not counties:
+        return {}
+    
+    from google.cloud.bigquery import ArrayQueryParameter
+    
+    client = get_bigquery_client(PROJECT_ID, app_name=APP_NAME)
+    sql = """
+        SELECT county_state, MIN(LPAD(CAST(geoid5 AS STRING), 5, '0')) AS geoid5
+        FROM shared.cbsa_to_county
+        WHERE LOWER(county_state) IN UNNEST(@county_names)
+            AND geoid5 IS NOT NULL
+        GROUP BY county_state
+        """
+    params = [ArrayQueryParameter('county_names', 'STRING', sorted({c.lower() for c in counties}))]
+    rows = run_query(client, sql, params=params, timeout=30)
+    
+    exact = {row['county_state']: row for row in rows}
+    case_insensitive = {}
+    for row in rows:
+        case_insensitive.setdefault(row['county_state'].lower(), row)
+    
+    matches = {}
+    for county in counties:
+        row = exact.get(county) or case_insensitive.get(county.lower())
+        if row:
+            matches[county] = {
+                'county_state': row['county_state'],
+                'geoid5': _normalize_geoid5(row['geoid5']),
+            }
+    return matches
+
+
+def execute_batched_tiered_queries(geoids: List[str], years: List[int],
+                                   loan_purpose: list = None) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    Execute tiered queries for many counties and years in one job per summary table.
+    
+    Filters both summary tables on IN UNNEST(@geoids) and IN UNNEST(@years), then
+    splits the returned rows locally by county so callers can keep their per-county
+    handling. A 40-county, 5-year state report needs 2 jobs instead of 400.
+    Results are fetched as DataFrames (Arrow, via the Storage Read API when
+    available) so state-level pulls never build a Python dict per row.
+    
+    Args:
+        geoids: 5-digit county GEOIDs
+        years: List of years
+        loan_purpose: List of loan purpose filters or None for all
+    
+    Returns:
+        Dictionary keyed by geoid5, each value shaped like execute_tiered_queries'
+        result but holding DataFrames: {'county_data': df, 'tract_data': df}
+    
+    Raises:
+        Exception: If either summary query fails (callers fall back to per-county queries)
+    """
+    from google.cloud.bigquery import ArrayQueryParameter
+    
+    geoids = sorted({_normalize_geoid5(g) for g in geoids if _normalize_geoid5(g)})
+    results = {geoid: {'county_data': pd.DataFrame(), 'tract_data': pd.DataFrame()} for geoid in geoids}
+    if not geoids or not years:
+        return results
+    
+    client = get_bigquery_client(SUMMARY_PROJECT_ID)
+    purpose_filter = _build_purpose_filter(loan_purpose)
+    params = [
+        ArrayQueryParameter('geoids', 'STRING', geoids),
+        ArrayQueryParameter('years', 'INT64', [int(y) for y in years]),
+    ]
+    # geoid5 is the padded STRING clustering column; compare it bare (params are
+    # padded above) so BigQuery can prune clusters
+    where_clause = f"""
+        WHERE geoid5 IN UNNEST(@geoids)
+            AND year IN UNNEST(@years)
+            AND {purpose_filter}"""
+    
+    county_sql = f"""
+        SELECT{_COUNTY_SUMMARY_COLUMNS}
+        FROM `{SUMMARY_PROJECT_ID}.lendsight.de_hmda_county_summary`{where_clause}
+        ORDER BY geoid5, lender_name, year
+        """
+    tract_sql = f"""
+        SELECT{_TRACT_SUMMARY_COLUMNS}
+        FROM `{SUMMARY_PROJECT_ID}.lendsight.de_hmda_tract_summary`{where_clause}
+        ORDER BY geoid5, lender_name, tract_code, year
+        """
+    
+    for key, sql in (('county_data', county_sql), ('tract_data', tract_sql)):
+        df = execute_query_df(client, sql, params=params, dtypes=_SUMMARY_DTYPES)
+        if not df.empty:
+            county_keys = df['geoid5'].astype(str).str.zfill(5)
+            for geoid, frame in df.groupby(county_keys, sort=False):
+                if geoid in results:
+                    results[geoid][key] = frame.reset_index(drop=True)
+        print(f"  [BATCHED] {key}: {len(df)} rows for {len(geoids)} counties x {len(years)} years")
+    
+    return results
@@ -1,5 +1,5 @@
 """Coordinator that assembles the mortgage report from its section builders."""
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
 import pandas as pd
 
@@ -32,7 +32,7 @@ from justdata.apps.lendsight.report_builder.sections.top_lenders import (
 
 
 def build_mortgage_report(
-    raw_data: List[Dict[str, Any]],
+    raw_data: Union[List[Dict[str, Any]], pd.DataFrame],
     counties: List[str],
     years: List[int],
     census_data: Dict = None,
@@ -43,7 +43,7 @@ def build_mortgage_report(
     Process raw BigQuery HMDA data and build comprehensive mortgage report dataframes.
 
     Args:
-        raw_data: List of dictionaries from BigQuery results
+        raw_data: BigQuery results, as a DataFrame or a list of dictionaries
         counties: List of counties in the report
         years: List of years in the report
         census_data: Optional dictionary of Census demographic data by county
@@ -53,7 +53,7 @@ def build_mortgage_report(
     Returns:
         Dictionary containing multiple dataframes for different report sections
     """
-    if not raw_data:
+    if raw_data is None or len(raw_data) == 0:
         raise ValueError("No data provided for report building")
 
     # Convert to DataFrame
@@ -5,6 +5,8 @@ from typing import Any, Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from justdata.shared.utils.hhi import concentration_level, hhi_by_market, market_shares
+
 def calculate_mortgage_hhi(df: pd.DataFrame) -> Dict[str, Any]:
     """
     Calculate Herfindahl-Hirschman Index (HHI) for mortgage loan amounts in the latest year.
@@ -25,11 +27,11 @@ def calculate_mortgage_hhi(df: pd.DataFrame) -> Dict[str, Any]:
     
     # Find latest year
     latest_year = df['year'].max()
-    latest_year_df = df[df['year'] == latest_year].copy()
+    latest_year_df = df[df['year'] == latest_year]
     
-    # Aggregate loan amounts by lender (across all counties)
-    lender_loans = latest_year_df.groupby('lender_name')['total_loan_amount'].sum().reset_index()
-    lender_loans = lender_loans[lender_loans['total_loan_amount'] > 0]  # Remove lenders with zero loans
+    # Aggregate loan amounts by lender (across all counties) with market shares (as percentages);
+    # lenders with zero loans are dropped
+    lender_loans = market_shares(latest_year_df, 'year', 'lender_name', 'total_loan_amount')
     
     if lender_loans.empty:
         return {
@@ -42,33 +44,20 @@ def calculate_mortgage_hhi(df: pd.DataFrame) -> Dict[str, Any]:
     
     total_loan_amount = lender_loans['total_loan_amount'].sum()
     
-    # Calculate market shares (as percentages)
-    lender_loans['market_share'] = (lender_loans['total_loan_amount'] / total_loan_amount) * 100
-    
     # Calculate HHI: sum of squared market shares (0-10,000 scale)
     hhi = (lender_loans['market_share'] ** 2).sum()
     
-    # Determine concentration level
-    if hhi < 1500:
-        concentration_level = 'Low concentration (competitive market)'
-    elif hhi < 2500:
-        concentration_level = 'Moderate concentration'
-    else:
-        concentration_level = 'High concentration'
-    
     # Get top lenders by loan amount
-    top_lenders = lender_loans.nlargest(10, 'total_loan_amount').copy()
-    top_lenders_list = []
-    for _, row in top_lenders.iterrows():
-        top_lenders_list.append({
-            'lender_name': row['lender_name'],
-            'total_loan_amount': float(row['total_loan_amount']),
-            'market_share': float(row['market_share'])
-        })
+    top_lenders = lender_loans.nlargest(10, 'total_loan_amount')
+    top_lenders_list = [
+        {'lender_name': name, 'total_loan_amount': float(amount), 'market_share': float(share)}
+        for name, amount, share in zip(top_lenders['lender_name'], top_lenders['total_loan_amount'],
+                                       top_lenders['market_share'])
+    ]
     
     return {
         'hhi': float(hhi),
-        'concentration_level': concentration_level,
+        'concentration_level': concentration_level(hhi),
         'year': int(latest_year),
         'total_loan_amount': float(total_loan_amount),
         'total_lenders': len(lender_loans),
@@ -129,11 +118,14 @@ def create_market_concentration_table(df: pd.DataFrame, years: List[int], metada
                 hhi_results.append(purpose_hhi_data)
                 continue
         
-        # Calculate HHI for each year
+        # Calculate HHI for every year in one pass
+        if 'total_loan_amount' in filtered_df.columns and 'lender_name' in filtered_df.columns:
+            by_year = hhi_by_market(filtered_df, 'year', 'lender_name', 'total_loan_amount')
+            hhi_lookup = dict(zip(by_year['year'], by_year['hhi'].astype(float)))
+        else:
+            hhi_lookup = {}
         for year in sorted(years):
-            year_df = filtered_df[filtered_df['year'] == year].copy()
-            hhi_value = calculate_mortgage_hhi_for_year(year_df, year)
-            purpose_hhi_data[year] = hhi_value['hhi'] if hhi_value['hhi'] is not None else None
+            purpose_hhi_data[year] = hhi_lookup.get(year)
         
         hhi_results.append(purpose_hhi_data)
     
@@ -160,9 +152,9 @@ def calculate_mortgage_hhi_for_year(df: pd.DataFrame, year: int) -> Dict[str, An
             'top_lenders': []
         }
     
-    # Aggregate loan amounts by lender (across all counties)
-    lender_loans = df.groupby('lender_name')['total_loan_amount'].sum().reset_index()
-    lender_loans = lender_loans[lender_loans['total_loan_amount'] > 0]  # Remove lenders with zero loans
+    # Aggregate loan amounts by lender (across all counties) with market shares (as percentages);
+    # lenders with zero loans are dropped
+    lender_loans = market_shares(df.assign(_year=year), '_year', 'lender_name', 'total_loan_amount')
     
     if lender_loans.empty:
         return {
@@ -175,23 +167,12 @@ def calculate_mortgage_hhi_for_year(df: pd.DataFrame, year: int) -> Dict[str, An
     
     total_loan_amount = lender_loans['total_loan_amount'].sum()
     
-    # Calculate market shares (as percentages)
-    lender_loans['market_share'] = (lender_loans['total_loan_amount'] / total_loan_amount) * 100
-    
     # Calculate HHI: sum of squared market shares (0-10,000 scale)
     hhi = (lender_loans['market_share'] ** 2).sum()
     
-    # Determine concentration level
-    if hhi < 1500:
-        concentration_level = 'Low concentration (competitive market)'
-    elif hhi < 2500:
-        concentration_level = 'Moderate concentration'
-    else:
-        concentration_level = 'High concentration'
-    
     return {
         'hhi': float(hhi),
-        'concentration_level': concentration_level,
+        'concentration_level': concentration_level(hhi),
         'year': int(year),
         'total_loan_amount': float(total_loan_amount),
         'total_lenders': len(lender_loans)
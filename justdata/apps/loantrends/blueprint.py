@@ -6,7 +6,6 @@ Converts the standalone LoanTrends app into a blueprint.
 from flask import Blueprint, render_template, request, jsonify, Response
 from jinja2 import ChoiceLoader, FileSystemLoader
 import json
-import time
 import logging
 from pathlib import Path
 
@@ -89,10 +88,11 @@ def analyze():
 @login_required
 def progress(job_id):
     """Get progress of analysis."""
-    from justdata.shared.utils.progress_tracker import get_progress
+    from justdata.shared.utils.progress_tracker import get_progress, get_progress_version, wait_for_progress
     
     def event_stream():
         last_percent = -1
+        version = get_progress_version(job_id)
         while True:
             progress = get_progress(job_id)
             percent = progress.get("percent", 0)
@@ -104,7 +104,7 @@ def progress(job_id):
                 last_percent = percent
             if done or error:
                 break
-            time.sleep(0.5)
+            version = wait_for_progress(job_id, version)
     return Response(event_stream(), mimetype="text/event-stream")
 
 
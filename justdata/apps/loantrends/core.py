@@ -14,6 +14,7 @@ from justdata.apps.loantrends.report_builder import build_trends_report
 from justdata.apps.loantrends.analysis import LoanTrendsAnalyzer
 from justdata.apps.loantrends.version import __version__
 from justdata.shared.utils.unified_env import get_unified_config
+from justdata.shared.utils.job_scheduler import JobCancelled
 
 
 def run_analysis(selected_endpoints: List[str], time_period: str = "all", 
@@ -304,6 +305,8 @@ def run_analysis(selected_endpoints: List[str], time_period: str = "all",
                     ai_insights['key_findings'] = ""
                 
                 print("AI insights generated successfully")
+        except JobCancelled:
+            raise
         except Exception as e:
             import traceback
             error_type = type(e).__name__
@@ -389,6 +392,8 @@ def run_analysis(selected_endpoints: List[str], time_period: str = "all",
         
         return result
         
+    except JobCancelled:
+        raise
     except Exception as e:
         import traceback
         error_type = type(e).__name__
@@ -10,7 +10,6 @@ import tempfile
 import zipfile
 from datetime import datetime
 import uuid
-import threading
 import time
 import json
 from typing import List, Dict
@@ -18,7 +17,10 @@ from pathlib import Path
 
 from justdata.main.auth import require_access, get_user_permissions, get_user_type, login_required, get_current_user
 from justdata.shared.utils.analysis_cache import get_cached_result, store_cached_result, log_usage, generate_cache_key, get_analysis_result_by_job_id
-from justdata.shared.utils.progress_tracker import get_progress, update_progress, create_progress_tracker
+from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, QueueFull
+from justdata.shared.utils.progress_tracker import (
+    get_progress, update_progress, create_progress_tracker, get_progress_version, wait_for_progress
+)
 from .config import TEMPLATES_DIR, STATIC_DIR, OUTPUT_DIR, PROJECT_ID
 from .version import __version__
 # Import functions from mergermeter modules
@@ -105,6 +107,14 @@ def goals_calculator():
         return jsonify({'error': str(e)}), 500
 
 
+@mergermeter_bp.route('/cancel/<job_id>', methods=['POST'])
+@login_required
+def cancel(job_id):
+    """Cancel a queued or running analysis job."""
+    cancelled = get_job_scheduler().cancel(job_id, requester=job_requester_id())
+    return jsonify({'success': True, 'cancelled': cancelled})
+
+
 @mergermeter_bp.route('/progress/<job_id>')
 @login_required
 def progress_handler(job_id):
@@ -112,8 +122,7 @@ def progress_handler(job_id):
     def event_stream():
         last_percent = -1
         last_step = ""
-        keepalive_counter = 0
-        max_keepalive = 20
+        version = get_progress_version(job_id)
         
         try:
             yield f": connected\n\n"
@@ -135,17 +144,15 @@ def progress_handler(job_id):
                         yield f"data: {{\"percent\": {percent}, \"step\": \"{step_escaped}\", \"done\": {str(done).lower()}, \"error\": {json.dumps(error) if error else 'null'}}}\n\n"
                         last_percent = percent
                         last_step = step
-                        keepalive_counter = 0
                     
                     if done or error:
                         break
                     
-                    keepalive_counter += 1
-                    if keepalive_counter >= max_keepalive:
+                    # Block until the job publishes again; keepalive on timeout
+                    new_version = wait_for_progress(job_id, version)
+                    if new_version == version:
                         yield f": keepalive\n\n"
-                        keepalive_counter = 0
-                    
-                    time.sleep(0.5)
+                    version = new_version
                     
                 except GeneratorExit:
                     break
@@ -362,11 +369,16 @@ def analyze():
                     user_agent=client_user_agent
                 )
         
-        thread = threading.Thread(target=run_analysis, daemon=True)
-        thread.start()
+        # Queue on the shared scheduler; an identical in-flight request reuses its job
+        submitted = get_job_scheduler().submit('mergermeter', run_analysis, job_id,
+                                               dedup_key=generate_cache_key('mergermeter', cache_params),
+                                               requester=job_requester_id())
+        session['job_id'] = submitted.job_id
         
-        return jsonify({'success': True, 'job_id': job_id})
+        return jsonify({'success': True, 'job_id': submitted.job_id, 'queue_position': submitted.queue_position})
         
+    except QueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -2,11 +2,18 @@
 """
 HHI (Herfindahl-Hirschman Index) calculator for merger analysis.
 Calculates deposit market concentration before and after merger.
+
+County calculations use the vectorized engine in justdata.shared.utils.hhi,
+which evaluates every county in one pass and supports N-way combinations
+and branch divestitures through MergerScenario.
 """
 
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from justdata.shared.utils.bigquery_client import get_bigquery_client, execute_query
+from justdata.shared.utils.hhi import (
+    MergerScenario, MERGER_LEVEL_LABELS, apply_scenario, concentration_level, merger_hhi
+)
 from justdata.apps.mergermeter.config import PROJECT_ID
 
 
@@ -50,19 +57,15 @@ def get_hhi_concentration_level(hhi: float) -> str:
     Returns:
         Concentration level string
     """
-    if hhi < 1500:
-        return "Low Concentration (Competitive)"
-    elif hhi < 2500:
-        return "Moderate Concentration"
-    else:
-        return "High Concentration"
+    return concentration_level(hhi, MERGER_LEVEL_LABELS)
 
 
 def get_county_deposit_data(
     county_geoids: List[str],
     acquirer_rssd: str,
     target_rssd: str,
-    year: int = 2025
+    year: int = 2025,
+    by_branch: bool = False
 ) -> pd.DataFrame:
     """
     Query BigQuery for branch deposit data in counties where both banks have branches.
@@ -72,9 +75,12 @@ def get_county_deposit_data(
         acquirer_rssd: RSSD ID of acquiring bank
         target_rssd: RSSD ID of target bank
         year: Year for branch data (default: 2025)
+        by_branch: Return one row per branch (adds branch_id) instead of per bank,
+            needed for divestiture scenarios
         
     Returns:
         DataFrame with columns: geoid5, county_state, rssd, bank_name, total_deposits
+        (plus branch_id when by_branch is True)
     """
     if not county_geoids:
         return pd.DataFrame()
@@ -82,6 +88,9 @@ def get_county_deposit_data(
     # Format GEOID5 list
     geoid5_list = [str(g).zfill(5) for g in county_geoids]
     geoid5_str = ', '.join([f"'{g}'" for g in geoid5_list])
+    branch_select = "CAST(b.uninumbr AS STRING) as branch_id," if by_branch else ""
+    branch_group = ", branch_id" if by_branch else ""
+    branch_output = "cb.branch_id," if by_branch else ""
     
     query = f"""
     WITH county_branches AS (
@@ -90,6 +99,7 @@ def get_county_deposit_data(
             CONCAT(c.County, ', ', c.State) as county_state,
             CAST(b.rssd AS STRING) as rssd,
             b.bank_name,
+            {branch_select}
             SUM(b.deposits_000s * 1000) as total_deposits  -- Convert from thousands to actual amount
         FROM `justdata-ncrc.branchsight.sod` b
         LEFT JOIN `justdata-ncrc.shared.cbsa_to_county` c
@@ -98,7 +108,7 @@ def get_county_deposit_data(
             AND CAST(b.geoid5 AS STRING) IN ({geoid5_str})
             AND b.deposits_000s IS NOT NULL
             AND b.deposits_000s > 0
-        GROUP BY geoid5, county_state, rssd, bank_name
+        GROUP BY geoid5, county_state, rssd, bank_name{branch_group}
     ),
     
     -- Find counties where both banks have branches
@@ -116,6 +126,7 @@ def get_county_deposit_data(
         cb.county_state,
         cb.rssd,
         cb.bank_name,
+        {branch_output}
         cb.total_deposits
     FROM county_branches cb
     INNER JOIN counties_with_both_banks cwb
@@ -168,35 +179,22 @@ def calculate_county_hhi(
     # Group deposits by RSSD
     deposits_by_rssd = county_data.groupby('rssd')['total_deposits'].sum().to_dict()
     
-    # Pre-merger: banks are separate
-    pre_merger_hhi = calculate_hhi(deposits_by_rssd)
-    pre_merger_deposits = deposits_by_rssd.copy()
-    
-    # Post-merger: combine acquirer and target deposits
-    post_merger_deposits = deposits_by_rssd.copy()
-    
-    # Combine acquirer and target into merged entity
-    merged_deposits = 0.0
-    merged_rssd = f"{acquirer_rssd}_merged_{target_rssd}"
-    
-    if acquirer_rssd in post_merger_deposits:
-        merged_deposits += post_merger_deposits.pop(acquirer_rssd)
-    if target_rssd in post_merger_deposits:
-        merged_deposits += post_merger_deposits.pop(target_rssd)
-    
-    if merged_deposits > 0:
-        post_merger_deposits[merged_rssd] = merged_deposits
-    
-    post_merger_hhi = calculate_hhi(post_merger_deposits)
+    # Post-merger: combine acquirer and target into merged entity
+    scenario = MergerScenario.two_bank(acquirer_rssd, target_rssd)
+    post_owner = county_data.assign(_owner=apply_scenario(county_data, 'rssd', scenario))
+    post_merger_deposits = post_owner.groupby('_owner')['total_deposits'].sum()
+    post_merger_deposits = post_merger_deposits[post_merger_deposits > 0].to_dict()
     
-    return pre_merger_hhi, post_merger_hhi, pre_merger_deposits, post_merger_deposits
+    return (calculate_hhi(deposits_by_rssd), calculate_hhi(post_merger_deposits),
+            deposits_by_rssd, post_merger_deposits)
 
 
 def calculate_hhi_by_county(
     county_geoids: List[str],
     acquirer_rssd: str,
     target_rssd: str,
-    year: int = 2025
+    year: int = 2025,
+    scenario: Optional[MergerScenario] = None
 ) -> pd.DataFrame:
     """
     Calculate HHI for each county where both banks have branches.
@@ -206,6 +204,8 @@ def calculate_hhi_by_county(
         acquirer_rssd: RSSD ID of acquiring bank
         target_rssd: RSSD ID of target bank
         year: Year for branch data (default: 2025)
+        scenario: Merger scenario to evaluate (default: acquirer + target combine).
+            Use it for N-way combinations or branch divestitures.
         
     Returns:
         DataFrame with columns:
@@ -219,8 +219,11 @@ def calculate_hhi_by_county(
         - Total Deposits (Pre-Merger)
         - Total Deposits (Post-Merger)
     """
+    scenario = scenario or MergerScenario.two_bank(acquirer_rssd, target_rssd)
+    by_branch = bool(scenario.divest)
+    
     # Get deposit data for all counties
-    deposit_df = get_county_deposit_data(county_geoids, acquirer_rssd, target_rssd, year)
+    deposit_df = get_county_deposit_data(county_geoids, acquirer_rssd, target_rssd, year, by_branch=by_branch)
     
     if deposit_df.empty:
         return pd.DataFrame(columns=[
@@ -229,38 +232,27 @@ def calculate_hhi_by_county(
             'Total Deposits (Pre-Merger)', 'Total Deposits (Post-Merger)'
         ])
     
-    # Group by county and calculate HHI
-    results = []
+    # All counties in one vectorized pass
+    hhi = merger_hhi(deposit_df, 'geoid5', 'rssd', 'total_deposits', scenario,
+                     branch_col='branch_id' if by_branch else None)
     
-    for geoid5 in deposit_df['geoid5'].unique():
-        county_data = deposit_df[deposit_df['geoid5'] == geoid5]
-        if county_data.empty:
-            continue
-        county_state = county_data['county_state'].iloc[0] if 'county_state' in county_data.columns else 'Unknown'
-        
-        pre_hhi, post_hhi, pre_deposits, post_deposits = calculate_county_hhi(
-            county_data, acquirer_rssd, target_rssd
-        )
-        
-        hhi_change = post_hhi - pre_hhi
-        
-        total_pre = sum(pre_deposits.values())
-        total_post = sum(post_deposits.values())
-        
-        results.append({
-            'County, State': county_state,
-            'GEOID5': geoid5,
-            'Pre-Merger HHI': round(pre_hhi, 2),
-            'Post-Merger HHI': round(post_hhi, 2),
-            'HHI Change': round(hhi_change, 2),
-            'Pre-Merger Concentration': get_hhi_concentration_level(pre_hhi),
-            'Post-Merger Concentration': get_hhi_concentration_level(post_hhi),
-            'Total Deposits (Pre-Merger)': total_pre,
-            'Total Deposits (Post-Merger)': total_post
-        })
+    if 'county_state' in deposit_df.columns:
+        county_names = deposit_df.drop_duplicates('geoid5').set_index('geoid5')['county_state']
+        hhi['county_state'] = hhi['geoid5'].map(county_names).fillna('Unknown')
+    else:
+        hhi['county_state'] = 'Unknown'
     
-    hhi_df = pd.DataFrame(results)
+    hhi_df = pd.DataFrame({
+        'County, State': hhi['county_state'],
+        'GEOID5': hhi['geoid5'],
+        'Pre-Merger HHI': hhi['pre_hhi'].round(2),
+        'Post-Merger HHI': hhi['post_hhi'].round(2),
+        'HHI Change': hhi['hhi_change'].round(2),
+        'Pre-Merger Concentration': hhi['pre_level'],
+        'Post-Merger Concentration': hhi['post_level'],
+        'Total Deposits (Pre-Merger)': hhi['pre_total'],
+        'Total Deposits (Post-Merger)': hhi['post_total']
+    })
     hhi_df = hhi_df.sort_values('County, State')
     
     return hhi_df
-
@@ -10,7 +10,6 @@ import tempfile
 import zipfile
 from datetime import datetime
 import uuid
-import threading
 import time
 import json
 from typing import List, Dict
@@ -22,7 +21,12 @@ REPO_ROOT = Path(__file__).parent.parent.parent.absolute()
 sys.path.insert(0, str(REPO_ROOT))
 
 from justdata.shared.web.app_factory import create_app, register_standard_routes
-from justdata.shared.utils.progress_tracker import get_progress, update_progress, create_progress_tracker
+from justdata.shared.utils.progress_tracker import (
+    get_progress, update_progress, create_progress_tracker, get_progress_version, wait_for_progress,
+    PROGRESS_KEEPALIVE_SECONDS
+)
+from justdata.shared.utils.job_scheduler import get_job_scheduler, job_requester_id, QueueFull
+from justdata.shared.utils.analysis_cache import generate_cache_key
 from justdata.shared.utils.unified_env import ensure_unified_env_loaded, get_unified_config
 
 # Use absolute imports from repo root (like other apps) - avoids issues with gunicorn
@@ -130,20 +134,17 @@ def progress_handler(job_id):
     def event_stream():
         last_percent = -1
         last_step = ""
-        keepalive_counter = 0
-        max_keepalive = 20  # Send keepalive every 10 seconds (20 * 0.5s)
+        version = get_progress_version(job_id)
         
         # Maximum stream duration: 5 minutes (600 seconds) to prevent memory issues
         max_duration = 300  # 5 minutes
         start_time = time.time()
-        max_iterations = int(max_duration / 0.5)  # Maximum iterations based on sleep time
-        iteration_count = 0
         
         try:
             # Send initial connection message
             yield f": connected\n\n"
             
-            while iteration_count < max_iterations:
+            while True:
                 try:
                     # Check if we've exceeded maximum duration
                     elapsed = time.time() - start_time
@@ -170,21 +171,19 @@ def progress_handler(job_id):
                         yield f"data: {{\"percent\": {percent}, \"step\": \"{step_escaped}\", \"done\": {str(done).lower()}, \"error\": {json.dumps(error) if error else 'null'}}}\n\n"
                         last_percent = percent
                         last_step = step
-                        keepalive_counter = 0
                     
                     if done or error:
                         # Small delay to ensure final message is sent
                         time.sleep(0.1)
                         break
                     
-                    # Send keepalive comment periodically to keep connection alive
-                    keepalive_counter += 1
-                    if keepalive_counter >= max_keepalive:
+                    # Block until the job publishes again (never past the stream deadline);
+                    # on timeout send a keepalive comment to keep the connection alive
+                    remaining = max(0.0, max_duration - (time.time() - start_time))
+                    new_version = wait_for_progress(job_id, version, timeout=min(PROGRESS_KEEPALIVE_SECONDS, remaining))
+                    if new_version == version:
                         yield f": keepalive\n\n"
-                        keepalive_counter = 0
-                    
-                    time.sleep(0.5)
-                    iteration_count += 1
+                    version = new_version
                     
                 except GeneratorExit:
                     # Client disconnected
@@ -204,7 +203,6 @@ def progress_handler(job_id):
                     except:
                         break
                     time.sleep(1)
-                    iteration_count += 1
                     
         except GeneratorExit:
             # Client disconnected normally
@@ -229,6 +227,12 @@ def progress_handler(job_id):
     return response
 
 
+def cancel_handler(job_id):
+    """Cancel a queued or running analysis job"""
+    cancelled = get_job_scheduler().cancel(job_id, requester=job_requester_id())
+    return jsonify({'success': True, 'cancelled': cancelled})
+
+
 def analyze():
     """Handle analysis request - returns immediately, runs analysis in background thread"""
     try:
@@ -277,16 +281,22 @@ def analyze():
                     traceback.print_exc()
                     update_progress(job_id, {'percent': 0, 'step': 'Error occurred', 'done': True, 'error': error_msg})
         
-        thread = threading.Thread(target=run_analysis, daemon=True)
-        thread.start()
+        # Queue on the shared scheduler; an identical in-flight request reuses its job
+        submitted = get_job_scheduler().submit('mergermeter', run_analysis, job_id,
+                                               dedup_key=generate_cache_key('mergermeter', form_data),
+                                               requester=job_requester_id())
+        session['job_id'] = submitted.job_id
         
         # Return immediately with job_id
         return jsonify({
             'success': True,
-            'job_id': job_id,
-            'message': 'Analysis started'
+            'job_id': submitted.job_id,
+            'queue_position': submitted.queue_position,
+            'message': 'Analysis queued' if submitted.queue_position else 'Analysis started'
         })
         
+    except QueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 503
     except Exception as e:
         import traceback
         error_msg = str(e)
@@ -297,6 +307,99 @@ def analyze():
         }), 500
 
 
+def _resolve_sb_ids(client, rssd, sb_id, role):
+    """
+    Resolve every SB respondent ID a bank has filed under, from its RSSD.
+
+    Banks that merged/rechartered have different respondent_ids across years,
+    so all IDs are resolved even when one was provided.
+
+    Returns:
+        Tuple of (list of respondent IDs, {year: respondent_id} for the Notes sheet)
+    """
+    from justdata.shared.utils.bigquery_client import execute_query
+
+    sb_ids = set()
+    sb_ids_by_year = {}
+    if sb_id:
+        sb_ids.add(sb_id)
+    if rssd:
+        try:
+            resolve_query = f"""
+            SELECT DISTINCT sb_resid, sb_year
+            FROM `justdata-ncrc.bizsight.sb_lenders`
+            WHERE CAST(sb_rssd AS STRING) = '{rssd}'
+               OR LPAD(CAST(sb_rssd AS STRING), 10, '0') = LPAD('{rssd}', 10, '0')
+            """
+            resolve_result = execute_query(client, resolve_query)
+            if resolve_result:
+                for row in resolve_result:
+                    if row.get('sb_resid'):
+                        sb_ids.add(row['sb_resid'])
+                        if row.get('sb_year'):
+                            sb_ids_by_year[str(row['sb_year'])] = row['sb_resid']
+            sb_ids.add(str(rssd).zfill(10))
+            print(f"[DEBUG] Resolved {role} SB IDs from RSSD {rssd}: {sb_ids}")
+        except Exception as e:
+            sb_ids.add(str(rssd).zfill(10))
+            print(f"[DEBUG] SB ID resolution failed for {role}: {e}, falling back to RSSD")
+    return list(sb_ids), sb_ids_by_year
+
+
+def _combine_branch_frames(subject_branch, market_branch):
+    """Merge a bank's aggregated branch data with the market (all other banks) by CBSA."""
+    import pandas as pd
+
+    if not subject_branch.empty and not market_branch.empty:
+        # Merge on cbsa_code
+        combined = subject_branch.merge(
+            market_branch,
+            on='cbsa_code',
+            how='outer',
+            suffixes=('_subject', '_market')
+        )
+        # Rename columns to match expected format
+        combined = combined.rename(columns={
+            'total_branches_subject': 'total_branches',
+            'branches_in_lmict_subject': 'branches_in_lmict',
+            'pct_lmict_subject': 'pct_lmict',
+            'branches_in_mmct_subject': 'branches_in_mmct',
+            'pct_mmct_subject': 'pct_mmct',
+            'cbsa_name_subject': 'cbsa_name',
+            'total_branches_market': 'market_total_branches',
+            'branches_in_lmict_market': 'market_branches_in_lmict',
+            'pct_lmict_market': 'market_pct_lmict',
+            'branches_in_mmct_market': 'market_branches_in_mmct',
+            'pct_mmct_market': 'market_pct_mmct'
+        })
+        # Fill numeric columns with 0, string/object columns with ''
+        # so cbsa_name NaN (market-only CBSAs) does not become integer 0
+        _numeric_cols = combined.select_dtypes(include='number').columns
+        _str_cols = combined.select_dtypes(exclude='number').columns
+        combined[_numeric_cols] = combined[_numeric_cols].fillna(0)
+        combined[_str_cols] = combined[_str_cols].fillna('')
+        return combined
+    if not subject_branch.empty:
+        combined = subject_branch.copy()
+        # Add empty market columns
+        combined['market_total_branches'] = 0
+        combined['market_branches_in_lmict'] = 0
+        combined['market_pct_lmict'] = 0
+        combined['market_branches_in_mmct'] = 0
+        combined['market_pct_mmct'] = 0
+        return combined
+    if not market_branch.empty:
+        combined = market_branch.copy()
+        # Add empty subject columns
+        combined['total_branches'] = 0
+        combined['branches_in_lmict'] = 0
+        combined['pct_lmict'] = 0
+        combined['branches_in_mmct'] = 0
+        combined['pct_mmct'] = 0
+        return combined
+    return pd.DataFrame()
+
+
 def _perform_analysis(job_id, form_data):
     """Perform the actual analysis (runs in background thread)"""
     try:
@@ -619,168 +722,155 @@ def _perform_analysis(job_id, form_data):
             })
             return
         
-        update_progress(job_id, {'percent': 15, 'step': 'Querying HMDA data for Bank A...', 'done': False, 'error': None})
+        update_progress(job_id, {'percent': 15, 'step': 'Querying HMDA, Small Business and branch data...', 'done': False, 'error': None})
         
-        # Query HMDA data
-        build_hmda_subject_query, build_hmda_peer_query, build_sb_subject_query, build_sb_peer_query, build_branch_query, build_branch_market_query, build_branch_details_query = _import_local_module(
-            'query_builders', 
-            'build_hmda_subject_query', 'build_hmda_peer_query',
-            'build_sb_subject_query', 'build_sb_peer_query',
-            'build_branch_query', 'build_branch_market_query', 'build_branch_details_query'
+        from justdata.apps.mergermeter.query_builders import (
+            build_hmda_subject_query, build_hmda_peer_query,
+            build_sb_subject_query, build_sb_peer_query,
+            build_branch_query, build_branch_market_query, build_branch_details_query,
+            build_county_level_hmda_goals_query, build_county_level_sb_goals_query
         )
-        from justdata.shared.utils.bigquery_client import get_bigquery_client, execute_query
+        from justdata.apps.mergermeter.query_dag import QueryDAG
+        from justdata.shared.utils.bigquery_client import get_bigquery_client, execute_query_df
         import pandas as pd
 
         client = get_bigquery_client(PROJECT_ID, app_name='MERGERMETER')
 
-        # Bank A HMDA Subject
-        bank_a_hmda_subject = pd.DataFrame()
-        if acquirer_lei and acquirer_geoids:
-            query = build_hmda_subject_query(
-                acquirer_lei, acquirer_geoids, hmda_years, loan_purpose,
-                action_taken, occupancy_type, total_units, construction_method, not_reverse
-            )
-            results = execute_query(client, query)
-            if results:
-                bank_a_hmda_subject = pd.DataFrame(results)
-
-        update_progress(job_id, {'percent': 25, 'step': 'Querying HMDA peer data for Bank A...', 'done': False, 'error': None})
-
-        # Bank A HMDA Peer
-        bank_a_hmda_peer = pd.DataFrame()
-        if acquirer_lei and acquirer_geoids:
-            query = build_hmda_peer_query(
-                acquirer_lei, acquirer_geoids, hmda_years, loan_purpose,
-                action_taken, occupancy_type, total_units, construction_method, not_reverse, peer_group
-            )
-            results = execute_query(client, query)
-            if results:
-                bank_a_hmda_peer = pd.DataFrame(results)
-
-        update_progress(job_id, {'percent': 35, 'step': 'Querying HMDA data for Bank B...', 'done': False, 'error': None})
-
-        # Bank B HMDA Subject
-        bank_b_hmda_subject = pd.DataFrame()
-        if target_lei and target_geoids:
-            query = build_hmda_subject_query(
-                target_lei, target_geoids, hmda_years, loan_purpose,
-                action_taken, occupancy_type, total_units, construction_method, not_reverse
-            )
-            results = execute_query(client, query)
-            if results:
-                bank_b_hmda_subject = pd.DataFrame(results)
-
-        update_progress(job_id, {'percent': 45, 'step': 'Querying HMDA peer data for Bank B...', 'done': False, 'error': None})
-
-        # Bank B HMDA Peer
-        bank_b_hmda_peer = pd.DataFrame()
-        if target_lei and target_geoids:
-            query = build_hmda_peer_query(
-                target_lei, target_geoids, hmda_years, loan_purpose,
-                action_taken, occupancy_type, total_units, construction_method, not_reverse, peer_group
-            )
-            results = execute_query(client, query)
-            if results:
-                bank_b_hmda_peer = pd.DataFrame(results)
-        
-        # ALWAYS resolve ALL SB respondent IDs from RSSD, even if one was provided.
-        # Banks that merged/rechartered have different respondent_ids across years
-        # (e.g., Cadence Bank: 0000011813 for 2023, 0000606046 for 2024).
-        acquirer_sb_ids = set()
-        acquirer_sb_ids_by_year = {}  # {year: resid} for Notes sheet
-        if acquirer_sb_id:
-            acquirer_sb_ids.add(acquirer_sb_id)
-        if acquirer_rssd:
-            try:
-                resolve_query = f"""
-                SELECT DISTINCT sb_resid, sb_year
-                FROM `justdata-ncrc.bizsight.sb_lenders`
-                WHERE CAST(sb_rssd AS STRING) = '{acquirer_rssd}'
-                   OR LPAD(CAST(sb_rssd AS STRING), 10, '0') = LPAD('{acquirer_rssd}', 10, '0')
-                """
-                resolve_result = execute_query(client, resolve_query)
-                if resolve_result:
-                    for row in resolve_result:
-                        if row.get('sb_resid'):
-                            acquirer_sb_ids.add(row['sb_resid'])
-                            if row.get('sb_year'):
-                                acquirer_sb_ids_by_year[str(row['sb_year'])] = row['sb_resid']
-                acquirer_sb_ids.add(str(acquirer_rssd).zfill(10))
-                print(f"[DEBUG] Resolved acquirer SB IDs from RSSD {acquirer_rssd}: {acquirer_sb_ids}")
-            except Exception as e:
-                acquirer_sb_ids.add(str(acquirer_rssd).zfill(10))
-                print(f"[DEBUG] SB ID resolution failed for acquirer: {e}, falling back to RSSD")
-        acquirer_sb_ids = list(acquirer_sb_ids)
-
-        target_sb_ids = set()
-        target_sb_ids_by_year = {}  # {year: resid} for Notes sheet
-        if target_sb_id:
-            target_sb_ids.add(target_sb_id)
-        if target_rssd:
-            try:
-                resolve_query = f"""
-                SELECT DISTINCT sb_resid, sb_year
-                FROM `justdata-ncrc.bizsight.sb_lenders`
-                WHERE CAST(sb_rssd AS STRING) = '{target_rssd}'
-                   OR LPAD(CAST(sb_rssd AS STRING), 10, '0') = LPAD('{target_rssd}', 10, '0')
-                """
-                resolve_result = execute_query(client, resolve_query)
-                if resolve_result:
-                    for row in resolve_result:
-                        if row.get('sb_resid'):
-                            target_sb_ids.add(row['sb_resid'])
-                            if row.get('sb_year'):
-                                target_sb_ids_by_year[str(row['sb_year'])] = row['sb_resid']
-                target_sb_ids.add(str(target_rssd).zfill(10))
-                print(f"[DEBUG] Resolved target SB IDs from RSSD {target_rssd}: {target_sb_ids}")
-            except Exception as e:
-                target_sb_ids.add(str(target_rssd).zfill(10))
-                print(f"[DEBUG] SB ID resolution failed for target: {e}, falling back to RSSD")
-        target_sb_ids = list(target_sb_ids)
+        def query_df(query):
+            """Run a query on the shared client straight into a DataFrame (Arrow download)."""
+            return execute_query_df(client, query)
+
+        def query_node(build_query, *args, **kwargs):
+            """Node function that builds and runs one query."""
+            return lambda: query_df(build_query(*args, **kwargs))
+
+        def sb_query_node(build_query, geoids, years):
+            """Node function for an SB query that needs the bank's resolved respondent IDs."""
+            def run(sb_resolution):
+                sb_ids = sb_resolution[0]
+                if not (sb_ids and geoids):
+                    return pd.DataFrame()
+                return query_df(build_query(sb_ids, geoids, years))
+            return run
+
+        # Every query below is independent except the SB queries, which wait on
+        # their own bank's respondent ID resolution. The DAG runs ready nodes
+        # concurrently on a bounded pool that shares the cached client.
+        dag = QueryDAG()
+        hmda_filters = (action_taken, occupancy_type, total_units, construction_method, not_reverse)
+        banks = [
+            ('a', 'Bank A', 'acquirer', acquirer_lei, acquirer_rssd, acquirer_sb_id, acquirer_geoids),
+            ('b', 'Bank B', 'target', target_lei, target_rssd, target_sb_id, target_geoids),
+        ]
+        loan_purpose_map = {
+            'home_purchase': '1',
+            'refinance': '31,32',
+            'home_equity': '2,4'
+        }
+        
+        for key, label, role, lei, rssd, sb_id, geoids in banks:
+            # HMDA subject and peer
+            if lei and geoids:
+                dag.add(f'hmda_{key}_subject', query_node(
+                    build_hmda_subject_query, lei, geoids, hmda_years, loan_purpose, *hmda_filters
+                ), label=f'HMDA data for {label}')
+                dag.add(f'hmda_{key}_peer', query_node(
+                    build_hmda_peer_query, lei, geoids, hmda_years, loan_purpose, *hmda_filters, peer_group
+                ), label=f'HMDA peer data for {label}')
+            
+            # ALWAYS resolve ALL SB respondent IDs from RSSD, even if one was provided.
+            # Banks that merged/rechartered have different respondent_ids across years
+            # (e.g., Cadence Bank: 0000011813 for 2023, 0000606046 for 2024).
+            dag.add(f'sb_ids_{key}', lambda rssd=rssd, sb_id=sb_id, role=role: _resolve_sb_ids(
+                client, rssd, sb_id, role
+            ), label=f'Small Business IDs for {label}')
+            dag.add(f'sb_{key}_subject', sb_query_node(build_sb_subject_query, geoids, sb_years),
+                    deps=[f'sb_ids_{key}'], label=f'Small Business data for {label}')
+            dag.add(f'sb_{key}_peer', sb_query_node(build_sb_peer_query, geoids, sb_years),
+                    deps=[f'sb_ids_{key}'], label=f'Small Business peer data for {label}')
+            
+            # Branch data: aggregated subject and market (all other banks), plus individual branches
+            if rssd and geoids:
+                dag.add(f'branch_{key}_subject', query_node(build_branch_query, rssd, geoids, year=2025),
+                        label=f'Branch data for {label}')
+                dag.add(f'branch_{key}_market', query_node(build_branch_market_query, rssd, geoids, year=2025),
+                        label=f'Branch market data for {label}')
+                dag.add(f'branch_{key}_details', query_node(build_branch_details_query, rssd, geoids, year=2025),
+                        label=f'Branch details for {label}')
+            
+            # Mortgage Goals baseline: HMDA by loan purpose type, aggregated by state
+            if all_geoids and lei and geoids:
+                for loan_type, loan_purpose_filter in loan_purpose_map.items():
+                    dag.add(f'goals_hmda_{loan_type}_{key}', query_node(
+                        build_county_level_hmda_goals_query, lei, geoids, baseline_hmda_years,
+                        loan_purpose_filter, *hmda_filters
+                    ), label=f'Mortgage Goals ({loan_type}) for {label}')
+            
+            # SB Goals baseline: aggregated by state
+            if all_geoids:
+                dag.add(f'goals_sb_{key}', sb_query_node(build_county_level_sb_goals_query, geoids, baseline_sb_years),
+                        deps=[f'sb_ids_{key}'], label=f'SB Goals for {label}')
+        
+        # Calculate HHI
+        print(f"[HHI] Starting HHI calculation - RSSDs: {acquirer_rssd}, {target_rssd}, Counties: {len(all_geoids) if all_geoids else 0}")
+        if acquirer_rssd and target_rssd and all_geoids:
+            calculate_hhi_by_county = _import_local_module('hhi_calculator', 'calculate_hhi_by_county')
+            
+            def calculate_hhi():
+                try:
+                    hhi = calculate_hhi_by_county(
+                        county_geoids=all_geoids,
+                        acquirer_rssd=acquirer_rssd,
+                        target_rssd=target_rssd,
+                        year=2025
+                    )
+                    print(f"[HHI] HHI calculation completed - {len(hhi)} counties with data")
+                    return hhi
+                except Exception as e:
+                    print(f"[HHI] Error calculating HHI: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    return pd.DataFrame()
+            
+            dag.add('hhi', calculate_hhi, label='HHI calculation')
+        else:
+            print(f"[HHI] Skipping HHI calculation - Missing: RSSDs={not (acquirer_rssd and target_rssd)}, Counties={not all_geoids}")
+        
+        def report_node_timing(timing, completed, total):
+            """Report each finished query (and how long it took) to the progress tracker."""
+            update_progress(job_id, {
+                'percent': 15 + int(completed / total * 78),
+                'step': f'{timing.label} ready ({timing.seconds:.1f}s) - {completed}/{total} queries complete',
+                'done': False,
+                'error': None
+            })
+        
+        dag_start = time.time()
+        query_results = dag.run(on_node_complete=report_node_timing)
+        print(f"[QUERY DAG] {len(query_results)} queries finished in {time.time() - dag_start:.1f}s wall clock "
+              f"(sum of query times: {sum(t.seconds for t in dag.timings):.1f}s)")
+        for timing in sorted(dag.timings, key=lambda t: t.seconds, reverse=True):
+            print(f"[QUERY DAG]   {timing.name}: {timing.seconds:.2f}s")
+        
+        def result_df(name):
+            return query_results.get(name, pd.DataFrame())
+        
+        bank_a_hmda_subject = result_df('hmda_a_subject')
+        bank_a_hmda_peer = result_df('hmda_a_peer')
+        bank_b_hmda_subject = result_df('hmda_b_subject')
+        bank_b_hmda_peer = result_df('hmda_b_peer')
+        
+        acquirer_sb_ids, acquirer_sb_ids_by_year = query_results['sb_ids_a']
+        target_sb_ids, target_sb_ids_by_year = query_results['sb_ids_b']
 
         # Keep single-string variables for backward compat with metadata
         acquirer_sb_id = ', '.join(acquirer_sb_ids) if acquirer_sb_ids else ''
         target_sb_id = ', '.join(target_sb_ids) if target_sb_ids else ''
-
-        update_progress(job_id, {'percent': 55, 'step': 'Querying Small Business data for Bank A...', 'done': False, 'error': None})
-
-        # Bank A Small Business Subject
-        bank_a_sb_subject = pd.DataFrame()
-        if acquirer_sb_ids and acquirer_geoids:
-            query = build_sb_subject_query(acquirer_sb_ids, acquirer_geoids, sb_years)
-            results = execute_query(client, query)
-            if results:
-                bank_a_sb_subject = pd.DataFrame(results)
-        
-        update_progress(job_id, {'percent': 65, 'step': 'Querying Small Business peer data for Bank A...', 'done': False, 'error': None})
-        
-        # Bank A Small Business Peer
-        bank_a_sb_peer = pd.DataFrame()
-        if acquirer_sb_ids and acquirer_geoids:
-            query = build_sb_peer_query(acquirer_sb_ids, acquirer_geoids, sb_years)
-            results = execute_query(client, query)
-            if results:
-                bank_a_sb_peer = pd.DataFrame(results)
-        
-        update_progress(job_id, {'percent': 75, 'step': 'Querying Small Business data for Bank B...', 'done': False, 'error': None})
-        
-        # Bank B Small Business Subject
-        bank_b_sb_subject = pd.DataFrame()
-        if target_sb_ids and target_geoids:
-            query = build_sb_subject_query(target_sb_ids, target_geoids, sb_years)
-            results = execute_query(client, query)
-            if results:
-                bank_b_sb_subject = pd.DataFrame(results)
-        
-        update_progress(job_id, {'percent': 85, 'step': 'Querying Small Business peer data for Bank B...', 'done': False, 'error': None})
-        
-        # Bank B Small Business Peer
-        bank_b_sb_peer = pd.DataFrame()
-        if target_sb_ids and target_geoids:
-            query = build_sb_peer_query(target_sb_ids, target_geoids, sb_years)
-            results = execute_query(client, query)
-            if results:
-                bank_b_sb_peer = pd.DataFrame(results)
+        
+        bank_a_sb_subject = result_df('sb_a_subject')
+        bank_a_sb_peer = result_df('sb_a_peer')
+        bank_b_sb_subject = result_df('sb_b_subject')
+        bank_b_sb_peer = result_df('sb_b_peer')
         
         # Log warning if SB data is empty after auto-resolution
         if acquirer_sb_ids and acquirer_geoids and bank_a_sb_subject.empty:
@@ -790,345 +880,24 @@ def _perform_analysis(job_id, form_data):
             print(f"[WARNING] No SB data found for target SB IDs {target_sb_ids} "
                   f"(RSSD: {target_rssd}) in {len(target_geoids)} counties, years {sb_years}")
 
-        update_progress(job_id, {'percent': 87, 'step': 'Querying branch data for Bank A...', 'done': False, 'error': None})
-
-        # Bank A Branch Data (aggregated) - subject and market
-        bank_a_branch = pd.DataFrame()
-        bank_a_branch_details = pd.DataFrame()
-        if acquirer_rssd and acquirer_geoids:
-            # Get subject bank aggregated branch data
-            query = build_branch_query(acquirer_rssd, acquirer_geoids, year=2025)
-            results = execute_query(client, query)
-            subject_branch = pd.DataFrame(results) if results else pd.DataFrame()
-            
-            # Get market (all other banks) aggregated branch data
-            query_market = build_branch_market_query(acquirer_rssd, acquirer_geoids, year=2025)
-            results_market = execute_query(client, query_market)
-            market_branch = pd.DataFrame(results_market) if results_market else pd.DataFrame()
-            
-            # Merge subject and market data by CBSA
-            if not subject_branch.empty and not market_branch.empty:
-                # Merge on cbsa_code
-                bank_a_branch = subject_branch.merge(
-                    market_branch,
-                    on='cbsa_code',
-                    how='outer',
-                    suffixes=('_subject', '_market')
-                )
-                # Rename columns to match expected format
-                bank_a_branch = bank_a_branch.rename(columns={
-                    'total_branches_subject': 'total_branches',
-                    'branches_in_lmict_subject': 'branches_in_lmict',
-                    'pct_lmict_subject': 'pct_lmict',
-                    'branches_in_mmct_subject': 'branches_in_mmct',
-                    'pct_mmct_subject': 'pct_mmct',
-                    'cbsa_name_subject': 'cbsa_name',
-                    'total_branches_market': 'market_total_branches',
-                    'branches_in_lmict_market': 'market_branches_in_lmict',
-                    'pct_lmict_market': 'market_pct_lmict',
-                    'branches_in_mmct_market': 'market_branches_in_mmct',
-                    'pct_mmct_market': 'market_pct_mmct'
-                })
-                # Fill numeric columns with 0, string/object columns with ''
-                # so cbsa_name NaN (market-only CBSAs) does not become integer 0
-                _numeric_cols = bank_a_branch.select_dtypes(include='number').columns
-                _str_cols = bank_a_branch.select_dtypes(exclude='number').columns
-                bank_a_branch[_numeric_cols] = bank_a_branch[_numeric_cols].fillna(0)
-                bank_a_branch[_str_cols] = bank_a_branch[_str_cols].fillna('')
-            elif not subject_branch.empty:
-                bank_a_branch = subject_branch.copy()
-                # Add empty market columns
-                bank_a_branch['market_total_branches'] = 0
-                bank_a_branch['market_branches_in_lmict'] = 0
-                bank_a_branch['market_pct_lmict'] = 0
-                bank_a_branch['market_branches_in_mmct'] = 0
-                bank_a_branch['market_pct_mmct'] = 0
-            elif not market_branch.empty:
-                bank_a_branch = market_branch.copy()
-                # Add empty subject columns
-                bank_a_branch['total_branches'] = 0
-                bank_a_branch['branches_in_lmict'] = 0
-                bank_a_branch['pct_lmict'] = 0
-                bank_a_branch['branches_in_mmct'] = 0
-                bank_a_branch['pct_mmct'] = 0
-            
-            # Get individual branch details
-            query_details = build_branch_details_query(acquirer_rssd, acquirer_geoids, year=2025)
-            results_details = execute_query(client, query_details)
-            if results_details:
-                bank_a_branch_details = pd.DataFrame(results_details)
-        
-        update_progress(job_id, {'percent': 88, 'step': 'Querying branch data for Bank B...', 'done': False, 'error': None})
-        
-        # Bank B Branch Data (aggregated) - subject and market
-        bank_b_branch = pd.DataFrame()
-        bank_b_branch_details = pd.DataFrame()
-        if target_rssd and target_geoids:
-            # Get subject bank aggregated branch data
-            query = build_branch_query(target_rssd, target_geoids, year=2025)
-            results = execute_query(client, query)
-            subject_branch = pd.DataFrame(results) if results else pd.DataFrame()
-            
-            # Get market (all other banks) aggregated branch data
-            query_market = build_branch_market_query(target_rssd, target_geoids, year=2025)
-            results_market = execute_query(client, query_market)
-            market_branch = pd.DataFrame(results_market) if results_market else pd.DataFrame()
-            
-            # Merge subject and market data by CBSA
-            if not subject_branch.empty and not market_branch.empty:
-                # Merge on cbsa_code
-                bank_b_branch = subject_branch.merge(
-                    market_branch,
-                    on='cbsa_code',
-                    how='outer',
-                    suffixes=('_subject', '_market')
-                )
-                # Rename columns to match expected format
-                bank_b_branch = bank_b_branch.rename(columns={
-                    'total_branches_subject': 'total_branches',
-                    'branches_in_lmict_subject': 'branches_in_lmict',
-                    'pct_lmict_subject': 'pct_lmict',
-                    'branches_in_mmct_subject': 'branches_in_mmct',
-                    'pct_mmct_subject': 'pct_mmct',
-                    'cbsa_name_subject': 'cbsa_name',
-                    'total_branches_market': 'market_total_branches',
-                    'branches_in_lmict_market': 'market_branches_in_lmict',
-                    'pct_lmict_market': 'market_pct_lmict',
-                    'branches_in_mmct_market': 'market_branches_in_mmct',
-                    'pct_mmct_market': 'market_pct_mmct'
-                })
-                # Fill numeric columns with 0, string/object columns with ''
-                # so cbsa_name NaN (market-only CBSAs) does not become integer 0
-                _numeric_cols = bank_b_branch.select_dtypes(include='number').columns
-                _str_cols = bank_b_branch.select_dtypes(exclude='number').columns
-                bank_b_branch[_numeric_cols] = bank_b_branch[_numeric_cols].fillna(0)
-                bank_b_branch[_str_cols] = bank_b_branch[_str_cols].fillna('')
-            elif not subject_branch.empty:
-                bank_b_branch = subject_branch.copy()
-                # Add empty market columns
-                bank_b_branch['market_total_branches'] = 0
-                bank_b_branch['market_branches_in_lmict'] = 0
-                bank_b_branch['market_pct_lmict'] = 0
-                bank_b_branch['market_branches_in_mmct'] = 0
-                bank_b_branch['market_pct_mmct'] = 0
-            elif not market_branch.empty:
-                bank_b_branch = market_branch.copy()
-                # Add empty subject columns
-                bank_b_branch['total_branches'] = 0
-                bank_b_branch['branches_in_lmict'] = 0
-                bank_b_branch['pct_lmict'] = 0
-                bank_b_branch['branches_in_mmct'] = 0
-                bank_b_branch['pct_mmct'] = 0
-            
-            # Get individual branch details
-            query_details = build_branch_details_query(target_rssd, target_geoids, year=2025)
-            results_details = execute_query(client, query_details)
-            if results_details:
-                bank_b_branch_details = pd.DataFrame(results_details)
-        
-        update_progress(job_id, {'percent': 90, 'step': 'Calculating HHI...', 'done': False, 'error': None})
+        # Merge subject and market branch data by CBSA
+        bank_a_branch = _combine_branch_frames(result_df('branch_a_subject'), result_df('branch_a_market'))
+        bank_a_branch_details = result_df('branch_a_details')
+        bank_b_branch = _combine_branch_frames(result_df('branch_b_subject'), result_df('branch_b_market'))
+        bank_b_branch_details = result_df('branch_b_details')
         
-        # Calculate HHI
-        hhi_df = pd.DataFrame()
-        print(f"[HHI] Starting HHI calculation - RSSDs: {acquirer_rssd}, {target_rssd}, Counties: {len(all_geoids) if all_geoids else 0}")
-        if acquirer_rssd and target_rssd and all_geoids:
-            calculate_hhi_by_county = _import_local_module('hhi_calculator', 'calculate_hhi_by_county')
-            try:
-                hhi_df = calculate_hhi_by_county(
-                    county_geoids=all_geoids,
-                    acquirer_rssd=acquirer_rssd,
-                    target_rssd=target_rssd,
-                    year=2025
-                )
-                print(f"[HHI] HHI calculation completed - {len(hhi_df)} counties with data")
-            except Exception as e:
-                print(f"[HHI] Error calculating HHI: {e}")
-                import traceback
-                traceback.print_exc()
-        else:
-            print(f"[HHI] Skipping HHI calculation - Missing: RSSDs={not (acquirer_rssd and target_rssd)}, Counties={not all_geoids}")
+        hhi_df = result_df('hhi')
         
-        update_progress(job_id, {'percent': 92, 'step': 'Querying Mortgage Goals data...', 'done': False, 'error': None})
+        update_progress(job_id, {'percent': 93, 'step': 'Aggregating Mortgage and SB Goals data...', 'done': False, 'error': None})
         
-        # Query HMDA data for Mortgage Goals (by loan purpose type, aggregated by state)
+        # Mortgage Goals: combine both banks and aggregate by state
         mortgage_goals_data = {}
         if (acquirer_lei or target_lei) and all_geoids:
-            # Get state mapping from counties
-            geoid5_list = "', '".join([str(g).zfill(5) for g in all_geoids])
-            state_query = f"""
-            SELECT DISTINCT 
-                LPAD(CAST(geoid5 AS STRING), 5, '0') as geoid5,
-                State as state_name
-            FROM `justdata-ncrc.shared.cbsa_to_county`
-            WHERE LPAD(CAST(geoid5 AS STRING), 5, '0') IN ('{geoid5_list}')
-            """
-            state_results = execute_query(client, state_query)
-            state_map = {row['geoid5']: row.get('state_name', '') for row in state_results} if state_results else {}
-            
-            # Query for each loan purpose type
-            loan_purpose_map = {
-                'home_purchase': '1',
-                'refinance': '31,32',
-                'home_equity': '2,4'
-            }
-            
-            for loan_type, loan_purpose_filter in loan_purpose_map.items():
-                combined_dfs = []
-                
-                # Build county-level query for mortgage goals (not CBSA-level)
-                # This allows us to properly break down multi-state CBSAs by county, then aggregate by state
-                def build_county_level_hmda_query(lei, geoids, years, loan_purpose, action_taken, occupancy_type, total_units, construction_method, not_reverse):
-                    """Build HMDA query aggregated by county (GEOID5) instead of CBSA"""
-                    geoid5_list = "', '".join([str(g).zfill(5) for g in geoids])
-                    years_list = "', '".join([str(y) for y in years])
-                    
-                    # Build filters
-                    loan_purpose_filter_str = ""
-                    if loan_purpose:
-                        if ',' in loan_purpose:
-                            purposes = [p.strip() for p in loan_purpose.split(',')]
-                            purpose_list = "', '".join(purposes)
-                            loan_purpose_filter_str = f"AND h.loan_purpose IN ('{purpose_list}')"
-                        else:
-                            loan_purpose_filter_str = f"AND h.loan_purpose = '{loan_purpose.strip()}'"
-                    
-                    action_taken_filter = ""
-                    if action_taken:
-                        if ',' in action_taken:
-                            actions = [a.strip() for a in action_taken.split(',')]
-                            action_list = "', '".join(actions)
-                            action_taken_filter = f"AND h.action_taken IN ('{action_list}')"
-                        else:
-                            action_taken_filter = f"AND h.action_taken = '{action_taken.strip()}'"
-                    
-                    occupancy_filter = ""
-                    if occupancy_type:
-                        if ',' in occupancy_type:
-                            occupancies = [o.strip() for o in occupancy_type.split(',')]
-                            occupancy_list = "', '".join(occupancies)
-                            occupancy_filter = f"AND h.occupancy_type IN ('{occupancy_list}')"
-                        else:
-                            occupancy_filter = f"AND h.occupancy_type = '{occupancy_type.strip()}'"
-                    
-                    units_filter = ""
-                    if total_units:
-                        # Handle range notation like '1-4' → expand to '1','2','3','4'
-                        if '-' in total_units and ',' not in total_units:
-                            try:
-                                parts = total_units.split('-')
-                                start, end = int(parts[0].strip()), int(parts[1].strip())
-                                units = [str(i) for i in range(start, end + 1)]
-                            except (ValueError, IndexError):
-                                units = [total_units.strip()]
-                        elif ',' in total_units:
-                            units = [u.strip() for u in total_units.split(',')]
-                        else:
-                            units = [total_units.strip()]
-
-                        if len(units) == 1:
-                            units_filter = f"AND h.total_units = '{units[0]}'"
-                        else:
-                            units_list = "', '".join(units)
-                            units_filter = f"AND h.total_units IN ('{units_list}')"
-
-                    construction_filter = ""
-                    if construction_method:
-                        if ',' in construction_method:
-                            constructions = [c.strip() for c in construction_method.split(',')]
-                            construction_list = "', '".join(constructions)
-                            construction_filter = f"AND h.construction_method IN ('{construction_list}')"
-                        else:
-                            construction_filter = f"AND h.construction_method = '{construction_method.strip()}'"
-                    
-                    reverse_filter = ""
-                    if not_reverse:
-                        if ',' in not_reverse:
-                            reverse_values = [r.strip() for r in not_reverse.split(',')]
-                            if '1' in reverse_values and '2' not in reverse_values:
-                                reverse_filter = "AND h.reverse_mortgage != '1'"
-                            elif '2' in reverse_values and '1' not in reverse_values:
-                                reverse_filter = "AND h.reverse_mortgage = '1'"
-                        else:
-                            if not_reverse == '1':
-                                reverse_filter = "AND h.reverse_mortgage != '1'"
-                            elif not_reverse == '2':
-                                reverse_filter = "AND h.reverse_mortgage = '1'"
-                    
-                    # Get state name from county crosswalk
-                    query = f"""
-                    WITH county_state_map AS (
-                        SELECT DISTINCT
-                            LPAD(CAST(geoid5 AS STRING), 5, '0') as geoid5,
-                            State as state_name
-                        FROM `justdata-ncrc.shared.cbsa_to_county`
-                        WHERE LPAD(CAST(geoid5 AS STRING), 5, '0') IN ('{geoid5_list}')
-                    ),
-                    filtered_hmda AS (
-                        SELECT 
-                            h.geoid5,
-                            h.loan_amount,
-                            -- Use pre-computed boolean flags from de_hmda (convert BOOL to INT)
-                            CASE WHEN h.is_lmict THEN 1 ELSE 0 END as is_lmict,
-                            CASE WHEN h.is_lmib THEN 1 ELSE 0 END as is_lmib,
-                            CASE WHEN h.is_mmct THEN 1 ELSE 0 END as is_mmct,
-                            CASE WHEN h.is_hispanic THEN 1 ELSE 0 END as is_hispanic,
-                            CASE WHEN h.is_black THEN 1 ELSE 0 END as is_black,
-                            CASE WHEN h.is_asian THEN 1 ELSE 0 END as is_asian,
-                            CASE WHEN h.is_native_american THEN 1 ELSE 0 END as is_native_american,
-                            CASE WHEN h.is_hopi THEN 1 ELSE 0 END as is_hopi
-                        FROM `justdata-ncrc.shared.de_hmda` h
-                        WHERE CAST(h.activity_year AS STRING) IN ('{years_list}')
-                            AND CAST(h.lei AS STRING) = '{lei}'
-                            AND h.geoid5 IN ('{geoid5_list}')
-                            {loan_purpose_filter_str}
-                            {action_taken_filter}
-                            {occupancy_filter}
-                            {units_filter}
-                            {construction_filter}
-                            {reverse_filter}
-                    )
-                    SELECT 
-                        csm.state_name,
-                        COUNT(*) as total_loans,
-                        SUM(fh.is_lmict) as lmict_loans,
-                        SUM(fh.is_lmib) as lmib_loans,
-                        SUM(CASE WHEN fh.is_lmib = 1 THEN fh.loan_amount ELSE 0 END) as lmib_amount,
-                        SUM(fh.is_mmct) as mmct_loans,
-                        SUM(CASE WHEN fh.is_mmct = 1 AND fh.is_lmib = 1 THEN 1 ELSE 0 END) as minb_loans,
-                        SUM(CASE WHEN fh.is_asian = 1 THEN 1 ELSE 0 END) as asian_loans,
-                        SUM(CASE WHEN fh.is_black = 1 THEN 1 ELSE 0 END) as black_loans,
-                        SUM(CASE WHEN fh.is_native_american = 1 THEN 1 ELSE 0 END) as native_american_loans,
-                        SUM(CASE WHEN fh.is_hopi = 1 THEN 1 ELSE 0 END) as hopi_loans,
-                        SUM(CASE WHEN fh.is_hispanic = 1 THEN 1 ELSE 0 END) as hispanic_loans
-                    FROM filtered_hmda fh
-                    INNER JOIN county_state_map csm
-                        ON fh.geoid5 = csm.geoid5
-                    GROUP BY csm.state_name
-                    ORDER BY csm.state_name
-                    """
-                    return query
-                
-                # Query Bank A - using baseline years for goals
-                if acquirer_lei and acquirer_geoids:
-                    query = build_county_level_hmda_query(
-                        acquirer_lei, acquirer_geoids, baseline_hmda_years, loan_purpose_filter,
-                        action_taken, occupancy_type, total_units, construction_method, not_reverse
-                    )
-                    results = execute_query(client, query)
-                    if results:
-                        df_a = pd.DataFrame(results)
-                        combined_dfs.append(df_a)
-
-                # Query Bank B - using baseline years for goals
-                if target_lei and target_geoids:
-                    query = build_county_level_hmda_query(
-                        target_lei, target_geoids, baseline_hmda_years, loan_purpose_filter,
-                        action_taken, occupancy_type, total_units, construction_method, not_reverse
-                    )
-                    results = execute_query(client, query)
-                    if results:
-                        df_b = pd.DataFrame(results)
-                        combined_dfs.append(df_b)
+            for loan_type in loan_purpose_map:
+                combined_dfs = [
+                    df for df in (result_df(f'goals_hmda_{loan_type}_a'), result_df(f'goals_hmda_{loan_type}_b'))
+                    if not df.empty
+                ]
                 
                 # Combine and aggregate by state (already aggregated by state in query, just need to sum)
                 if combined_dfs:
@@ -1159,102 +928,13 @@ def _perform_analysis(job_id, form_data):
                 else:
                     mortgage_goals_data[loan_type] = pd.DataFrame()
         
-        # Query SB data for SB Goals (aggregated by state, only states with branches)
-        update_progress(job_id, {'percent': 93, 'step': 'Querying SB Goals data...', 'done': False, 'error': None})
+        # SB Goals: combine both banks and aggregate by state
         sb_goals_data = None
         if (acquirer_sb_id or target_sb_id) and all_geoids:
-            # Get state mapping from counties (only states where banks have branches)
-            geoid5_list = "', '".join([str(g).zfill(5) for g in all_geoids])
-            state_query = f"""
-            SELECT DISTINCT 
-                LPAD(CAST(geoid5 AS STRING), 5, '0') as geoid5,
-                State as state_name
-            FROM `justdata-ncrc.shared.cbsa_to_county`
-            WHERE LPAD(CAST(geoid5 AS STRING), 5, '0') IN ('{geoid5_list}')
-            """
-            state_results = execute_query(client, state_query)
-            state_map = {row['geoid5']: row.get('state_name', '') for row in state_results} if state_results else {}
-            states_with_branches = set(state_map.values())
-            
-            # Build county-level SB query aggregated by state
-            def build_county_level_sb_query(sb_ids, geoids, years):
-                """Build SB query aggregated by county (GEOID5) then by state"""
-                geoid5_list = "', '".join([str(g).zfill(5) for g in geoids])
-                years_list = "', '".join([str(y) for y in years])
-
-                # Build respondent_id IN clause from all IDs
-                if isinstance(sb_ids, str):
-                    sb_ids = [sb_ids]
-                all_ids = set()
-                for sid in sb_ids:
-                    all_ids.add(sid)
-                    if '-' in sid:
-                        all_ids.add(sid.split('-', 1)[-1])
-                id_list = "', '".join(all_ids)
-                
-                query = f"""
-                WITH county_state_map AS (
-                    SELECT DISTINCT
-                        LPAD(CAST(geoid5 AS STRING), 5, '0') as geoid5,
-                        State as state_name
-                    FROM `justdata-ncrc.shared.cbsa_to_county`
-                    WHERE LPAD(CAST(geoid5 AS STRING), 5, '0') IN ('{geoid5_list}')
-                ),
-                filtered_sb_data AS (
-                    SELECT
-                        LPAD(CAST(d.geoid5 AS STRING), 5, '0') as geoid5,
-                        COALESCE(d.total_loans, d.num_under_100k + d.num_100k_250k + d.num_250k_1m) as sb_loans_count,
-                        -- SB amounts are stored in thousands of dollars, convert to actual dollars
-                        (d.amt_under_100k + d.amt_100k_250k + d.amt_250k_1m) * 1000 as sb_loans_amount,
-                        -- LMICT: Use pre-computed lmi_tract_loans from summary table
-                        COALESCE(d.lmi_tract_loans, 0) as lmict_loans_count,
-                        -- Estimate LMICT amount proportionally (lmi_tract_loans / total_loans * total_amount)
-                        SAFE_MULTIPLY(
-                            SAFE_DIVIDE(COALESCE(d.lmi_tract_loans, 0), NULLIF(COALESCE(d.total_loans, d.num_under_100k + d.num_100k_250k + d.num_250k_1m), 0)),
-                            (d.amt_under_100k + d.amt_100k_250k + d.amt_250k_1m) * 1000
-                        ) as lmict_loans_amount,
-                        COALESCE(d.numsbrev_under_1m, 0) as loans_rev_under_1m,
-                        COALESCE(d.amtsbrev_under_1m, 0) * 1000 as amount_rev_under_1m
-                    FROM `justdata-ncrc.bizsight.sb_county_summary` d
-                    INNER JOIN `justdata-ncrc.bizsight.sb_lenders` l
-                        ON d.respondent_id = l.sb_resid
-                        AND CAST(d.year AS STRING) = l.sb_year
-                    WHERE CAST(d.year AS STRING) IN ('{years_list}')
-                        AND LPAD(CAST(d.geoid5 AS STRING), 5, '0') IN ('{geoid5_list}')
-                        AND l.sb_resid IN ('{id_list}')
-                )
-                SELECT
-                    csm.state_name,
-                    SUM(fs.sb_loans_count) as sb_loans_total,
-                    SUM(fs.lmict_loans_count) as lmict_count,
-                    SUM(fs.lmict_loans_amount) as lmict_loans_amount,
-                    SUM(fs.loans_rev_under_1m) as loans_rev_under_1m_count,
-                    SUM(fs.amount_rev_under_1m) as amount_rev_under_1m
-                FROM filtered_sb_data fs
-                INNER JOIN county_state_map csm
-                    ON fs.geoid5 = csm.geoid5
-                GROUP BY csm.state_name
-                ORDER BY csm.state_name
-                """
-                return query
-            
-            combined_sb_dfs = []
-
-            # Query Bank A - using baseline years for goals
-            if acquirer_sb_ids and acquirer_geoids:
-                query = build_county_level_sb_query(acquirer_sb_ids, acquirer_geoids, baseline_sb_years)
-                results = execute_query(client, query)
-                if results:
-                    df_a = pd.DataFrame(results)
-                    combined_sb_dfs.append(df_a)
-
-            # Query Bank B - using baseline years for goals
-            if target_sb_ids and target_geoids:
-                query = build_county_level_sb_query(target_sb_ids, target_geoids, baseline_sb_years)
-                results = execute_query(client, query)
-                if results:
-                    df_b = pd.DataFrame(results)
-                    combined_sb_dfs.append(df_b)
+            combined_sb_dfs = [
+                df for df in (result_df('goals_sb_a'), result_df('goals_sb_b'))
+                if not df.empty
+            ]
             
             # Combine and aggregate by state
             if combined_sb_dfs:
@@ -3219,6 +2899,7 @@ register_standard_routes(
 
 # Register MergerMeter-specific routes
 app.add_url_rule('/report', 'report', report, methods=['GET'])
+app.add_url_rule('/cancel/<job_id>', 'cancel', cancel_handler, methods=['POST'])
 # Note: /report-data and /api/generate-assessment-areas-from-branches are already registered via @app.route decorators above
 
 
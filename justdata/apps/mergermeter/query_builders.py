@@ -1213,3 +1213,205 @@ ORDER BY year, cbsa_code
 """
     return query
 
+
+def build_county_level_hmda_goals_query(lei, geoids, years, loan_purpose, action_taken, occupancy_type, total_units, construction_method, not_reverse):
+    """
+    Build the Mortgage Goals HMDA query for one lender.
+
+    Aggregated by county (GEOID5) instead of CBSA so multi-state CBSAs are
+    broken down by county and then rolled up by state.
+    """
+    geoid5_list = "', '".join([str(g).zfill(5) for g in geoids])
+    years_list = "', '".join([str(y) for y in years])
+
+    # Build filters
+    loan_purpose_filter_str = ""
+    if loan_purpose:
+        if ',' in loan_purpose:
+            purposes = [p.strip() for p in loan_purpose.split(',')]
+            purpose_list = "', '".join(purposes)
+            loan_purpose_filter_str = f"AND h.loan_purpose IN ('{purpose_list}')"
+        else:
+            loan_purpose_filter_str = f"AND h.loan_purpose = '{loan_purpose.strip()}'"
+
+    action_taken_filter = ""
+    if action_taken:
+        if ',' in action_taken:
+            actions = [a.strip() for a in action_taken.split(',')]
+            action_list = "', '".join(actions)
+            action_taken_filter = f"AND h.action_taken IN ('{action_list}')"
+        else:
+            action_taken_filter = f"AND h.action_taken = '{action_taken.strip()}'"
+
+    occupancy_filter = ""
+    if occupancy_type:
+        if ',' in occupancy_type:
+            occupancies = [o.strip() for o in occupancy_type.split(',')]
+            occupancy_list = "', '".join(occupancies)
+            occupancy_filter = f"AND h.occupancy_type IN ('{occupancy_list}')"
+        else:
+            occupancy_filter = f"AND h.occupancy_type = '{occupancy_type.strip()}'"
+
+    units_filter = ""
+    if total_units:
+        # Handle range notation like '1-4' → expand to '1','2','3','4'
+        if '-' in total_units and ',' not in total_units:
+            try:
+                parts = total_units.split('-')
+                start, end = int(parts[0].strip()), int(parts[1].strip())
+                units = [str(i) for i in range(start, end + 1)]
+            except (ValueError, IndexError):
+                units = [total_units.strip()]
+        elif ',' in total_units:
+            units = [u.strip() for u in total_units.split(',')]
+        else:
+            units = [total_units.strip()]
+
+        if len(units) == 1:
+            units_filter = f"AND h.total_units = '{units[0]}'"
+        else:
+            units_list = "', '".join(units)
+            units_filter = f"AND h.total_units IN ('{units_list}')"
+
+    construction_filter = ""
+    if construction_method:
+        if ',' in construction_method:
+            constructions = [c.strip() for c in construction_method.split(',')]
+            construction_list = "', '".join(constructions)
+            construction_filter = f"AND h.construction_method IN ('{construction_list}')"
+        else:
+            construction_filter = f"AND h.construction_method = '{construction_method.strip()}'"
+
+    reverse_filter = ""
+    if not_reverse:
+        if ',' in not_reverse:
+            reverse_values = [r.strip() for r in not_reverse.split(',')]
+            if '1' in reverse_values and '2' not in reverse_values:
+                reverse_filter = "AND h.reverse_mortgage != '1'"
+            elif '2' in reverse_values and '1' not in reverse_values:
+                reverse_filter = "AND h.reverse_mortgage = '1'"
+        else:
+            if not_reverse == '1':
+                reverse_filter = "AND h.reverse_mortgage != '1'"
+            elif not_reverse == '2':
+                reverse_filter = "AND h.reverse_mortgage = '1'"
+
+    # Get state name from county crosswalk
+    query = f"""
+    WITH county_state_map AS (
+        SELECT DISTINCT
+            LPAD(CAST(geoid5 AS STRING), 5, '0') as geoid5,
+            State as state_name
+        FROM `justdata-ncrc.shared.cbsa_to_county`
+        WHERE LPAD(CAST(geoid5 AS STRING), 5, '0') IN ('{geoid5_list}')
+    ),
+    filtered_hmda AS (
+        SELECT 
+            h.geoid5,
+            h.loan_amount,
+            -- Use pre-computed boolean flags from de_hmda (convert BOOL to INT)
+            CASE WHEN h.is_lmict THEN 1 ELSE 0 END as is_lmict,
+            CASE WHEN h.is_lmib THEN 1 ELSE 0 END as is_lmib,
+            CASE WHEN h.is_mmct THEN 1 ELSE 0 END as is_mmct,
+            CASE WHEN h.is_hispanic THEN 1 ELSE 0 END as is_hispanic,
+            CASE WHEN h.is_black THEN 1 ELSE 0 END as is_black,
+            CASE WHEN h.is_asian THEN 1 ELSE 0 END as is_asian,
+            CASE WHEN h.is_native_american THEN 1 ELSE 0 END as is_native_american,
+            CASE WHEN h.is_hopi THEN 1 ELSE 0 END as is_hopi
+        FROM `justdata-ncrc.shared.de_hmda` h
+        WHERE CAST(h.activity_year AS STRING) IN ('{years_list}')
+            AND CAST(h.lei AS STRING) = '{lei}'
+            AND h.geoid5 IN ('{geoid5_list}')
+            {loan_purpose_filter_str}
+            {action_taken_filter}
+            {occupancy_filter}
+            {units_filter}
+            {construction_filter}
+            {reverse_filter}
+    )
+    SELECT 
+        csm.state_name,
+        COUNT(*) as total_loans,
+        SUM(fh.is_lmict) as lmict_loans,
+        SUM(fh.is_lmib) as lmib_loans,
+        SUM(CASE WHEN fh.is_lmib = 1 THEN fh.loan_amount ELSE 0 END) as lmib_amount,
+        SUM(fh.is_mmct) as mmct_loans,
+        SUM(CASE WHEN fh.is_mmct = 1 AND fh.is_lmib = 1 THEN 1 ELSE 0 END) as minb_loans,
+        SUM(CASE WHEN fh.is_asian = 1 THEN 1 ELSE 0 END) as asian_loans,
+        SUM(CASE WHEN fh.is_black = 1 THEN 1 ELSE 0 END) as black_loans,
+        SUM(CASE WHEN fh.is_native_american = 1 THEN 1 ELSE 0 END) as native_american_loans,
+        SUM(CASE WHEN fh.is_hopi = 1 THEN 1 ELSE 0 END) as hopi_loans,
+        SUM(CASE WHEN fh.is_hispanic = 1 THEN 1 ELSE 0 END) as hispanic_loans
+    FROM filtered_hmda fh
+    INNER JOIN county_state_map csm
+        ON fh.geoid5 = csm.geoid5
+    GROUP BY csm.state_name
+    ORDER BY csm.state_name
+    """
+    return query
+
+
+def build_county_level_sb_goals_query(sb_ids, geoids, years):
+    """
+    Build the SB Goals small business query for one lender.
+
+    Aggregated by county (GEOID5) then by state.
+    """
+    geoid5_list = "', '".join([str(g).zfill(5) for g in geoids])
+    years_list = "', '".join([str(y) for y in years])
+
+    # Build respondent_id IN clause from all IDs
+    if isinstance(sb_ids, str):
+        sb_ids = [sb_ids]
+    all_ids = set()
+    for sid in sb_ids:
+        all_ids.add(sid)
+        if '-' in sid:
+            all_ids.add(sid.split('-', 1)[-1])
+    id_list = "', '".join(all_ids)
+
+    query = f"""
+    WITH county_state_map AS (
+        SELECT DISTINCT
+            LPAD(CAST(geoid5 AS STRING), 5, '0') as geoid5,
+            State as state_name
+        FROM `justdata-ncrc.shared.cbsa_to_county`
+        WHERE LPAD(CAST(geoid5 AS STRING), 5, '0') IN ('{geoid5_list}')
+    ),
+    filtered_sb_data AS (
+        SELECT
+            LPAD(CAST(d.geoid5 AS STRING), 5, '0') as geoid5,
+            COALESCE(d.total_loans, d.num_under_100k + d.num_100k_250k + d.num_250k_1m) as sb_loans_count,
+            -- SB amounts are stored in thousands of dollars, convert to actual dollars
+            (d.amt_under_100k + d.amt_100k_250k + d.amt_250k_1m) * 1000 as sb_loans_amount,
+            -- LMICT: Use pre-computed lmi_tract_loans from summary table
+            COALESCE(d.lmi_tract_loans, 0) as lmict_loans_count,
+            -- Estimate LMICT amount proportionally (lmi_tract_loans / total_loans * total_amount)
+            SAFE_MULTIPLY(
+                SAFE_DIVIDE(COALESCE(d.lmi_tract_loans, 0), NULLIF(COALESCE(d.total_loans, d.num_under_100k + d.num_100k_250k + d.num_250k_1m), 0)),
+                (d.amt_under_100k + d.amt_100k_250k + d.amt_250k_1m) * 1000
+            ) as lmict_loans_amount,
+            COALESCE(d.numsbrev_under_1m, 0) as loans_rev_under_1m,
+            COALESCE(d.amtsbrev_under_1m, 0) * 1000 as amount_rev_under_1m
+        FROM `justdata-ncrc.bizsight.sb_county_summary` d
+        INNER JOIN `justdata-ncrc.bizsight.sb_lenders` l
+            ON d.respondent_id = l.sb_resid
+            AND CAST(d.year AS STRING) = l.sb_year
+        WHERE CAST(d.year AS STRING) IN ('{years_list}')
+            AND LPAD(CAST(d.geoid5 AS STRING), 5, '0') IN ('{geoid5_list}')
+            AND l.sb_resid IN ('{id_list}')
+    )
+    SELECT
+        csm.state_name,
+        SUM(fs.sb_loans_count) as sb_loans_total,
+        SUM(fs.lmict_loans_count) as lmict_count,
+        SUM(fs.lmict_loans_amount) as lmict_loans_amount,
+        SUM(fs.loans_rev_under_1m) as loans_rev_under_1m_count,
+        SUM(fs.amount_rev_under_1m) as amount_rev_under_1m
+    FROM filtered_sb_data fs
+    INNER JOIN county_state_map csm
+        ON fs.geoid5 = csm.geoid5
+    GROUP BY csm.state_name
+    ORDER BY csm.state_name
+    """
+    return query
@@ -7,10 +7,19 @@ Shared across BranchSight, BizSight, and LendSight.
 import sys
 import os
 import json
+import atexit
+import hashlib
+import queue
+import tempfile
+import threading
+import time
 import numpy as np
 from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime
 
+from justdata.shared.utils.local_cache import LocalTTLCache
+from justdata.shared.utils.rate_limited_http import TokenBucket
+
 # =============================================================================
 # AI USAGE TRACKING
 # =============================================================================
@@ -26,9 +35,221 @@ AI_PRICING = {
     'gpt-4o-mini': {'input': 0.15, 'output': 0.60},
 }
 
-# In-memory usage accumulator (flushed to BigQuery periodically)
-_ai_usage_buffer = []
-_last_flush_time = None
+AI_USAGE_TABLE = 'justdata-ncrc.firebase_analytics.ai_usage'
+AI_USAGE_SCHEMA = [
+    ('timestamp', 'STRING'),
+    ('provider', 'STRING'),
+    ('model', 'STRING'),
+    ('input_tokens', 'INTEGER'),
+    ('output_tokens', 'INTEGER'),
+    ('total_tokens', 'INTEGER'),
+    ('input_cost_usd', 'FLOAT'),
+    ('output_cost_usd', 'FLOAT'),
+    ('total_cost_usd', 'FLOAT'),
+    ('app_name', 'STRING'),
+    ('report_type', 'STRING'),
+]
+
+# Usage records are written to BigQuery by a background sink, never on the
+# request thread: records go through a bounded queue into a local spool file
+# (so a restart does not lose them) and are inserted in batches when the
+# spool reaches AI_USAGE_BATCH_SIZE records or every AI_USAGE_FLUSH_SECONDS.
+AI_USAGE_ASYNC = os.getenv('AI_USAGE_ASYNC', 'true').lower() == 'true'
+AI_USAGE_BATCH_SIZE = int(os.getenv('AI_USAGE_BATCH_SIZE', '50'))
+AI_USAGE_FLUSH_SECONDS = float(os.getenv('AI_USAGE_FLUSH_SECONDS', '30'))
+AI_USAGE_QUEUE_MAX = int(os.getenv('AI_USAGE_QUEUE_MAX', '10000'))
+AI_USAGE_SPOOL_DIR = os.getenv('AI_USAGE_SPOOL_DIR') or os.path.join(tempfile.gettempdir(), 'justdata_ai_usage')
+
+# Rows per insert_rows_json request
+AI_USAGE_INSERT_ROWS = 500
+
+_ai_usage_table_ready = False
+
+
+def _insert_ai_usage_rows(rows: List[dict]):
+    """Insert usage rows with the shared BigQuery client; raises on failure."""
+    global _ai_usage_table_ready
+    from google.cloud import bigquery
+    from justdata.shared.utils.bigquery_client import get_bigquery_client
+
+    client = get_bigquery_client('justdata-ncrc')
+
+    # Create table if it doesn't exist (checked once per process)
+    if not _ai_usage_table_ready:
+        try:
+            client.get_table(AI_USAGE_TABLE)
+        except Exception:
+            schema = [bigquery.SchemaField(name, field_type) for name, field_type in AI_USAGE_SCHEMA]
+            client.create_table(bigquery.Table(AI_USAGE_TABLE, schema=schema), exists_ok=True)
+            print(f"[AI Usage] Created table {AI_USAGE_TABLE}")
+        _ai_usage_table_ready = True
+
+    for start in range(0, len(rows), AI_USAGE_INSERT_ROWS):
+        errors = client.insert_rows_json(AI_USAGE_TABLE, rows[start:start + AI_USAGE_INSERT_ROWS])
+        if errors:
+            raise RuntimeError(f"BigQuery insert errors: {errors}")
+
+
+class _AIUsageSink:
+    """
+    Background writer for AI usage records.
+
+    record() only enqueues (or, if the queue is full, appends to the spool
+    file). A daemon thread moves queued records into this process's spool
+    file and periodically sends the spooled records in one batch. Spool
+    files left by a process that has exited are picked up and sent too, and
+    anything that fails to send stays spooled for the next flush.
+    """
+
+    def __init__(self, spool_dir: str, batch_size: int, interval_seconds: float, max_queue: int,
+                 writer=None):
+        self.spool_dir = spool_dir
+        self.batch_size = max(1, batch_size)
+        self.interval_seconds = interval_seconds
+        self.max_queue = max_queue
+        self._writer = writer or _insert_ai_usage_rows
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """(Re)initialize per-process state - also after a fork."""
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._spooled = 0
+        self._thread = None
+        self._batch_seq = 0
+
+    @property
+    def spool_path(self) -> str:
+        return os.path.join(self.spool_dir, f"ai_usage-{self._pid}.jsonl")
+
+    def record(self, row: dict) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='ai-usage-sink', daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._append([row])
+
+    def _drain(self, block: bool, timeout: float = None) -> List[dict]:
+        rows = []
+        try:
+            rows.append(self._queue.get(block=block, timeout=timeout))
+            while True:
+                rows.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return rows
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.interval_seconds
+        while True:
+            rows = self._drain(block=True, timeout=max(0.0, deadline - time.monotonic()))
+            self._append(rows)
+            now = time.monotonic()
+            if self._spooled >= self.batch_size or (now >= deadline and self._spooled):
+                self._send()
+            if now >= deadline:
+                deadline = now + self.interval_seconds
+
+    def _append(self, rows: List[dict]) -> None:
+        """Append rows to this process's spool file."""
+        if not rows:
+            return
+        try:
+            with self._lock:
+                os.makedirs(self.spool_dir, exist_ok=True)
+                with open(self.spool_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(row) + '\n' for row in rows))
+                    f.flush()
+                self._spooled += len(rows)
+        except Exception as e:
+            print(f"[AI Usage] Failed to spool {len(rows)} record(s): {e}")
+
+    def _batch_path(self) -> str:
+        self._batch_seq += 1
+        return os.path.join(self.spool_dir, f"ai_usage-{self._pid}-{int(time.time() * 1000)}-{self._batch_seq}.batch")
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except Exception:
+            return True
+        return True
+
+    def _claim_batches(self) -> List[str]:
+        """Turn this process's spool (and files of exited processes) into batch files to send."""
+        with self._lock:
+            if os.path.exists(self.spool_path) and os.path.getsize(self.spool_path):
+                os.replace(self.spool_path, self._batch_path())
+            self._spooled = 0
+
+            batches = []
+            for name in sorted(os.listdir(self.spool_dir)):
+                if not name.startswith('ai_usage-'):
+                    continue
+                path = os.path.join(self.spool_dir, name)
+                try:
+                    pid = int(name[len('ai_usage-'):].split('-')[0].split('.')[0])
+                except ValueError:
+                    continue
+                if pid != self._pid:
+                    if self._pid_alive(pid):
+                        continue
+                    # Adopt files from an exited process (rename is atomic - one claimant wins)
+                    claimed = self._batch_path()
+                    try:
+                        os.replace(path, claimed)
+                    except FileNotFoundError:
+                        continue
+                    path = claimed
+                elif not name.endswith('.batch'):
+                    continue
+                batches.append(path)
+            return sorted(batches)
+
+    def _send(self) -> int:
+        """Send every claimed batch file; failed batches stay on disk. Returns rows sent."""
+        sent = 0
+        with self._send_lock:
+            try:
+                batches = self._claim_batches() if os.path.isdir(self.spool_dir) else []
+            except Exception as e:
+                print(f"[AI Usage] Failed to read spool {self.spool_dir}: {e}")
+                return 0
+            for path in batches:
+                try:
+                    with open(path, encoding='utf-8') as f:
+                        rows = [json.loads(line) for line in f if line.strip()]
+                    if rows:
+                        self._writer(rows)
+                    os.remove(path)
+                    sent += len(rows)
+                except Exception as e:
+                    # Don't fail the main operation if logging fails; retried next flush
+                    print(f"[AI Usage] Failed to flush to BigQuery (kept in spool): {e}")
+                    break
+        if sent:
+            print(f"[AI Usage] Flushed {sent} record(s) to {AI_USAGE_TABLE}")
+        return sent
+
+    def flush(self) -> int:
+        """Spool everything queued and send all spooled records now. Returns rows sent."""
+        if self._pid == os.getpid():
+            self._append(self._drain(block=False))
+        return self._send()
+
+
+_ai_usage_sink = _AIUsageSink(AI_USAGE_SPOOL_DIR, AI_USAGE_BATCH_SIZE, AI_USAGE_FLUSH_SECONDS, AI_USAGE_QUEUE_MAX)
+atexit.register(_ai_usage_sink.flush)
 
 
 def log_ai_usage(
@@ -42,6 +263,9 @@ def log_ai_usage(
     """
     Log AI API usage for cost tracking.
     
+    The record is handed to the background usage sink; the BigQuery write
+    happens off the calling thread (synchronously if AI_USAGE_ASYNC=false).
+    
     Args:
         provider: 'claude' or 'openai'
         model: Model name used
@@ -73,77 +297,19 @@ def log_ai_usage(
         'report_type': report_type or 'unknown'
     }
     
-    # Add to buffer
-    _ai_usage_buffer.append(usage_record)
-    
     # Log to console for debugging
     print(f"[AI Usage] {provider}/{model}: {input_tokens}+{output_tokens} tokens = ${total_cost:.4f}")
     
-    # Flush to BigQuery immediately (was 10, but data was lost on app restart)
-    _flush_ai_usage_to_bigquery()
+    _ai_usage_sink.record(usage_record)
+    if not AI_USAGE_ASYNC:
+        _flush_ai_usage_to_bigquery()
     
     return usage_record
 
 
 def _flush_ai_usage_to_bigquery():
-    """Flush accumulated AI usage to BigQuery."""
-    global _ai_usage_buffer, _last_flush_time
-    
-    if not _ai_usage_buffer:
-        return
-    
-    try:
-        from google.cloud import bigquery
-        from google.oauth2 import service_account
-        
-        # Get credentials
-        creds_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
-        if creds_json:
-            creds_dict = json.loads(creds_json)
-            credentials = service_account.Credentials.from_service_account_info(creds_dict)
-            client = bigquery.Client(project='justdata-ncrc', credentials=credentials)
-        else:
-            client = bigquery.Client(project='justdata-ncrc')
-        
-        # Create table if it doesn't exist
-        table_id = 'justdata-ncrc.firebase_analytics.ai_usage'
-        
-        try:
-            client.get_table(table_id)
-        except Exception:
-            # Table doesn't exist, create it
-            schema = [
-                bigquery.SchemaField("timestamp", "STRING"),
-                bigquery.SchemaField("provider", "STRING"),
-                bigquery.SchemaField("model", "STRING"),
-                bigquery.SchemaField("input_tokens", "INTEGER"),
-                bigquery.SchemaField("output_tokens", "INTEGER"),
-                bigquery.SchemaField("total_tokens", "INTEGER"),
-                bigquery.SchemaField("input_cost_usd", "FLOAT"),
-                bigquery.SchemaField("output_cost_usd", "FLOAT"),
-                bigquery.SchemaField("total_cost_usd", "FLOAT"),
-                bigquery.SchemaField("app_name", "STRING"),
-                bigquery.SchemaField("report_type", "STRING"),
-            ]
-            table = bigquery.Table(table_id, schema=schema)
-            client.create_table(table)
-            print(f"[AI Usage] Created table {table_id}")
-        
-        # Insert rows
-        rows_to_insert = _ai_usage_buffer.copy()
-        print(f"[AI Usage] Attempting to insert {len(rows_to_insert)} rows to {table_id}")
-        errors = client.insert_rows_json(table_id, rows_to_insert)
-        
-        if errors:
-            print(f"[AI Usage] BigQuery insert errors: {errors}")
-        else:
-            print(f"[AI Usage] SUCCESS: Flushed {len(rows_to_insert)} records to BigQuery")
-            _ai_usage_buffer = []
-            _last_flush_time = datetime.utcnow()
-            
-    except Exception as e:
-        # Don't fail the main operation if logging fails
-        print(f"[AI Usage] Failed to flush to BigQuery: {e}")
+    """Flush queued and spooled AI usage to BigQuery now."""
+    _ai_usage_sink.flush()
 
 
 def get_ai_usage_summary(days: int = 30) -> dict:
@@ -327,13 +493,251 @@ def convert_numpy_types(obj):
             pass
         return obj
 
+# =============================================================================
+# NARRATIVE CACHE AND PROVIDER CLIENTS
+# =============================================================================
+# Completions are cached by (provider, model, temperature, max_tokens, prompt
+# hash), so re-running a report on the same data reuses its narratives instead
+# of paying another 30-90 seconds of model latency. Entries live in worker
+# memory and on local disk; AI_CACHE_SHARED=redis (with REDIS_URL) adds a tier
+# shared by every instance. Set AI_CACHE_ENABLED=false to always call the model.
+AI_CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', 'true').lower() == 'true'
+AI_CACHE_TTL_SECONDS = float(os.getenv('AI_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+AI_CACHE_SHARED = os.getenv('AI_CACHE_SHARED', '').lower()
+AI_CACHE_KEY_VERSION = 'v1'
+
+_narrative_cache = LocalTTLCache(
+    'ai_narratives',
+    max_entries=int(os.getenv('AI_CACHE_MAX_ENTRIES', '2048')),
+    max_bytes=int(os.getenv('AI_CACHE_MAX_MB', '64')) * 1024 * 1024,
+    ttl_seconds=AI_CACHE_TTL_SECONDS,
+    disk_dir=os.getenv('AI_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'justdata_ai_cache'),
+    disk_max_bytes=int(os.getenv('AI_CACHE_DISK_MAX_MB', '256')) * 1024 * 1024,
+)
+_narrative_stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'saved_input_tokens': 0,
+                    'saved_output_tokens': 0, 'saved_cost_usd': 0.0}
+_narrative_stats_lock = threading.Lock()
+_shared_tier = None
+_shared_tier_checked = False
+
+# One client per (provider, API key), reused across calls and threads so
+# connections stay pooled instead of a new client per request
+_provider_clients: Dict[Tuple[str, str], Any] = {}
+_provider_clients_lock = threading.Lock()
+
+# Process-wide limits per provider, shared by every report running in this
+# worker, so concurrent narrative generation stays under the provider quota
+AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', '4'))
+AI_REQUESTS_PER_MINUTE = float(os.getenv('AI_REQUESTS_PER_MINUTE', '50'))
+_provider_limits: Dict[str, Tuple[threading.BoundedSemaphore, TokenBucket]] = {}
+
+
+def _provider_limit(provider: str) -> Tuple[threading.BoundedSemaphore, TokenBucket]:
+    """(concurrency slots, request-rate bucket) for a provider."""
+    with _provider_clients_lock:
+        limit = _provider_limits.get(provider)
+        if limit is None:
+            limit = (threading.BoundedSemaphore(max(1, AI_MAX_CONCURRENCY)),
+                     TokenBucket(AI_REQUESTS_PER_MINUTE / 60, capacity=max(1, AI_MAX_CONCURRENCY)))
+            _provider_limits[provider] = limit
+        return limit
+
+
+def _get_provider_client(provider: str, api_key: str):
+    """Shared Anthropic/OpenAI client for this provider and key."""
+    key = (provider, hashlib.sha256(api_key.encode('utf-8')).hexdigest())
+    with _provider_clients_lock:
+        client = _provider_clients.get(key)
+        if client is None:
+            if provider == "openai":
+                from openai import OpenAI
+                client = OpenAI(api_key=api_key)
+            elif provider == "claude":
+                try:
+                    import anthropic
+                except ImportError:
+                    raise Exception("anthropic module not installed. Install it with: pip install anthropic")
+                client = anthropic.Anthropic(api_key=api_key)
+            else:
+                raise Exception(f"Unsupported AI provider: {provider}")
+            _provider_clients[key] = client
+        return client
+
+
+def narrative_cache_key(provider: str, model: str, prompt: str, max_tokens: Optional[int] = None,
+                        temperature: Optional[float] = None) -> str:
+    """Cache key for a completion: every request parameter plus a hash of the prompt."""
+    prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    return f"ai:{AI_CACHE_KEY_VERSION}:{provider}:{model}:{temperature}:{max_tokens}:{prompt_hash}"
+
+
+def _get_shared_tier():
+    """Redis client for the shared cache tier, or None if not configured/available."""
+    global _shared_tier, _shared_tier_checked
+    if _shared_tier_checked:
+        return _shared_tier
+    _shared_tier_checked = True
+    if AI_CACHE_SHARED != 'redis':
+        return None
+    url = os.getenv('REDIS_URL')
+    if not url:
+        print("[WARNING] AI_CACHE_SHARED=redis but REDIS_URL is not set; using local narrative cache only")
+        return None
+    try:
+        import redis
+        _shared_tier = redis.Redis.from_url(url)
+    except Exception as e:
+        print(f"[WARNING] Shared narrative cache unavailable, using local cache only: {e}")
+    return _shared_tier
+
+
+def _narrative_cache_get(key: str) -> Optional[dict]:
+    entry = _narrative_cache.get(key)
+    shared_hit = False
+    if entry is None:
+        shared = _get_shared_tier()
+        if shared is not None:
+            try:
+                raw = shared.get(key)
+                if raw:
+                    entry = json.loads(raw)
+                    shared_hit = True
+                    _narrative_cache.set(key, entry)
+            except Exception as e:
+                print(f"[WARNING] Shared narrative cache read failed: {e}")
+
+    with _narrative_stats_lock:
+        if entry is None:
+            _narrative_stats['misses'] += 1
+            return None
+        pricing = AI_PRICING.get(entry.get('model'), {'input': 10.0, 'output': 30.0})
+        _narrative_stats['hits'] += 1
+        _narrative_stats['shared_hits'] += int(shared_hit)
+        _narrative_stats['saved_input_tokens'] += entry.get('input_tokens', 0)
+        _narrative_stats['saved_output_tokens'] += entry.get('output_tokens', 0)
+        _narrative_stats['saved_cost_usd'] += (entry.get('input_tokens', 0) * pricing['input']
+                                               + entry.get('output_tokens', 0) * pricing['output']) / 1_000_000
+    return entry
+
+
+def _narrative_cache_set(key: str, entry: dict):
+    _narrative_cache.set(key, entry)
+    shared = _get_shared_tier()
+    if shared is not None:
+        try:
+            shared.setex(key, int(AI_CACHE_TTL_SECONDS), json.dumps(entry))
+        except Exception as e:
+            print(f"[WARNING] Shared narrative cache write failed: {e}")
+
+
+def get_ai_cache_stats() -> dict:
+    """Narrative cache hit/miss counts, tokens and cost saved, and local tier usage."""
+    with _narrative_stats_lock:
+        stats = dict(_narrative_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['saved_cost_usd'] = round(stats['saved_cost_usd'], 4)
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    stats['enabled'] = AI_CACHE_ENABLED
+    stats['shared_tier'] = _get_shared_tier() is not None
+    stats['local'] = _narrative_cache.stats()
+    return stats
+
+
+def complete_prompt(
+    provider: str,
+    api_key: str,
+    model: str,
+    prompt: str,
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    app_name: str = None,
+    report_type: str = None,
+    use_cache: bool = True
+) -> str:
+    """
+    Run one completion through the narrative cache and the pooled provider client.
+    
+    Args:
+        provider: 'claude' or 'openai'
+        api_key: Provider API key
+        model: Model name
+        prompt: Prompt text
+        max_tokens: Completion limit (provider default if None; Claude requires one)
+        temperature: Sampling temperature (provider default if None)
+        app_name: Application name for usage tracking
+        report_type: Report type for usage tracking
+        use_cache: Read and write the narrative cache (False always calls the model)
+    
+    Returns:
+        The response text (unstripped)
+    """
+    use_cache = use_cache and AI_CACHE_ENABLED
+    key = narrative_cache_key(provider, model, prompt, max_tokens, temperature)
+    if use_cache:
+        cached = _narrative_cache_get(key)
+        if cached is not None:
+            print(f"[AI Cache] Hit {provider}/{model} ({report_type or app_name or 'unknown'}): "
+                  f"saved {cached.get('input_tokens', 0)}+{cached.get('output_tokens', 0)} tokens")
+            return cached['text']
+
+    client = _get_provider_client(provider, api_key)
+    params = {}
+    if temperature is not None:
+        params['temperature'] = temperature
+    slots, rate = _provider_limit(provider)
+    if provider == "openai":
+        if max_tokens is not None:
+            params['max_tokens'] = max_tokens
+        with slots:
+            rate.acquire()
+            response = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                **params
+            )
+        text = response.choices[0].message.content
+        usage = getattr(response, 'usage', None)
+        input_tokens = (usage.prompt_tokens or 0) if usage else 0
+        output_tokens = (usage.completion_tokens or 0) if usage else 0
+    else:
+        with slots:
+            rate.acquire()
+            response = client.messages.create(
+                model=model,
+                max_tokens=max_tokens or 4000,
+                messages=[{"role": "user", "content": prompt}],
+                **params
+            )
+        text = response.content[0].text
+        usage = getattr(response, 'usage', None)
+        input_tokens = (usage.input_tokens or 0) if usage else 0
+        output_tokens = (usage.output_tokens or 0) if usage else 0
+
+    # Log usage
+    if usage:
+        log_ai_usage(
+            provider=provider,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            app_name=app_name,
+            report_type=report_type
+        )
+
+    if use_cache and text:
+        _narrative_cache_set(key, {'text': text, 'model': model, 'input_tokens': input_tokens,
+                                   'output_tokens': output_tokens})
+    return text
+
+
 def ask_ai(
     prompt: str, 
     ai_provider: str = "claude", 
     model: str = None, 
     api_key: str = None,
     app_name: str = None,
-    report_type: str = None
+    report_type: str = None,
+    use_cache: bool = True
 ) -> str:
     """
     Send a prompt to the configured AI provider and return the response.
@@ -345,6 +749,7 @@ def ask_ai(
         api_key: API key (optional, defaults to env var)
         app_name: Application name for usage tracking
         report_type: Report type for usage tracking
+        use_cache: Serve repeat prompts from the narrative cache
     
     Returns:
         The AI response text
@@ -365,54 +770,12 @@ def ask_ai(
     
     try:
         if ai_provider == "openai":
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            if not model:
-                model = "gpt-4"
-            response = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            # Log usage
-            if hasattr(response, 'usage') and response.usage:
-                log_ai_usage(
-                    provider='openai',
-                    model=model,
-                    input_tokens=response.usage.prompt_tokens or 0,
-                    output_tokens=response.usage.completion_tokens or 0,
-                    app_name=app_name,
-                    report_type=report_type
-                )
-            
-            return response.choices[0].message.content
-            
+            return complete_prompt('openai', api_key, model or "gpt-4", prompt,
+                                   app_name=app_name, report_type=report_type, use_cache=use_cache)
         elif ai_provider == "claude":
-            try:
-                import anthropic
-            except ImportError:
-                raise Exception("anthropic module not installed. Install it with: pip install anthropic")
-            client = anthropic.Anthropic(api_key=api_key)
-            if not model:
-                model = "claude-sonnet-4-20250514"
-            response = client.messages.create(
-                model=model,
-                max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            # Log usage
-            if hasattr(response, 'usage') and response.usage:
-                log_ai_usage(
-                    provider='claude',
-                    model=model,
-                    input_tokens=response.usage.input_tokens or 0,
-                    output_tokens=response.usage.output_tokens or 0,
-                    app_name=app_name,
-                    report_type=report_type
-                )
-            
-            return response.content[0].text
+            return complete_prompt('claude', api_key, model or "claude-sonnet-4-20250514", prompt,
+                                   max_tokens=4000, app_name=app_name, report_type=report_type,
+                                   use_cache=use_cache)
         else:
             raise Exception(f"Unsupported AI provider: {ai_provider}")
     except Exception as e:
@@ -443,57 +806,20 @@ class AIAnalyzer:
             self.model = "claude-sonnet-4-20250514" if ai_provider == "claude" else "gpt-4"
         
     def _call_ai(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.3, 
-                  app_name: str = None, report_type: str = None) -> str:
-        """Make a call to the configured AI provider with usage tracking."""
+                  app_name: str = None, report_type: str = None, use_cache: bool = True) -> str:
+        """Make a call to the configured AI provider with usage tracking and narrative caching."""
         try:
-            if self.provider == "openai":
-                from openai import OpenAI
-                client = OpenAI(api_key=self.api_key)
-                response = client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
-                
-                # Log usage
-                if hasattr(response, 'usage') and response.usage:
-                    log_ai_usage(
-                        provider='openai',
-                        model=self.model,
-                        input_tokens=response.usage.prompt_tokens or 0,
-                        output_tokens=response.usage.completion_tokens or 0,
-                        app_name=app_name or getattr(self, 'app_name', None),
-                        report_type=report_type
-                    )
-                
-                return response.choices[0].message.content.strip()
-                
-            elif self.provider == "claude":
-                try:
-                    import anthropic
-                except ImportError:
-                    raise Exception("anthropic module not installed. Install it with: pip install anthropic")
-                client = anthropic.Anthropic(api_key=self.api_key)
-                response = client.messages.create(
-                    model=self.model,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                
-                # Log usage
-                if hasattr(response, 'usage') and response.usage:
-                    log_ai_usage(
-                        provider='claude',
-                        model=self.model,
-                        input_tokens=response.usage.input_tokens or 0,
-                        output_tokens=response.usage.output_tokens or 0,
-                        app_name=app_name or getattr(self, 'app_name', None),
-                        report_type=report_type
-                    )
-                
-                return response.content[0].text.strip()
+            if self.provider not in ("openai", "claude"):
+                return None
+            text = complete_prompt(
+                self.provider, self.api_key, self.model, prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                app_name=app_name or getattr(self, 'app_name', None),
+                report_type=report_type,
+                use_cache=use_cache
+            )
+            return text.strip()
         except Exception as e:
             error_msg = f"Error calling {self.provider} API: {e}"
             print(error_msg)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Concurrent AI narrative generation for report analyzers.
+
+Report builders make many independent model calls (one per table, section
+or summary). NarrativeScheduler runs them on a bounded thread pool so the AI
+phase of a report takes about as long as its slowest call instead of the sum
+of all of them. Provider quotas are enforced in ai_provider.complete_prompt
+(process-wide concurrency and requests/minute per provider); the scheduler
+adds per-call timeouts, retries calls rejected for rate limiting, and hands
+each result to a callback as soon as it completes.
+
+Usage:
+    from justdata.shared.analysis.narrative_scheduler import NarrativeScheduler
+
+    scheduler = NarrativeScheduler(progress_tracker=progress_tracker)
+    scheduler.submit('key_findings', analyzer.generate_key_findings, ai_data, label='Key Findings')
+    scheduler.submit('trends_analysis', analyzer.generate_trends_analysis, ai_data)
+    results = scheduler.run()   # {'key_findings': '...', 'trends_analysis': '...'}
+    scheduler.errors            # {name: exception} for calls that failed or timed out
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from justdata.shared.utils.job_scheduler import JobCancelled
+
+AI_NARRATIVE_WORKERS = int(os.getenv('AI_NARRATIVE_WORKERS', '4'))
+AI_NARRATIVE_TIMEOUT_SECONDS = float(os.getenv('AI_NARRATIVE_TIMEOUT_SECONDS', '180'))
+AI_NARRATIVE_RATE_LIMIT_RETRIES = 2
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an error (or anything it wraps) is a provider rate-limit/overload rejection."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if getattr(error, 'status_code', None) in (429, 529):
+            return True
+        text = str(error).lower()
+        if 'rate limit' in text or 'rate_limit' in text or '429' in text or 'overloaded' in text:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class NarrativeTimeout(Exception):
+    """A narrative call did not finish within the scheduler's per-call timeout."""
+
+
+class _Task:
+    def __init__(self, name: str, fn: Callable, args: tuple, kwargs: dict, label: Optional[str],
+                 on_result: Optional[Callable], on_error: Optional[Callable]):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.label = label or name.replace('_', ' ').title()
+        self.on_result = on_result
+        self.on_error = on_error
+        self.started_at = None
+
+
+class NarrativeScheduler:
+    """Runs independent narrative calls on a bounded pool with timeouts and progress reporting."""
+
+    def __init__(self, max_workers: int = None, timeout: float = None, progress_tracker=None,
+                 on_result: Optional[Callable[[str, Any], None]] = None,
+                 retry_delay: float = 5.0):
+        """
+        Args:
+            max_workers: Calls in flight at once (default AI_NARRATIVE_WORKERS)
+            timeout: Seconds a single call may run before it is abandoned
+                     (default AI_NARRATIVE_TIMEOUT_SECONDS)
+            progress_tracker: Optional ProgressTracker; update_ai_progress is called as calls finish
+            on_result: Optional callback(name, result) run as each call succeeds, e.g. to save
+                       partial results
+            retry_delay: Base backoff in seconds before retrying a rate-limited call
+        """
+        self.max_workers = max(1, max_workers or AI_NARRATIVE_WORKERS)
+        self.timeout = timeout or AI_NARRATIVE_TIMEOUT_SECONDS
+        self.progress_tracker = progress_tracker
+        self.on_result = on_result
+        self.retry_delay = retry_delay
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self.durations: Dict[str, float] = {}
+        self._tasks: List[_Task] = []
+        self._lock = threading.Lock()
+        self._pool = None
+        self._running = {}
+        self._total = 0
+        self._done = 0
+
+    def submit(self, name: str, fn: Callable, *args, label: str = None,
+               on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None, **kwargs) -> None:
+        """
+        Queue fn(*args, **kwargs) under name. May also be called from a callback while run() is
+        in progress (e.g. to queue fallback calls when one fails).
+
+        Args:
+            name: Result key (must be unique within the scheduler)
+            fn: Callable making one model call
+            label: Progress message for this call
+            on_result: Optional callback(result) for this call, run on the scheduler thread
+            on_error: Optional callback(error) for this call, run on the scheduler thread
+        """
+        task = _Task(name, fn, args, kwargs, label, on_result, on_error)
+        with self._lock:
+            self._total += 1
+            if self._pool is None:
+                self._tasks.append(task)
+            else:
+                self._start(task)
+
+    def __len__(self) -> int:
+        """Number of calls submitted so far."""
+        return self._total
+
+    def _call(self, task: _Task):
+        task.started_at = time.monotonic()
+        for attempt in range(AI_NARRATIVE_RATE_LIMIT_RETRIES + 1):
+            try:
+                return task.fn(*task.args, **task.kwargs)
+            except Exception as e:
+                if attempt == AI_NARRATIVE_RATE_LIMIT_RETRIES or not is_rate_limit_error(e):
+                    raise
+                delay = self.retry_delay * (2 ** attempt)
+                print(f"[WARNING] {task.name}: rate limited, retrying in {delay:.0f}s")
+                time.sleep(delay)
+                task.started_at = time.monotonic()
+
+    def _start(self, task: _Task):
+        self._running[self._pool.submit(self._call, task)] = task
+
+    def _finish(self, task: _Task, result: Any = None, error: BaseException = None):
+        if isinstance(error, JobCancelled):
+            raise error
+        self._done += 1
+        if task.started_at is not None:
+            self.durations[task.name] = round(time.monotonic() - task.started_at, 2)
+        if error is None:
+            self.results[task.name] = result
+            print(f"  [OK] {task.name} ({self.durations.get(task.name, 0):.1f}s)")
+        else:
+            self.errors[task.name] = error
+            print(f"  [WARNING] Failed to generate {task.name}: {error}")
+
+        if self.progress_tracker:
+            try:
+                self.progress_tracker.update_ai_progress(self._done, max(self._total, self._done), task.label)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                print(f"[WARNING] Could not update AI progress: {e}")
+
+        try:
+            if error is None:
+                if task.on_result:
+                    task.on_result(result)
+                if self.on_result:
+                    self.on_result(task.name, result)
+            elif task.on_error:
+                task.on_error(error)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"[WARNING] Callback for {task.name} failed: {e}")
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every submitted call and wait for them (and any calls they queue).
+
+        Returns:
+            Results by name for the calls that succeeded; failures are in self.errors
+        """
+        start = time.monotonic()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ai-narrative')
+        try:
+            with self._lock:
+                for task in self._tasks:
+                    self._start(task)
+                self._tasks = []
+
+            while True:
+                with self._lock:
+                    running = dict(self._running)
+                if not running:
+                    break
+
+                now = time.monotonic()
+                deadlines = [t.started_at + self.timeout for t in running.values() if t.started_at is not None]
+                wait_for = max(0.05, min(deadlines) - now) if deadlines else self.timeout
+                done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                now = time.monotonic()
+                for future, task in running.items():
+                    if future in done:
+                        with self._lock:
+                            del self._running[future]
+                        error = future.exception()
+                        self._finish(task, None if error else future.result(), error)
+                    elif task.started_at is not None and now - task.started_at > self.timeout:
+                        # The thread can't be interrupted; its result is ignored when it returns
+                        with self._lock:
+                            del self._running[future]
+                        self._finish(task, error=NarrativeTimeout(
+                            f"{task.name} did not finish within {self.timeout:.0f}s"))
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+        print(f"[INFO] Generated {len(self.results)}/{self._total} AI narratives in "
+              f"{time.monotonic() - start:.1f}s (longest call "
+              f"{max(self.durations.values(), default=0):.1f}s)")
+        return self.results
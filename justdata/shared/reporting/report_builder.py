@@ -10,6 +10,8 @@ from datetime import datetime
 import os
 import re
 
+from justdata.shared.utils.hhi import concentration_level, hhi_by_market, market_shares
+
 
 def sanitize_sheet_name(name: str) -> str:
     r"""
@@ -113,11 +115,11 @@ def calculate_hhi(df: pd.DataFrame) -> Dict[str, Any]:
     
     # Find latest year
     latest_year = df['year'].max()
-    latest_year_df = df[df['year'] == latest_year].copy()
+    latest_year_df = df[df['year'] == latest_year]
     
-    # Aggregate deposits by bank (across all counties)
-    bank_deposits = latest_year_df.groupby('bank_name')['total_deposits'].sum().reset_index()
-    bank_deposits = bank_deposits[bank_deposits['total_deposits'] > 0]  # Remove banks with zero deposits
+    # Aggregate deposits by bank (across all counties) with market shares (as percentages);
+    # banks with zero deposits are dropped
+    bank_deposits = market_shares(latest_year_df, 'year', 'bank_name', 'total_deposits')
     
     if bank_deposits.empty:
         return {
@@ -130,26 +132,15 @@ def calculate_hhi(df: pd.DataFrame) -> Dict[str, Any]:
     
     total_deposits = bank_deposits['total_deposits'].sum()
     
-    # Calculate market shares (as percentages)
-    bank_deposits['market_share'] = (bank_deposits['total_deposits'] / total_deposits) * 100
-    
     # Calculate HHI: sum of squared market shares (0-10,000 scale)
     hhi = (bank_deposits['market_share'] ** 2).sum()
     
-    # Determine concentration level
-    if hhi < 1500:
-        concentration_level = 'Low concentration (competitive market)'
-    elif hhi < 2500:
-        concentration_level = 'Moderate concentration'
-    else:
-        concentration_level = 'High concentration'
-    
     # Get top banks by deposits
     top_banks = bank_deposits.nlargest(10, 'total_deposits')[['bank_name', 'total_deposits', 'market_share']].to_dict('records')
     
     return {
         'hhi': round(hhi, 2),
-        'concentration_level': concentration_level,
+        'concentration_level': concentration_level(hhi),
         'year': int(latest_year),
         'total_deposits': int(total_deposits),
         'top_banks': top_banks,
@@ -167,35 +158,13 @@ def calculate_hhi_by_year(df: pd.DataFrame) -> List[Dict[str, Any]]:
     if 'total_deposits' not in df.columns or 'year' not in df.columns:
         return []
 
-    results = []
-    years = sorted(df['year'].unique())
-
-    for year in years:
-        year_df = df[df['year'] == year].copy()
-
-        # Aggregate deposits by bank (across all counties)
-        bank_deposits = year_df.groupby('bank_name')['total_deposits'].sum().reset_index()
-        bank_deposits = bank_deposits[bank_deposits['total_deposits'] > 0]
-
-        if bank_deposits.empty:
-            continue
-
-        total_deposits = bank_deposits['total_deposits'].sum()
-        if total_deposits == 0:
-            continue
-
-        # Calculate market shares (as percentages)
-        bank_deposits['market_share'] = (bank_deposits['total_deposits'] / total_deposits) * 100
-
-        # Calculate HHI: sum of squared market shares (0-10,000 scale)
-        hhi = (bank_deposits['market_share'] ** 2).sum()
-
-        results.append({
-            'year': int(year),
-            'hhi_value': round(hhi, 2)
-        })
+    # Deposits aggregated by bank (across all counties), all years in one pass
+    by_year = hhi_by_market(df, 'year', 'bank_name', 'total_deposits')
 
-    return results
+    return [
+        {'year': int(year), 'hhi_value': round(hhi, 2)}
+        for year, hhi in zip(by_year['year'], by_year['hhi'])
+    ]
 
 
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -5,14 +5,20 @@ Stores each section (data tables, AI summaries, etc.) separately for better quer
 All results stored as JSON in BigQuery regardless of size.
 """
 
+import atexit
 import hashlib
 import json
 import os
+import threading
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
+import pandas as pd
 from google.cloud import bigquery
 from justdata.shared.utils.bigquery_client import get_bigquery_client
+from justdata.shared.utils.local_cache import LocalTTLCache
+from justdata.shared.utils import columnar_sections
 
 # Project and dataset
 PROJECT_ID = os.getenv('JUSTDATA_PROJECT_ID', 'justdata-ncrc')
@@ -24,6 +30,107 @@ USAGE_TABLE = f'{PROJECT_ID}.{DATASET_ID}.usage_log'
 RESULTS_TABLE = f'{PROJECT_ID}.{DATASET_ID}.analysis_results'
 SECTIONS_TABLE = f'{PROJECT_ID}.{DATASET_ID}.analysis_result_sections'
 
+# In-process L1 cache in front of BigQuery. A repeat request for the same
+# report is served from worker memory (or the optional disk tier) instead of
+# re-running the cache lookup, sections query and access-count DML.
+# Only this process is invalidated when a key is rewritten, so other workers
+# may serve the previous result for up to the TTL.
+L1_CACHE_ENABLED = os.getenv('ANALYSIS_CACHE_L1_ENABLED', 'true').lower() == 'true'
+_l1_cache = LocalTTLCache(
+    'analysis_cache',
+    max_entries=int(os.getenv('ANALYSIS_CACHE_L1_MAX_ENTRIES', '128')),
+    max_bytes=int(os.getenv('ANALYSIS_CACHE_L1_MAX_MB', '256')) * 1024 * 1024,
+    ttl_seconds=float(os.getenv('ANALYSIS_CACHE_L1_TTL_SECONDS', '900')),
+    disk_dir=os.getenv('ANALYSIS_CACHE_DISK_DIR') or None,
+    disk_max_bytes=int(os.getenv('ANALYSIS_CACHE_DISK_MAX_MB', '1024')) * 1024 * 1024,
+)
+
+# Section writes are batched into multi-row INSERTs up to this size; BigQuery
+# caps a query request (text plus parameters) at 10 MB.
+SECTION_BATCH_MAX_BYTES = int(os.getenv('ANALYSIS_CACHE_SECTION_BATCH_MB', '8')) * 1024 * 1024
+
+# Superseded results/sections are removed by a background sweeper at most this
+# often per process, and only once they are older than the grace period.
+SWEEP_INTERVAL_SECONDS = float(os.getenv('ANALYSIS_CACHE_SWEEP_INTERVAL_SECONDS', str(6 * 3600)))
+SWEEP_GRACE_HOURS = float(os.getenv('ANALYSIS_CACHE_SWEEP_GRACE_HOURS', '24'))
+
+# How often pending access-count increments are written back to BigQuery
+ACCESS_FLUSH_INTERVAL_SECONDS = float(os.getenv('ANALYSIS_CACHE_ACCESS_FLUSH_SECONDS', '30'))
+
+
+class _AccessCountBatcher:
+    """
+    Accumulates cache hits per cache_key and writes them to BigQuery in one
+    UPDATE per flush interval, instead of one synchronous DML job per hit.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, cache_key: str) -> None:
+        with self._lock:
+            self._pending[cache_key] = self._pending.get(cache_key, 0) + 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='analysis-cache-access',
+                                                daemon=True)
+                self._thread.start()
+
+    def pending_hits(self, cache_key: str) -> int:
+        with self._lock:
+            return self._pending.get(cache_key, 0)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending increments to BigQuery. Failures are logged and dropped."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        update_query = f"""
+        UPDATE `{CACHE_TABLE}` c
+        SET
+            last_accessed = CURRENT_TIMESTAMP(),
+            access_count = c.access_count + h.hits
+        FROM UNNEST(@hits) h
+        WHERE c.cache_key = h.cache_key
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter("hits", "STRUCT", [
+                    bigquery.StructQueryParameter(
+                        None,
+                        bigquery.ScalarQueryParameter("cache_key", "STRING", key),
+                        bigquery.ScalarQueryParameter("hits", "INT64", hits),
+                    )
+                    for key, hits in pending.items()
+                ])
+            ]
+        )
+        try:
+            client = get_bigquery_client(PROJECT_ID, app_name='cache')
+            client.query(update_query, job_config=job_config).result()
+        except Exception as e:
+            print(f"[WARNING] Failed to flush cache access counts for {len(pending)} key(s): {e}")
+
+
+_access_batcher = _AccessCountBatcher(ACCESS_FLUSH_INTERVAL_SECONDS)
+atexit.register(_access_batcher.flush)
+
+
+def invalidate_local_cache(app_name: str, params: Dict[str, Any]) -> None:
+    """Drop a cached result from this process's L1 cache (memory and disk tiers)."""
+    _l1_cache.invalidate(generate_cache_key(app_name, params))
+
 
 def sanitize_nan_values(data: Any, precision: int = 4) -> Any:
     """
@@ -148,6 +255,11 @@ def normalize_parameters(app_name: str, params: Dict[str, Any]) -> Dict[str, Any
             normalized['counties'] = ';'.join(sorted(counties_list))
         normalized['years'] = params.get('years', '').strip()
     
+    else:
+        # No app-specific normalization: key on the raw parameters so different
+        # requests never collide (also used to de-duplicate in-flight jobs)
+        normalized['params'] = params
+    
     return normalized
 
 
@@ -447,7 +559,21 @@ def extract_sections(app_name: str, result_data: Dict[str, Any]) -> List[Dict[st
                 
                 # Convert DataFrame to list of dicts if needed
                 if isinstance(value, pd.DataFrame):
-                    if not value.empty:
+                    if columnar_sections.should_encode('data_table', value):
+                        # Stored as Arrow IPC; skip the row-wise NaN cleaning entirely
+                        sections.append({
+                            'section_name': key,
+                            'section_type': 'data_table',
+                            'section_category': 'tables',
+                            'section_data': value,
+                            'section_metadata': {
+                                'row_count': len(value),
+                                'columns': list(value.columns)
+                            },
+                            'display_order': display_order
+                        })
+                        display_order += 1
+                    elif not value.empty:
                         import numpy as np
                         # Replace all NaN types before converting to dict
                         # This handles pd.NA, pd.NaT, np.nan, and any other NaN values
@@ -556,13 +682,54 @@ def extract_sections(app_name: str, result_data: Dict[str, Any]) -> List[Dict[st
     return sections
 
 
+def _section_blob_column(prefix: str = '') -> str:
+    """SELECT fragment for the columnar section_blob column (absent until migration 30)."""
+    return f",\n        {prefix}section_blob" if columnar_sections.COLUMNAR_SECTIONS_ENABLED else ''
+
+
+def _decode_section(row: Any, as_dataframe: bool = False) -> Tuple[Any, int]:
+    """
+    Decode a section row, from Arrow IPC bytes if it was stored columnar, else JSON.
+
+    Returns:
+        (section data, approximate decoded size in bytes) - the DataFrame's deep
+        memory usage for columnar sections, the JSON length otherwise
+    """
+    blob = getattr(row, 'section_blob', None)
+    if blob:
+        df = columnar_sections.decode_table(blob)
+        size_bytes = int(df.memory_usage(index=True, deep=True).sum())
+        return (df if as_dataframe else columnar_sections.dataframe_to_records(df)), size_bytes
+    if isinstance(row.section_data, str):
+        return json.loads(row.section_data), len(row.section_data)
+    return row.section_data, len(json.dumps(row.section_data, default=str))
+
+
+def _load_section_data(row: Any, as_dataframe: bool = False) -> Any:
+    """Decode a section row, from Arrow IPC bytes if it was stored columnar, else JSON."""
+    return _decode_section(row, as_dataframe)[0]
+
+
 def get_cached_result(app_name: str, params: Dict[str, Any], 
                      user_type: str = 'public') -> Optional[Dict[str, Any]]:
     """
     Check if a cached result exists and retrieve it with all sections.
     Returns None if cache miss, or dict with 'job_id', 'result_data', 'cache_key' if cache hit.
+
+    Results are served from the in-process L1 cache when possible. The returned
+    result_data may be shared with other requests and must not be mutated.
     """
     cache_key = generate_cache_key(app_name, params)
+
+    if L1_CACHE_ENABLED:
+        local = _l1_cache.get(cache_key)
+        if local is not None:
+            _access_batcher.record(cache_key)
+            return {
+                **local,
+                'access_count': local['access_count'] + _access_batcher.pending_hits(cache_key),
+            }
+
     client = get_bigquery_client(PROJECT_ID, app_name=app_name)
 
     # Check cache
@@ -604,7 +771,7 @@ def get_cached_result(app_name: str, params: Dict[str, Any],
             section_category,
             section_data,
             section_metadata,
-            display_order
+            display_order{_section_blob_column()}
         FROM `{SECTIONS_TABLE}`
         WHERE job_id = @job_id
         ORDER BY display_order ASC
@@ -632,11 +799,13 @@ def get_cached_result(app_name: str, params: Dict[str, Any],
         result_data = {}
         report_data = {}
         ai_insights = {}
+        size_bytes = 0
         
         for row in sections_rows:
             section_name = row.section_name
             section_type = row.section_type
-            section_data = json.loads(row.section_data) if isinstance(row.section_data, str) else row.section_data
+            section_data, section_bytes = _decode_section(row)
+            size_bytes += section_bytes
             
             if section_type == 'data_table' or section_type == 'raw_data':
                 # Store in report_data
@@ -671,23 +840,20 @@ def get_cached_result(app_name: str, params: Dict[str, Any],
         result_data['report_data'] = report_data
         result_data['ai_insights'] = ai_insights
         
-        # Update cache access stats
-        update_query = f"""
-        UPDATE `{CACHE_TABLE}`
-        SET 
-            last_accessed = CURRENT_TIMESTAMP(),
-            access_count = access_count + 1
-        WHERE cache_key = @cache_key
-        """
-        client.query(update_query, job_config=job_config).result()
-        
-        return {
+        # Access stats are batched and written back in the background
+        _access_batcher.record(cache_key)
+
+        cached = {
             'job_id': job_id,
             'cache_key': cache_row.cache_key,
             'result_data': result_data,
             'cached': True,
             'access_count': cache_row.access_count
         }
+        if L1_CACHE_ENABLED:
+            # Decoded sizes gathered above avoid re-serializing the result
+            _l1_cache.set(cache_key, cached, size_bytes=size_bytes)
+        return cached
         
     except Exception as e:
         print(f"Error checking cache: {e}")
@@ -696,11 +862,16 @@ def get_cached_result(app_name: str, params: Dict[str, Any],
         return None
 
 
-def get_analysis_result_by_job_id(job_id: str) -> Optional[Dict[str, Any]]:
+def get_analysis_result_by_job_id(job_id: str, as_dataframes: bool = False) -> Optional[Dict[str, Any]]:
     """
     Retrieve analysis result from BigQuery by job_id.
     Returns None if not found, or dict with 'report_data', 'ai_insights', 'metadata' if found.
     This is the primary method for retrieving results - BigQuery-only, no in-memory storage.
+
+    Args:
+        job_id: Analysis job ID
+        as_dataframes: Return columnar-encoded tables as DataFrames instead of
+            row dicts (JSON-encoded tables are always returned as stored)
     """
     client = get_bigquery_client(PROJECT_ID, app_name='cache')
 
@@ -715,7 +886,7 @@ def get_analysis_result_by_job_id(job_id: str) -> Optional[Dict[str, Any]]:
         s.section_category,
         s.section_data,
         s.section_metadata,
-        s.display_order
+        s.display_order{_section_blob_column('s.')}
     FROM `{RESULTS_TABLE}` r
     LEFT JOIN `{SECTIONS_TABLE}` s ON r.job_id = s.job_id
     WHERE r.job_id = @job_id
@@ -805,7 +976,7 @@ def get_analysis_result_by_job_id(job_id: str) -> Optional[Dict[str, Any]]:
         for row in rows:
             if row.section_name:
                 print(f"[DEBUG] Processing section: {row.section_name} (type: {row.section_type})")
-                section_data = json.loads(row.section_data) if isinstance(row.section_data, str) else row.section_data
+                section_data = _load_section_data(row, as_dataframes)
                 
                 if row.section_type in ['data_table', 'raw_data']:
                     # Handle MergerMeter format with headers
@@ -902,58 +1073,21 @@ def store_cached_result(app_name: str, params: Dict[str, Any],
                        metadata: Optional[Dict[str, Any]] = None) -> None:
     """
     Store analysis result in BigQuery with section-based storage.
-    If a cache entry with the same cache_key already exists (e.g., force_refresh),
-    the old entry and its associated data are deleted first.
+
+    Sections are staged under the new job_id first (invisible to readers until
+    the cache row points at them), then the results row and the cache entry are
+    written in a single transaction that MERGEs cache_key -> job_id. If a cache
+    entry already exists (e.g., force_refresh) it is swapped atomically; the
+    superseded results and sections are removed later by
+    sweep_superseded_results() rather than inline.
     """
     cache_key = generate_cache_key(app_name, params)
     normalized_params = normalize_parameters(app_name, params)
     client = get_bigquery_client(PROJECT_ID, app_name=app_name)
 
-    # Delete any existing cache entry with the same cache_key (for force_refresh scenarios)
-    # This also requires deleting associated results and sections to maintain referential integrity
-    try:
-        # First, get the old job_id if it exists
-        old_job_query = f"""
-        SELECT job_id FROM `{CACHE_TABLE}` WHERE cache_key = @cache_key
-        """
-        old_job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("cache_key", "STRING", cache_key)
-            ]
-        )
-        old_job_result = list(client.query(old_job_query, job_config=old_job_config).result())
-
-        if old_job_result:
-            old_job_id = old_job_result[0].job_id
-            print(f"[INFO] Found existing cache entry for cache_key {cache_key[:16]}... with job_id {old_job_id}. Deleting old data.")
-
-            # Delete old sections
-            delete_sections_query = f"""
-            DELETE FROM `{SECTIONS_TABLE}` WHERE job_id = @old_job_id
-            """
-            sections_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("old_job_id", "STRING", old_job_id)
-                ]
-            )
-            client.query(delete_sections_query, job_config=sections_config).result()
-
-            # Delete old results
-            delete_results_query = f"""
-            DELETE FROM `{RESULTS_TABLE}` WHERE job_id = @old_job_id
-            """
-            client.query(delete_results_query, job_config=sections_config).result()
-
-            # Delete old cache entry
-            delete_cache_query = f"""
-            DELETE FROM `{CACHE_TABLE}` WHERE cache_key = @cache_key
-            """
-            client.query(delete_cache_query, job_config=old_job_config).result()
-
-            print(f"[OK] Deleted old cache entry and associated data for job_id {old_job_id}")
-    except Exception as cleanup_error:
-        print(f"[WARNING] Error during cache cleanup (non-fatal): {cleanup_error}")
-    
+    # The key is being rewritten, so the local copy of the old result is stale
+    _l1_cache.invalidate(cache_key)
+
     # Extract sections
     sections = extract_sections(app_name, result_data)
     
@@ -993,20 +1127,10 @@ def store_cached_result(app_name: str, params: Dict[str, Any],
     # Calculate total result size
     total_size = len(json.dumps(result_data, default=str).encode('utf-8'))
     
-    # Insert into cache table
-    cache_insert = f"""
-    INSERT INTO `{CACHE_TABLE}`
-    (cache_key, app_name, job_id, parameters_hash, parameters_json, 
-     created_at, created_by_user_type, last_accessed, access_count,
-     result_size_bytes, cost_saved_usd, expires_at)
-    VALUES
-    (@cache_key, @app_name, @job_id, @params_hash, PARSE_JSON(@params_json),
-     CURRENT_TIMESTAMP(), @user_type, CURRENT_TIMESTAMP(), 0,
-     @result_size, 0.0, NULL)
-    """
-    
-    # Insert into results table
-    results_insert = f"""
+    # Results row plus atomic cache_key -> job_id swap, in one transaction
+    swap_script = f"""
+    BEGIN TRANSACTION;
+
     INSERT INTO `{RESULTS_TABLE}`
     (job_id, app_name, cache_key, result_summary, sections_summary,
      created_at, created_by_user_type, analysis_duration_seconds,
@@ -1014,10 +1138,36 @@ def store_cached_result(app_name: str, params: Dict[str, Any],
     VALUES
     (@job_id, @app_name, @cache_key, PARSE_JSON(@result_summary), PARSE_JSON(@sections_summary),
      CURRENT_TIMESTAMP(), @user_type, @duration,
-     @bq_queries, @ai_calls, @status, @error)
+     @bq_queries, @ai_calls, @status, @error);
+
+    MERGE `{CACHE_TABLE}` t
+    USING (SELECT @cache_key AS cache_key) s
+    ON t.cache_key = s.cache_key
+    WHEN MATCHED THEN UPDATE SET
+        job_id = @job_id,
+        app_name = @app_name,
+        parameters_hash = @params_hash,
+        parameters_json = PARSE_JSON(@params_json),
+        created_at = CURRENT_TIMESTAMP(),
+        created_by_user_type = @user_type,
+        last_accessed = CURRENT_TIMESTAMP(),
+        access_count = 0,
+        result_size_bytes = @result_size,
+        cost_saved_usd = 0.0,
+        expires_at = NULL
+    WHEN NOT MATCHED THEN INSERT
+    (cache_key, app_name, job_id, parameters_hash, parameters_json,
+     created_at, created_by_user_type, last_accessed, access_count,
+     result_size_bytes, cost_saved_usd, expires_at)
+    VALUES
+    (@cache_key, @app_name, @job_id, @params_hash, PARSE_JSON(@params_json),
+     CURRENT_TIMESTAMP(), @user_type, CURRENT_TIMESTAMP(), 0,
+     @result_size, 0.0, NULL);
+
+    COMMIT TRANSACTION;
     """
-    
-    job_config_cache = bigquery.QueryJobConfig(
+
+    swap_config = bigquery.QueryJobConfig(
         query_parameters=[
             bigquery.ScalarQueryParameter("cache_key", "STRING", cache_key),
             bigquery.ScalarQueryParameter("app_name", "STRING", app_name.lower()),
@@ -1026,17 +1176,8 @@ def store_cached_result(app_name: str, params: Dict[str, Any],
             bigquery.ScalarQueryParameter("params_json", "STRING", json.dumps(normalized_params)),
             bigquery.ScalarQueryParameter("user_type", "STRING", user_type),
             bigquery.ScalarQueryParameter("result_size", "INT64", total_size),
-        ]
-    )
-    
-    job_config_results = bigquery.QueryJobConfig(
-        query_parameters=[
-            bigquery.ScalarQueryParameter("job_id", "STRING", job_id),
-            bigquery.ScalarQueryParameter("app_name", "STRING", app_name.lower()),
-            bigquery.ScalarQueryParameter("cache_key", "STRING", cache_key),
             bigquery.ScalarQueryParameter("result_summary", "STRING", json.dumps(result_summary)),
             bigquery.ScalarQueryParameter("sections_summary", "STRING", json.dumps(sections_summary)),
-            bigquery.ScalarQueryParameter("user_type", "STRING", user_type),
             bigquery.ScalarQueryParameter("duration", "FLOAT64", metadata.get('duration_seconds', 0.0) if metadata else 0.0),
             bigquery.ScalarQueryParameter("bq_queries", "INT64", metadata.get('bq_queries_count', 0) if metadata else 0),
             bigquery.ScalarQueryParameter("ai_calls", "INT64", metadata.get('ai_calls_count', 0) if metadata else 0),
@@ -1044,51 +1185,23 @@ def store_cached_result(app_name: str, params: Dict[str, Any],
             bigquery.ScalarQueryParameter("error", "STRING", None),
         ]
     )
-    
+
     try:
-        # IMPORTANT: Insert sections FIRST, before the results row.
-        # The results row has status='completed' which makes data visible to the
-        # report-data endpoint. If we insert results first, the frontend can query
-        # via LEFT JOIN and get partial data before all sections are stored.
+        # IMPORTANT: Stage sections FIRST. They are keyed by the new job_id, which
+        # nothing references until the swap below commits, so readers keep seeing
+        # the previous complete result (if any) and never a partial one.
         print(f"[DEBUG] Storing {len(sections)} sections to BigQuery...")
-        for idx, section in enumerate(sections):
-            section_id = str(uuid.uuid4())
-            section_insert = f"""
-            INSERT INTO `{SECTIONS_TABLE}`
-            (section_id, job_id, app_name, section_type, section_name, section_category,
-             section_data, section_metadata, display_order, created_at, updated_at)
-            VALUES
-            (@section_id, @job_id, @app_name, @section_type, @section_name, @section_category,
-             PARSE_JSON(@section_data), PARSE_JSON(@section_metadata), @display_order,
-             CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP())
-            """
-
-            section_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("section_id", "STRING", section_id),
-                    bigquery.ScalarQueryParameter("job_id", "STRING", job_id),
-                    bigquery.ScalarQueryParameter("app_name", "STRING", app_name.lower()),
-                    bigquery.ScalarQueryParameter("section_type", "STRING", section['section_type']),
-                    bigquery.ScalarQueryParameter("section_name", "STRING", section['section_name']),
-                    bigquery.ScalarQueryParameter("section_category", "STRING", section.get('section_category')),
-                    bigquery.ScalarQueryParameter("section_data", "STRING", json.dumps(section['section_data'], default=str)),
-                    bigquery.ScalarQueryParameter("section_metadata", "STRING", json.dumps(section.get('section_metadata', {}))),
-                    bigquery.ScalarQueryParameter("display_order", "INT64", section.get('display_order', 0)),
-                ]
-            )
-
+        batches = _batch_sections(sections)
+        for idx, batch in enumerate(batches):
             try:
-                client.query(section_insert, job_config=section_config).result()
-                print(f"  [OK] Stored section {idx+1}/{len(sections)}: {section['section_name']}")
+                _insert_section_batch(client, app_name, job_id, batch)
+                print(f"  [OK] Stored section batch {idx+1}/{len(batches)} ({len(batch)} sections)")
             except Exception as section_error:
-                print(f"  [ERROR] Failed to store section {section['section_name']}: {section_error}")
+                names = ', '.join(sec['section_name'] for sec in batch)
+                print(f"  [ERROR] Failed to store section batch [{names}]: {section_error}")
                 raise
 
-        # Now insert result summary (with status='completed') - all sections exist at this point
-        client.query(results_insert, job_config=job_config_results).result()
-
-        # Insert cache entry last (maps cache_key -> job_id for cache lookups)
-        client.query(cache_insert, job_config=job_config_cache).result()
+        _run_with_transaction_retry(client, swap_script, swap_config)
 
         print(f"[OK] Stored cache entry, result summary, and {len(sections)} sections for job_id: {job_id}")
 
@@ -1098,6 +1211,171 @@ def store_cached_result(app_name: str, params: Dict[str, Any],
         traceback.print_exc()
         raise
 
+    # Superseded rows are garbage-collected in the background, off the request path
+    _maybe_schedule_sweep()
+
+
+def _batch_sections(sections: List[Dict[str, Any]],
+                    max_bytes: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Serialize sections and group them into batches that fit in one query request.
+    A section larger than max_bytes (default SECTION_BATCH_MAX_BYTES) is sent on its own.
+    """
+    max_bytes = max_bytes or SECTION_BATCH_MAX_BYTES
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_bytes = 0
+    for section in sections:
+        section_data = section['section_data']
+        section_metadata = dict(section.get('section_metadata', {}))
+        blob = None
+        if columnar_sections.should_encode(section['section_type'], section_data):
+            blob = columnar_sections.encode_table(section_data)
+        if blob is not None:
+            section_metadata['encoding'] = columnar_sections.ENCODING_ARROW_IPC
+            section_data = {'encoding': columnar_sections.ENCODING_ARROW_IPC, 'row_count': len(section_data)}
+        elif isinstance(section_data, pd.DataFrame):
+            # Columnar encoding failed; store the rows as JSON instead
+            section_data = columnar_sections.dataframe_to_records(section_data)
+        serialized = {
+            'section_type': section['section_type'],
+            'section_name': section['section_name'],
+            'section_category': section.get('section_category'),
+            'section_data': json.dumps(section_data, default=str),
+            'section_metadata': json.dumps(section_metadata, default=str),
+            'display_order': section.get('display_order', 0),
+            'section_blob': blob,
+        }
+        # BYTES parameters travel base64-encoded, hence the 4/3
+        size = (len(serialized['section_data']) + len(serialized['section_metadata'])
+                + (len(blob) * 4 // 3 if blob else 0))
+        if current and current_bytes + size > max_bytes:
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(serialized)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _insert_section_batch(client: bigquery.Client, app_name: str, job_id: str,
+                          batch: List[Dict[str, Any]]) -> None:
+    """Insert a batch of serialized sections with a single multi-row INSERT."""
+    with_blob = columnar_sections.COLUMNAR_SECTIONS_ENABLED
+    section_insert = f"""
+    INSERT INTO `{SECTIONS_TABLE}`
+    (section_id, job_id, app_name, section_type, section_name, section_category,
+     section_data, section_metadata, display_order, created_at, updated_at{', section_blob' if with_blob else ''})
+    SELECT
+        GENERATE_UUID(), @job_id, @app_name, s.section_type, s.section_name, s.section_category,
+        PARSE_JSON(s.section_data), PARSE_JSON(s.section_metadata), s.display_order,
+        CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP(){', s.section_blob' if with_blob else ''}
+    FROM UNNEST(@sections) s
+    """
+    section_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("job_id", "STRING", job_id),
+            bigquery.ScalarQueryParameter("app_name", "STRING", app_name.lower()),
+            bigquery.ArrayQueryParameter("sections", "STRUCT", [
+                bigquery.StructQueryParameter(
+                    None,
+                    bigquery.ScalarQueryParameter("section_type", "STRING", sec['section_type']),
+                    bigquery.ScalarQueryParameter("section_name", "STRING", sec['section_name']),
+                    bigquery.ScalarQueryParameter("section_category", "STRING", sec['section_category']),
+                    bigquery.ScalarQueryParameter("section_data", "STRING", sec['section_data']),
+                    bigquery.ScalarQueryParameter("section_metadata", "STRING", sec['section_metadata']),
+                    bigquery.ScalarQueryParameter("display_order", "INT64", sec['display_order']),
+                    *([bigquery.ScalarQueryParameter("section_blob", "BYTES", sec['section_blob'])]
+                      if with_blob else []),
+                )
+                for sec in batch
+            ]),
+        ]
+    )
+    client.query(section_insert, job_config=section_config).result()
+
+
+def _run_with_transaction_retry(client: bigquery.Client, script: str,
+                                job_config: bigquery.QueryJobConfig, attempts: int = 3) -> None:
+    """
+    Run a multi-statement transaction, retrying when BigQuery aborts it because
+    a concurrent transaction touched the same table (e.g. two refreshes at once).
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            client.query(script, job_config=job_config).result()
+            return
+        except Exception as e:
+            if attempt == attempts or 'concurrent update' not in str(e).lower():
+                raise
+            print(f"[WARNING] Cache swap aborted by concurrent update, retrying ({attempt}/{attempts})")
+            time.sleep(0.5 * attempt)
+
+
+_sweep_lock = threading.Lock()
+_last_sweep_at = 0.0
+
+
+def _maybe_schedule_sweep() -> None:
+    """Start a background sweep if none has run in this process for SWEEP_INTERVAL_SECONDS."""
+    global _last_sweep_at
+    if SWEEP_INTERVAL_SECONDS <= 0:
+        return
+    with _sweep_lock:
+        now = time.time()
+        if now - _last_sweep_at < SWEEP_INTERVAL_SECONDS:
+            return
+        _last_sweep_at = now
+    threading.Thread(target=sweep_superseded_results, name='analysis-cache-sweep', daemon=True).start()
+
+
+def sweep_superseded_results(grace_hours: float = None) -> bool:
+    """
+    Delete results and sections that no cache entry points at any more.
+
+    A row is removed only when it is older than the grace period, so in-flight
+    writes (sections staged before their swap commits) and readers still
+    holding the previous job_id are unaffected. Results rows for cache keys
+    that no longer exist at all are kept for analytics.
+
+    Args:
+        grace_hours: Minimum age of rows to delete (default SWEEP_GRACE_HOURS)
+
+    Returns:
+        True if the sweep completed, False on error
+    """
+    grace_hours = SWEEP_GRACE_HOURS if grace_hours is None else grace_hours
+    sweep_script = f"""
+    DECLARE cutoff TIMESTAMP DEFAULT TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @grace_minutes MINUTE);
+
+    -- Results replaced by a newer job for the same cache key
+    DELETE FROM `{RESULTS_TABLE}` r
+    WHERE r.created_at < cutoff
+        AND EXISTS (
+            SELECT 1 FROM `{CACHE_TABLE}` c
+            WHERE c.cache_key = r.cache_key AND c.job_id != r.job_id
+        );
+
+    -- Sections whose results row is gone (superseded above, or a failed write)
+    DELETE FROM `{SECTIONS_TABLE}` s
+    WHERE s.created_at < cutoff
+        AND NOT EXISTS (SELECT 1 FROM `{RESULTS_TABLE}` r WHERE r.job_id = s.job_id);
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("grace_minutes", "INT64", int(grace_hours * 60))
+        ]
+    )
+    try:
+        client = get_bigquery_client(PROJECT_ID, app_name='cache')
+        client.query(sweep_script, job_config=job_config).result()
+        print(f"[OK] Swept superseded analysis results older than {grace_hours}h")
+        return True
+    except Exception as e:
+        print(f"[WARNING] Analysis cache sweep failed (non-fatal): {e}")
+        return False
+
 
 def log_usage(user_type: str, app_name: str, params: Dict[str, Any],
              cache_key: str, cache_hit: bool, job_id: str,
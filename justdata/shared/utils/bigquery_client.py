@@ -11,6 +11,7 @@ import os
 import json
 import tempfile
 import logging
+import threading
 import concurrent.futures
 from google.cloud import bigquery
 from google.oauth2 import service_account
@@ -292,6 +293,37 @@ def clear_client_cache():
     _credential_path_cache = None
 
 
+def _run_job(client: bigquery.Client, sql: str, params: Optional[List] = None,
+             timeout: int = 120):
+    """Run a query job and wait for it, returning the RowIterator.
+
+    Timeouts cancel the job. Query errors (syntax, missing tables, etc.) are
+    re-raised with their real message.
+    """
+    from google.cloud.bigquery import QueryJobConfig
+
+    job_config = QueryJobConfig()
+    job_config.use_query_cache = True
+    job_config.use_legacy_sql = False
+    if params:
+        job_config.query_parameters = params
+
+    query_job = client.query(sql, job_config=job_config)
+
+    try:
+        return query_job.result(timeout=timeout)
+    except concurrent.futures.TimeoutError as timeout_error:
+        # Only catch actual timeouts, not query errors
+        try:
+            query_job.cancel()
+            logger.warning("Query cancelled due to timeout")
+        except Exception:
+            pass
+        raise Exception(f"Query timed out after {timeout} seconds: {timeout_error}")
+    except Exception as query_error:
+        raise Exception(f"BigQuery query error: {query_error}")
+
+
 def execute_query(client: bigquery.Client, sql: str, timeout: int = 120) -> List[Dict[str, Any]]:
     """
     Execute a BigQuery SQL query with timeout.
@@ -305,29 +337,7 @@ def execute_query(client: bigquery.Client, sql: str, timeout: int = 120) -> List
         List of dictionaries containing query results
     """
     try:
-        from google.cloud.bigquery import QueryJobConfig
-        
-        # Configure query with timeout
-        job_config = QueryJobConfig()
-        job_config.use_query_cache = True
-        job_config.use_legacy_sql = False
-        
-        query_job = client.query(sql, job_config=job_config)
-        
-        # Wait for results with timeout
-        try:
-            results = query_job.result(timeout=timeout)
-        except concurrent.futures.TimeoutError as timeout_error:
-            # Only catch actual timeouts, not query errors
-            try:
-                query_job.cancel()
-                logger.warning("Query cancelled due to timeout")
-            except:
-                pass
-            raise Exception(f"Query timed out after {timeout} seconds: {timeout_error}")
-        except Exception as query_error:
-            # Re-raise query errors (syntax, missing tables, etc.) with their real message
-            raise Exception(f"BigQuery query error: {query_error}")
+        results = _run_job(client, sql, timeout=timeout)
         
         # Convert to list of dictionaries
         data = [dict(row.items()) for row in results]
@@ -360,31 +370,120 @@ def run_query(
         List of dictionaries containing query results
     """
     try:
-        from google.cloud.bigquery import QueryJobConfig
+        results = _run_job(client, sql, params=params, timeout=timeout)
+        data = [dict(row.items()) for row in results]
+        logger.debug(f"Query returned {len(data)} rows")
+        return data
 
-        job_config = QueryJobConfig()
-        job_config.use_query_cache = True
-        job_config.use_legacy_sql = False
-        if params:
-            job_config.query_parameters = params
+    except Exception as e:
+        logger.error(f"BigQuery query error: {e}")
+        raise Exception(f"Error executing BigQuery query: {e}")
+
+
+# Large results are downloaded over the BigQuery Storage Read API (parallel
+# Arrow streams) when google-cloud-bigquery-storage is installed. Small results
+# that fit in the first REST page skip it automatically.
+USE_STORAGE_READ_API = os.getenv('BIGQUERY_USE_STORAGE_API', 'true').lower() == 'true'
+
+_bqstorage_clients: Dict[int, tuple] = {}
+_bqstorage_lock = threading.Lock()
 
-        query_job = client.query(sql, job_config=job_config)
 
+def _get_bqstorage_client(client: bigquery.Client):
+    """Return a Storage Read API client sharing client's credentials, or None if unavailable."""
+    if not USE_STORAGE_READ_API:
+        return None
+    try:
+        from google.cloud import bigquery_storage
+    except ImportError:
+        return None
+    with _bqstorage_lock:
+        entry = _bqstorage_clients.get(id(client))
+        if entry is not None and entry[0] is client:
+            return entry[1]
         try:
-            results = query_job.result(timeout=timeout)
-        except concurrent.futures.TimeoutError as timeout_error:
-            try:
-                query_job.cancel()
-                logger.warning("Query cancelled due to timeout")
-            except Exception:
-                pass
-            raise Exception(f"Query timed out after {timeout} seconds: {timeout_error}")
-        except Exception as query_error:
-            raise Exception(f"BigQuery query error: {query_error}")
+            read_client = bigquery_storage.BigQueryReadClient(credentials=client._credentials)
+        except Exception as e:
+            logger.warning(f"BigQuery Storage Read API unavailable, using REST downloads: {e}")
+            read_client = None
+        # Keep a reference to client so its id() cannot be reused while cached
+        _bqstorage_clients[id(client)] = (client, read_client)
+        return read_client
 
-        data = [dict(row.items()) for row in results]
-        logger.debug(f"Query returned {len(data)} rows")
-        return data
+
+def execute_query_arrow(
+    client: bigquery.Client,
+    sql: str,
+    params: Optional[List] = None,
+    timeout: int = 120,
+):
+    """Execute a BigQuery query and return results as a pyarrow.Table.
+
+    Rows are never materialized as Python objects, which keeps state-level
+    pulls with millions of rows cheap to fetch and hold in memory.
+
+    Args:
+        client: BigQuery client instance
+        sql: SQL query string (use @param_name placeholders if params is given)
+        params: Optional list of google.cloud.bigquery.QueryParameter objects
+        timeout: Query timeout in seconds (default: 120)
+
+    Returns:
+        pyarrow.Table of query results
+    """
+    try:
+        results = _run_job(client, sql, params=params, timeout=timeout)
+        table = results.to_arrow(bqstorage_client=_get_bqstorage_client(client),
+                                 create_bqstorage_client=False)
+        logger.debug(f"Query returned {table.num_rows} rows")
+        return table
+
+    except Exception as e:
+        logger.error(f"BigQuery query error: {e}")
+        raise Exception(f"Error executing BigQuery query: {e}")
+
+
+def execute_query_df(
+    client: bigquery.Client,
+    sql: str,
+    params: Optional[List] = None,
+    timeout: int = 120,
+    dtypes: Optional[Dict[str, Any]] = None,
+):
+    """Execute a BigQuery query and return results as a pandas DataFrame.
+
+    Downloads Arrow record batches and converts them column-wise, instead of
+    building a dict per row and handing the list to pd.DataFrame. Column
+    dtypes match what pd.DataFrame(execute_query(...)) produces (int64, or
+    float64 when a column has NULLs; object for strings) so existing report
+    code sees the same frames.
+
+    Args:
+        client: BigQuery client instance
+        sql: SQL query string (use @param_name placeholders if params is given)
+        params: Optional list of google.cloud.bigquery.QueryParameter objects
+        timeout: Query timeout in seconds (default: 120)
+        dtypes: Optional {column: dtype} hints applied to the result, e.g.
+            {'year': 'int16', 'lender_name': 'category'}. Columns not in the
+            result are ignored.
+
+    Returns:
+        pandas.DataFrame of query results (empty DataFrame if no rows).
+    """
+    try:
+        results = _run_job(client, sql, params=params, timeout=timeout)
+        df = results.to_dataframe(
+            bqstorage_client=_get_bqstorage_client(client),
+            create_bqstorage_client=False,
+            int_dtype=None,
+            bool_dtype=None,
+        )
+        if dtypes:
+            hints = {col: dtype for col, dtype in dtypes.items() if col in df.columns}
+            if hints:
+                df = df.astype(hints)
+        logger.debug(f"Query returned {len(df)} rows")
+        return df
 
     except Exception as e:
         logger.error(f"BigQuery query error: {e}")
@@ -396,21 +495,23 @@ def run_query_df(
     sql: str,
     params: Optional[List] = None,
     timeout: int = 120,
+    dtypes: Optional[Dict[str, Any]] = None,
 ):
     """Execute a BigQuery query and return results as a pandas DataFrame.
 
+    Alias of execute_query_df, kept for existing callers.
+
     Args:
         client: BigQuery client instance
         sql: SQL query string (use @param_name placeholders if params is given)
         params: Optional list of google.cloud.bigquery.QueryParameter objects
         timeout: Query timeout in seconds (default: 120)
+        dtypes: Optional {column: dtype} hints applied to the result
 
     Returns:
         pandas.DataFrame of query results (empty DataFrame if no rows).
     """
-    import pandas as pd
-    rows = run_query(client, sql, params=params, timeout=timeout)
-    return pd.DataFrame(rows)
+    return execute_query_df(client, sql, params=params, timeout=timeout, dtypes=dtypes)
 
 
 def run_query_with_retry(
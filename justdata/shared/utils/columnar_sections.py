@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Columnar (Arrow IPC) encoding for cached report table sections.
+
+The JSON path in analysis_cache turns every DataFrame into row dicts, cleans
+NaN values row by row and parses them back with json.loads on read. For
+large data_table/raw_data sections this encoding stores the table as Arrow
+IPC bytes in the section_blob column instead, so it round-trips straight
+back to a DataFrame.
+
+Requires pyarrow and migration 30_add_section_blob_column.sql. Enabled with
+ANALYSIS_CACHE_COLUMNAR_SECTIONS=true; otherwise every section uses JSON.
+"""
+
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+ENCODING_ARROW_IPC = 'arrow_ipc'
+
+COLUMNAR_SECTIONS_ENABLED = (
+    os.getenv('ANALYSIS_CACHE_COLUMNAR_SECTIONS', 'false').lower() == 'true' and PYARROW_AVAILABLE
+)
+
+# Small tables are cheaper to keep as JSON (and stay queryable in BigQuery)
+COLUMNAR_MIN_ROWS = int(os.getenv('ANALYSIS_CACHE_COLUMNAR_MIN_ROWS', '200'))
+
+COLUMNAR_SECTION_TYPES = ('data_table', 'raw_data')
+
+
+def should_encode(section_type: str, section_data: Any) -> bool:
+    """Return True if a section should be stored columnar rather than as JSON."""
+    if not COLUMNAR_SECTIONS_ENABLED or section_type not in COLUMNAR_SECTION_TYPES:
+        return False
+    if isinstance(section_data, pd.DataFrame):
+        return len(section_data) >= COLUMNAR_MIN_ROWS
+    return (isinstance(section_data, list) and len(section_data) >= COLUMNAR_MIN_ROWS
+            and isinstance(section_data[0], dict))
+
+
+def encode_table(section_data: Any) -> Optional[bytes]:
+    """
+    Encode a DataFrame (or list of row dicts) as compressed Arrow IPC bytes.
+
+    Returns None if the data cannot be represented in Arrow (e.g. a column
+    mixing numbers and strings); the caller should fall back to JSON.
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+    try:
+        df = section_data if isinstance(section_data, pd.DataFrame) else pd.DataFrame.from_records(section_data)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression='zstd') if pa.Codec.is_available('zstd') else None
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    except Exception as e:
+        logger.warning(f"Columnar encoding failed, falling back to JSON: {e}")
+        return None
+
+
+def decode_table(blob: bytes) -> pd.DataFrame:
+    """Decode Arrow IPC bytes written by encode_table back into a DataFrame."""
+    with pa.ipc.open_stream(pa.py_buffer(blob)) as reader:
+        return reader.read_all().to_pandas()
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a decoded table to JSON-safe row dicts, matching what the JSON
+    path returns (NaN -> None, timestamps as strings).
+    """
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].astype(str).where(df[column].notna(), None)
+    return df.astype(object).where(df.notna(), None).to_dict('records')
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Bounded background job scheduler for report analyses.
+
+Analyze endpoints used to start a new daemon thread per request, so a burst of
+requests ran every analysis at once and could exhaust instance memory. Jobs
+are now submitted here instead:
+
+- Each app has a concurrency limit (JOB_SCHEDULER_DEFAULT_LIMIT, overridden
+  per app with JOB_SCHEDULER_LIMITS="lendsight=2,dataexplorer=3"); only that
+  many worker threads run per app and the rest wait in a priority queue.
+- Identical in-flight requests (same dedup key, normally the analysis cache
+  key) attach to the job that is already queued or running instead of
+  starting another one.
+- Queued jobs report their position through the progress tracker.
+- Jobs can be cancelled. Each requester (normally the browser session, see
+  job_requester_id()) withdraws only its own interest; a shared job stops
+  once no requester is left. Queued jobs are dropped; running jobs stop at
+  their next intermediate progress update, where update_progress() raises
+  JobCancelled. Code that catches Exception around progress updates must
+  re-raise JobCancelled.
+"""
+
+import os
+import heapq
+import itertools
+import threading
+import time
+import traceback
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10
+
+DEFAULT_APP_LIMIT = int(os.getenv('JOB_SCHEDULER_DEFAULT_LIMIT', '2'))
+# Queued (not yet running) jobs allowed per app before submit() refuses more
+MAX_QUEUED_PER_APP = int(os.getenv('JOB_SCHEDULER_MAX_QUEUED', '50'))
+
+CANCELLED_MESSAGE = 'Analysis cancelled'
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once it has been cancelled."""
+
+
+class QueueFull(Exception):
+    """Raised by submit() when an app's queue is at MAX_QUEUED_PER_APP."""
+
+
+def _parse_app_limits(value: str) -> Dict[str, int]:
+    limits = {}
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        app_name, limit = item.split('=', 1)
+        try:
+            limits[app_name.strip().lower()] = max(1, int(limit))
+        except ValueError:
+            print(f"[WARNING] Ignoring invalid JOB_SCHEDULER_LIMITS entry: {item!r}")
+    return limits
+
+
+@dataclass
+class SubmittedJob:
+    """Result of JobScheduler.submit()."""
+    job_id: str
+    deduplicated: bool = False
+    queue_position: int = 0  # 0 = started immediately
+
+
+@dataclass
+class _Job:
+    job_id: str
+    app_name: str
+    func: Callable[[], Any]
+    priority: int
+    seq: int
+    dedup_key: Optional[str]
+    progress_update: Callable[[str, Dict[str, Any]], None]
+    state: str = 'queued'  # queued, running, finished, cancelled
+    requesters: Set[str] = field(default_factory=set)
+    waited: bool = False  # A queue position was published, so announce the start
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    submitted_at: float = field(default_factory=time.time)
+
+
+def job_requester_id() -> Optional[str]:
+    """
+    Requester identity for submit()/cancel(): a random id kept in the Flask
+    session, so repeated cancels from one browser count once. None outside a
+    request.
+    """
+    try:
+        from flask import has_request_context, session
+        if not has_request_context():
+            return None
+        requester = session.get('job_requester_id')
+        if not requester:
+            requester = session['job_requester_id'] = uuid.uuid4().hex
+        return requester
+    except Exception as e:
+        print(f"[WARNING] Could not determine job requester: {e}")
+        return None
+
+
+def _default_progress_update(job_id: str, data: Dict[str, Any]):
+    from justdata.shared.utils.progress_tracker import update_progress
+    update_progress(job_id, data)
+
+
+class JobScheduler:
+    """Per-app bounded worker threads fed from a priority queue."""
+
+    def __init__(self, default_limit: int = DEFAULT_APP_LIMIT, app_limits: Optional[Dict[str, int]] = None,
+                 max_queued: int = MAX_QUEUED_PER_APP):
+        self.default_limit = max(1, default_limit)
+        self.app_limits = {k.lower(): v for k, v in (app_limits or {}).items()}
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._queues: Dict[str, List] = {}
+        self._running: Dict[str, int] = {}
+        self._jobs: Dict[str, _Job] = {}
+        self._inflight: Dict[str, str] = {}  # dedup key -> job_id
+
+    def limit_for(self, app_name: str) -> int:
+        return self.app_limits.get(app_name.lower(), self.default_limit)
+
+    def submit(self, app_name: str, func: Callable[[], Any], job_id: str, dedup_key: Optional[str] = None,
+               priority: int = PRIORITY_NORMAL,
+               progress_update: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+               requester: Optional[str] = None) -> SubmittedJob:
+        """
+        Queue a job, or attach to an identical one already in flight.
+
+        Args:
+            app_name: App the job belongs to (selects the concurrency limit)
+            func: Zero-argument callable that runs the analysis
+            job_id: Job identifier used for progress tracking
+            dedup_key: Key identifying identical requests (e.g. generate_cache_key output)
+            priority: Lower runs first (PRIORITY_HIGH / PRIORITY_NORMAL / PRIORITY_LOW)
+            progress_update: update_progress(job_id, data) for queue feedback;
+                defaults to the shared progress tracker
+            requester: Who is asking (e.g. job_requester_id()); defaults to job_id,
+                which is unique per request
+
+        Returns:
+            SubmittedJob - job_id is the existing job's id when deduplicated
+
+        Raises:
+            QueueFull: If the app already has max_queued jobs waiting
+        """
+        to_start = []
+        requester = requester or job_id
+        with self._lock:
+            existing_id = self._inflight.get(dedup_key) if dedup_key else None
+            existing = self._jobs.get(existing_id) if existing_id else None
+            if existing is not None and existing.state in ('queued', 'running'):
+                existing.requesters.add(requester)
+                print(f"[INFO] {app_name} job {job_id} attached to in-flight job {existing.job_id}")
+                return SubmittedJob(existing.job_id, deduplicated=True,
+                                    queue_position=self._position_locked(existing))
+
+            queue = self._queues.setdefault(app_name, [])
+            if len([j for j in queue if j[2].state == 'queued']) >= self.max_queued:
+                raise QueueFull(f"Too many {app_name} analyses are queued; please try again shortly.")
+
+            job = _Job(job_id=job_id, app_name=app_name, func=func, priority=priority, seq=next(self._seq),
+                       dedup_key=dedup_key, progress_update=progress_update or _default_progress_update,
+                       requesters={requester})
+            self._jobs[job_id] = job
+            if dedup_key:
+                self._inflight[dedup_key] = job_id
+            heapq.heappush(queue, (job.priority, job.seq, job))
+            to_start = self._dispatch_locked(app_name)
+            position = self._position_locked(job)
+            queued = self._queued_positions_locked(app_name)
+
+        self._start(to_start)
+        self._publish_positions(queued)
+        return SubmittedJob(job_id, queue_position=position)
+
+    def cancel(self, job_id: str, requester: Optional[str] = None) -> bool:
+        """
+        Cancel a job on behalf of one requester.
+
+        A job shared by several deduplicated requesters keeps running until
+        every requester has cancelled it; cancelling twice as the same
+        requester counts once.
+
+        Args:
+            job_id: Job to cancel
+            requester: The requester withdrawing (same value passed to submit();
+                defaults to job_id)
+
+        Returns:
+            True if the job is (now) cancelled, False if it is unknown,
+            finished, not requested by this requester, or still wanted by another
+        """
+        requester = requester or job_id
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state in ('finished', 'cancelled'):
+                return False
+            if requester not in job.requesters:
+                return False
+            job.requesters.discard(requester)
+            if job.requesters:
+                return False
+            job.cancel_event.set()
+            was_queued = job.state == 'queued'
+            if was_queued:
+                job.state = 'cancelled'
+                self._forget_locked(job)
+            queued = self._queued_positions_locked(job.app_name)
+
+        if was_queued:
+            self._notify(job, {'percent': 0, 'step': CANCELLED_MESSAGE, 'done': True, 'error': CANCELLED_MESSAGE})
+            self._publish_positions(queued)
+        print(f"[INFO] Cancelled {job.app_name} job {job_id} ({'queued' if was_queued else 'running'})")
+        return True
+
+    def is_cancelled(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        return job is not None and job.cancel_event.is_set()
+
+    def raise_if_cancelled(self, job_id: str):
+        """Raise JobCancelled if the job has been cancelled (called from update_progress)."""
+        if self.is_cancelled(job_id):
+            raise JobCancelled(CANCELLED_MESSAGE)
+
+    def queue_position(self, job_id: str) -> int:
+        """1-based position among an app's queued jobs; 0 if running or unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._position_locked(job) if job else 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            apps = set(self._queues) | set(self._running)
+            return {
+                app: {
+                    'running': self._running.get(app, 0),
+                    'queued': sum(1 for _, _, j in self._queues.get(app, []) if j.state == 'queued'),
+                    'limit': self.limit_for(app),
+                }
+                for app in apps
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _dispatch_locked(self, app_name: str) -> List[_Job]:
+        """Move queued jobs to running while the app has free slots."""
+        started = []
+        queue = self._queues.get(app_name, [])
+        while queue and self._running.get(app_name, 0) < self.limit_for(app_name):
+            _, _, job = heapq.heappop(queue)
+            if job.state != 'queued':
+                continue  # Cancelled while queued
+            job.state = 'running'
+            self._running[app_name] = self._running.get(app_name, 0) + 1
+            started.append(job)
+        return started
+
+    def _queued_locked(self, app_name: str) -> List[_Job]:
+        return [j for _, _, j in sorted(self._queues.get(app_name, [])) if j.state == 'queued']
+
+    def _queued_positions_locked(self, app_name: str) -> List[tuple]:
+        return [(job, position) for position, job in enumerate(self._queued_locked(app_name), start=1)]
+
+    def _position_locked(self, job: _Job) -> int:
+        if job.state != 'queued':
+            return 0
+        return self._queued_locked(job.app_name).index(job) + 1
+
+    def _forget_locked(self, job: _Job):
+        self._jobs.pop(job.job_id, None)
+        if job.dedup_key and self._inflight.get(job.dedup_key) == job.job_id:
+            del self._inflight[job.dedup_key]
+
+    def _start(self, jobs: List[_Job]):
+        for job in jobs:
+            threading.Thread(target=self._run, args=(job,), name=f"{job.app_name}-job-{job.job_id[:8]}",
+                             daemon=True).start()
+
+    def _run(self, job: _Job):
+        try:
+            if job.cancel_event.is_set():
+                raise JobCancelled(CANCELLED_MESSAGE)
+            if job.waited:
+                self._notify(job, {'percent': 0, 'step': 'Starting analysis...', 'done': False, 'error': None})
+            job.func()
+        except JobCancelled:
+            self._notify(job, {'percent': 0, 'step': CANCELLED_MESSAGE, 'done': True, 'error': CANCELLED_MESSAGE})
+        except Exception as e:
+            print(f"[WARNING] Unhandled error in {job.app_name} job {job.job_id}: {e}")
+            traceback.print_exc()
+            self._notify(job, {'percent': 0, 'step': 'Error', 'done': True, 'error': str(e)})
+        finally:
+            with self._lock:
+                job.state = 'cancelled' if job.cancel_event.is_set() else 'finished'
+                self._running[job.app_name] -= 1
+                self._forget_locked(job)
+                to_start = self._dispatch_locked(job.app_name)
+                queued = self._queued_positions_locked(job.app_name)
+            self._start(to_start)
+            self._publish_positions(queued)
+
+    def _publish_positions(self, queued: List[tuple]):
+        for job, position in queued:
+            if job.state != 'queued':
+                continue  # Started or cancelled since the snapshot
+            job.waited = True
+            self._notify(job, {
+                'percent': 0,
+                'step': f'Waiting in queue (position {position})...',
+                'done': False,
+                'error': None,
+                'queue_position': position,
+            })
+
+    @staticmethod
+    def _notify(job: _Job, data: Dict[str, Any]):
+        try:
+            job.progress_update(job.job_id, data)
+        except Exception as e:
+            print(f"[WARNING] Could not update progress for job {job.job_id}: {e}")
+
+
+_scheduler: Optional[JobScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_job_scheduler() -> JobScheduler:
+    """Return the process-wide job scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = JobScheduler(app_limits=_parse_app_limits(os.getenv('JOB_SCHEDULER_LIMITS', '')))
+    return _scheduler
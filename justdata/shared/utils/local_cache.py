@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Per-process TTL/LRU cache with an optional on-disk tier.
+Shared across JustData apps for caching expensive lookups (BigQuery cache
+reads, external API responses) inside a single worker process.
+
+The memory tier is bounded by both entry count and approximate size in
+bytes; least-recently-used entries are evicted first. When a disk directory
+is configured, entries are also pickled there so they survive worker
+restarts, and a disk hit is promoted back into memory.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LocalTTLCache:
+    """Thread-safe LRU cache with per-entry TTL, size limits and optional disk tier."""
+
+    def __init__(self, name: str, max_entries: int = 256, max_bytes: int = 256 * 1024 * 1024,
+                 ttl_seconds: float = 900, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Args:
+            name: Cache name (used in logs and as the disk subdirectory)
+            max_entries: Maximum number of entries held in memory
+            max_bytes: Approximate maximum memory footprint of cached values
+            ttl_seconds: Time-to-live for entries in both tiers
+            disk_dir: Optional directory for the on-disk tier (disabled if None)
+            disk_max_bytes: Maximum total size of the on-disk tier
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()  # key -> (expires_at, size, value)
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        self._disk_dir = None
+        if disk_dir:
+            try:
+                path = Path(disk_dir) / name
+                path.mkdir(parents=True, exist_ok=True)
+                self._disk_dir = path
+            except OSError as e:
+                logger.warning(f"[{name}] Disk cache disabled, could not create {disk_dir}: {e}")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                self._remove(key)
+
+        value = self._disk_get(key, now)
+        with self._lock:
+            if value is None:
+                self._stats['misses'] += 1
+                return None
+            self._stats['disk_hits'] += 1
+        self._memory_set(key, value, None)
+        return value
+
+    def set(self, key: str, value: Any, size_bytes: Optional[int] = None) -> None:
+        """
+        Cache value under key in memory (and on disk if enabled).
+
+        Args:
+            key: Cache key
+            value: Any picklable value; callers must treat returned values as read-only
+            size_bytes: Approximate size of value. Estimated by pickling if omitted.
+        """
+        payload = None
+        if size_bytes is None or self._disk_dir is not None:
+            try:
+                # Disk records carry the key so digest collisions can be detected on read
+                payload = pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logger.warning(f"[{self.name}] Value for {key[:24]} is not picklable, not cached: {e}")
+                return
+            if size_bytes is None:
+                size_bytes = len(payload)
+        self._memory_set(key, value, size_bytes)
+        if self._disk_dir is not None and payload is not None:
+            self._disk_set(key, payload)
+
+    def invalidate(self, key: str) -> None:
+        """Drop key from every tier."""
+        with self._lock:
+            self._remove(key)
+        path = self._disk_path(key)
+        if path is not None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"[{self.name}] Could not remove disk entry {path}: {e}")
+
+    def clear(self) -> None:
+        """Drop every entry from memory (the disk tier is left to expire)."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            return {
+                **self._stats,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'disk_enabled': self._disk_dir is not None,
+            }
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _memory_set(self, key: str, value: Any, size_bytes: Optional[int]) -> None:
+        if size_bytes is None:
+            try:
+                size_bytes = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                return
+        if size_bytes > self.max_bytes:
+            logger.info(f"[{self.name}] Entry {key[:24]} ({size_bytes:,} bytes) exceeds memory limit, not cached in memory")
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time() + self.ttl_seconds, size_bytes, value)
+            self._total_bytes += size_bytes
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats['evictions'] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self._disk_dir is None:
+            return None
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return self._disk_dir / f"{digest}.pkl"
+
+    def _disk_get(self, key: str, now: float) -> Optional[Any]:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            if path.stat().st_mtime + self.ttl_seconds <= now:
+                path.unlink()
+                return None
+            with open(path, 'rb') as f:
+                stored_key, value = pickle.load(f)
+            # Guard against (vanishingly unlikely) digest collisions
+            return value if stored_key == key else None
+        except Exception as e:
+            logger.warning(f"[{self.name}] Could not read disk entry {path}: {e}")
+            return None
+
+    def _disk_set(self, key: str, payload: bytes) -> None:
+        path = self._disk_path(key)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=str(self._disk_dir), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)  # Atomic so readers never see partial files
+            self._prune_disk()
+        except Exception as e:
+            logger.warning(f"[{self.name}] Could not write disk entry for {key[:24]}: {e}")
+
+    def _prune_disk(self) -> None:
+        """Delete the oldest disk entries until the tier fits in disk_max_bytes."""
+        files = []
+        total = 0
+        for path in self._disk_dir.glob('*.pkl'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.disk_max_bytes:
+            return
+        for _, size, path in sorted(files):
+            try:
+                path.unlink()
+                total -= size
+            except FileNotFoundError:
+                pass
+            if total <= self.disk_max_bytes:
+                break
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Character n-gram (trigram by default) inverted index for fuzzy name lookup.
+
+Scoring a query against every known name with difflib.SequenceMatcher is
+O(names) slow ratio computations per lookup. The index instead generates a
+short list of candidates that share the most n-grams with the query (Dice
+coefficient over n-gram sets), so only those few need the expensive score.
+
+Usage:
+    index = NgramIndex(['WELLS FARGO', 'WELLS FARGO ADVISORS', 'FIFTH THIRD'])
+    index.candidates('WELLS FARGO & CO', limit=5)
+"""
+
+import heapq
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class NgramIndex:
+    """Inverted index from character n-grams to the keys containing them."""
+
+    def __init__(self, keys: Iterable[str], n: int = 3):
+        """
+        Args:
+            keys: Strings to index (duplicates are indexed once, first position kept)
+            n: Gram length
+        """
+        self.n = n
+        self.keys: List[str] = list(dict.fromkeys(keys))
+        self._position: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._sizes: List[int] = []
+        for position, key in enumerate(self.keys):
+            grams = self.grams(key)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(position)
+
+    def grams(self, text: str) -> Set[str]:
+        """N-grams of text, padded so short strings and word edges still produce grams."""
+        padded = f"{' ' * (self.n - 1)}{text} "
+        return {padded[i:i + self.n] for i in range(len(padded) - self.n + 1)}
+
+    def scored_candidates(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Keys sharing the most n-grams with query.
+
+        Args:
+            query: Text to look up (normalized the same way as the keys)
+            limit: Maximum number of candidates
+
+        Returns:
+            (key, dice) pairs, best first; ties keep index order
+        """
+        grams = self.grams(query)
+        shared = Counter()
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                shared[position] += 1
+        total = len(grams)
+        ranked = heapq.nsmallest(
+            limit,
+            ((-2.0 * count / (total + self._sizes[position]), position) for position, count in shared.items()),
+        )
+        return [(self.keys[position], -negative_dice) for negative_dice, position in ranked]
+
+    def candidates(self, query: str, limit: int = 10) -> List[str]:
+        """Candidate keys for query in index (insertion) order."""
+        return sorted((key for key, _ in self.scored_candidates(query, limit)), key=self._position.__getitem__)
+
+    def __len__(self) -> int:
+        return len(self.keys)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Publish/subscribe bus for job progress updates.
+
+SSE progress handlers used to poll get_progress() every 0.5 seconds per open
+connection. With the bus, progress_tracker.update_progress() publishes each
+update and the handlers block in wait() until the next one arrives (or a
+keepalive timeout passes), so idle streams cost no CPU or file I/O.
+
+Each job has a version counter and its own threading.Condition, which covers
+every thread in the process. Updates published by other processes/instances
+can be delivered through a pluggable backend; set PROGRESS_BUS_BACKEND=redis
+(with REDIS_URL) to use Redis pub/sub, or install a custom ProgressBusBackend
+with set_backend().
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Channels without waiters are dropped after this long without an update
+CHANNEL_MAX_AGE = 3600
+MAX_CHANNELS = 500
+
+
+class ProgressBusBackend:
+    """
+    Cross-instance transport for progress updates.
+
+    The bus calls publish() for every local update and start() once with a
+    deliver(job_id, data) callback to invoke for updates from other instances.
+    The base class is a no-op, which keeps delivery in-process only.
+    """
+
+    def publish(self, job_id: str, data: Dict[str, Any]):
+        pass
+
+    def start(self, deliver: Callable[[str, Dict[str, Any]], None]):
+        pass
+
+    def close(self):
+        pass
+
+
+class RedisProgressBackend(ProgressBusBackend):
+    """Fan progress updates out to other instances over Redis pub/sub."""
+
+    def __init__(self, url: str, channel: str = 'justdata:progress'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self.instance_id = uuid.uuid4().hex
+        self._pubsub = None
+        self._thread = None
+
+    def publish(self, job_id: str, data: Dict[str, Any]):
+        message = json.dumps({'instance': self.instance_id, 'job_id': job_id, 'data': data}, default=str)
+        self.client.publish(self.channel, message)
+
+    def start(self, deliver: Callable[[str, Dict[str, Any]], None]):
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(self.channel)
+
+        def listen():
+            for message in self._pubsub.listen():
+                try:
+                    payload = json.loads(message['data'])
+                    if payload.get('instance') != self.instance_id:
+                        deliver(payload['job_id'], payload['data'])
+                except Exception as e:
+                    logger.warning(f"Ignoring malformed progress message: {e}")
+
+        self._thread = threading.Thread(target=listen, name='progress-bus-redis', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+
+class _Channel:
+    __slots__ = ('condition', 'version', 'data', 'updated_at', 'waiters')
+
+    def __init__(self, lock: threading.Lock):
+        # Per-job condition sharing the bus lock, so a publish only wakes that job's streams
+        self.condition = threading.Condition(lock)
+        self.version = 0
+        self.data = None
+        self.updated_at = time.time()
+        self.waiters = 0
+
+
+class ProgressBus:
+    """In-process progress bus with an optional cross-instance backend."""
+
+    def __init__(self, backend: Optional[ProgressBusBackend] = None):
+        self._lock = threading.Lock()
+        self._channels: Dict[str, _Channel] = {}
+        self._remote_handler: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        self.backend = None
+        self.set_backend(backend)
+
+    def set_backend(self, backend: Optional[ProgressBusBackend]):
+        """Install (or remove, with None) the cross-instance backend."""
+        if self.backend is not None:
+            try:
+                self.backend.close()
+            except Exception as e:
+                logger.warning(f"Error closing progress bus backend: {e}")
+        self.backend = backend
+        if backend is not None:
+            backend.start(self._deliver_remote)
+
+    def set_remote_handler(self, handler: Optional[Callable[[str, Dict[str, Any]], None]]):
+        """Register a callback run for updates received from other instances."""
+        self._remote_handler = handler
+
+    def publish(self, job_id: str, data: Dict[str, Any], propagate: bool = True):
+        """
+        Publish a progress update and wake every waiter for the job.
+
+        Args:
+            job_id: Job identifier
+            data: Progress payload ({'step', 'percent', 'done', 'error'})
+            propagate: Also send the update through the backend
+        """
+        with self._lock:
+            channel = self._channels.get(job_id)
+            if channel is None:
+                if len(self._channels) >= MAX_CHANNELS:
+                    self._prune_locked()
+                channel = self._channels[job_id] = _Channel(self._lock)
+            channel.version += 1
+            channel.data = data
+            channel.updated_at = time.time()
+            channel.condition.notify_all()
+
+        if propagate and self.backend is not None:
+            try:
+                self.backend.publish(job_id, data)
+            except Exception as e:
+                logger.warning(f"Progress bus backend publish failed for {job_id}: {e}")
+
+    def version(self, job_id: str) -> int:
+        """Current version of a job's progress (0 if nothing was published)."""
+        with self._lock:
+            channel = self._channels.get(job_id)
+            return channel.version if channel else 0
+
+    def wait(self, job_id: str, last_version: int, timeout: float) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        Block until the job's progress moves past last_version or timeout expires.
+
+        Args:
+            job_id: Job identifier
+            last_version: Version the caller has already seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            (version, data) - version equals last_version on timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            channel = self._channels.get(job_id)
+            if channel is None:
+                channel = self._channels[job_id] = _Channel(self._lock)
+            channel.waiters += 1
+            try:
+                while channel.version <= last_version:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    channel.condition.wait(remaining)
+                return channel.version, channel.data
+            finally:
+                channel.waiters -= 1
+
+    def discard(self, job_id: str):
+        """Forget a job's channel unless a stream is still waiting on it."""
+        with self._lock:
+            channel = self._channels.get(job_id)
+            if channel is not None and channel.waiters == 0:
+                del self._channels[job_id]
+
+    def _prune_locked(self):
+        cutoff = time.time() - CHANNEL_MAX_AGE
+        for job_id, channel in list(self._channels.items()):
+            if channel.waiters == 0 and channel.updated_at < cutoff:
+                del self._channels[job_id]
+
+    def _deliver_remote(self, job_id: str, data: Dict[str, Any]):
+        if self._remote_handler is not None:
+            try:
+                self._remote_handler(job_id, data)
+            except Exception as e:
+                logger.warning(f"Error applying remote progress for {job_id}: {e}")
+        self.publish(job_id, data, propagate=False)
+
+
+def _backend_from_env() -> Optional[ProgressBusBackend]:
+    backend_name = os.getenv('PROGRESS_BUS_BACKEND', '').lower()
+    if backend_name != 'redis':
+        return None
+    url = os.getenv('REDIS_URL')
+    if not url:
+        logger.warning("PROGRESS_BUS_BACKEND=redis but REDIS_URL is not set; using in-process bus only")
+        return None
+    try:
+        return RedisProgressBackend(url)
+    except Exception as e:
+        logger.warning(f"Redis progress backend unavailable, using in-process bus only: {e}")
+        return None
+
+
+_bus: Optional[ProgressBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Return the process-wide progress bus, creating it on first use."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = ProgressBus(_backend_from_env())
+    return _bus
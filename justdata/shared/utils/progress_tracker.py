@@ -10,6 +10,9 @@ import json
 import os
 from pathlib import Path
 
+from justdata.shared.utils.job_scheduler import get_job_scheduler
+from justdata.shared.utils.progress_bus import get_progress_bus
+
 
 class ProgressTracker:
     """Tracks and reports progress during analysis."""
@@ -130,6 +133,8 @@ PROGRESS_STORAGE_DIR = _get_progress_storage_dir()
 MAX_JOB_AGE = 3600
 # Maximum number of jobs to keep in memory
 MAX_JOBS = 100
+# Longest an SSE stream blocks waiting for an update before sending a keepalive
+PROGRESS_KEEPALIVE_SECONDS = float(os.getenv('PROGRESS_KEEPALIVE_SECONDS', '10'))
 
 def _get_progress_file_path(job_id: str) -> Optional[Path]:
     """Get file path for storing progress data."""
@@ -264,6 +269,7 @@ def _cleanup_old_jobs():
     for job_id in jobs_to_remove:
         progress_store.pop(job_id, None)
         analysis_results_store.pop(job_id, None)
+        get_progress_bus().discard(job_id)
     
     # If we still have too many jobs, remove oldest ones
     if len(progress_store) > MAX_JOBS:
@@ -281,6 +287,7 @@ def _cleanup_old_jobs():
         for job_id, _ in jobs_with_times[:excess]:
             progress_store.pop(job_id, None)
             analysis_results_store.pop(job_id, None)
+            get_progress_bus().discard(job_id)
 
 def get_progress(job_id: str) -> Dict[str, Any]:
     """Get current progress for a job."""
@@ -316,7 +323,16 @@ def get_progress(job_id: str) -> Dict[str, Any]:
         return job_data
 
 def update_progress(job_id: str, progress_data: Dict[str, Any]):
-    """Update progress for a job."""
+    """
+    Update progress for a job.
+    
+    Intermediate updates double as cancellation checkpoints: if the job was
+    cancelled through the job scheduler this raises JobCancelled, which
+    unwinds the analysis. Final (done) updates are always recorded.
+    """
+    if not progress_data.get('done'):
+        get_job_scheduler().raise_if_cancelled(job_id)
+    
     # Store with timestamp for cleanup
     job_data = {
         'data': progress_data,
@@ -324,6 +340,9 @@ def update_progress(job_id: str, progress_data: Dict[str, Any]):
     }
     progress_store[job_id] = job_data
     
+    # Wake any SSE streams waiting on this job before the slower file write
+    get_progress_bus().publish(job_id, progress_data)
+    
     # Also save to file for persistence across gunicorn restarts
     _save_progress_to_file(job_id, progress_data)
     
@@ -331,6 +350,40 @@ def update_progress(job_id: str, progress_data: Dict[str, Any]):
     if len(progress_store) > MAX_JOBS:
         _cleanup_old_jobs()
 
+def _store_remote_progress(job_id: str, progress_data: Dict[str, Any]):
+    """Apply a progress update published by another instance (no file write or re-publish)."""
+    progress_store[job_id] = {
+        'data': progress_data,
+        'timestamp': time.time()
+    }
+
+get_progress_bus().set_remote_handler(_store_remote_progress)
+
+def get_progress_version(job_id: str) -> int:
+    """Return the job's current progress version, to pass to wait_for_progress()."""
+    return get_progress_bus().version(job_id)
+
+def wait_for_progress(job_id: str, last_version: int, timeout: Optional[float] = None) -> int:
+    """
+    Block until the job publishes progress newer than last_version.
+    
+    Replaces fixed-interval polling in SSE handlers: the call returns as soon as
+    update_progress() runs for the job, or after timeout seconds (default
+    PROGRESS_KEEPALIVE_SECONDS) so the caller can send a keepalive.
+    
+    Args:
+        job_id: Job identifier
+        last_version: Version already seen (from get_progress_version or a previous call)
+        timeout: Maximum seconds to wait
+        
+    Returns:
+        The new version; equal to last_version if the wait timed out
+    """
+    if timeout is None:
+        timeout = PROGRESS_KEEPALIVE_SECONDS
+    version, _ = get_progress_bus().wait(job_id, last_version, timeout)
+    return version
+
 def create_progress_tracker(job_id: str, steps_config: Dict[str, Dict] = None) -> ProgressTracker:
     """Create a progress tracker for a job."""
     def progress_callback(job_id: str, data: Dict[str, Any]):
@@ -416,6 +469,7 @@ def cleanup_job(job_id: str):
     """Explicitly remove a job from stores."""
     progress_store.pop(job_id, None)
     analysis_results_store.pop(job_id, None)
+    get_progress_bus().discard(job_id)
     
     # Also remove from file storage
     try:
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Resumable, parallel HTTP downloads for large files.
+
+A file is split into fixed-size byte ranges that are fetched concurrently
+with HTTP Range requests and written in place into '<dest>.part'. Finished
+ranges are recorded in '<dest>.part.json', so an interrupted download
+resumes where it stopped (as long as the server still reports the same
+size and validator). Servers that do not support ranges get one streamed
+GET instead.
+
+A completed file gets a '<dest>.meta.json' sidecar with its URL, size,
+ETag / Last-Modified and SHA-256. The next download of the same URL is
+skipped when the server's HEAD response still matches it (and, if given,
+the expected checksum does too).
+
+Usage:
+    from justdata.shared.utils.range_download import RangeDownloader
+
+    downloader = RangeDownloader(parts=4)
+    result = downloader.download(url, Path('/data/fec/indiv24.zip'))
+    result['status']  # 'downloaded', 'resumed' or 'skipped'
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARTS = 4
+DEFAULT_PART_BYTES = 32 * 1024 * 1024
+STREAM_BLOCK_BYTES = 1024 * 1024
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(STREAM_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text()) if path.exists() else {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable {path.name}: {e}")
+        return {}
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+class RangeDownloader:
+    """Downloads files with parallel range requests, resume and size/checksum skip."""
+
+    def __init__(self, parts: int = DEFAULT_PARTS, part_bytes: int = DEFAULT_PART_BYTES,
+                 timeout: float = 300, max_retries: int = 3, session: Optional[requests.Session] = None):
+        """
+        Args:
+            parts: Ranges fetched at once for one file
+            part_bytes: Size of each range (also the resume granularity)
+            timeout: Per-request timeout in seconds
+            max_retries: Attempts per range before the download fails
+            session: requests.Session to use (default: a pooled session)
+        """
+        self.parts = max(1, parts)
+        self.part_bytes = max(1, part_bytes)
+        self.timeout = timeout
+        self.max_retries = max(1, max_retries)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=self.parts * 4)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+
+    @staticmethod
+    def _paths(dest: Path) -> Tuple[Path, Path, Path]:
+        return (dest.with_name(dest.name + '.part'), dest.with_name(dest.name + '.part.json'),
+                dest.with_name(dest.name + '.meta.json'))
+
+    def _probe(self, url: str) -> Dict[str, Any]:
+        """HEAD the URL for size, range support and validators."""
+        response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+        response.raise_for_status()
+        size = response.headers.get('Content-Length')
+        return {
+            'url': url,
+            'size': int(size) if size and size.isdigit() else None,
+            'ranges': response.headers.get('Accept-Ranges', '').lower() == 'bytes',
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+
+    @staticmethod
+    def _same_remote(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        """Whether two probes/records describe the same remote file."""
+        if a.get('size') != b.get('size') or a.get('url') != b.get('url'):
+            return False
+        if a.get('etag') or b.get('etag'):
+            return a.get('etag') == b.get('etag')
+        return a.get('last_modified') == b.get('last_modified')
+
+    def is_current(self, url: str, dest: Union[str, Path], sha256: Optional[str] = None,
+                   remote: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Whether dest already holds the file at url.
+
+        Compares the local size and recorded validators with a HEAD response;
+        with sha256, the recorded (or freshly computed) checksum must match too.
+        """
+        dest = Path(dest)
+        meta = _read_json(self._paths(dest)[2])
+        if not dest.exists() or not meta:
+            return False
+        remote = remote or self._probe(url)
+        if dest.stat().st_size != meta.get('size') or not self._same_remote(remote, meta):
+            return False
+        if sha256:
+            return (meta.get('sha256') or file_sha256(dest)) == sha256
+        return True
+
+    def download(self, url: str, dest: Union[str, Path], force: bool = False,
+                 sha256: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Download url to dest unless it is already current.
+
+        Args:
+            url: File URL
+            dest: Local path for the finished file
+            force: Download even if dest is current (still resumes a partial download)
+            sha256: Expected checksum; a mismatch raises ValueError
+
+        Returns:
+            {'path', 'status' ('skipped' / 'downloaded' / 'resumed'), 'bytes' fetched, 'size'}
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part_path, progress_path, meta_path = self._paths(dest)
+
+        remote = self._probe(url)
+        if not force and self.is_current(url, dest, sha256, remote):
+            logger.info(f"  {dest.name}: up to date ({remote['size'] or 0:,} bytes) - skipping download")
+            return {'path': dest, 'status': 'skipped', 'bytes': 0, 'size': remote['size']}
+
+        if remote['ranges'] and remote['size']:
+            fetched, resumed = self._download_ranges(remote, part_path, progress_path)
+        else:
+            fetched, resumed = self._download_stream(url, part_path), False
+
+        size = part_path.stat().st_size
+        if remote['size'] is not None and size != remote['size']:
+            raise OSError(f"{dest.name}: expected {remote['size']:,} bytes, got {size:,}")
+        checksum = file_sha256(part_path)
+        if sha256 and checksum != sha256:
+            part_path.unlink()
+            progress_path.unlink(missing_ok=True)
+            raise ValueError(f"{dest.name}: checksum mismatch ({checksum} != {sha256})")
+
+        os.replace(part_path, dest)
+        progress_path.unlink(missing_ok=True)
+        _write_json(meta_path, dict(remote, size=size, sha256=checksum))
+        status = 'resumed' if resumed else 'downloaded'
+        logger.info(f"  {dest.name}: {status} {fetched / 1024 / 1024:.1f}MB")
+        return {'path': dest, 'status': status, 'bytes': fetched, 'size': size}
+
+    def _ranges(self, size: int) -> List[Tuple[int, int]]:
+        return [(start, min(start + self.part_bytes, size) - 1) for start in range(0, size, self.part_bytes)]
+
+    def _download_ranges(self, remote: Dict[str, Any], part_path: Path, progress_path: Path) -> Tuple[int, bool]:
+        """Fetch the missing ranges into part_path. Returns (bytes fetched, resumed)."""
+        ranges = self._ranges(remote['size'])
+        progress = _read_json(progress_path)
+        done = set()
+        if (part_path.exists() and progress.get('part_bytes') == self.part_bytes
+                and self._same_remote(remote, progress) and part_path.stat().st_size == remote['size']):
+            done = set(progress.get('done', []))
+        else:
+            with open(part_path, 'wb') as f:
+                f.truncate(remote['size'])
+        resumed = bool(done)
+        if resumed:
+            logger.info(f"  {part_path.name}: resuming, {len(done)}/{len(ranges)} ranges already fetched")
+
+        lock = threading.Lock()
+        fetched = [0]
+
+        def fetch(index: int):
+            start, end = ranges[index]
+            for attempt in range(1, self.max_retries + 1):
+                try:
+                    written = self._fetch_range(remote['url'], part_path, start, end)
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        raise
+                    logger.warning(f"  {part_path.name}: range {start}-{end} failed ({e}), retrying")
+            with lock:
+                done.add(index)
+                fetched[0] += written
+                _write_json(progress_path, dict(remote, part_bytes=self.part_bytes, done=sorted(done)))
+
+        todo = [i for i in range(len(ranges)) if i not in done]
+        with ThreadPoolExecutor(max_workers=min(self.parts, max(len(todo), 1)),
+                                thread_name_prefix='range-download') as pool:
+            list(pool.map(fetch, todo))
+        return fetched[0], resumed
+
+    def _fetch_range(self, url: str, part_path: Path, start: int, end: int) -> int:
+        """Write bytes start..end (inclusive) of url at the same offset in part_path."""
+        headers = {'Range': f"bytes={start}-{end}"}
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise OSError(f"server ignored range request (HTTP {response.status_code})")
+            written = 0
+            with open(part_path, 'r+b') as f:
+                f.seek(start)
+                for block in response.iter_content(chunk_size=STREAM_BLOCK_BYTES):
+                    f.write(block)
+                    written += len(block)
+        if written != end - start + 1:
+            raise OSError(f"short range: {written:,} of {end - start + 1:,} bytes")
+        return written
+
+    def _download_stream(self, url: str, part_path: Path) -> int:
+        """Single streamed GET, for servers without range support."""
+        written = 0
+        with self.session.get(url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            with open(part_path, 'wb') as f:
+                for block in response.iter_content(chunk_size=STREAM_BLOCK_BYTES):
+                    f.write(block)
+                    written += len(block)
+        return written
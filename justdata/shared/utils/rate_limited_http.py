@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Rate-limited HTTP client with a shared conditional-request response cache.
+
+Each external source gets one RateLimitedClient: a token bucket paces its
+requests (rate per second with a burst allowance), a semaphore bounds how
+many are in flight, and 429 responses are retried after Retry-After (or an
+exponential backoff). Callers can then fan requests out over threads with
+map() without tripping the vendor's limits, instead of sleeping between
+sequential calls.
+
+Successful responses that carry an ETag or Last-Modified header are kept in
+a ResponseCache (memory, optionally mirrored to a directory). The next
+request for the same URL and parameters is sent with If-None-Match /
+If-Modified-Since, and a 304 is answered from the cache. API keys are left
+out of the cache key.
+
+Usage:
+    cache = ResponseCache('/tmp/http_cache')
+    client = RateLimitedClient('fmp', rate=5, burst=10, max_concurrency=4, cache=cache)
+    response = client.get(url, params={'symbol': 'WFC', 'apikey': key})
+    results = client.map(fetch_symbol, symbols)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that carry credentials (never part of a cache key)
+SECRET_PARAMS = ('api_key', 'apikey', 'apiKey', 'token', 'key')
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Burst size (default max(1, rate))
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, waiting until they are available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+
+class ResponseCache:
+    """Validator-keyed response bodies, in memory and optionally on disk."""
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None, max_entries: int = 5000):
+        """
+        Args:
+            directory: Mirror entries as JSON files here (None = memory only)
+            max_entries: In-memory entries kept (oldest dropped first)
+        """
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max_entries
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[Dict] = None) -> str:
+        """Cache key for a request, ignoring credential parameters and parameter order."""
+        public = sorted((k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS)
+        raw = json.dumps([method.upper(), url, public])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.directory / f"{key}.json" if self.directory else None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        path = self._path(key)
+        if path and path.exists():
+            try:
+                entry = json.loads(path.read_text())
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable HTTP cache entry {path.name}: {e}")
+                return None
+            self._remember(key, entry)
+            return entry
+        return None
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        self._remember(key, entry)
+        path = self._path(key)
+        if path:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps(entry))
+                os.replace(tmp, path)
+            except Exception as e:
+                logger.warning(f"Could not write HTTP cache entry {path.name}: {e}")
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+
+def _retry_after_seconds(response: requests.Response, default: float) -> float:
+    value = response.headers.get('Retry-After')
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return default
+
+
+class RateLimitedClient:
+    """Per-source HTTP client: token-bucket pacing, bounded concurrency, 429 retries, conditional cache."""
+
+    def __init__(self, name: str, rate: float, burst: Optional[float] = None, max_concurrency: int = 4,
+                 cache: Optional[ResponseCache] = None, timeout: float = 30, max_retries: int = 3,
+                 session: Optional[requests.Session] = None, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            name: Source name (for logs)
+            rate: Requests per second
+            burst: Requests that may go out back to back (default max(1, rate))
+            max_concurrency: Requests in flight at once (also map()'s thread count)
+            cache: Shared response cache for conditional requests (None disables)
+            timeout: Per-request timeout in seconds
+            max_retries: Retries after a 429 response
+            session: requests.Session to send with (default: a new pooled session)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.name = name
+        self.bucket = TokenBucket(rate, burst, sleep=sleep)
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._sleep = sleep
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=self.max_concurrency)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+        self.stats = {'requests': 0, 'not_modified': 0, 'rate_limited': 0, 'waited_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def get(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        """
+        GET url under this source's limits.
+
+        A 304 answer is returned as the cached 200 response, so callers can
+        keep using raise_for_status() / json(). Network errors propagate as
+        requests exceptions; a final 429 is returned for the caller to handle.
+        """
+        cache_key = ResponseCache.key('GET', url, params) if self.cache else None
+        cached = self.cache.get(cache_key) if cache_key else None
+        headers = dict(headers or {})
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        for attempt in range(self.max_retries + 1):
+            self._count('waited_seconds', self.bucket.acquire())
+            with self._slots:
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout or self.timeout)
+            self._count('requests')
+
+            if response.status_code == 429 and attempt < self.max_retries:
+                self._count('rate_limited')
+                delay = _retry_after_seconds(response, default=2 ** attempt)
+                logger.warning(f"{self.name}: rate limited, retrying in {delay:.1f}s")
+                self._sleep(delay)
+                continue
+            break
+
+        if response.status_code == 304 and cached:
+            self._count('not_modified')
+            return self._from_cache(cached, response)
+
+        if cache_key and response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.cache.put(cache_key, {
+                    'url': response.url,
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'content_type': response.headers.get('Content-Type', ''),
+                    'body': response.text,
+                    'stored_at': time.time(),
+                })
+        return response
+
+    @staticmethod
+    def _from_cache(entry: Dict[str, Any], not_modified: requests.Response) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry.get('url') or not_modified.url
+        response.headers = CaseInsensitiveDict({
+            'Content-Type': entry.get('content_type', ''),
+            'ETag': entry.get('etag') or '',
+            'Last-Modified': entry.get('last_modified') or '',
+            'X-Cache': 'revalidated',
+        })
+        response.encoding = 'utf-8'
+        response._content = entry['body'].encode('utf-8')
+        response.request = not_modified.request
+        return response
+
+    def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Call func on every item on up to max_concurrency threads.
+
+        func is expected to make its requests through this client (the token
+        bucket sets the pace). Results keep the order of items; an exception
+        from func is re-raised.
+        """
+        items: Sequence[Any] = list(items)
+        if self.max_concurrency == 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items)),
+                                thread_name_prefix=f"{self.name}-fetch") as pool:
+            return list(pool.map(func, items))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-county HHI loops vs the vectorized HHI engine.
+
+Mirrors MergerMeter's calculate_hhi_by_county on a national-scale synthetic
+deposit table (all US counties, one row per bank per county):
+  Loop:       filter the frame per county, build deposit dicts, calculate_hhi twice
+              (the pre-engine implementation)
+  Vectorized: one merger_hhi() call over every county
+
+Usage:
+    python scripts/benchmarks/bench_hhi.py [--counties 3100] [--banks-per-county 12] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from justdata.apps.mergermeter.hhi_calculator import calculate_hhi
+from justdata.shared.utils.hhi import MergerScenario, merger_hhi
+
+ACQUIRER, TARGET = '1000', '1001'
+
+
+def make_deposits(counties: int, banks_per_county: int) -> pd.DataFrame:
+    """Synthetic SOD-style deposits; both merging banks are present everywhere."""
+    rng = np.random.default_rng(42)
+    frames = []
+    bank_pool = np.array([str(1002 + i) for i in range(4000)])
+    for geoid in range(counties):
+        others = rng.choice(bank_pool, banks_per_county - 2, replace=False)
+        frames.append(pd.DataFrame({
+            'geoid5': f'{geoid:05d}',
+            'rssd': np.concatenate([[ACQUIRER, TARGET], others]),
+            'total_deposits': rng.lognormal(17, 1.5, banks_per_county),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def loop_hhi(df: pd.DataFrame):
+    rows = []
+    for geoid5 in df['geoid5'].unique():
+        county_data = df[df['geoid5'] == geoid5]
+        pre_deposits = county_data.groupby('rssd')['total_deposits'].sum().to_dict()
+        post_deposits = {}
+        for rssd, deposits in pre_deposits.items():
+            owner = 'merged' if rssd in (ACQUIRER, TARGET) else rssd
+            post_deposits[owner] = post_deposits.get(owner, 0.0) + deposits
+        pre, post = calculate_hhi(pre_deposits), calculate_hhi(post_deposits)
+        rows.append((geoid5, pre, post, post - pre, sum(pre_deposits.values()), sum(post_deposits.values())))
+    return rows
+
+
+def vectorized_hhi(df: pd.DataFrame):
+    return merger_hhi(df, 'geoid5', 'rssd', 'total_deposits', MergerScenario.two_bank(ACQUIRER, TARGET))
+
+
+def best_of(repeat: int, func, *args):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--counties', type=int, default=3100)
+    parser.add_argument('--banks-per-county', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_deposits(args.counties, max(3, args.banks_per_county))
+    print(f"Deposits: {len(df):,} bank-county rows across {args.counties:,} counties\n")
+
+    loop_time, loop_rows = best_of(args.repeat, loop_hhi, df)
+    vec_time, vec = best_of(args.repeat, vectorized_hhi, df)
+
+    loop_post = np.array(sorted(row[2] for row in loop_rows))
+    assert np.allclose(loop_post, np.sort(vec['post_hhi'].to_numpy())), "Results differ"
+
+    print(f"{'Method':<28}{'Time':>10}")
+    print(f"{'Per-county loop':<28}{loop_time:>9.3f}s")
+    print(f"{'Vectorized merger_hhi':<28}{vec_time:>9.3f}s")
+    print(f"\nSpeedup: {loop_time / vec_time:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
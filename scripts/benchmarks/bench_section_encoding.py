@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON vs columnar (Arrow IPC) encoding of cached report sections.
+
+Mirrors what analysis_cache does for a LendSight data_table section:
+  JSON:     NaN cleaning + to_dict('records') + json.dumps on write, json.loads on read
+  Columnar: encode_table on write, decode_table (optionally -> records) on read
+
+Usage:
+    python scripts/benchmarks/bench_section_encoding.py [--rows 50000] [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from justdata.shared.utils import columnar_sections
+
+
+def make_table(rows: int) -> pd.DataFrame:
+    """Synthetic lender-by-tract table with the column mix of LendSight raw data."""
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        'lei': rng.choice([f'LEI{i:017d}' for i in range(400)], rows),
+        'lender_name': rng.choice([f'Lender {i}' for i in range(400)], rows),
+        'geoid5': rng.choice([f'{i:05d}' for i in range(1000, 1100)], rows),
+        'tract_code': rng.integers(100000, 999999, rows).astype(str),
+        'year': rng.integers(2018, 2025, rows),
+        'total_loans': rng.integers(0, 500, rows),
+        'total_amount': rng.random(rows) * 1e7,
+        'lmib_loans': rng.integers(0, 200, rows),
+        'hispanic_pct': rng.random(rows) * 100,
+        'black_pct': rng.random(rows) * 100,
+    })
+    df.loc[df.sample(frac=0.05, random_state=1).index, 'hispanic_pct'] = np.nan
+    return df
+
+
+def json_roundtrip(df: pd.DataFrame):
+    cleaned = df.replace({pd.NA: None, pd.NaT: None}).replace({np.nan: None})
+    cleaned = cleaned.where(pd.notnull(cleaned), None)
+    payload = json.dumps(cleaned.to_dict('records'), default=str)
+    return payload, json.loads(payload)
+
+
+def columnar_roundtrip(df: pd.DataFrame, to_records: bool):
+    blob = columnar_sections.encode_table(df)
+    decoded = columnar_sections.decode_table(blob)
+    return blob, columnar_sections.dataframe_to_records(decoded) if to_records else decoded
+
+
+def best_of(repeat: int, func, *args):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if not columnar_sections.PYARROW_AVAILABLE:
+        print("pyarrow is not installed; columnar encoding is unavailable.")
+        return 1
+
+    df = make_table(args.rows)
+    print(f"Table: {args.rows:,} rows x {len(df.columns)} columns\n")
+
+    json_time, (payload, _) = best_of(args.repeat, json_roundtrip, df)
+    df_time, (blob, _) = best_of(args.repeat, columnar_roundtrip, df, False)
+    rec_time, _ = best_of(args.repeat, columnar_roundtrip, df, True)
+
+    print(f"{'Encoding':<28}{'Round trip':>12}{'Stored size':>16}")
+    print(f"{'JSON (records)':<28}{json_time:>11.3f}s{len(payload):>15,}B")
+    print(f"{'Arrow IPC -> DataFrame':<28}{df_time:>11.3f}s{len(blob):>15,}B")
+    print(f"{'Arrow IPC -> records':<28}{rec_time:>11.3f}s{len(blob):>15,}B")
+    print(f"\nSpeedup (DataFrame consumers): {json_time / df_time:.1f}x, "
+          f"size reduction: {len(payload) / len(blob):.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
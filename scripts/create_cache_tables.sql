@@ -76,7 +76,8 @@ CREATE TABLE IF NOT EXISTS `hdma1-242116.justdata.analysis_result_sections` (
   section_metadata JSON,                  -- Section-specific metadata (headers, columns, word_count, etc.)
   display_order INT64,                    -- Order for display (1, 2, 3...)
   created_at TIMESTAMP NOT NULL,          -- When section was created
-  updated_at TIMESTAMP                    -- If section was regenerated/updated
+  updated_at TIMESTAMP,                   -- If section was regenerated/updated
+  section_blob BYTES                      -- Arrow IPC table for columnar-encoded sections (else NULL)
 )
 PARTITION BY DATE(created_at)
 CLUSTER BY app_name, job_id, section_type;
@@ -0,0 +1,18 @@
+-- Migration Script 30: Add columnar section storage to analysis_result_sections
+-- Large data_table/raw_data sections can be stored as Arrow IPC bytes instead of
+-- row-by-row JSON (see justdata/shared/utils/columnar_sections.py).
+--
+-- Destination: justdata-ncrc.cache.analysis_result_sections
+-- Type: Additive schema change (existing rows keep section_blob = NULL and are read as JSON)
+--
+-- Run this BEFORE setting ANALYSIS_CACHE_COLUMNAR_SECTIONS=true on any service;
+-- reads and writes only reference section_blob when that flag is on.
+
+ALTER TABLE `justdata-ncrc.cache.analysis_result_sections`
+ADD COLUMN IF NOT EXISTS section_blob BYTES;
+
+-- Verify
+SELECT column_name, data_type
+FROM `justdata-ncrc.cache.INFORMATION_SCHEMA.COLUMNS`
+WHERE table_name = 'analysis_result_sections'
+ORDER BY ordinal_position;
@@ -0,0 +1,34 @@
+-- Migration Script 31: Precomputed firm trade statistics for ElectWatch
+-- The weekly pipeline aggregates officials' trades per ticker once per run
+-- (pipeline/transformers/electwatch_transform_firm_stats.py) instead of the
+-- app walking every trade on each firms request.
+--
+-- Destination: justdata-ncrc.electwatch.firm_stats
+-- Type: New table (full refresh each weekly run)
+--
+-- Until this table exists and has been populated, the app falls back to
+-- computing the stats from officials and firms on request.
+
+CREATE TABLE IF NOT EXISTS `justdata-ncrc.electwatch.firm_stats` (
+  ticker STRING NOT NULL,
+  name STRING,
+  industry STRING,              -- Lowercase sector code ('banking', ..., 'other')
+
+  total FLOAT64,                -- Sum of trade range midpoints
+  officials INT64,              -- Distinct officials who traded the ticker
+  stock_trades INT64,           -- Number of trades
+  rank INT64,                   -- Position by total (1 = largest); default sort
+  news JSON,                    -- The firm's latest news items (at most 3)
+
+  updated_at TIMESTAMP
+)
+CLUSTER BY industry, ticker
+OPTIONS(
+  description="Per-firm trade statistics computed by the ElectWatch weekly pipeline"
+);
+
+-- Verify
+SELECT column_name, data_type
+FROM `justdata-ncrc.electwatch.INFORMATION_SCHEMA.COLUMNS`
+WHERE table_name = 'firm_stats'
+ORDER BY ordinal_position;
@@ -0,0 +1,116 @@
+"""Tests for the precomputed lender directory and its search index."""
+
+from justdata.apps.dataexplorer import data_utils, lender_directory
+from justdata.apps.dataexplorer.lender_directory import LenderDirectory, build_lender_directory, format_lender
+
+ROWS = [
+    {'lender_name': 'WELLS FARGO BANK', 'respondent_name': 'Wells Fargo Bank, N.A.', 'lender_id': 'L1',
+     'respondent_rssd': '451965', 'respondent_city': 'Sioux Falls', 'respondent_state': 'SD', 'lar_count': 90000},
+    {'lender_name': 'CITIZENS BANK', 'lender_id': 'L2', 'respondent_rssd': '3303298',
+     'respondent_city': 'Providence', 'respondent_state': 'RI', 'lar_count': 50000},
+    {'lender_name': 'CITIBANK', 'lender_id': 'L6', 'respondent_city': 'Sioux Falls', 'respondent_state': 'SD',
+     'lar_count': 40000},
+    {'lender_name': 'CITIZENS BANK', 'lender_id': 'L3', 'respondent_city': 'Olanta', 'respondent_state': 'SC',
+     'lar_count': 300},
+    {'lender_name': 'FIRST CITIZENS BANK', 'lender_id': 'L4', 'respondent_city': 'Raleigh', 'respondent_state': 'NC',
+     'lar_count': 20000},
+    {'lender_name': 'BANK OF AMERICA', 'lender_id': 'L5', 'respondent_city': 'Charlotte', 'respondent_state': 'NC',
+     'lar_count': 80000},
+]
+
+
+def _ids(results):
+    return [lender['lei'] for lender in results]
+
+
+def test_search_ranking_and_typos():
+    directory = LenderDirectory([format_lender(row) for row in ROWS])
+    # Prefix matches first (by LAR count), then word prefixes
+    assert _ids(directory.search('citi')) == ['L2', 'L6', 'L3', 'L4']
+    # Exact matches, then word prefixes, then trigram-similar names
+    assert _ids(directory.search('Citizens Bank')) == ['L2', 'L3', 'L4', 'L6']
+    assert _ids(directory.search('bank', limit=2)) == ['L5', 'L1']
+    # Respondent name is searchable, and misspellings still match
+    assert _ids(directory.search('wells fargo bank n a')) == ['L1']
+    assert _ids(directory.search('wels fargo'))[0] == 'L1'
+    assert directory.search('zzzz') == []
+    assert directory.by_rssd['3303298']['lei'] == 'L2'
+
+
+def test_build_and_load_round_trip(tmp_path):
+    path = tmp_path / 'lender_directory.json'
+    built = build_lender_directory(path, fetch_rows=lambda: ROWS, upload=False)
+    loaded = lender_directory.load_lender_directory(path)
+    assert loaded.lenders == built.lenders
+    assert loaded.age_hours < 1
+    assert lender_directory.load_lender_directory(tmp_path / 'missing.json') is None
+
+
+def test_search_lenders18_uses_directory(monkeypatch):
+    directory = LenderDirectory([format_lender(row) for row in ROWS])
+    monkeypatch.setattr(lender_directory, 'get_lender_directory', lambda: directory)
+    monkeypatch.setattr(lender_directory, 'get_lender_verification',
+                        lambda lei, name, city=None, state=None: {'confidence': 'high', 'verified': True,
+                                                                  'warnings': []})
+
+    results = data_utils.search_lenders18('first citizens')
+    assert _ids(results)[0] == 'L4'
+    assert results[0]['verification_summary'] == {'confidence': 'high', 'verified': True,
+                                                  'has_warnings': False, 'warnings_count': 0}
+    # Results are copies; the directory records are unchanged
+    assert 'verification' not in directory.by_lei['L4']
+    assert data_utils.load_all_lenders18() is directory.lenders
+
+
+class FakeBlob:
+    def __init__(self, generation, content):
+        self.generation = generation
+        self.content = content
+        self.downloads = 0
+
+    def download_to_filename(self, filename):
+        self.downloads += 1
+        with open(filename, 'w') as f:
+            f.write(self.content)
+
+
+def _use_artifact(monkeypatch, path, gcs_path=''):
+    monkeypatch.setattr(lender_directory, 'LENDER_DIRECTORY_PATH', path)
+    monkeypatch.setattr(lender_directory, 'LENDER_DIRECTORY_GCS_PATH', gcs_path)
+    monkeypatch.setattr(lender_directory, '_directory', None)
+    monkeypatch.setattr(lender_directory, '_directory_mtime', None)
+    monkeypatch.setattr(lender_directory, '_directory_checked', 0.0)
+
+
+def test_missing_artifact_fails_fast_without_bigquery(tmp_path, monkeypatch):
+    _use_artifact(monkeypatch, tmp_path / 'lender_directory.json')
+
+    def no_build(*args, **kwargs):
+        raise AssertionError('the directory must not be built on the request path')
+
+    monkeypatch.setattr(lender_directory, 'build_lender_directory', no_build)
+    monkeypatch.setattr(lender_directory, 'fetch_directory_rows', no_build)
+    assert data_utils.search_lenders18('citizens', include_verification=False) == []
+    assert len(lender_directory.get_lender_directory()) == 0
+
+
+def test_new_gcs_generation_is_downloaded(tmp_path, monkeypatch):
+    path = tmp_path / 'lender_directory.json'
+    _use_artifact(monkeypatch, path, gcs_path='dataexplorer/lender_directory.json')
+    source = tmp_path / 'built.json'
+    build_lender_directory(source, fetch_rows=lambda: ROWS[:2], upload=False)
+    blob = FakeBlob(1, source.read_text())
+    bucket = type('Bucket', (), {'get_blob': lambda self, name: blob})()
+    monkeypatch.setattr('justdata.shared.utils.gcs_storage.get_bucket', lambda *a, **k: bucket)
+
+    assert _ids(lender_directory.get_lender_directory().lenders) == ['L1', 'L2']
+    assert not lender_directory.sync_from_gcs()  # Same generation: no download
+    assert blob.downloads == 1
+
+    # A rebuild uploaded as a new generation replaces the worker's copy
+    build_lender_directory(source, fetch_rows=lambda: ROWS, upload=False)
+    blob.generation, blob.content = 2, source.read_text()
+    with lender_directory._directory_lock:
+        lender_directory._refresh_directory_locked()
+    assert blob.downloads == 2
+    assert len(lender_directory.get_lender_directory()) == len(ROWS)
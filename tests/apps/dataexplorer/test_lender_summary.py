@@ -0,0 +1,49 @@
+"""Tests for grouped subject/peer lender summaries."""
+
+from justdata.apps.dataexplorer import data_utils, lender_analysis_processor
+
+HMDA_ROWS = [
+    {'lender_id': 'SUBJ', 'year': 2023, 'loan_purpose': '1', 'lender_name': 'Subject Bank', 'total_loans': 30, 'total_volume': 9e6},
+    {'lender_id': 'SUBJ', 'year': 2022, 'loan_purpose': '1', 'lender_name': 'Subject Bank', 'total_loans': 10, 'total_volume': 2e6},
+    {'lender_id': 'SUBJ', 'year': 2022, 'loan_purpose': '31', 'lender_name': 'Subject Bank', 'total_loans': 10, 'total_volume': 1e6},
+    {'lender_id': 'PEER1', 'year': 2023, 'loan_purpose': '1', 'lender_name': 'Peer One', 'total_loans': 20, 'total_volume': 4e6},
+    {'lender_id': 'PEER2', 'year': 2023, 'loan_purpose': '1', 'lender_name': None, 'total_loans': 40, 'total_volume': 8e6},
+]
+
+
+def test_summarize_lender_rows():
+    summaries = data_utils.summarize_lender_rows(HMDA_ROWS)
+    subject = summaries['SUBJ']
+    assert subject['lender_name'] == 'Subject Bank'
+    assert subject['total_loans'] == 50 and subject['total_volume'] == 12e6
+    assert subject['by_year'] == {'2023': {'total_loans': 30, 'total_volume': 9e6},
+                                  '2022': {'total_loans': 20, 'total_volume': 3e6}}
+    assert subject['by_loan_purpose']['31'] == {'total_loans': 10, 'total_volume': 1e6}
+    assert summaries['PEER2']['lender_name'] == 'Unknown'
+
+
+def test_subject_and_custom_peers_in_one_query(monkeypatch):
+    jobs = []
+
+    def fake_run_query(client, sql, params=None, timeout=120):
+        leis = params[0].values
+        jobs.append((sql, leis))
+        return [row for row in HMDA_ROWS if row['lender_id'] in leis]
+
+    monkeypatch.setattr(data_utils, 'get_bigquery_client', lambda *args, **kwargs: object())
+    monkeypatch.setattr(data_utils, 'run_query', fake_run_query)
+
+    result = lender_analysis_processor.process_lender_hmda(
+        'SUBJ', years=[2022, 2023], geoids=['24031'], custom_peers=['PEER1', 'PEER2', 'NODATA']
+    )
+
+    assert len(jobs) == 1
+    sql, leis = jobs[0]
+    assert leis == ['SUBJ', 'PEER1', 'PEER2', 'NODATA']
+    assert 'lei IN UNNEST(@leis)' in sql and 'GROUP BY' in sql
+
+    assert result['subject']['total_loans'] == 50
+    assert result['subject']['average_loan_amount'] == 12e6 / 50
+    peers = result['comparison']['custom_peers']
+    assert [p['lender_id'] for p in peers] == ['PEER1', 'PEER2']
+    assert result['comparison']['peer_average'] == {'total_loans': 30.0, 'total_volume': 6e6}
@@ -0,0 +1,99 @@
+"""Tests for ElectWatchBQWriter's load-job based writes."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from google.cloud import bigquery
+
+from justdata.apps.electwatch.services.bq_writer import ElectWatchBQWriter
+
+
+class _Job:
+    num_dml_affected_rows = 2
+
+    def result(self):
+        return self
+
+
+class _FakeClient:
+    def __init__(self):
+        self.loads, self.queries, self.deleted, self.created = [], [], [], []
+        self.schema = [bigquery.SchemaField(name, 'STRING') for name in ('id', 'bioguide_id', 'amount')]
+
+    def get_table(self, table_ref):
+        table = bigquery.Table(table_ref)
+        table.schema = self.schema
+        return table
+
+    def create_table(self, table):
+        self.created.append(table)
+        return table
+
+    def load_table_from_json(self, rows, destination, job_config=None):
+        self.loads.append((destination, list(rows), job_config.write_disposition))
+        return _Job()
+
+    def query(self, sql):
+        self.queries.append(sql)
+        return _Job()
+
+    def delete_table(self, table_ref, not_found_ok=False):
+        self.deleted.append(table_ref)
+
+    def insert_rows_json(self, *args, **kwargs):
+        raise AssertionError("streaming inserts should not be used")
+
+
+def _writer():
+    writer = ElectWatchBQWriter.__new__(ElectWatchBQWriter)
+    writer.client = _FakeClient()
+    writer.dataset_ref = 'proj.electwatch'
+    return writer
+
+
+def test_merge_rows_loads_staging_table_and_runs_one_merge():
+    writer = _writer()
+    rows = [{'id': 'a', 'bioguide_id': 'X', 'amount': '1'}, {'id': 'b', 'bioguide_id': 'Y', 'amount': '2'},
+            {'id': 'a', 'bioguide_id': 'X', 'amount': '3'}, {'id': '', 'bioguide_id': 'Z', 'amount': '4'}]
+
+    assert writer._merge_rows('official_pac_contributions', rows) == 2
+
+    [(staging, loaded, disposition)] = writer.client.loads
+    assert staging.startswith('proj.electwatch._staging_official_pac_contributions_')
+    assert disposition == bigquery.WriteDisposition.WRITE_APPEND
+    [created] = writer.client.created
+    assert str(created.reference) == staging and created.schema == writer.client.schema
+    assert created.expires <= datetime.now(timezone.utc) + timedelta(hours=1)
+    assert loaded == [{'id': 'a', 'bioguide_id': 'X', 'amount': '3'}, {'id': 'b', 'bioguide_id': 'Y', 'amount': '2'}]
+
+    [merge] = writer.client.queries
+    assert 'MERGE `proj.electwatch.official_pac_contributions` T' in merge
+    assert f'USING `{staging}` S' in merge
+    assert 'UPDATE SET bioguide_id = S.bioguide_id, amount = S.amount' in merge
+    assert 'INSERT (id, bioguide_id, amount)' in merge
+    assert writer.client.deleted == [staging]
+
+
+def test_full_refresh_and_append_use_load_jobs():
+    writer = _writer()
+    assert writer._insert_rows('firms', [{'id': 'f1'}], replace=True) == 1
+    assert writer._insert_rows('trend_snapshots', [{'id': 't1'}]) == 1
+    assert [(dest, disp) for dest, _, disp in writer.client.loads] == [
+        ('proj.electwatch.firms', bigquery.WriteDisposition.WRITE_TRUNCATE),
+        ('proj.electwatch.trend_snapshots', bigquery.WriteDisposition.WRITE_APPEND),
+    ]
+
+    # An empty full refresh still clears the table
+    assert writer._insert_rows('news', [], replace=True) == 0
+    assert writer.client.queries == ['DELETE FROM `proj.electwatch.news` WHERE TRUE']
+
+
+def test_firm_stats_keep_news():
+    writer = _writer()
+    news = [{'headline': 'JPM earnings', 'url': 'https://example.com/jpm'}]
+    writer.write_firm_stats([{'ticker': 'JPM', 'name': 'JPMorgan Chase', 'rank': 1, 'news': news},
+                             {'ticker': 'XYZ', 'rank': 2, 'news': []}])
+
+    [(destination, loaded, _)] = writer.client.loads
+    assert destination == 'proj.electwatch.firm_stats'
+    assert [json.loads(row['news']) for row in loaded] == [news, []]
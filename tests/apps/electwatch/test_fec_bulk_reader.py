@@ -0,0 +1,96 @@
+"""Tests for the chunked FEC bulk file reader."""
+
+import zipfile
+
+import pandas as pd
+
+from justdata.apps.electwatch.services import fec_bulk_reader
+from justdata.apps.electwatch.services.fec_bulk_reader import (
+    aggregate_individual_chunk, chunk_ranges, filter_individual_chunk, open_text, scan_file
+)
+
+
+def _line(cmte_id, employer, occupation, date, amount, sub_id):
+    fields = [cmte_id, 'N', 'Q1', 'P', '123', '15', 'IND', 'DOE, JANE', 'CITY', 'ST', '12345',
+              employer, occupation, date, amount, '', 'T1', '1', '', '', sub_id]
+    return '|'.join(fields)
+
+
+def _write_itcont(path):
+    lines = []
+    for i in range(300):
+        lines.append(_line('C001', 'BIG BANK' if i % 3 else 'SCHOOL', 'TELLER', '01152024', '100', f'S{i}'))
+        lines.append(_line('C999', 'OTHER', 'X', '01152024', '50', f'O{i}'))  # Not a committee of interest
+    lines.append(_line('C002', 'BIG BANK', 'VP', '06012022', '500', 'OLD'))  # Before min_date
+    lines.append(_line('C002', 'BIG BANK', 'VP', '', '25', 'NODATE'))  # Kept: no date
+    lines.append(_line('C002', 'BIG BANK', 'VP', '02022024', 'n/a', 'BAD'))  # Unparseable amount
+    lines.append(_line('C002', 'BIG "QUOTED" BANK', 'VP', '02022024', '-10', 'REFUND'))
+    path.write_text('\n'.join(lines) + '\n', encoding='latin-1')
+
+
+def test_chunk_ranges_cover_whole_lines(tmp_path):
+    path = tmp_path / 'itcont.txt'
+    _write_itcont(path)
+    ranges = chunk_ranges(path, chunk_bytes=1000)
+    data = path.read_bytes()
+
+    assert len(ranges) > 10
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(data[end - 1:end] == b'\n' for _, end in ranges)
+
+
+def test_aggregate_matches_across_workers(tmp_path):
+    path = tmp_path / 'itcont.txt'
+    _write_itcont(path)
+    context = {'committee_to_candidate': {'C001': 'H001', 'C002': 'H002'}, 'min_date': '2023-01-01'}
+
+    def run(workers):
+        results = list(scan_file(path, aggregate_individual_chunk, context, workers=workers, chunk_bytes=4000))
+        assert sum(rows for rows, _ in results) == 604
+        combined = pd.concat([chunk for _, chunk in results])
+        return combined.groupby(['cand_id', 'employer', 'occupation'])[['amount', 'count']].sum()
+
+    serial = run(1)
+    assert serial.loc[('H001', 'BIG BANK', 'TELLER')].tolist() == [20000.0, 200]
+    assert serial.loc[('H001', 'SCHOOL', 'TELLER')].tolist() == [10000.0, 100]
+    assert serial.loc[('H002', 'BIG BANK', 'VP')].tolist() == [25.0, 1]
+    assert len(serial) == 3
+    pd.testing.assert_frame_equal(serial, run(2), check_dtype=False)
+
+
+def test_filter_individual_chunk_keeps_committee_rows(tmp_path):
+    path = tmp_path / 'itcont.txt'
+    _write_itcont(path)
+    [(rows, df)] = list(scan_file(path, filter_individual_chunk, {'committee_ids': {'C002'}}, workers=1))
+
+    assert rows == 604
+    assert list(df['sub_id']) == ['OLD', 'NODATE', 'BAD', 'REFUND']
+    assert list(df['amount']) == [500.0, 25.0, 0.0, -10.0]
+    assert df['employer'].iloc[-1] == 'BIG "QUOTED" BANK'
+    assert fec_bulk_reader._worker_context == {}
+
+
+def test_zip_member_is_streamed_without_extracting(tmp_path):
+    path = tmp_path / 'itcont.txt'
+    _write_itcont(path)
+    archive = tmp_path / 'indiv24.zip'
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('by_date/itcont_2024_1.txt', 'ignored|\n')
+        zf.write(path, 'itcont.txt')
+    context = {'committee_to_candidate': {'C001': 'H001', 'C002': 'H002'}, 'min_date': '2023-01-01'}
+
+    def totals(source, workers):
+        results = list(scan_file(source, aggregate_individual_chunk, context, workers=workers,
+                                 chunk_bytes=4000, member='itcont.txt'))
+        assert sum(rows for rows, _ in results) == 604
+        combined = pd.concat([chunk for _, chunk in results])
+        return combined.groupby(['cand_id', 'employer', 'occupation'])[['amount', 'count']].sum()
+
+    expected = totals(path, 1)
+    pd.testing.assert_frame_equal(expected, totals(archive, 1), check_dtype=False)
+    pd.testing.assert_frame_equal(expected, totals(archive, 2), check_dtype=False)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['indiv24.zip', 'itcont.txt']
+
+    with open_text(archive, 'itcont.txt') as f:
+        assert f.readline().startswith('C001|')
@@ -0,0 +1,37 @@
+"""Tests for FirmMapper fuzzy PAC and firm-name matching."""
+
+from difflib import SequenceMatcher
+
+from justdata.apps.electwatch.services.firm_mapper import FirmMapper
+
+
+def _brute_force_pac(mapper, normalized, threshold=0.7):
+    best, best_score = None, 0
+    for key, firm in mapper._pac_index.items():
+        score = SequenceMatcher(None, normalized, key).ratio()
+        if score > best_score and score >= threshold:
+            best, best_score = firm, score
+    return best
+
+
+def test_fuzzy_pac_matches_full_scan():
+    mapper = FirmMapper()
+    queries = ['WELLS FARGO & COMPANY EMPLOYEE', 'JP MORGAN CHASE & CO', 'GOLDMAN SACHS GROUP',
+               'CITIGROUP INC EMPLOYEES', 'NATIONAL WIDGET MAKERS', 'FIFTH THIRD BANCORP']
+    for query in queries:
+        normalized = mapper._normalize_pac_name(query)
+        assert mapper._fuzzy_match_pac(normalized) is _brute_force_pac(mapper, normalized), query
+
+    assert mapper.get_industry_from_pac('NATIONAL WIDGET MAKERS PAC') == []
+    assert mapper.get_firm_from_pac('GOLDMAN SACHS GROUP PAC') is not None
+
+
+def test_fuzzy_lookups_are_memoized():
+    mapper = FirmMapper()
+    mapper.get_firm_from_pac('SOME UNKNOWN ASSOCIATION PAC')
+    mapper.get_firm_from_pac('SOME UNKNOWN ASSOCIATION PAC')
+    assert mapper._fuzzy_pac_memo.cache_info().hits == 1
+
+    firm = mapper.get_firm_from_name('Wells Fargo Bank NA')
+    assert firm is not None and firm is mapper.get_firm_from_name('Wells Fargo Bank NA')
+    assert mapper._fuzzy_name_memo.cache_info().hits == 1
@@ -0,0 +1,56 @@
+"""Tests for the precomputed ElectWatch firm trade statistics."""
+
+import pytest
+
+from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_firm_stats import (
+    build_firm_stats, query_firm_stats
+)
+from justdata.apps.electwatch.services.snapshot import ElectWatchSnapshot
+
+
+def _trade(ticker, low, high, company=''):
+    return {'ticker': ticker, 'company': company, 'amount': {'min': low, 'max': high}}
+
+
+OFFICIALS = [
+    {'name': 'A', 'trades': [_trade('JPM', 1000, 15000), _trade('JPM', 15000, 50000), _trade('COIN', 0, 2000)]},
+    {'name': 'B', 'trades': [_trade('JPM', 1000, 15000), _trade('XYZ', 50000, 100000, 'Xyz Corp')]},
+    {'name': 'C', 'trades': [_trade('', 1, 1)]},
+]
+FIRMS = [
+    {'ticker': 'JPM', 'name': 'JPMorgan Chase', 'industry': 'Banking', 'quote': {'current_price': 1.0}},
+    {'ticker': 'COIN', 'name': 'Coinbase', 'industry': 'crypto', 'news': [{'headline': str(i)} for i in range(5)]},
+    {'ticker': 'AIG', 'name': 'AIG', 'industry': ''},
+]
+
+
+def test_build_firm_stats():
+    stats = {row['ticker']: row for row in build_firm_stats(OFFICIALS, FIRMS)}
+
+    assert stats['JPM'] == {
+        'name': 'JPMorgan Chase', 'ticker': 'JPM', 'industry': 'banking', 'total': 48500.0,
+        'officials': 2, 'stock_trades': 3, 'quote': {'current_price': 1.0}, 'news': [], 'rank': 2,
+    }
+    assert stats['XYZ']['name'] == 'Xyz Corp' and stats['XYZ']['industry'] == 'other'
+    assert stats['XYZ']['rank'] == 1
+    assert stats['AIG']['industry'] == 'other' and stats['AIG']['stock_trades'] == 0
+    assert [item['headline'] for item in stats['COIN']['news']] == ['0', '1', '2']
+
+
+def test_query_firm_stats():
+    rows = build_firm_stats(OFFICIALS, FIRMS)
+
+    assert [r['ticker'] for r in query_firm_stats(rows)] == ['XYZ', 'JPM', 'COIN', 'AIG']
+    assert [r['ticker'] for r in query_firm_stats(rows, industry='BANKING')] == ['JPM']
+    assert [r['ticker'] for r in query_firm_stats(rows, sort='stock_trades', descending=True, limit=2)] == ['JPM', 'XYZ']
+    assert [r['ticker'] for r in query_firm_stats(rows, sort='ticker', limit=2, offset=1)] == ['COIN', 'JPM']
+    with pytest.raises(ValueError):
+        query_firm_stats(rows, sort='total; DROP TABLE firms')
+
+
+def test_snapshot_computes_firm_stats_when_bundle_lacks_them():
+    snapshot = ElectWatchSnapshot({'version': 'v', 'officials': OFFICIALS, 'firms': FIRMS, 'firm_stats': None})
+
+    assert [r['ticker'] for r in snapshot.firm_stats_page()] == ['XYZ', 'JPM', 'COIN', 'AIG']
+    assert [r['ticker'] for r in snapshot.firm_stats_page(industry='crypto')] == ['COIN']
+    assert snapshot.firm_stats_page(industry='insurance') == []
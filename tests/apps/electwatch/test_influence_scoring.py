@@ -0,0 +1,88 @@
+"""Tests for the columnar influence scoring engine."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from justdata.apps.electwatch.pipeline.transformers.electwatch_transform_scores import _normalize_scores_to_zscore
+from justdata.apps.electwatch.services.influence_scoring import (
+    InfluenceScoringEngine, percentile_rank_scores, score_snapshots
+)
+
+CLASSIFICATIONS = {
+    'JPM': {'is_financial': True, 'subsector': 'banking'},
+    'GS': {'is_financial': True, 'subsector': 'investment'},
+    'AAPL': {'is_financial': False, 'subsector': 'technology'},
+}
+
+
+def _trade(ticker, amount, owner='Self'):
+    return {'ticker': ticker, 'amount': {'min': amount, 'max': amount * 2}, 'owner_type': owner}
+
+
+@pytest.fixture
+def officials():
+    return [
+        {'bioguide_id': 'A000001', 'name': 'A', 'financial_individual_total': 1000,
+         'top_financial_pacs': [{'amount': 500}],
+         'trades': [_trade('JPM', 1000), _trade('JPM', 3000), _trade('GS', 2000, 'Spouse'), _trade('AAPL', 4000)]},
+        {'bioguide_id': 'B000002', 'name': 'B', 'trades': [_trade('GS', 15000)]},
+        {'bioguide_id': 'C000003', 'name': 'C', 'trades': []},
+    ]
+
+
+def test_dimension_scores(officials):
+    engine = InfluenceScoringEngine(officials, CLASSIFICATIONS, net_worth_data={'B000002': 30000})
+    scores = engine.calculate_all_scores()
+    a, b, c = scores['A000001'], scores['B000002'], scores['C000003']
+
+    # Scale: A has 1000+3000+2000 financial trades + 500 PAC + 1000 individual
+    assert a.scale_details['raw_dollars'] == 7500
+    assert a.scale_score == 50.0 and b.scale_score == 100.0 and c.scale_score == 0.0
+
+    # Concentration: JPM 4000, AAPL 4000 (tie keeps first-traded order), GS 2000
+    assert a.concentration_details['top_tickers'] == ['JPM', 'AAPL', 'GS']
+    assert a.concentration_details['dominant_subsector'] == 'banking'
+    assert a.concentration_details['subsector_concentration'] == 40.0
+    assert a.concentration_details['repeat_trading_ratio'] == 1.33
+
+    # Personal: B has net worth, A does not
+    assert b.personal_involvement_details['trade_to_wealth_ratio'] == 50.0
+    assert a.personal_involvement_details['direct_ownership_ratio'] == 75.0
+    assert c.to_dict()['personal_involvement_details']['net_worth_available'] is False
+
+    expected = a.scale_score * 0.4 + a.concentration_score * 0.3 + a.personal_involvement_score * 0.3
+    assert a.composite_score == pytest.approx(expected)
+
+
+def test_reweighting_and_leaderboard(officials):
+    engine = InfluenceScoringEngine(officials, CLASSIFICATIONS)
+    assert [o['name'] for o, _ in engine.get_leaderboard('scale')] == ['B', 'A', 'C']
+
+    engine.set_weights(scale=0, concentration=0, personal=1)
+    composite = engine.get_leaderboard()
+    assert [o['name'] for o, _ in composite] == [o['name'] for o, _ in engine.get_leaderboard('personal')]
+    assert all(s.composite_score == pytest.approx(s.personal_involvement_score) for _, s in composite)
+    with pytest.raises(ValueError):
+        engine.set_weights(novelty=1)
+
+    # Officials outside the population are ranked against it
+    outsider = {'bioguide_id': 'Z000009', 'trades': [_trade('JPM', 10000)]}
+    assert engine.calculate_score(outsider).scale_score == 50.0
+
+
+def test_score_snapshots(officials):
+    frame = score_snapshots({'2026-01-24': officials[:2], '2026-01-31': officials}, CLASSIFICATIONS)
+    assert list(frame['snapshot']) == ['2026-01-24'] * 2 + ['2026-01-31'] * 3
+    assert frame.loc[frame['bioguide_id'] == 'C000003', 'composite_score'].item() == 0.0
+
+
+def test_percentile_ranks_match_normalization():
+    values = [0, 5, 5, 2, 10, 0]
+    assert list(percentile_rank_scores(values)) == [1, 67, 67, 50, 100, 1]
+
+    coordinator = SimpleNamespace(officials_data=[{'name': str(i), 'involvement_score': v}
+                                                  for i, v in enumerate(values)])
+    _normalize_scores_to_zscore(coordinator)
+    assert [o['involvement_score'] for o in coordinator.officials_data] == [1, 67, 67, 50, 100, 1]
+    assert coordinator.officials_data[4]['raw_score'] == 10
@@ -0,0 +1,48 @@
+"""Tests for the compiled keyword matcher behind the financial-sector classifiers."""
+
+import pandas as pd
+
+from justdata.apps.electwatch.services.fec_bulk_loader import classify_financial_sector, is_financial_sector
+from justdata.apps.electwatch.services.keyword_matcher import KeywordMatcher
+from justdata.apps.electwatch.services.pac_classifier import PACClassifier
+
+
+def test_first_keyword_follows_list_order_not_text_position():
+    matcher = KeywordMatcher(['banking', 'bank', 'capital', 'ban'])
+    assert matcher.first('capital banking') == 'banking'  # Overlapping 'bank'/'ban' rank lower
+    assert matcher.first('capital bank') == 'bank'
+    assert matcher.first('bancorp') == 'ban'
+    assert matcher.first('school') is None
+    assert matcher.first('') is None
+    assert KeywordMatcher([]).first('anything') is None
+
+    batch = matcher.first_many(pd.Series(['bank', None, 'capital', 'bank']))
+    assert list(batch) == ['bank', None, 'capital', 'bank']
+
+
+def test_is_financial_sector_reasons_and_batch():
+    rows = [
+        ('Citibank PAC', 'Wells Fargo', 'CFO'),   # name wins; 'bank' precedes 'citi' in the list
+        ('JANE DOE', 'Bank of America', ''),
+        ('JANE DOE', 'ACME', 'Portfolio Manager'),
+        ('JANE DOE', 'SCHOOL', 'TEACHER'),
+    ]
+    expected = [(True, 'name:bank'), (True, 'employer:bank'), (True, 'occupation:portfolio'), (False, '')]
+    assert [is_financial_sector(*row) for row in rows] == expected
+
+    df = pd.DataFrame(rows, columns=['name', 'employer', 'occupation'])
+    batch = classify_financial_sector(df['name'], df['employer'], df['occupation'])
+    assert list(zip(batch['is_financial'], batch['match_reason'])) == expected
+
+
+def test_pac_classifier_patterns(monkeypatch):
+    monkeypatch.setattr(PACClassifier, '_load_cache', lambda self: None)
+    classifier = PACClassifier()
+
+    wells = classifier.classify_pac('Wells Fargo & Company Employee PAC')
+    assert (wells['sector'], wells['subsector'], wells['confidence']) == ('banking', 'major_bank', 'high')
+    generic = classifier.classify_pac('Acme Credit Services PAC')
+    assert (generic['sector'], generic['confidence']) == ('consumer_lending', 'low')
+    by_org = classifier.classify_pac('Employees PAC', 'KKR & Co')
+    assert (by_org['subsector'], by_org['confidence']) == ('private_equity', 'medium')
+    assert not classifier.classify_pac('Capital Area Food Bank PAC')['is_financial']
@@ -0,0 +1,158 @@
+"""Tests for incremental pipeline watermarks and change detection."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from justdata.apps.electwatch.pipeline import insights
+from justdata.apps.electwatch.services import fec_bulk_loader
+from justdata.apps.electwatch.services.fec_bulk_reader import filter_individual_chunk, scan_file
+from justdata.apps.electwatch.services.pipeline_state import (
+    PipelineState, content_hash, file_fingerprint, trade_watermark
+)
+
+
+def _pas2_line(cmte_id, cand_id, amount, sub_id):
+    fields = [cmte_id, 'N', 'Q1', 'P', '123', '24K', 'PAC', 'BIG BANK PAC', 'CITY', 'ST', '12345',
+              '', '', '01152024', amount, '', cand_id, 'T1', '1', '', '', sub_id]
+    return '|'.join(fields)
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    monkeypatch.setattr('justdata.shared.utils.bigquery_client.get_bigquery_client', lambda *a, **k: None)
+    loader = fec_bulk_loader.FECBulkLoader()
+    loader.fec_to_bioguide = {'H0XX01': 'X000001'}
+    loader.congress_fec_ids = {'H0XX01'}
+    loader.committees = {'C001': {'name': 'BIG BANK PAC', 'connected_org': 'BIG BANK'}}
+    return loader
+
+
+def test_state_round_trip_and_official_changes(tmp_path):
+    path = tmp_path / 'state.json'
+    officials = [
+        {'bioguide_id': 'A000001', 'name': 'A', 'trades': [{'ticker': 'JPM'}]},
+        {'bioguide_id': 'B000002', 'name': 'B', 'trades': []},
+    ]
+    state = PipelineState(path=path, use_gcs=False)
+    assert state.changed_officials(officials) == {'A000001', 'B000002'}
+    state.set_source('fmp_trades', trade_watermark([{'transaction_date': '2025-01-02'}]))
+    assert state.save()
+
+    reloaded = PipelineState.load(path=path, use_gcs=False)
+    assert reloaded.source('fmp_trades')['last_trade_date'] == '2025-01-02'
+    officials[1] = dict(officials[1], trades=[{'ticker': 'BAC'}])
+    officials[0] = dict(officials[0], photo_url='ignored.jpg')  # Not an input field
+    assert reloaded.changed_officials(officials) == {'B000002'}
+    assert PipelineState.load(path=tmp_path / 'missing.json', use_gcs=False).source('fmp_trades') == {}
+
+
+def test_file_fingerprint_ignores_mtime_but_not_content(tmp_path):
+    path = tmp_path / 'itpas2.txt'
+    path.write_text('a|b\n' * 100)
+    first = file_fingerprint(path, sample_bytes=64)
+    path.write_text('a|b\n' * 100)
+    assert file_fingerprint(path, sample_bytes=64) == first
+    path.write_text('a|b\n' * 100 + 'c|d\n')
+    assert file_fingerprint(path, sample_bytes=64)['size'] > first['size']
+    assert trade_watermark([{'x': 1}, {'x': 2}]) == trade_watermark([{'x': 2}, {'x': 1}])
+
+
+def test_pac_delta_past_watermark(tmp_path, loader):
+    path = tmp_path / 'itpas2.txt'
+    path.write_text('\n'.join([
+        _pas2_line('C001', 'H0XX01', '500', '100'),
+        _pas2_line('C001', 'H0XX01', '250', '105'),
+        _pas2_line('C009', 'H0ZZ99', '900', '110'),  # Not a Congress member
+    ]) + '\n')
+    state = PipelineState(path=tmp_path / 'state.json', use_gcs=False)
+
+    reload, plan = loader._plan_updates(state, 'pas2', {'2024': path})
+    assert reload and plan['2024']['min_sub_id'] == 0
+    assert len(loader.process_pac_contributions(str(path))) == 2
+    loader._record_watermarks(state, 'pas2', plan)
+    assert state.source('fec/pas2/2024')['max_sub_id'] == 110
+
+    # Unchanged file is skipped
+    assert loader._plan_updates(state, 'pas2', {'2024': path}) == (False, {})
+
+    # A new Congress member changes the scope: the file is reread from the start
+    loader.fec_to_bioguide['H0ZZ99'] = 'Z000009'
+    reload, plan = loader._plan_updates(state, 'pas2', {'2024': path})
+    assert reload and plan['2024']['min_sub_id'] == 0
+    del loader.fec_to_bioguide['H0ZZ99']
+
+    # Appended rows: only those past the watermark are processed
+    with open(path, 'a') as f:
+        f.write(_pas2_line('C001', 'H0XX01', '75', '120') + '\n')
+    reload, plan = loader._plan_updates(state, 'pas2', {'2024': path})
+    assert not reload and plan['2024']['min_sub_id'] == 110
+    delta = loader.process_pac_contributions(str(path), min_sub_id=110)
+    assert [c['amount'] for c in delta] == [75.0]
+
+    # A shrunk file (or --full) rebuilds the table
+    path.write_text(_pas2_line('C001', 'H0XX01', '500', '100') + '\n')
+    assert loader._plan_updates(state, 'pas2', {'2024': path})[0]
+    assert loader._plan_updates(state, 'pas2', {}, full=True) == (True, {})
+
+
+def test_individual_chunk_filter_respects_watermark(tmp_path):
+    path = tmp_path / 'itcont.txt'
+    rows = [['C001', 'N', 'Q1', 'P', '1', '15', 'IND', 'DOE, JANE', 'CITY', 'ST', '1',
+             'BIG BANK', 'VP', '01152024', '100', '', 'T1', '1', '', '', sub_id]
+            for sub_id in ('5', '9', 'x', '12')]
+    path.write_text('\n'.join('|'.join(r) for r in rows) + '\n')
+    context = {'committee_ids': {'C001'}, 'min_sub_id': 9}
+    [(read, df)] = list(scan_file(path, filter_individual_chunk, context, workers=1))
+    assert read == 4
+    assert list(df['sub_id']) == ['12'] and list(df['sub_id_num']) == [12]
+
+
+def test_summaries_reuse_unchanged_sections(tmp_path, monkeypatch):
+    monkeypatch.delenv('CLAUDE_API_KEY', raising=False)
+    official = {'name': 'A', 'party': 'D', 'state': 'CA', 'total_trades': 3, 'stock_trades_display': '$1K',
+                'purchase_count': 2, 'sale_count': 1, 'trades': [{'ticker': 'JPM'}]}
+    coordinator = SimpleNamespace(
+        officials_data=[official], news_data=[{'title': 'News'}], summaries={}, warnings=[],
+        state=PipelineState(path=tmp_path / 'state.json', use_gcs=False),
+    )
+    for section, inputs in (('weekly_overview', insights._weekly_overview_inputs),
+                            ('top_movers', insights._top_movers_inputs),
+                            ('industry_highlights', insights._industry_highlights_inputs)):
+        coordinator.state.set_summary(section, content_hash(inputs(coordinator)), f'{section} text')
+
+    insights.generate_summaries(coordinator)
+    assert coordinator.summaries['status'] == 'generated'
+    assert coordinator.summaries['top_movers'] == 'top_movers text'
+
+    # A changed input needs the API again (no key here -> skipped)
+    official['sale_count'] = 5
+    coordinator.summaries = {}
+    insights.generate_summaries(coordinator)
+    assert coordinator.summaries['status'] == 'skipped'
+
+
+def test_save_keeps_entries_written_by_other_jobs(tmp_path):
+    path = tmp_path / 'state.json'
+    coordinator_state = PipelineState.load(path=path, use_gcs=False)
+    fresh_state = PipelineState(path=path, use_gcs=False)  # incremental=False
+
+    # The FEC bulk loader saves its watermarks while the weekly run is in progress
+    loader_state = PipelineState.load(path=path, use_gcs=False)
+    loader_state.set_source('fec/pas2/2024', {'digest': 'abc', 'max_sub_id': 110})
+    assert loader_state.save()
+
+    coordinator_state.set_source('fmp_trades', {'count': 3})
+    coordinator_state.changed_officials([{'bioguide_id': 'A000001', 'name': 'A'}])
+    assert coordinator_state.save()
+    assert fresh_state.save()
+
+    saved = PipelineState.load(path=path, use_gcs=False)
+    assert saved.source('fec/pas2/2024')['max_sub_id'] == 110
+    assert saved.source('fmp_trades')['count'] == 3
+    assert list(saved.data['officials']) == ['A000001']
+
+    # Cleared watermarks are removed on save
+    saved.clear_sources('fec/')
+    assert saved.save()
+    assert PipelineState.load(path=path, use_gcs=False).source('fec/pas2/2024') == {}
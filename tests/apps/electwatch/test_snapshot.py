@@ -0,0 +1,108 @@
+"""Tests for the ElectWatch in-memory read snapshot."""
+
+import datetime
+
+from justdata.apps.electwatch.services import data_store, snapshot
+from justdata.apps.electwatch.services.snapshot import (
+    ElectWatchSnapshot, SnapshotStore, build_bundle, dump_bundle, load_bundle
+)
+
+
+class _FakeClient:
+    def __init__(self, version='2026-01-04T00:00:00'):
+        self.version = version
+        self.calls = 0
+
+    def get_freshness(self):
+        return {'last_updated': self.version}
+
+    def get_metadata(self):
+        return {'status': 'valid', 'last_updated': self.version}
+
+    def get_officials(self):
+        self.calls += 1
+        return [
+            {'bioguide_id': 'P000197', 'name': 'Nancy Pelosi', 'involvement_score': 50,
+             'trades': [{'ticker': 'JPM', 'transaction_date': datetime.date(2025, 3, 1)}]},
+            {'bioguide_id': 'C001098', 'name': 'Ted Cruz', 'involvement_score': 80, 'trades': []},
+        ]
+
+    def get_firms(self):
+        return [{'ticker': 'JPM', 'name': 'JPMorgan Chase'}, {'ticker': 'WFC', 'name': 'Wells Fargo'}]
+
+    def get_industries(self):
+        return [{'sector': 'banking', 'officials_count': 3}]
+
+    def get_committees(self):
+        return [{'id': 'HSBA', 'name': 'Financial Services'}]
+
+    def get_news(self):
+        return [{'title': 'News'}]
+
+    def get_insights(self):
+        return [{'title': 'Insight'}]
+
+    def get_summaries(self):
+        return {'weekly_overview': 'Quiet week'}
+
+
+def _store(tmp_path, client):
+    return SnapshotStore(lambda: client, check_seconds=3600, local_dir=tmp_path, use_gcs=False)
+
+
+def test_bundle_round_trip_and_indexes():
+    bundle = load_bundle(dump_bundle(build_bundle(_FakeClient())))
+    snap = ElectWatchSnapshot(bundle)
+
+    assert snap.version == '2026-01-04T00:00:00'
+    assert snap.official('p000197')['name'] == 'Nancy Pelosi'
+    assert snap.official('P-000197')['trades'][0]['transaction_date'] == '2025-03-01'
+    assert snap.official_by_name('cruz')['bioguide_id'] == 'C001098'
+    assert snap.firm('wfc')['name'] == 'Wells Fargo'
+    assert snap.firm('morgan')['ticker'] == 'JPM'
+    assert snap.industry('Banking')['officials_count'] == 3
+    assert snap.committee('HSBA')['name'] == 'Financial Services'
+    assert snap.official('X000000') is None
+
+
+def test_store_swaps_only_on_new_run(tmp_path):
+    client = _FakeClient()
+    store = _store(tmp_path, client)
+
+    first = store.refresh()
+    assert client.calls == 1
+    assert store.refresh() is first  # same run: nothing reloaded
+    assert client.calls == 1
+
+    client.version = '2026-01-11T00:00:00'
+    second = store.refresh()
+    assert second is not first and second.version == client.version
+    assert store.get() is second
+
+
+def test_store_prefers_local_bundle(tmp_path):
+    publisher = _store(tmp_path, _FakeClient())
+    publisher.write_local(build_bundle(_FakeClient()))
+
+    reader_client = _FakeClient()
+    reader = _store(tmp_path, reader_client)
+    assert reader.get().version == reader_client.version
+    assert reader_client.calls == 0
+
+
+def test_data_store_reads_from_snapshot(tmp_path, monkeypatch):
+    store = SnapshotStore(lambda: _FakeClient(), data_store._normalize_official, check_seconds=3600,
+                          local_dir=tmp_path, use_gcs=False)
+    store.refresh()
+    monkeypatch.setattr(snapshot, '_store', store)
+    monkeypatch.setattr(data_store, '_get_bq_client', lambda: (_ for _ in ()).throw(AssertionError('BigQuery')))
+
+    officials = data_store.get_officials()
+    assert [o['id'] for o in officials] == ['P000197', 'C001098']
+    officials[0]['name'] = 'changed'
+    assert data_store.get_official('P000197')['name'] == 'Nancy Pelosi'
+    assert data_store.get_firm('JPM')['name'] == 'JPMorgan Chase'
+    assert data_store.get_freshness()['last_updated'] == '2026-01-04T00:00:00'
+
+    with snapshot.bypassed():
+        assert snapshot.current() is None
@@ -0,0 +1,68 @@
+"""Tests for LendSight batched tiered summary queries."""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from justdata.apps.lendsight import data_utils
+from justdata.shared.utils import bigquery_client
+
+
+def test_batched_queries_split_rows_by_county(monkeypatch):
+    calls = []
+
+    def fake_query_df(client, sql, params=None, timeout=120, dtypes=None):
+        calls.append((sql, params))
+        if "de_hmda_county_summary" in sql:
+            return pd.DataFrame([
+                {"geoid5": "24031", "lei": "A", "year": 2023},
+                {"geoid5": 24033, "lei": "B", "year": 2024},
+            ])
+        return pd.DataFrame([{"geoid5": "24031", "lei": "A", "tract_code": "000100", "year": 2023}])
+
+    monkeypatch.setattr(data_utils, "get_bigquery_client", lambda *a, **k: MagicMock())
+    monkeypatch.setattr(data_utils, "execute_query_df", fake_query_df)
+
+    results = data_utils.execute_batched_tiered_queries(["24031", "24033"], [2023, 2024])
+
+    assert len(calls) == 2
+    params = {p.name: p.values for p in calls[0][1]}
+    assert params == {"geoids": ["24031", "24033"], "years": [2023, 2024]}
+    # The clustering column is compared bare so BigQuery can prune clusters
+    assert "WHERE geoid5 IN UNNEST(@geoids)" in calls[0][0]
+    assert "LPAD" not in calls[0][0]
+    assert results["24031"]["county_data"]["lei"].tolist() == ["A"]
+    assert results["24033"]["county_data"]["lei"].tolist() == ["B"]
+    assert len(results["24031"]["tract_data"]) == 1
+    assert results["24033"]["tract_data"].empty
+
+
+def test_find_exact_county_matches_prefers_exact_then_case_insensitive(monkeypatch):
+    rows = [{"county_state": "Montgomery County, Maryland", "geoid5": "24031"}]
+    monkeypatch.setattr(data_utils, "get_bigquery_client", lambda *a, **k: MagicMock())
+    monkeypatch.setattr(data_utils, "run_query", lambda *a, **k: rows)
+
+    matches = data_utils.find_exact_county_matches(
+        ["montgomery county, maryland", "Nowhere County, Maryland"]
+    )
+
+    assert matches == {
+        "montgomery county, maryland": {
+            "county_state": "Montgomery County, Maryland",
+            "geoid5": "24031",
+        }
+    }
+
+
+def test_execute_query_df_uses_numpy_dtypes_and_hints(monkeypatch):
+    result = MagicMock()
+    result.to_dataframe.return_value = pd.DataFrame({"year": [2023.0, 2024.0], "lei": ["A", "B"]})
+    client = MagicMock()
+    client.query.return_value.result.return_value = result
+    monkeypatch.setattr(bigquery_client, "_get_bqstorage_client", lambda c: None)
+
+    df = bigquery_client.execute_query_df(client, "SELECT 1", dtypes={"year": "int64", "missing": "int8"})
+
+    kwargs = result.to_dataframe.call_args.kwargs
+    assert kwargs["int_dtype"] is None and kwargs["create_bqstorage_client"] is False
+    assert df["year"].dtype == "int64"
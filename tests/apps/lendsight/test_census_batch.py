@@ -0,0 +1,72 @@
+"""Tests for batched, cached Census fetches in LendSight."""
+
+from unittest.mock import MagicMock
+
+from justdata.apps.lendsight import census_utils
+from justdata.shared.utils.local_cache import LocalTTLCache
+
+
+def _table(variables, rows):
+    """Census API JSON: header row, then one row per county."""
+    header = variables + ['state', 'county']
+    return [header] + [[str(values.get(v, 0)) for v in variables] + ['24', fips]
+                       for fips, values in rows.items()]
+
+
+def _fake_get(calls):
+    def get(url, params=None, timeout=None):
+        calls.append((url, params['for'], params['in']))
+        if 'acs/acs5' in url:
+            data = _table(census_utils.ACS_VARIABLES, {
+                '031': {'B01003_001E': 1000, 'B03002_003E': 500, 'B03002_012E': 200},
+                '033': {'B01003_001E': 2000, 'B03002_004E': 1000},
+            })
+        elif 'dec/pl' in url:
+            data = _table(census_utils.CENSUS2020_VARIABLES, {'031': {'P1_001N': 900, 'P2_005N': 450}})
+        else:
+            data = _table(census_utils.CENSUS2010_VARIABLES, {'031': {'P001001': 800, 'P005003': 400}})
+        response = MagicMock()
+        response.json.return_value = data
+        return response
+    return get
+
+
+def test_state_wide_requests_fill_all_counties_and_are_cached(monkeypatch):
+    calls = []
+    monkeypatch.setattr(census_utils, '_census_cache', LocalTTLCache('test_census'))
+    monkeypatch.setattr(census_utils.requests, 'get', _fake_get(calls))
+    counties = [
+        {'name': 'Montgomery County, Maryland', 'geoid5': '24031'},
+        {'name': "Prince George's County, Maryland", 'geoid5': '24033'},
+    ]
+
+    result = census_utils.get_census_data_for_multiple_counties(counties, '24', api_key='k')
+
+    assert len(calls) == 3  # ACS 5-year, 2020 PL, 2010 SF1 - one per dataset, not per county
+    assert all(c[1] == 'county:*' and c[2] == 'state:24' for c in calls)
+    assert list(result) == ['Montgomery County, Maryland', "Prince George's County, Maryland"]
+    montgomery = result['Montgomery County, Maryland']['time_periods']
+    assert set(montgomery) == {'acs', 'census2020', 'census2010'}
+    assert montgomery['acs']['demographics']['white_percentage'] == 50
+    assert set(result["Prince George's County, Maryland"]['time_periods']) == {'acs'}
+
+    census_utils.get_census_data_for_multiple_counties(counties, '24', api_key='k')
+    assert len(calls) == 3  # Served from cache
+
+
+def test_counties_missing_from_batch_fall_back_to_per_county(monkeypatch):
+    monkeypatch.setattr(census_utils, '_census_cache', LocalTTLCache('test_census'))
+    monkeypatch.setattr(census_utils.requests, 'get', _fake_get([]))
+    fallback_calls = []
+
+    def fake_single(state_fips, county_fips, county_name=None, api_key=None, *args):
+        fallback_calls.append((state_fips, county_fips))
+        return {'county_name': county_name, 'time_periods': {'acs': {}}}
+
+    monkeypatch.setattr(census_utils, 'get_census_demographics_for_county', fake_single)
+
+    result = census_utils.get_census_data_for_multiple_counties(
+        [{'name': 'Garrett County, Maryland', 'geoid5': '24023'}], '24', api_key='k')
+
+    assert fallback_calls == [('24', '023')]
+    assert 'Garrett County, Maryland' in result
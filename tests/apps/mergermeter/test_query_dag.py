@@ -0,0 +1,72 @@
+"""Tests for the MergerMeter query dependency-graph executor."""
+
+import threading
+import time
+
+import pytest
+
+from justdata.apps.mergermeter.query_dag import QueryDAG
+from justdata.shared.utils.job_scheduler import JobCancelled
+
+
+def test_independent_nodes_run_concurrently_and_deps_are_passed():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def slow(value):
+        def run():
+            barrier.wait()  # Deadlocks unless all three run at the same time
+            return value
+        return run
+
+    dag = QueryDAG(max_workers=3)
+    dag.add("a", slow(1)).add("b", slow(2)).add("c", slow(3))
+    dag.add("total", lambda a, b, c: a + b + c, deps=["a", "b", "c"])
+
+    completed = []
+    results = dag.run(on_node_complete=lambda t, done, total: completed.append((t.name, done, total)))
+
+    assert results["total"] == 6
+    assert completed[-1] == ("total", 4, 4)
+    assert {t.name for t in dag.timings} == {"a", "b", "c", "total"}
+
+
+def test_failure_is_reraised_and_dependents_do_not_run():
+    ran = []
+
+    def boom():
+        time.sleep(0.01)
+        raise RuntimeError("query failed")
+
+    dag = QueryDAG(max_workers=2)
+    dag.add("bad", boom)
+    dag.add("child", lambda bad: ran.append(bad), deps=["bad"])
+
+    with pytest.raises(RuntimeError, match="query failed"):
+        dag.run()
+    assert ran == []
+
+
+def test_cancellation_from_progress_callback_stops_the_run():
+    ran = []
+    dag = QueryDAG(max_workers=1)
+    dag.add("first", lambda: 1)
+    dag.add("second", lambda first: ran.append(first), deps=["first"])
+
+    def cancelled(timing, done, total):
+        raise JobCancelled("Analysis cancelled")
+
+    with pytest.raises(JobCancelled):
+        dag.run(on_node_complete=cancelled)
+    assert ran == []
+
+
+def test_unknown_dependency_and_cycles_are_rejected():
+    dag = QueryDAG()
+    dag.add("a", lambda: 1, deps=["missing"])
+    with pytest.raises(ValueError, match="unknown"):
+        dag.run()
+
+    dag = QueryDAG()
+    dag.add("a", lambda b: b, deps=["b"]).add("b", lambda a: a, deps=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        dag.run()
@@ -0,0 +1,67 @@
+"""Tests for the AI narrative cache and pooled provider clients."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from justdata.shared.analysis import ai_provider
+from justdata.shared.analysis.ai_provider import AIAnalyzer, get_ai_cache_stats
+from justdata.shared.utils.local_cache import LocalTTLCache
+
+
+class FakeMessages:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        text = f"narrative {len(self.calls)}"
+        return SimpleNamespace(content=[SimpleNamespace(text=f"  {text}\n")],
+                               usage=SimpleNamespace(input_tokens=100, output_tokens=20))
+
+
+@pytest.fixture
+def fake_claude(monkeypatch, tmp_path):
+    messages = FakeMessages()
+    client = SimpleNamespace(messages=messages)
+    monkeypatch.setattr(ai_provider, '_get_provider_client', lambda provider, api_key: client)
+    monkeypatch.setattr(ai_provider, '_narrative_cache', LocalTTLCache('ai_test', disk_dir=str(tmp_path)))
+    monkeypatch.setattr(ai_provider, '_narrative_stats', {k: 0 for k in ai_provider._narrative_stats})
+    monkeypatch.setattr(ai_provider, 'log_ai_usage', lambda **kwargs: None)
+    return messages
+
+
+def test_repeat_prompt_served_from_cache(fake_claude):
+    analyzer = AIAnalyzer('claude', api_key='test-key')
+    first = analyzer._call_ai('Summarize county 24031', max_tokens=500)
+    assert analyzer._call_ai('Summarize county 24031', max_tokens=500) == first == 'narrative 1'
+    assert len(fake_claude.calls) == 1
+
+    # Any change to the prompt or parameters is a different entry
+    assert analyzer._call_ai('Summarize county 24031', max_tokens=800) == 'narrative 2'
+    assert analyzer._call_ai('Summarize county 24033', max_tokens=500) == 'narrative 3'
+    assert analyzer._call_ai('Summarize county 24031', max_tokens=500, use_cache=False) == 'narrative 4'
+
+    stats = get_ai_cache_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 3
+    assert stats['saved_input_tokens'] == 100 and stats['saved_output_tokens'] == 20
+    assert stats['saved_cost_usd'] > 0
+
+
+def test_disk_tier_survives_restart(fake_claude, monkeypatch, tmp_path):
+    analyzer = AIAnalyzer('claude', api_key='test-key')
+    analyzer._call_ai('Trends for Cook County')
+
+    # A new worker process starts with an empty memory tier
+    monkeypatch.setattr(ai_provider, '_narrative_cache', LocalTTLCache('ai_test', disk_dir=str(tmp_path)))
+    assert analyzer._call_ai('Trends for Cook County') == 'narrative 1'
+    assert len(fake_claude.calls) == 1
+
+
+def test_provider_clients_are_reused(monkeypatch):
+    anthropic = pytest.importorskip('anthropic')
+    monkeypatch.setattr(ai_provider, '_provider_clients', {})
+    client = ai_provider._get_provider_client('claude', 'key-a')
+    assert ai_provider._get_provider_client('claude', 'key-a') is client
+    assert ai_provider._get_provider_client('claude', 'key-b') is not client
+    assert isinstance(client, anthropic.Anthropic)
@@ -0,0 +1,62 @@
+"""Tests for the background AI usage sink."""
+
+import os
+import threading
+
+from justdata.shared.analysis.ai_provider import _AIUsageSink
+
+
+class RecordingWriter:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.rows = []
+        self.called = threading.Event()
+
+    def __call__(self, rows):
+        if self.fail:
+            raise RuntimeError('BigQuery unavailable')
+        self.rows.extend(rows)
+        self.called.set()
+
+
+def _row(i):
+    return {'model': 'gpt-4o-mini', 'input_tokens': i, 'output_tokens': 1}
+
+
+def test_batch_size_triggers_background_flush(tmp_path):
+    writer = RecordingWriter()
+    sink = _AIUsageSink(str(tmp_path), batch_size=3, interval_seconds=60, max_queue=100, writer=writer)
+    for i in range(3):
+        sink.record(_row(i))
+    assert writer.called.wait(5)
+    assert [r['input_tokens'] for r in writer.rows] == [0, 1, 2]
+    # The sent batch file is removed once the insert succeeds
+    with sink._send_lock:
+        assert os.listdir(tmp_path) == []
+
+
+def test_failed_rows_stay_spooled_until_next_flush(tmp_path):
+    failing = RecordingWriter(fail=True)
+    sink = _AIUsageSink(str(tmp_path), batch_size=100, interval_seconds=60, max_queue=100, writer=failing)
+    sink.record(_row(1))
+    sink.record(_row(2))
+    assert sink.flush() == 0
+    assert len(os.listdir(tmp_path)) == 1
+
+    # A later flush (or another process after a restart) sends what was kept
+    writer = RecordingWriter()
+    sink._writer = writer
+    assert sink.flush() == 2
+    assert [r['input_tokens'] for r in writer.rows] == [1, 2]
+    assert os.listdir(tmp_path) == []
+
+
+def test_full_queue_spills_to_spool(tmp_path):
+    writer = RecordingWriter()
+    sink = _AIUsageSink(str(tmp_path), batch_size=100, interval_seconds=60, max_queue=1, writer=writer)
+    # Hold the worker off the queue so it fills up
+    with sink._send_lock:
+        for i in range(5):
+            sink.record(_row(i))
+    assert sink.flush() == 5
+    assert sorted(r['input_tokens'] for r in writer.rows) == [0, 1, 2, 3, 4]
@@ -0,0 +1,77 @@
+"""Tests for the BigQuery analysis cache: section storage, columnar sections and L1 sizing."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from justdata.shared.utils import analysis_cache
+
+
+def test_store_cached_result_stages_sections_then_swaps_atomically(monkeypatch):
+    client = MagicMock()
+    monkeypatch.setattr(analysis_cache, 'get_bigquery_client', lambda *a, **k: client)
+    monkeypatch.setattr(analysis_cache, '_maybe_schedule_sweep', lambda: None)
+    monkeypatch.setattr(analysis_cache, 'SECTION_BATCH_MAX_BYTES', 100)
+
+    result_data = {'report_data': {
+        f'sheet_{i}': {'headers': ['a'], 'data': [{'a': i}]} for i in range(3)
+    }}
+    analysis_cache.store_cached_result('mergermeter', {'acquirer_lei': 'X'}, 'job-2', result_data)
+
+    statements = [call.args[0] for call in client.query.call_args_list]
+    assert not any('DELETE' in sql for sql in statements)
+    assert sum('INSERT INTO' in sql and 'UNNEST(@sections)' in sql for sql in statements[:-1]) == len(statements) - 1
+    assert len(statements) - 1 == 2  # Sections are grouped by size, not one job each
+    assert 'BEGIN TRANSACTION' in statements[-1] and 'MERGE' in statements[-1]
+
+
+def test_columnar_sections_round_trip(monkeypatch):
+    import pandas as pd
+    from justdata.shared.utils import columnar_sections
+
+    monkeypatch.setattr(columnar_sections, 'COLUMNAR_SECTIONS_ENABLED', True)
+    monkeypatch.setattr(columnar_sections, 'COLUMNAR_MIN_ROWS', 2)
+    df = pd.DataFrame({'lei': ['A', 'B', 'C'], 'loans': [1, 2, 3], 'pct': [0.5, None, 1.5]})
+
+    [batch] = analysis_cache._batch_sections([{
+        'section_name': 'top_lenders', 'section_type': 'data_table', 'section_data': df,
+        'section_metadata': {'row_count': 3},
+    }, {
+        'section_name': 'summary', 'section_type': 'ai_summary', 'section_data': {'text': 'x'},
+    }])
+    table, summary = batch
+    assert table['section_blob'] and summary['section_blob'] is None
+
+    row = SimpleNamespace(section_data=table['section_data'], section_blob=table['section_blob'])
+    pd.testing.assert_frame_equal(analysis_cache._load_section_data(row, as_dataframe=True), df)
+    records = analysis_cache._load_section_data(row)
+    assert records[1] == {'lei': 'B', 'loans': 2, 'pct': None}
+
+
+def test_l1_size_counts_decoded_sections(monkeypatch):
+    import pandas as pd
+    from justdata.shared.utils import columnar_sections
+    from justdata.shared.utils.local_cache import LocalTTLCache
+
+    monkeypatch.setattr(analysis_cache, '_l1_cache', LocalTTLCache('test'))
+    monkeypatch.setattr(analysis_cache, '_access_batcher', analysis_cache._AccessCountBatcher(interval_seconds=3600))
+    df = pd.DataFrame({'lender_name': ['SAME LENDER NAME'] * 500, 'loans': [7] * 500})
+    blob = columnar_sections.encode_table(df)
+    parsed = [{'a': 1}] * 50
+
+    def section(name, data, blob=None):
+        return SimpleNamespace(section_name=name, section_type='data_table', section_category='table',
+                               section_data=data, section_metadata='{}', display_order=0, section_blob=blob)
+
+    sections = [section('arrow', None, blob), section('parsed', parsed), section('json', '[{"a": 1}]')]
+    client = MagicMock()
+    client.query.return_value.result.side_effect = [
+        [SimpleNamespace(job_id='job-1', cache_key='key', access_count=0, status='completed')], sections,
+    ]
+    monkeypatch.setattr(analysis_cache, 'get_bigquery_client', lambda *a, **k: client)
+
+    analysis_cache.get_cached_result('bizsight', {'county_data': {'geoid5': '17031'}})
+    # Decoded (not compressed) size for Arrow sections; parsed sections count too
+    expected = df.memory_usage(index=True, deep=True).sum() + len(json.dumps(parsed)) + len('[{"a": 1}]')
+    assert analysis_cache._l1_cache.stats()['bytes'] == expected
+    assert expected > 10 * len(blob)
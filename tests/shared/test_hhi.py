@@ -0,0 +1,87 @@
+"""Tests for the vectorized HHI engine and the app functions built on it."""
+
+import pandas as pd
+import pytest
+
+from justdata.apps.lendsight.report_builder.sections.concentration import (
+    calculate_mortgage_hhi, create_market_concentration_table
+)
+from justdata.apps.mergermeter.hhi_calculator import calculate_county_hhi, calculate_hhi
+from justdata.shared.utils.hhi import (
+    NEW_ENTRANT, MergerScenario, apply_scenario, concentration_level, hhi_by_market, merger_hhi
+)
+
+
+def _deposits():
+    return pd.DataFrame({
+        'geoid5': ['01001'] * 4 + ['01003'] * 3,
+        'rssd': ['A', 'B', 'C', 'D', 'A', 'B', 'C'],
+        'branch_id': ['a1', 'b1', 'c1', 'd1', 'a2', 'b2', 'c2'],
+        'total_deposits': [400.0, 300.0, 200.0, 100.0, 50.0, 25.0, 25.0],
+    })
+
+
+def test_two_bank_merger_matches_per_county_calculation():
+    df = _deposits()
+    result = merger_hhi(df, 'geoid5', 'rssd', 'total_deposits', MergerScenario.two_bank('A', 'B')).set_index('geoid5')
+
+    for geoid5, county in df.groupby('geoid5'):
+        pre, post, pre_deposits, post_deposits = calculate_county_hhi(county, 'A', 'B')
+        assert result.loc[geoid5, 'pre_hhi'] == pytest.approx(pre)
+        assert result.loc[geoid5, 'post_hhi'] == pytest.approx(post)
+        assert result.loc[geoid5, 'post_total'] == pytest.approx(sum(post_deposits.values()))
+    # 40/30/20/10 -> 3000 before, 70/20/10 -> 5400 after
+    assert result.loc['01001', 'pre_hhi'] == pytest.approx(3000)
+    assert result.loc['01001', 'hhi_change'] == pytest.approx(2400)
+    assert result.loc['01001', 'post_level'] == 'High Concentration'
+
+
+def test_three_way_combination_and_divestiture():
+    df = _deposits()
+    three_way = MergerScenario(combine=[['A', 'B', 'C']])
+    post = merger_hhi(df, 'geoid5', 'rssd', 'total_deposits', three_way).set_index('geoid5')['post_hhi']
+    assert post['01001'] == pytest.approx(calculate_hhi({'ABC': 900, 'D': 100}))
+    assert post['01003'] == pytest.approx(10000)
+
+    # Selling A's branch a1 to D before A+B merge
+    divest = MergerScenario(combine=[['A', 'B']], divest={'a1': 'D', 'b2': None})
+    owners = apply_scenario(df, 'rssd', divest, branch_col='branch_id')
+    assert list(owners) == ['D', 'A_merged_B', 'C', 'D', 'A_merged_B', NEW_ENTRANT, 'C']
+    post = merger_hhi(df, 'geoid5', 'rssd', 'total_deposits', divest, branch_col='branch_id').set_index('geoid5')
+    assert post.loc['01001', 'post_hhi'] == pytest.approx(calculate_hhi({'AB': 300, 'C': 200, 'D': 500}))
+
+    with pytest.raises(ValueError):
+        apply_scenario(df, 'rssd', divest)
+
+
+def test_hhi_by_market_and_levels():
+    df = pd.DataFrame({
+        'year': [2022, 2022, 2023, 2023, 2023],
+        'bank_name': ['X', 'Y', 'X', 'Y', 'Z'],
+        'total_deposits': [50.0, 50.0, 80.0, 20.0, 0.0],
+    })
+    by_year = hhi_by_market(df, 'year', 'bank_name', 'total_deposits')
+    assert list(by_year['year']) == [2022, 2023]
+    assert list(by_year['hhi']) == pytest.approx([5000, 6800])
+    assert list(by_year['entities']) == [2, 2]  # Zero-deposit banks are dropped
+    assert concentration_level(1499.9) == 'Low concentration (competitive market)'
+    assert list(concentration_level(pd.Series([1500, 2500]))) == ['Moderate concentration', 'High concentration']
+
+
+def test_lendsight_concentration_uses_engine():
+    df = pd.DataFrame({
+        'year': [2023, 2023, 2024, 2024, 2024],
+        'lender_name': ['L1', 'L2', 'L1', 'L2', 'L3'],
+        'loan_purpose': ['Home Purchase'] * 5,
+        'total_loan_amount': [600.0, 400.0, 500.0, 300.0, 200.0],
+    })
+    hhi = calculate_mortgage_hhi(df)
+    assert hhi['year'] == 2024
+    assert hhi['hhi'] == pytest.approx(3800)
+    assert hhi['concentration_level'] == 'High concentration'
+    assert [lender['lender_name'] for lender in hhi['top_lenders']] == ['L1', 'L2', 'L3']
+
+    table = create_market_concentration_table(df, [2023, 2024, 2025])
+    assert table[0]['Loan Purpose'] == 'All Loans'
+    assert table[0][2023] == pytest.approx(5200) and table[0][2025] is None
+    assert table[2]['Loan Purpose'] == 'Refinance' and table[2][2024] is None
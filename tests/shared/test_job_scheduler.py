@@ -0,0 +1,111 @@
+"""Tests for the bounded, de-duplicating report job scheduler."""
+
+import threading
+
+import pytest
+
+from justdata.shared.utils import progress_tracker
+from justdata.shared.utils.job_scheduler import PRIORITY_HIGH, JobScheduler, QueueFull
+
+
+class _Recorder:
+    def __init__(self):
+        self.updates = {}
+
+    def __call__(self, job_id, data):
+        self.updates.setdefault(job_id, []).append(data)
+
+    def last(self, job_id):
+        return self.updates[job_id][-1]
+
+
+def _blocking_job(started, release, ran=None, name=None):
+    def run():
+        if ran is not None:
+            ran.append(name)
+        started.set()
+        release.wait(5)
+    return run
+
+
+def test_limit_priority_and_queue_positions():
+    scheduler = JobScheduler(default_limit=1)
+    recorder = _Recorder()
+    release = threading.Event()
+    ran = []
+    first_started = threading.Event()
+
+    scheduler.submit('lendsight', _blocking_job(first_started, release, ran, 'a'), 'a', progress_update=recorder)
+    assert first_started.wait(2)
+    done_b, done_c = threading.Event(), threading.Event()
+    b = scheduler.submit('lendsight', lambda: (ran.append('b'), done_b.set()), 'b', progress_update=recorder)
+    c = scheduler.submit('lendsight', lambda: (ran.append('c'), done_c.set()), 'c', priority=PRIORITY_HIGH,
+                         progress_update=recorder)
+
+    assert b.queue_position == 1
+    assert (scheduler.queue_position('b'), c.queue_position) == (2, 1)  # Higher priority jumps the queue
+    assert recorder.last('b')['queue_position'] == 2
+    assert scheduler.stats()['lendsight'] == {'running': 1, 'queued': 2, 'limit': 1}
+
+    release.set()
+    assert done_b.wait(2) and done_c.wait(2)
+    assert ran == ['a', 'c', 'b']
+    assert recorder.last('b')['step'] == 'Starting analysis...'
+
+
+def test_identical_requests_attach_to_running_job():
+    scheduler = JobScheduler(default_limit=2)
+    started, release = threading.Event(), threading.Event()
+    ran = []
+
+    first = scheduler.submit('bizsight', _blocking_job(started, release, ran, 'first'), 'job-1',
+                             dedup_key='key', progress_update=_Recorder(), requester='alice')
+    second = scheduler.submit('bizsight', _blocking_job(started, release, ran, 'second'), 'job-2',
+                              dedup_key='key', progress_update=_Recorder(), requester='bob')
+
+    assert not first.deduplicated
+    assert second.deduplicated and second.job_id == 'job-1'
+    # One requester cancelling (even repeatedly) does not stop a job the other is still waiting on
+    assert scheduler.cancel('job-1', requester='alice') is False
+    assert scheduler.cancel('job-1', requester='alice') is False
+    assert scheduler.cancel('job-1', requester='mallory') is False
+    assert not scheduler.is_cancelled('job-1')
+    assert scheduler.cancel('job-1', requester='bob') is True
+    release.set()
+    assert started.wait(2)
+    assert ran == ['first']
+
+
+def test_cancel_queued_and_running_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(progress_tracker, '_progress_storage_dir', tmp_path)
+    scheduler = JobScheduler(default_limit=1, max_queued=1)
+    monkeypatch.setattr('justdata.shared.utils.job_scheduler._scheduler', scheduler)
+
+    started, release = threading.Event(), threading.Event()
+    finished = threading.Event()
+    reached_checkpoint = []
+
+    def running_job():
+        started.set()
+        release.wait(5)
+        try:
+            progress_tracker.update_progress('run-job', {'percent': 50, 'step': 'x', 'done': False, 'error': None})
+            reached_checkpoint.append(True)
+        finally:
+            finished.set()
+
+    scheduler.submit('mergermeter', running_job, 'run-job')
+    assert started.wait(2)
+    scheduler.submit('mergermeter', lambda: None, 'queued-job')
+    with pytest.raises(QueueFull):
+        scheduler.submit('mergermeter', lambda: None, 'overflow-job')
+
+    assert scheduler.cancel('queued-job') is True
+    assert progress_tracker.get_progress('queued-job')['error'] == 'Analysis cancelled'
+
+    assert scheduler.cancel('run-job') is True
+    release.set()
+    assert finished.wait(2)
+    assert reached_checkpoint == []  # update_progress raised JobCancelled
+    progress = progress_tracker.get_progress('run-job')
+    assert progress['done'] and progress['error'] == 'Analysis cancelled'
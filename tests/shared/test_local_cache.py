@@ -0,0 +1,68 @@
+"""Tests for the in-process L1 cache in front of the BigQuery analysis cache."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from justdata.shared.utils import analysis_cache
+from justdata.shared.utils.local_cache import LocalTTLCache
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = LocalTTLCache('test', max_entries=2, max_bytes=100)
+    cache.set('a', 1, size_bytes=10)
+    cache.set('b', 2, size_bytes=10)
+    assert cache.get('a') == 1  # 'a' becomes most recently used
+    cache.set('c', 3, size_bytes=10)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+    cache.set('big', 'x', size_bytes=95)
+    assert cache.get('big') == 'x'
+    assert cache.stats()['bytes'] <= 100
+
+
+def test_ttl_expiry_and_disk_tier(tmp_path):
+    cache = LocalTTLCache('test', ttl_seconds=60, disk_dir=str(tmp_path))
+    cache.set('k', {'v': 1})
+    cache.clear()
+    assert cache.get('k') == {'v': 1}  # Promoted back from disk
+    assert cache.stats()['disk_hits'] == 1
+
+    cache.invalidate('k')
+    assert cache.get('k') is None
+
+    short = LocalTTLCache('short', ttl_seconds=0.01)
+    short.set('k', 1)
+    time.sleep(0.02)
+    assert short.get('k') is None
+
+
+def _section(name, data):
+    return SimpleNamespace(section_name=name, section_type='data_table', section_category='table',
+                           section_data=data, section_metadata='{}', display_order=0)
+
+
+def test_get_cached_result_served_from_l1_until_store(monkeypatch):
+    monkeypatch.setattr(analysis_cache, '_l1_cache', LocalTTLCache('test'))
+    batcher = analysis_cache._AccessCountBatcher(interval_seconds=3600)
+    monkeypatch.setattr(analysis_cache, '_access_batcher', batcher)
+
+    cache_row = SimpleNamespace(job_id='job-1', cache_key='key', access_count=4, status='completed')
+    sections = [_section(f's{i}', '[{"a": 1}]') for i in range(3)]
+    client = MagicMock()
+    client.query.return_value.result.side_effect = [[cache_row], sections]
+    monkeypatch.setattr(analysis_cache, 'get_bigquery_client', lambda *a, **k: client)
+
+    params = {'county_data': {'geoid5': '17031'}, 'startYear': 2020, 'endYear': 2023}
+    first = analysis_cache.get_cached_result('bizsight', params)
+    second = analysis_cache.get_cached_result('bizsight', params)
+
+    assert client.query.call_count == 2  # Cache lookup + sections, no access-count DML
+    assert second['job_id'] == 'job-1'
+    assert second['result_data'] == first['result_data']
+    assert second['access_count'] == 6
+    assert batcher.pending_hits(analysis_cache.generate_cache_key('bizsight', params)) == 2
+
+    analysis_cache.invalidate_local_cache('bizsight', params)
+    assert analysis_cache._l1_cache.get(analysis_cache.generate_cache_key('bizsight', params)) is None
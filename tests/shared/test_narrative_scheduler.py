@@ -0,0 +1,72 @@
+"""Tests for concurrent AI narrative generation."""
+
+import threading
+import time
+
+from justdata.shared.analysis.narrative_scheduler import NarrativeScheduler, NarrativeTimeout
+
+
+class RecordingTracker:
+    def __init__(self):
+        self.updates = []
+
+    def update_ai_progress(self, current_call, total_calls, insight_name=None):
+        self.updates.append((current_call, total_calls, insight_name))
+
+
+def test_calls_run_concurrently_and_report_progress():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def narrative(name):
+        barrier.wait()  # Only passes if all three calls are in flight at once
+        return f"{name} text"
+
+    tracker = RecordingTracker()
+    saved = {}
+    scheduler = NarrativeScheduler(max_workers=3, progress_tracker=tracker,
+                                   on_result=lambda name, value: saved.__setitem__(name, value))
+    for name in ('key_findings', 'trends_analysis', 'table1_narrative'):
+        scheduler.submit(name, narrative, name)
+
+    results = scheduler.run()
+    assert results == saved == {n: f"{n} text" for n in ('key_findings', 'trends_analysis', 'table1_narrative')}
+    assert [u[:2] for u in tracker.updates] == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_failure_can_queue_fallback_calls():
+    def combined():
+        raise ValueError('combined call failed')
+
+    scheduler = NarrativeScheduler(max_workers=2)
+    scheduler.submit('combined', combined,
+                     on_error=lambda error: scheduler.submit('fallback', lambda: 'individual'))
+    assert scheduler.run() == {'fallback': 'individual'}
+    assert isinstance(scheduler.errors['combined'], ValueError)
+    assert len(scheduler) == 2
+
+
+def test_rate_limited_call_is_retried():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise Exception('Error calling claude API: 429 rate_limit_error')
+        return 'ok'
+
+    scheduler = NarrativeScheduler(retry_delay=0.01)
+    scheduler.submit('summary', flaky)
+    assert scheduler.run() == {'summary': 'ok'} and len(attempts) == 2
+
+
+def test_slow_call_times_out_without_blocking_others():
+    release = threading.Event()
+    scheduler = NarrativeScheduler(max_workers=2, timeout=0.2)
+    scheduler.submit('slow', release.wait, 5)
+    scheduler.submit('fast', lambda: 'done')
+
+    start = time.monotonic()
+    assert scheduler.run() == {'fast': 'done'}
+    assert time.monotonic() - start < 2
+    assert isinstance(scheduler.errors['slow'], NarrativeTimeout)
+    release.set()
@@ -0,0 +1,17 @@
+"""Tests for the trigram candidate index used by fuzzy name lookups."""
+
+from justdata.shared.utils.ngram_index import NgramIndex
+
+
+def test_candidates_rank_by_shared_trigrams():
+    index = NgramIndex(['WELLS FARGO', 'FIFTH THIRD', 'WELLS FARGO ADVISORS', 'FIRST HORIZON', 'WELLS FARGO'])
+    assert len(index) == 4
+
+    scored = index.scored_candidates('WELLS FARGO & CO', limit=2)
+    assert [key for key, _ in scored] == ['WELLS FARGO', 'WELLS FARGO ADVISORS']
+    assert 0 < scored[1][1] < scored[0][1] <= 1
+    assert index.scored_candidates('WELLS FARGO')[0] == ('WELLS FARGO', 1.0)
+
+    # Returned in index order for stable tie-breaking by the caller
+    assert index.candidates('FIRST FIFTH', limit=2) == ['FIFTH THIRD', 'FIRST HORIZON']
+    assert index.candidates('ZZZ') == []
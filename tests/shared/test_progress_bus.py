@@ -0,0 +1,67 @@
+"""Tests for the push-based progress bus used by the SSE progress handlers."""
+
+import threading
+import time
+
+from justdata.shared.utils import progress_tracker
+from justdata.shared.utils.progress_bus import ProgressBus, ProgressBusBackend
+
+
+def test_wait_returns_on_publish_and_times_out_otherwise():
+    bus = ProgressBus()
+    assert bus.wait('job', 0, timeout=0.01) == (0, None)
+
+    def publish_later():
+        time.sleep(0.05)
+        bus.publish('job', {'percent': 10})
+
+    threading.Thread(target=publish_later).start()
+    start = time.monotonic()
+    version, data = bus.wait('job', 0, timeout=5)
+    assert version == 1 and data == {'percent': 10}
+    assert time.monotonic() - start < 1
+
+    # An update published before the wait starts is not missed
+    bus.publish('job', {'percent': 20})
+    assert bus.wait('job', 1, timeout=0) == (2, {'percent': 20})
+
+
+class _LoopbackBackend(ProgressBusBackend):
+    def __init__(self):
+        self.sent = []
+        self.deliver = None
+
+    def publish(self, job_id, data):
+        self.sent.append((job_id, data))
+
+    def start(self, deliver):
+        self.deliver = deliver
+
+
+def test_backend_fans_out_local_updates_and_delivers_remote_ones():
+    backend = _LoopbackBackend()
+    bus = ProgressBus(backend)
+    received = []
+    bus.set_remote_handler(lambda job_id, data: received.append((job_id, data)))
+
+    bus.publish('job', {'percent': 5})
+    assert backend.sent == [('job', {'percent': 5})]
+
+    backend.deliver('job', {'percent': 50})
+    assert received == [('job', {'percent': 50})]
+    assert bus.wait('job', 1, timeout=0) == (2, {'percent': 50})
+    assert len(backend.sent) == 1  # Remote updates are not re-published
+
+
+def test_update_progress_wakes_waiting_stream(tmp_path, monkeypatch):
+    monkeypatch.setattr(progress_tracker, '_progress_storage_dir', tmp_path)
+    job_id = 'bus-test-job'
+    version = progress_tracker.get_progress_version(job_id)
+
+    tracker = progress_tracker.create_progress_tracker(job_id)
+    threading.Timer(0.05, tracker.update_progress, args=('querying_data',)).start()
+
+    new_version = progress_tracker.wait_for_progress(job_id, version, timeout=5)
+    assert new_version == version + 1
+    assert progress_tracker.get_progress(job_id)['percent'] == 35
+    progress_tracker.cleanup_job(job_id)
@@ -0,0 +1,93 @@
+"""Tests for the per-source rate-limited HTTP client and its conditional cache."""
+
+import threading
+import time
+
+import requests
+
+from justdata.shared.utils.rate_limited_http import RateLimitedClient, ResponseCache, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _response(status, body='', headers=None, url='https://api.example.com/x'):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode('utf-8')
+    response.headers.update(headers or {})
+    response.url = url
+    return response
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append({'url': url, 'params': params, 'headers': dict(headers or {})})
+        return self.responses.pop(0)
+
+
+def test_token_bucket_paces_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() == 0 and bucket.acquire() == 0
+    assert bucket.acquire() == 0.5
+    assert clock.now == 0.5
+
+
+def test_conditional_request_served_from_cache(tmp_path):
+    session = FakeSession([
+        _response(200, '{"n": 1}', {'ETag': '"v1"', 'Content-Type': 'application/json'}),
+        _response(304),
+    ])
+    client = RateLimitedClient('test', rate=100, cache=ResponseCache(tmp_path), session=session)
+
+    first = client.get('https://api.example.com/x', params={'symbol': 'JPM', 'apikey': 'secret'})
+    assert first.json() == {'n': 1}
+    second = client.get('https://api.example.com/x', params={'apikey': 'other', 'symbol': 'JPM'})
+    assert second.status_code == 200 and second.json() == {'n': 1}
+    assert session.calls[1]['headers']['If-None-Match'] == '"v1"'
+    assert client.stats['not_modified'] == 1
+
+    # Entries survive a restart via the cache directory
+    fresh = ResponseCache(tmp_path)
+    assert fresh.get(ResponseCache.key('GET', 'https://api.example.com/x', {'symbol': 'JPM'}))['etag'] == '"v1"'
+
+
+def test_429_is_retried_after_retry_after():
+    slept = []
+    session = FakeSession([_response(429, headers={'Retry-After': '3'}), _response(200, 'ok')])
+    client = RateLimitedClient('test', rate=100, session=session, sleep=slept.append)
+    assert client.get('https://api.example.com/x').text == 'ok'
+    assert 3.0 in slept
+    assert client.stats['rate_limited'] == 1 and client.stats['requests'] == 2
+
+
+def test_map_keeps_order_and_bounds_concurrency():
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            in_flight.append(item)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(item)
+        return item * 2
+
+    client = RateLimitedClient('test', rate=100, max_concurrency=3, session=FakeSession([]))
+    assert client.map(work, range(10)) == [i * 2 for i in range(10)]
+    assert max(peak) <= 3